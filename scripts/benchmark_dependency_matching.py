@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark Azure heuristic dependency detection.
+
+Generates synthetic subscriptions (resources spread over resource groups,
+including SQL databases and Service Bus queues nested under their
+servers and namespaces) and times the indexed DependencyMatcher against the
+previous nested-loop matching, which compared every pair of resources with
+every pattern. The nested loops are quadratic, so they only run up to
+--legacy-max resources.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from topdeck.discovery.azure.dependency_matcher import (
+    HIERARCHICAL_PARENTS,
+    DependencyMatcher,
+    DependencyPattern,
+)
+from topdeck.discovery.azure.discoverer import AzureDiscoverer
+from topdeck.discovery.models import (
+    CloudProvider,
+    DependencyCategory,
+    DependencyType,
+    DiscoveredResource,
+    ResourceDependency,
+)
+
+# Resource types nested under another resource's ID
+CHILD_TYPES = {
+    "sql_server": ("sql_database", "databases"),
+    "servicebus_namespace": ("servicebus_queue", "queues"),
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark Azure dependency matching")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[10000, 50000],
+        help="Subscription sizes in resources (default: 10000 50000)",
+    )
+    parser.add_argument(
+        "--resources-per-group",
+        type=int,
+        default=50,
+        help="Average resources per resource group (default: 50)",
+    )
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=10000,
+        help="Largest size the nested-loop matching is timed for (default: 10000)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    return parser.parse_args()
+
+
+def synthetic_subscription(
+    size: int, resources_per_group: int, patterns: list[DependencyPattern], seed: int
+) -> list[DiscoveredResource]:
+    """Generate a subscription of resources with the types the patterns use."""
+    rng = random.Random(seed)
+    types = sorted({t for pattern in patterns for t in pattern[:2]})
+    groups = max(1, size // resources_per_group)
+
+    resources = []
+    while len(resources) < size:
+        resource_group = f"rg-{rng.randrange(groups)}"
+        resource_type = rng.choice(types)
+        name = f"{resource_type}-{len(resources)}"
+        resource_id = (
+            f"/subscriptions/sub-1/resourceGroups/{resource_group}"
+            f"/providers/Microsoft.Synthetic/{resource_type}/{name}"
+        )
+        resources.append(_resource(resource_id, name, resource_type, resource_group))
+
+        child = CHILD_TYPES.get(resource_type)
+        if child and len(resources) < size:
+            child_type, collection = child
+            child_name = f"{child_type}-{len(resources)}"
+            resources.append(
+                _resource(
+                    f"{resource_id}/{collection}/{child_name}",
+                    child_name,
+                    child_type,
+                    resource_group,
+                )
+            )
+    rng.shuffle(resources)
+    return resources
+
+
+def _resource(
+    resource_id: str, name: str, resource_type: str, resource_group: str
+) -> DiscoveredResource:
+    """Create a synthetic Azure resource."""
+    return DiscoveredResource(
+        id=resource_id,
+        name=name,
+        resource_type=resource_type,
+        cloud_provider=CloudProvider.AZURE,
+        region="eastus",
+        resource_group=resource_group,
+    )
+
+
+def nested_loop_dependencies(
+    resources: list[DiscoveredResource], patterns: list[DependencyPattern]
+) -> list[ResourceDependency]:
+    """Previous matching: every resource pair against every pattern."""
+    dependencies = []
+    for resource in resources:
+        hierarchy = HIERARCHICAL_PARENTS.get(resource.resource_type)
+        if hierarchy is None:
+            continue
+        parent_type, description = hierarchy
+        for other in resources:
+            if other.resource_type == parent_type and other.id.lower() in resource.id.lower():
+                dependencies.append(
+                    ResourceDependency(
+                        source_id=resource.id,
+                        target_id=other.id,
+                        category=DependencyCategory.COMPUTE,
+                        dependency_type=DependencyType.STRONG,
+                        strength=1.0,
+                        discovered_method="resource_hierarchy",
+                        description=description,
+                    )
+                )
+                break
+
+    existing_pairs = {(d.source_id, d.target_id) for d in dependencies}
+    for source in resources:
+        for target in resources:
+            if source.id == target.id or source.resource_group != target.resource_group:
+                continue
+            for source_type, target_type, category, dep_type, strength, description in patterns:
+                if source.resource_type == source_type and target.resource_type == target_type:
+                    pair = (source.id, target.id)
+                    if pair in existing_pairs:
+                        continue
+                    dependencies.append(
+                        ResourceDependency(
+                            source_id=source.id,
+                            target_id=target.id,
+                            category=category,
+                            dependency_type=dep_type,
+                            strength=strength,
+                            discovered_method="heuristic_same_rg",
+                            description=f"{description} in same resource group",
+                        )
+                    )
+                    existing_pairs.add(pair)
+    return dependencies
+
+
+def _timed(func, *args) -> tuple[list[ResourceDependency], float]:
+    """Run a function and return its result and duration in seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    """Main entry point."""
+    args = parse_args()
+    patterns = AzureDiscoverer(subscription_id="benchmark")._get_dependency_patterns()
+    matcher = DependencyMatcher(patterns)
+
+    print(
+        f"{'resources':>10} {'dependencies':>13} {'indexed':>10} "
+        f"{'nested loops':>13} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        resources = synthetic_subscription(size, args.resources_per_group, patterns, args.seed)
+        dependencies, indexed = _timed(matcher.match, resources)
+
+        legacy_column, speedup_column = "skipped", "-"
+        if size <= args.legacy_max:
+            legacy_dependencies, legacy = _timed(nested_loop_dependencies, resources, patterns)
+            if [(d.source_id, d.target_id) for d in legacy_dependencies] != [
+                (d.source_id, d.target_id) for d in dependencies
+            ]:
+                sys.exit(f"Indexed and nested-loop matching disagree at {size} resources")
+            legacy_column, speedup_column = f"{legacy:.2f}s", f"{legacy / indexed:.0f}x"
+
+        print(
+            f"{size:>10} {len(dependencies):>13} {indexed:>9.2f}s "
+            f"{legacy_column:>13} {speedup_column:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
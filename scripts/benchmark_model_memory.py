@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory held by discovery models.
+
+Generates synthetic Azure resource listings page by page (decoded from
+JSON, like SDK responses, so every resource carries its own copies of
+repeated strings), maps them to DiscoveredResource objects with the Azure
+mapper's helpers, and adds one ResourceDependency per resource and one Pod
+for every tenth resource. The same inputs are built with the slotted,
+interning models and with the previous layout (plain dataclasses with a
+per-instance __dict__ and no interning), and the memory retained by each is
+measured with tracemalloc.
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import MISSING, field, fields, make_dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from topdeck.discovery.azure.mapper import AzureResourceMapper
+from topdeck.discovery.models import (
+    CloudProvider,
+    DependencyCategory,
+    DependencyType,
+    DiscoveredResource,
+    Pod,
+    ResourceDependency,
+)
+
+AZURE_TYPES = [
+    "Microsoft.Web/sites",
+    "Microsoft.Sql/servers",
+    "Microsoft.Storage/storageAccounts",
+    "Microsoft.Cache/Redis",
+    "Microsoft.KeyVault/vaults",
+    "Microsoft.Compute/virtualMachines",
+    "Microsoft.Network/virtualNetworks",
+    "Microsoft.ContainerService/managedClusters",
+]
+REGIONS = ["eastus", "westeurope", "southeastasia", "uksouth"]
+PAGE_SIZE = 1000
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark discovery model memory")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[100000],
+        help="Discovery sizes in resources (default: 100000)",
+    )
+    parser.add_argument(
+        "--resources-per-group",
+        type=int,
+        default=50,
+        help="Average resources per resource group (default: 50)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    return parser.parse_args()
+
+
+def dict_backed(cls: type) -> type:
+    """Rebuild a model as it was before: a plain dataclass without interning."""
+    return make_dataclass(
+        f"DictBacked{cls.__name__}",
+        [
+            (f.name, f.type, field(default=f.default, default_factory=f.default_factory))
+            if f.default is not MISSING or f.default_factory is not MISSING
+            else (f.name, f.type)
+            for f in fields(cls)
+        ],
+        namespace={"to_neo4j_properties": cls.to_neo4j_properties},
+    )
+
+
+def listing_pages(size: int, resources_per_group: int, seed: int) -> Iterator[list[dict]]:
+    """Generate pages of a synthetic Azure resource listing."""
+    rng = random.Random(seed)
+    groups = max(1, size // resources_per_group)
+    subscriptions = [f"{rng.getrandbits(128):032x}" for _ in range(4)]
+    for start in range(0, size, PAGE_SIZE):
+        page = []
+        for index in range(start, min(start + PAGE_SIZE, size)):
+            azure_type = rng.choice(AZURE_TYPES)
+            name = f"res-{index}"
+            page.append(
+                {
+                    "id": f"/subscriptions/{rng.choice(subscriptions)}"
+                    f"/resourceGroups/rg-{rng.randrange(groups)}"
+                    f"/providers/{azure_type}/{name}",
+                    "name": name,
+                    "type": azure_type,
+                    "location": rng.choice(REGIONS),
+                    "tags": {"environment": rng.choice(["prod", "staging", "dev"])},
+                }
+            )
+            if index % 10 == 0:
+                page[-1]["pod"] = {
+                    "namespace": rng.choice(["default", "payments", "web"]),
+                    "phase": "Running",
+                    "node_name": f"aks-nodepool-{rng.randrange(8)}",
+                }
+        yield json.loads(json.dumps(page))
+
+
+def build_models(
+    pages: Iterator[list[dict]],
+    resource_cls: Callable[..., Any],
+    dependency_cls: Callable[..., Any],
+    pod_cls: Callable[..., Any],
+    seen_at: datetime,
+) -> tuple[list[Any], list[Any], list[Any]]:
+    """Map listing pages to resources, dependencies and pods."""
+    resources, dependencies, pods = [], [], []
+    for page in pages:
+        for item in page:
+            resource = resource_cls(
+                id=item["id"],
+                name=item["name"],
+                resource_type=AzureResourceMapper.map_resource_type(item["type"]),
+                cloud_provider=CloudProvider.AZURE,
+                region=item["location"],
+                resource_group=AzureResourceMapper.extract_resource_group(item["id"]),
+                subscription_id=AzureResourceMapper.extract_subscription_id(item["id"]),
+                environment=AzureResourceMapper.extract_environment_from_tags(item["tags"]),
+                tags=item["tags"],
+                discovered_at=seen_at,
+                last_seen=seen_at,
+            )
+            if resources:
+                dependencies.append(
+                    dependency_cls(
+                        source_id=resource.id,
+                        target_id=resources[-1].id,
+                        category=DependencyCategory.DATA,
+                        dependency_type=DependencyType.OPTIONAL,
+                        discovered_at=seen_at,
+                        discovered_method="heuristic_same_rg",
+                    )
+                )
+            if "pod" in item:
+                pods.append(
+                    pod_cls(
+                        id=f"{resource.id}/pods/pod-{len(pods)}",
+                        name=f"pod-{len(pods)}",
+                        cluster_id=resource.id.rsplit("/", 1)[0],
+                        last_seen=seen_at,
+                        discovered_at=seen_at,
+                        **item["pod"],
+                    )
+                )
+            resources.append(resource)
+    return resources, dependencies, pods
+
+
+def measure(
+    args: argparse.Namespace, size: int, classes: tuple[type, type, type], seen_at: datetime
+) -> tuple[int, tuple[list[Any], list[Any], list[Any]]]:
+    """Build the models of one discovery and return the bytes they retain."""
+    gc.collect()
+    tracemalloc.start()
+    models = build_models(
+        listing_pages(size, args.resources_per_group, args.seed), *classes, seen_at
+    )
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, models
+
+
+def main() -> None:
+    """Main entry point."""
+    args = parse_args()
+    seen_at = datetime.now(UTC)
+    compact_classes = (DiscoveredResource, ResourceDependency, Pod)
+    legacy_classes = tuple(dict_backed(cls) for cls in compact_classes)
+
+    print(
+        f"{'resources':>10} {'dict-backed':>12} {'compact':>10} {'saved':>7} "
+        f"{'per resource':>13}"
+    )
+    for size in args.sizes:
+        legacy_bytes, legacy_models = measure(args, size, legacy_classes, seen_at)
+        compact_bytes, compact_models = measure(args, size, compact_classes, seen_at)
+
+        for legacy, compact in zip(legacy_models, compact_models, strict=True):
+            for index in (0, len(legacy) // 2, len(legacy) - 1):
+                if legacy[index].to_neo4j_properties() != compact[index].to_neo4j_properties():
+                    sys.exit(f"Models disagree on to_neo4j_properties() at {size} resources")
+        del legacy_models, compact_models
+
+        saved = legacy_bytes - compact_bytes
+        print(
+            f"{size:>10} {legacy_bytes / 2**20:>10.1f}MB {compact_bytes / 2**20:>8.1f}MB "
+            f"{saved / legacy_bytes:>6.0%} {saved / size:>11.0f} B"
+        )
+
+
+if __name__ == "__main__":
+    main()
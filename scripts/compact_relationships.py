@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Remove duplicate relationships from the TopDeck graph.
+
+Earlier versions created a new relationship on every discovery run, so
+graphs populated before relationship writes became idempotent can contain
+many parallel edges between the same resources. This one-shot job keeps the
+most recently discovered edge per (source, target, type, discovered_method)
+and deletes the rest in batches.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from topdeck.common.config import settings
+from topdeck.storage.neo4j_client import UPSERT_RELATIONSHIP_TYPES, Neo4jClient
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Compact duplicate relationships in Neo4j")
+    parser.add_argument(
+        "--types",
+        nargs="+",
+        default=list(UPSERT_RELATIONSHIP_TYPES),
+        help="Relationship types to compact (default: all upserted types)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10000,
+        help="Duplicate groups removed per transaction (default: 10000)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point."""
+    args = parse_args()
+
+    client = Neo4jClient(
+        uri=settings.neo4j_uri,
+        username=settings.neo4j_username,
+        password=settings.neo4j_password,
+        max_transaction_retry_time=settings.neo4j_max_transaction_retry_time,
+        enable_query_cache=False,
+    )
+    try:
+        client.connect()
+    except Exception as e:
+        print(f"✗ Could not connect to Neo4j at {settings.neo4j_uri}: {e}")
+        sys.exit(1)
+
+    try:
+        removed = client.compact_duplicate_relationships(
+            relationship_types=args.types, batch_size=args.batch_size
+        )
+    finally:
+        client.close()
+
+    for relationship_type, count in removed.items():
+        print(f"  {relationship_type}: {count} duplicate(s) removed")
+    print(f"✓ Removed {sum(removed.values())} duplicate relationship(s)")
+
+
+if __name__ == "__main__":
+    main()
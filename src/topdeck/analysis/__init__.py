@@ -4,8 +4,14 @@ This module contains:
 - Topology: Network topology mapping and visualization
 - Risk: Risk analysis and impact assessment
 - Dependencies: Dependency graph builder
+- Graph snapshot: In-memory, adjacency-indexed copy of the graph for fast traversals
 """
 
+from .graph_snapshot import (
+    GraphSnapshot,
+    get_graph_snapshot,
+    refresh_graph_snapshot,
+)
 from .risk import (
     BlastRadius,
     FailureSimulation,
@@ -26,6 +32,10 @@ from .topology import (
 )
 
 __all__ = [
+    # Graph snapshot
+    "GraphSnapshot",
+    "get_graph_snapshot",
+    "refresh_graph_snapshot",
     # Topology
     "TopologyService",
     "TopologyGraph",
@@ -10,7 +10,7 @@ from typing import Any
 
 import structlog
 
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 from .models import PredictionOutcome
 from .prediction_tracker import PredictionTracker
 
@@ -28,7 +28,7 @@ class PredictionCalibrator:
     4. Recommend feature weight adjustments
     """
 
-    def __init__(self, neo4j_client: Neo4jClient):
+    def __init__(self, neo4j_client: AsyncNeo4jClient):
         """
         Initialize calibrator.
         
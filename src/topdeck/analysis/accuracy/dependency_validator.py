@@ -6,7 +6,7 @@ from datetime import datetime, timezone, timedelta
 
 import structlog
 
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 from .models import (
     AccuracyMetrics,
     DependencyValidation,
@@ -25,7 +25,7 @@ class DependencyValidator:
     over time to improve confidence scoring.
     """
 
-    def __init__(self, neo4j_client: Neo4jClient):
+    def __init__(self, neo4j_client: AsyncNeo4jClient):
         """
         Initialize dependency validator.
         
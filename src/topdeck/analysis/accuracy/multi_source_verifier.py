@@ -17,7 +17,7 @@ import structlog
 
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
 from topdeck.monitoring.collectors.tempo import TempoCollector
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 # AzureDevOpsDiscoverer is an optional dependency for ADO verification
 try:
@@ -66,7 +66,7 @@ class MultiSourceDependencyVerifier:
 
     def __init__(
         self,
-        neo4j_client: Neo4jClient,
+        neo4j_client: AsyncNeo4jClient,
         ado_discoverer: AzureDevOpsDiscoverer | None = None,
         prometheus_collector: PrometheusCollector | None = None,
         tempo_collector: TempoCollector | None = None,
@@ -8,7 +8,7 @@ import uuid
 
 import structlog
 
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 from .models import (
     AccuracyMetrics,
     PredictionOutcome,
@@ -27,7 +27,7 @@ class PredictionTracker:
     Calculates accuracy metrics over time to improve model confidence.
     """
 
-    def __init__(self, neo4j_client: Neo4jClient):
+    def __init__(self, neo4j_client: AsyncNeo4jClient):
         """
         Initialize prediction tracker.
         
@@ -19,7 +19,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from topdeck.analysis.accuracy.dependency_validator import DependencyValidator
 from topdeck.analysis.accuracy.prediction_tracker import PredictionTracker
 from topdeck.analysis.accuracy.calibration import PredictionCalibrator
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,7 @@ class AccuracyMaintenanceScheduler:
 
     def __init__(
         self,
-        neo4j_client: Neo4jClient,
+        neo4j_client: AsyncNeo4jClient,
         validation_interval_hours: int = 1,
         decay_schedule: str = "0 2 * * *",  # 2 AM daily
         calibration_schedule: str = "0 3 * * 0",  # 3 AM Sunday
@@ -9,14 +9,16 @@ Provides:
 """
 
 import logging
-import statistics
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Any, Optional
 
+from topdeck.analysis.baseline_store import BaselineStore, MetricBaselineState
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.monitoring.collectors.range_fetch import RangeSeries
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 logger = logging.getLogger(__name__)
 
@@ -110,14 +112,18 @@ class BaselineAnalyzer:
     - Compare current metrics with historical periods
     - Detect deviations from baseline
     - Identify trends
+    
+    Baselines are answered from rolling aggregates in a BaselineStore, so
+    each calculation only fetches samples newer than the last one.
     """
     
     def __init__(
         self,
         prometheus_collector: PrometheusCollector,
-        neo4j_client: Neo4jClient,
+        neo4j_client: AsyncNeo4jClient,
         baseline_period_days: int = 7,
         anomaly_threshold_stdev: float = 2.0,
+        baseline_store: Optional[BaselineStore] = None,
     ):
         """
         Initialize baseline analyzer.
@@ -127,11 +133,13 @@ class BaselineAnalyzer:
             neo4j_client: Neo4j client for topology
             baseline_period_days: Days of data to use for baseline (default 7)
             anomaly_threshold_stdev: Standard deviations for anomaly detection (default 2.0)
+            baseline_store: Store for rolling aggregates (default: in-memory store)
         """
         self.prometheus = prometheus_collector
         self.neo4j = neo4j_client
         self.baseline_period_days = baseline_period_days
         self.anomaly_threshold_stdev = anomaly_threshold_stdev
+        self.baseline_store = baseline_store or BaselineStore()
         
         # Cache for baselines (in production, use Redis or database)
         self.baseline_cache: dict[str, Baseline] = {}
@@ -221,79 +229,67 @@ class BaselineAnalyzer:
         resource_id: str,
         metric_type: MetricType,
     ) -> BaselineMetric:
-        """Calculate baseline for a single metric."""
-        # Get historical data
-        end_time = datetime.now(UTC)
-        start_time = end_time - timedelta(days=self.baseline_period_days)
+        """
+        Calculate baseline for a single metric.
         
-        # Build Prometheus query based on metric type
-        query = self._build_prometheus_query(resource_id, metric_type)
+        Fetches only the samples since the last update (the whole baseline
+        period the first time), folds them into the stored aggregates and
+        derives the baseline from those.
+        """
+        end_time = datetime.now(UTC)
+        period_start = end_time - timedelta(days=self.baseline_period_days)
         
-        # Query Prometheus for historical data
-        try:
-            data = await self.prometheus.query_range(
-                query=query,
-                start=start_time,
-                end=end_time,
-                step="5m",  # 5-minute granularity
-            )
+        async with self.baseline_store.lock(resource_id, metric_type.value):
+            state = await self.baseline_store.load(resource_id, metric_type.value)
             
-            # Extract values
-            values = []
-            if data and len(data) > 0:
-                for result in data:
-                    if "values" in result:
-                        for timestamp, value in result["values"]:
-                            try:
-                                values.append(float(value))
-                            except (ValueError, TypeError):
-                                continue
-            
-            if not values:
-                # No data available, return default baseline
-                return BaselineMetric(
-                    metric_name=metric_type.value,
-                    mean=0.0,
-                    median=0.0,
-                    std_dev=0.0,
-                    min_value=0.0,
-                    max_value=0.0,
-                    percentile_95=0.0,
-                    percentile_99=0.0,
-                    sample_count=0,
-                    calculation_period=f"{self.baseline_period_days} days",
+            start_time = period_start
+            if state.last_timestamp is not None:
+                start_time = max(
+                    start_time, datetime.fromtimestamp(state.last_timestamp, UTC)
                 )
             
-            # Calculate statistics
-            mean = statistics.mean(values)
-            median = statistics.median(values)
-            std_dev = statistics.stdev(values) if len(values) > 1 else 0.0
-            min_val = min(values)
-            max_val = max(values)
+            # Build Prometheus query based on metric type
+            query = self._build_prometheus_query(resource_id, metric_type)
             
-            # Calculate percentiles
-            sorted_values = sorted(values)
-            p95_idx = min(int(len(sorted_values) * 0.95), len(sorted_values) - 1)
-            p99_idx = min(int(len(sorted_values) * 0.99), len(sorted_values) - 1)
-            percentile_95 = sorted_values[p95_idx]
-            percentile_99 = sorted_values[p99_idx]
+            try:
+                series = await self.prometheus.fetch_range(
+                    query=query,
+                    start=start_time,
+                    end=end_time,
+                    step="5m",  # 5-minute granularity
+                )
+                added = state.add_samples(self._iter_samples(series))
+                logger.debug(
+                    f"Added {added} samples to {metric_type.value} baseline of {resource_id}"
+                )
+            except Exception as e:
+                # Keep serving the stored aggregates
+                logger.error(f"Error querying Prometheus for {metric_type.value}: {e}")
             
-            return BaselineMetric(
-                metric_name=metric_type.value,
-                mean=mean,
-                median=median,
-                std_dev=std_dev,
-                min_value=min_val,
-                max_value=max_val,
-                percentile_95=percentile_95,
-                percentile_99=percentile_99,
-                sample_count=len(values),
-                calculation_period=f"{self.baseline_period_days} days",
+            state.expire(period_start.timestamp())
+            await self.baseline_store.save(
+                state, ttl=int(timedelta(days=self.baseline_period_days + 1).total_seconds())
             )
-            
-        except Exception as e:
-            logger.error(f"Error querying Prometheus for {metric_type.value}: {e}")
-            # Return default baseline on error
+        
+        return self._baseline_from_state(metric_type, state)
+    
+    @staticmethod
+    def _iter_samples(series: list[RangeSeries]) -> Iterator[tuple[float, float]]:
+        """Extract (timestamp, value) pairs from fetched range series."""
+        for s in series:
+            yield from zip(s.timestamps.tolist(), s.values.tolist(), strict=True)
+    
+    def _baseline_from_state(
+        self,
+        metric_type: MetricType,
+        state: MetricBaselineState,
+    ) -> BaselineMetric:
+        """Build baseline statistics from stored aggregates."""
+        summary = state.summary()
+        stats = summary.stats
+        
+        if stats.count == 0:
+            # No data available, return default baseline
             return BaselineMetric(
                 metric_name=metric_type.value,
                 mean=0.0,
@@ -306,6 +302,23 @@ class BaselineAnalyzer:
                 sample_count=0,
                 calculation_period=f"{self.baseline_period_days} days",
             )
+        
+        def percentile(q: float) -> float:
+            # Sketch estimates are within its relative accuracy; keep them in range
+            return min(max(summary.sketch.quantile(q), stats.min_value), stats.max_value)
+        
+        return BaselineMetric(
+            metric_name=metric_type.value,
+            mean=stats.mean,
+            median=percentile(0.5),
+            std_dev=stats.std_dev,
+            min_value=stats.min_value,
+            max_value=stats.max_value,
+            percentile_95=percentile(0.95),
+            percentile_99=percentile(0.99),
+            sample_count=stats.count,
+            calculation_period=f"{self.baseline_period_days} days",
+        )
     
     def _build_prometheus_query(self, resource_id: str, metric_type: MetricType) -> str:
         """Build Prometheus query for a metric type."""
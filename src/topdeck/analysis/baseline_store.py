@@ -0,0 +1,431 @@
+"""
+Persistent rolling aggregates for metric baselines.
+
+Instead of refetching ``baseline_period_days`` of samples for every baseline,
+the store keeps per resource and metric:
+
+- Welford running mean/variance plus min/max, and
+- a DDSketch-style quantile sketch (relative-error log buckets),
+
+split into time buckets (one day by default). New samples are folded into
+the current bucket, buckets older than the baseline period are dropped, and
+a baseline is the merge of the remaining buckets. Only samples newer than
+the last ingested timestamp have to be fetched.
+
+States are kept in memory and, when a Redis cache is given, persisted there
+so they survive restarts and are shared between replicas.
+"""
+
+import asyncio
+import logging
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from topdeck.common.cache import Cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "baseline:"
+DEFAULT_BUCKET_SECONDS = 86400
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+
+
+@dataclass
+class RunningStats:
+    """Count, mean, variance (Welford) and range of a stream of values."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min_value: float | None = None
+    max_value: float | None = None
+
+    def add(self, value: float) -> None:
+        """Add one value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Merge another stream's statistics into this one (Chan et al.)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min_value, self.max_value = other.min_value, other.max_value
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+
+    @property
+    def std_dev(self) -> float:
+        """Sample standard deviation (0 for fewer than two values)."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a dictionary."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min_value,
+            "max": self.max_value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RunningStats":
+        """Deserialize from a dictionary."""
+        return cls(
+            count=data["count"],
+            mean=data["mean"],
+            m2=data["m2"],
+            min_value=data["min"],
+            max_value=data["max"],
+        )
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error (DDSketch).
+
+    Values are counted in logarithmic bins, so any quantile is estimated
+    within ``relative_accuracy`` of a true sample value. When there are more
+    than ``max_bins`` bins, the lowest ones are collapsed, which only affects
+    accuracy of the smallest values.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_bins: int = DEFAULT_MAX_BINS,
+    ):
+        """
+        Initialize quantile sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+            max_bins: Maximum number of bins per sign
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.positive: dict[int, int] = {}
+        self.negative: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Add a value (``weight`` times)."""
+        if value > 0:
+            self._add_to(self.positive, self._key(value), weight)
+        elif value < 0:
+            self._add_to(self.negative, self._key(-value), weight)
+        else:
+            self.zero_count += weight
+        self.count += weight
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge another sketch with the same relative accuracy into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, weight in other.positive.items():
+            self._add_to(self.positive, key, weight)
+        for key, weight in other.negative.items():
+            self._add_to(self.negative, key, weight)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a dictionary (bins as [key, count] pairs)."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "positive": [[key, weight] for key, weight in self.positive.items()],
+            "negative": [[key, weight] for key, weight in self.negative.items()],
+            "zero_count": self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        """Deserialize from a dictionary."""
+        sketch = cls(data["relative_accuracy"], data["max_bins"])
+        sketch.positive = {int(key): weight for key, weight in data["positive"]}
+        sketch.negative = {int(key): weight for key, weight in data["negative"]}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = (
+            sum(sketch.positive.values()) + sum(sketch.negative.values()) + sketch.zero_count
+        )
+        return sketch
+
+    def _key(self, magnitude: float) -> int:
+        """Bin index of a positive magnitude."""
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Representative value of a bin (relative error <= relative_accuracy)."""
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def _add_to(self, bins: dict[int, int], key: int, weight: int) -> None:
+        """Add to a bin, collapsing the lowest bins past max_bins."""
+        bins[key] = bins.get(key, 0) + weight
+        if len(bins) > self.max_bins:
+            lowest = sorted(bins)[: len(bins) - self.max_bins + 1]
+            target = lowest[-1]
+            bins[target] += sum(bins.pop(k) for k in lowest[:-1])
+
+
+@dataclass
+class WindowAggregate:
+    """Aggregates of the samples in one time bucket."""
+
+    stats: RunningStats = field(default_factory=RunningStats)
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add(self, value: float) -> None:
+        """Add one sample value."""
+        self.stats.add(value)
+        self.sketch.add(value)
+
+
+@dataclass
+class MetricBaselineState:
+    """Rolling aggregates of one metric of one resource."""
+
+    resource_id: str
+    metric_name: str
+    bucket_seconds: int = DEFAULT_BUCKET_SECONDS
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    buckets: dict[int, WindowAggregate] = field(default_factory=dict)
+    last_timestamp: float | None = None
+
+    def add_samples(self, samples: Iterable[tuple[float, float]]) -> int:
+        """
+        Fold new samples into their time buckets.
+
+        Samples at or before the last ingested timestamp are skipped, so
+        overlapping fetch windows do not count samples twice.
+
+        Args:
+            samples: (unix timestamp, value) pairs
+
+        Returns:
+            Number of samples added
+        """
+        added = 0
+        newest = self.last_timestamp
+        for timestamp, value in samples:
+            if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+                continue
+            if math.isnan(value) or math.isinf(value):
+                continue
+            start = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+            bucket = self.buckets.get(start)
+            if bucket is None:
+                bucket = WindowAggregate(sketch=QuantileSketch(self.relative_accuracy))
+                self.buckets[start] = bucket
+            bucket.add(value)
+            newest = timestamp if newest is None else max(newest, timestamp)
+            added += 1
+        self.last_timestamp = newest
+        return added
+
+    def expire(self, before: float) -> int:
+        """
+        Drop buckets that end before a timestamp.
+
+        Args:
+            before: Unix timestamp where the baseline period starts
+
+        Returns:
+            Number of buckets dropped
+        """
+        expired = [start for start in self.buckets if start + self.bucket_seconds <= before]
+        for start in expired:
+            del self.buckets[start]
+        return len(expired)
+
+    def summary(self) -> WindowAggregate:
+        """Merge all buckets into aggregates of the whole period."""
+        total = WindowAggregate(sketch=QuantileSketch(self.relative_accuracy))
+        for start in sorted(self.buckets):
+            total.stats.merge(self.buckets[start].stats)
+            total.sketch.merge(self.buckets[start].sketch)
+        return total
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to a dictionary."""
+        return {
+            "resource_id": self.resource_id,
+            "metric_name": self.metric_name,
+            "bucket_seconds": self.bucket_seconds,
+            "relative_accuracy": self.relative_accuracy,
+            "last_timestamp": self.last_timestamp,
+            "buckets": [
+                [start, bucket.stats.to_dict(), bucket.sketch.to_dict()]
+                for start, bucket in self.buckets.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MetricBaselineState":
+        """Deserialize from a dictionary."""
+        return cls(
+            resource_id=data["resource_id"],
+            metric_name=data["metric_name"],
+            bucket_seconds=data["bucket_seconds"],
+            relative_accuracy=data["relative_accuracy"],
+            last_timestamp=data["last_timestamp"],
+            buckets={
+                int(start): WindowAggregate(
+                    stats=RunningStats.from_dict(stats),
+                    sketch=QuantileSketch.from_dict(sketch),
+                )
+                for start, stats, sketch in data["buckets"]
+            },
+        )
+
+
+class BaselineStore:
+    """
+    Store of rolling baseline aggregates per resource and metric.
+
+    States live in memory and, with a cache, in Redis under
+    ``baseline:<resource_id>:<metric_name>``; the Redis copy wins on load.
+    """
+
+    def __init__(
+        self,
+        cache: Cache | None = None,
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ):
+        """
+        Initialize baseline store.
+
+        Args:
+            cache: Connected Redis cache for persistence (None for memory only)
+            bucket_seconds: Width of the time buckets samples are aggregated in
+            relative_accuracy: Relative accuracy of quantile estimates
+        """
+        self.cache = cache
+        self.bucket_seconds = bucket_seconds
+        self.relative_accuracy = relative_accuracy
+        self._states: dict[tuple[str, str], MetricBaselineState] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    def lock(self, resource_id: str, metric_name: str) -> asyncio.Lock:
+        """
+        Get the lock serializing updates of one state.
+
+        Args:
+            resource_id: Resource ID
+            metric_name: Metric name
+
+        Returns:
+            Lock for the state
+        """
+        return self._locks.setdefault((resource_id, metric_name), asyncio.Lock())
+
+    async def load(self, resource_id: str, metric_name: str) -> MetricBaselineState:
+        """
+        Load the state of a resource metric, or a new empty one.
+
+        Args:
+            resource_id: Resource ID
+            metric_name: Metric name
+
+        Returns:
+            Baseline state
+        """
+        key = (resource_id, metric_name)
+        state = self._states.get(key)
+        if self.cache is not None:
+            # Redis holds the latest state when replicas share it
+            data = await self.cache.get(self._cache_key(resource_id, metric_name))
+            if data is not None:
+                try:
+                    state = MetricBaselineState.from_dict(data)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Discarding unreadable baseline state {key}: {e}")
+        if state is None or state.bucket_seconds != self.bucket_seconds:
+            state = MetricBaselineState(
+                resource_id=resource_id,
+                metric_name=metric_name,
+                bucket_seconds=self.bucket_seconds,
+                relative_accuracy=self.relative_accuracy,
+            )
+        self._states[key] = state
+        return state
+
+    async def save(self, state: MetricBaselineState, ttl: int | None = None) -> None:
+        """
+        Save a state.
+
+        Args:
+            state: Baseline state
+            ttl: Time to live of the persisted copy in seconds
+        """
+        self._states[(state.resource_id, state.metric_name)] = state
+        if self.cache is not None:
+            await self.cache.set(
+                self._cache_key(state.resource_id, state.metric_name), state.to_dict(), ttl=ttl
+            )
+
+    async def delete(self, resource_id: str, metric_name: str) -> None:
+        """
+        Delete the state of a resource metric.
+
+        Args:
+            resource_id: Resource ID
+            metric_name: Metric name
+        """
+        self._states.pop((resource_id, metric_name), None)
+        if self.cache is not None:
+            await self.cache.delete(self._cache_key(resource_id, metric_name))
+
+    @staticmethod
+    def _cache_key(resource_id: str, metric_name: str) -> str:
+        """Build the Redis key of a state."""
+        return f"{KEY_PREFIX}{resource_id}:{metric_name}"
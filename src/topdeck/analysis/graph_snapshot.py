@@ -0,0 +1,620 @@
+"""
+In-memory graph snapshot for fast topology and risk traversals.
+
+Loads the whole resource graph from Neo4j once and keeps it as a read-only,
+adjacency-indexed structure (compressed sparse rows over interned node IDs).
+Traversals such as dependency counts, blast radius and BFS/DFS walks then run
+in-process instead of issuing one variable-length Cypher query per call.
+
+The snapshot is rebuilt after each discovery run and swapped in atomically,
+so readers always see a complete, consistent graph.
+"""
+
+import logging
+import threading
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.query_catalog import (
+    DEPENDENCY_RELATIONSHIP_TYPES,
+    NODE_LABEL,
+    RESOURCE_LABEL,
+    QueryBuilder,
+    register_query,
+)
+
+logger = logging.getLogger(__name__)
+
+# Directions understood by the traversal helpers
+OUTGOING = "out"
+INCOMING = "in"
+BOTH = "both"
+
+SNAPSHOT_NODES_QUERY = register_query(
+    "snapshot.nodes",
+    f"""
+    MATCH (n:{NODE_LABEL})
+    WHERE n.id IS NOT NULL
+    RETURN n.id as id,
+           n.name as name,
+           {QueryBuilder.node_type("n")} as resource_type,
+           n.cloud_provider as cloud_provider,
+           '{RESOURCE_LABEL}' IN labels(n) as is_resource,
+           properties(n) as properties
+    """,
+)
+
+SNAPSHOT_EDGES_QUERY = register_query(
+    "snapshot.edges",
+    f"""
+    MATCH (source:{NODE_LABEL})-[rel]->(target:{NODE_LABEL})
+    RETURN source.id as source_id,
+           target.id as target_id,
+           type(rel) as relationship_type
+    """,
+)
+
+
+class GraphSnapshot:
+    """
+    Read-only, array-backed snapshot of the resource graph.
+
+    Node IDs are interned to dense integer indices. Outgoing and incoming
+    adjacency are stored as CSR arrays (offsets + targets + relationship
+    type codes), so neighbour lookups are a slice and a full BFS is
+    O(V + E) without touching the database.
+    """
+
+    def __init__(
+        self,
+        nodes: Iterable[dict[str, Any]],
+        edges: Iterable[tuple[str, str, str]],
+        built_at: datetime | None = None,
+    ):
+        """
+        Build a snapshot from node and edge records.
+
+        Args:
+            nodes: Node records with at least 'id'; optional 'name',
+                'resource_type', 'cloud_provider', 'is_resource' and 'properties'
+            edges: (source_id, target_id, relationship_type) tuples. Edges whose
+                endpoints are not in ``nodes`` are skipped.
+            built_at: When the underlying data was read (defaults to now)
+        """
+        self.built_at = built_at or datetime.now(UTC)
+
+        self._ids: list[str] = []
+        self._index: dict[str, int] = {}
+        self._names: list[str | None] = []
+        self._types: list[str | None] = []
+        self._providers: list[str | None] = []
+        self._properties: list[dict[str, Any]] = []
+        self._is_resource = bytearray()
+
+        for node in nodes:
+            node_id = node.get("id")
+            if node_id is None or node_id in self._index:
+                continue
+            self._index[node_id] = len(self._ids)
+            self._ids.append(node_id)
+            self._names.append(node.get("name"))
+            self._types.append(node.get("resource_type"))
+            self._providers.append(node.get("cloud_provider"))
+            self._properties.append(node.get("properties") or {})
+            self._is_resource.append(1 if node.get("is_resource", True) else 0)
+
+        self._rel_types: list[str] = []
+        self._rel_type_index: dict[str, int] = {}
+
+        sources = array("l")
+        targets = array("l")
+        codes = array("h")
+        for source_id, target_id, rel_type in edges:
+            source_idx = self._index.get(source_id)
+            target_idx = self._index.get(target_id)
+            if source_idx is None or target_idx is None:
+                continue
+            code = self._rel_type_index.get(rel_type)
+            if code is None:
+                code = len(self._rel_types)
+                self._rel_type_index[rel_type] = code
+                self._rel_types.append(rel_type)
+            sources.append(source_idx)
+            targets.append(target_idx)
+            codes.append(code)
+
+        self._out_offsets, self._out_targets, self._out_codes = self._build_csr(
+            sources, targets, codes
+        )
+        self._in_offsets, self._in_targets, self._in_codes = self._build_csr(
+            targets, sources, codes
+        )
+
+    def _build_csr(
+        self, rows: array, cols: array, codes: array
+    ) -> tuple[array, array, array]:
+        """Build CSR arrays (offsets, columns, codes) with a counting sort on rows."""
+        node_count = len(self._ids)
+        offsets = array("l", [0] * (node_count + 1))
+        for row in rows:
+            offsets[row + 1] += 1
+        for i in range(node_count):
+            offsets[i + 1] += offsets[i]
+
+        cursor = array("l", offsets[:-1]) if node_count else array("l")
+        out_cols = array("l", [0] * len(rows))
+        out_codes = array("h", [0] * len(rows))
+        for row, col, code in zip(rows, cols, codes, strict=True):
+            position = cursor[row]
+            out_cols[position] = col
+            out_codes[position] = code
+            cursor[row] = position + 1
+
+        return offsets, out_cols, out_codes
+
+    @classmethod
+    def from_neo4j(cls, neo4j_client: Neo4jClient) -> "GraphSnapshot":
+        """
+        Load a snapshot of the full graph from Neo4j.
+
+        Uses two set-oriented queries (all nodes, all relationships) regardless
+        of graph size.
+
+        Args:
+            neo4j_client: Neo4j client to read from
+
+        Returns:
+            New GraphSnapshot
+        """
+        built_at = datetime.now(UTC)
+        with neo4j_client.session() as session:
+            nodes = [
+                {
+                    "id": record["id"],
+                    "name": record["name"],
+                    "resource_type": record["resource_type"],
+                    "cloud_provider": record["cloud_provider"],
+                    "is_resource": record["is_resource"],
+                    "properties": dict(record["properties"]) if record["properties"] else {},
+                }
+                for record in session.run(SNAPSHOT_NODES_QUERY)
+            ]
+            edges = [
+                (record["source_id"], record["target_id"], record["relationship_type"])
+                for record in session.run(SNAPSHOT_EDGES_QUERY)
+            ]
+
+        return cls(nodes, edges, built_at=built_at)
+
+    @property
+    def node_count(self) -> int:
+        """Number of nodes in the snapshot."""
+        return len(self._ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of relationships in the snapshot."""
+        return len(self._out_targets)
+
+    def __contains__(self, resource_id: object) -> bool:
+        return resource_id in self._index
+
+    @property
+    def node_ids(self) -> list[str]:
+        """Node IDs in internal index order (do not modify)."""
+        return self._ids
+
+    def index_of(self, resource_id: str) -> int | None:
+        """Get the internal index of a node, or None if it is not in the snapshot."""
+        return self._index.get(resource_id)
+
+    def index_edges(
+        self, relationship_types: Iterable[str] | None = None
+    ) -> list[tuple[int, int]]:
+        """
+        Get relationships as (source index, target index) pairs.
+
+        Intended for whole-graph algorithms that work on integer node indexes.
+
+        Args:
+            relationship_types: Restrict to these relationship types (None = all)
+
+        Returns:
+            List of (source_index, target_index) tuples
+        """
+        codes = self._type_codes(relationship_types)
+        return [
+            (source, target)
+            for source in range(len(self._ids))
+            for target, _ in self._iter_adjacent(source, OUTGOING, codes)
+        ]
+
+    def get_node(self, resource_id: str) -> dict[str, Any] | None:
+        """
+        Get the stored attributes of a node.
+
+        Args:
+            resource_id: Node ID
+
+        Returns:
+            Dictionary with id, name, resource_type, cloud_provider, is_resource
+            and properties, or None if the node is not in the snapshot
+        """
+        idx = self._index.get(resource_id)
+        if idx is None:
+            return None
+        return self._node_dict(idx)
+
+    def _node_dict(self, idx: int) -> dict[str, Any]:
+        return {
+            "id": self._ids[idx],
+            "name": self._names[idx],
+            "resource_type": self._types[idx],
+            "cloud_provider": self._providers[idx],
+            "is_resource": bool(self._is_resource[idx]),
+            "properties": self._properties[idx],
+        }
+
+    def _type_codes(self, relationship_types: Iterable[str] | None) -> frozenset[int] | None:
+        """Translate relationship type names into interned codes (None = all types)."""
+        if relationship_types is None:
+            return None
+        return frozenset(
+            self._rel_type_index[t] for t in relationship_types if t in self._rel_type_index
+        )
+
+    def _iter_adjacent(
+        self, idx: int, direction: str, codes: frozenset[int] | None
+    ) -> Iterator[tuple[int, int]]:
+        """Yield (neighbour index, relationship code) pairs for a node."""
+        if direction in (OUTGOING, BOTH):
+            for pos in range(self._out_offsets[idx], self._out_offsets[idx + 1]):
+                code = self._out_codes[pos]
+                if codes is None or code in codes:
+                    yield self._out_targets[pos], code
+        if direction in (INCOMING, BOTH):
+            for pos in range(self._in_offsets[idx], self._in_offsets[idx + 1]):
+                code = self._in_codes[pos]
+                if codes is None or code in codes:
+                    yield self._in_targets[pos], code
+
+    def neighbors(
+        self,
+        resource_id: str,
+        direction: str = OUTGOING,
+        relationship_types: Iterable[str] | None = None,
+    ) -> list[tuple[str, str]]:
+        """
+        Get the direct neighbours of a node, one entry per relationship.
+
+        Args:
+            resource_id: Node ID
+            direction: "out" (what it depends on), "in" (what depends on it) or "both"
+            relationship_types: Restrict to these relationship types (None = all)
+
+        Returns:
+            List of (neighbour_id, relationship_type) tuples
+        """
+        idx = self._index.get(resource_id)
+        if idx is None:
+            return []
+        codes = self._type_codes(relationship_types)
+        return [
+            (self._ids[neighbor], self._rel_types[code])
+            for neighbor, code in self._iter_adjacent(idx, direction, codes)
+        ]
+
+    def degree(
+        self,
+        resource_id: str,
+        direction: str = OUTGOING,
+        relationship_types: Iterable[str] | None = None,
+        distinct: bool = True,
+    ) -> int:
+        """
+        Count neighbours of a node.
+
+        Args:
+            resource_id: Node ID
+            direction: "out", "in" or "both"
+            relationship_types: Restrict to these relationship types (None = all)
+            distinct: Count distinct neighbours rather than relationships
+
+        Returns:
+            Neighbour (or relationship) count
+        """
+        idx = self._index.get(resource_id)
+        if idx is None:
+            return 0
+        codes = self._type_codes(relationship_types)
+        adjacent = (neighbor for neighbor, _ in self._iter_adjacent(idx, direction, codes))
+        if distinct:
+            return len(set(adjacent))
+        return sum(1 for _ in adjacent)
+
+    def dependency_counts(self, resource_id: str) -> tuple[int, int]:
+        """
+        Get distinct upstream and downstream dependency counts.
+
+        Args:
+            resource_id: Node ID
+
+        Returns:
+            Tuple of (dependencies_count, dependents_count)
+        """
+        return (
+            self.degree(resource_id, OUTGOING, DEPENDENCY_RELATIONSHIP_TYPES),
+            self.degree(resource_id, INCOMING, DEPENDENCY_RELATIONSHIP_TYPES),
+        )
+
+    def _bfs(
+        self,
+        idx: int,
+        direction: str,
+        max_depth: int,
+        codes: frozenset[int] | None,
+    ) -> tuple[dict[int, int], dict[int, int]]:
+        """Breadth-first search returning (distance, parent) maps keyed by node index."""
+        distances = {idx: 0}
+        parents: dict[int, int] = {}
+        queue = deque([idx])
+        while queue:
+            current = queue.popleft()
+            depth = distances[current]
+            if depth >= max_depth:
+                continue
+            for neighbor, _ in self._iter_adjacent(current, direction, codes):
+                if neighbor not in distances:
+                    distances[neighbor] = depth + 1
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        return distances, parents
+
+    def traverse(
+        self,
+        resource_id: str,
+        direction: str = OUTGOING,
+        max_depth: int = 10,
+        relationship_types: Iterable[str] | None = None,
+    ) -> dict[str, int]:
+        """
+        Find every node reachable within ``max_depth`` hops.
+
+        Args:
+            resource_id: Start node ID
+            direction: "out" (upstream dependencies), "in" (downstream dependents) or "both"
+            max_depth: Maximum number of hops
+            relationship_types: Restrict to these relationship types (None = all)
+
+        Returns:
+            Dictionary mapping reachable node IDs to their shortest hop distance,
+            ordered by distance. The start node is not included.
+        """
+        idx = self._index.get(resource_id)
+        if idx is None:
+            return {}
+        distances, _ = self._bfs(idx, direction, max_depth, self._type_codes(relationship_types))
+        return {self._ids[node]: dist for node, dist in distances.items() if node != idx}
+
+    def traverse_nodes(
+        self,
+        resource_id: str,
+        direction: str = OUTGOING,
+        max_depth: int = 10,
+        relationship_types: Iterable[str] | None = None,
+        resources_only: bool = False,
+    ) -> list[tuple[dict[str, Any], int]]:
+        """
+        Like :meth:`traverse` but returns full node attributes.
+
+        Args:
+            resource_id: Start node ID
+            direction: "out", "in" or "both"
+            max_depth: Maximum number of hops
+            relationship_types: Restrict to these relationship types (None = all)
+            resources_only: Only return nodes carrying the Resource label
+
+        Returns:
+            List of (node_dict, distance) tuples ordered by distance
+        """
+        idx = self._index.get(resource_id)
+        if idx is None:
+            return []
+        distances, _ = self._bfs(idx, direction, max_depth, self._type_codes(relationship_types))
+        return [
+            (self._node_dict(node), dist)
+            for node, dist in distances.items()
+            if node != idx and (not resources_only or self._is_resource[node])
+        ]
+
+    def deepest_path(
+        self,
+        resource_id: str,
+        direction: str = INCOMING,
+        max_depth: int = 10,
+        relationship_types: Iterable[str] | None = None,
+    ) -> list[str]:
+        """
+        Get the shortest path from a node to the node furthest away from it.
+
+        Used as the critical path: the deepest chain of cascading impact.
+
+        Args:
+            resource_id: Start node ID
+            direction: "in" follows dependents, "out" follows dependencies
+            max_depth: Maximum number of hops
+            relationship_types: Restrict to these relationship types (None = all)
+
+        Returns:
+            List of node IDs starting with ``resource_id``
+        """
+        idx = self._index.get(resource_id)
+        if idx is None:
+            return [resource_id]
+        distances, parents = self._bfs(
+            idx, direction, max_depth, self._type_codes(relationship_types)
+        )
+        # BFS discovers nodes in non-decreasing distance, so the last key is the deepest
+        deepest = next(reversed(distances))
+        path = [deepest]
+        while path[-1] != idx:
+            path.append(parents[path[-1]])
+        return [self._ids[node] for node in reversed(path)]
+
+    def max_depth(
+        self,
+        resource_id: str,
+        direction: str = OUTGOING,
+        max_depth: int = 10,
+        relationship_types: Iterable[str] | None = None,
+    ) -> int:
+        """
+        Get the hop distance to the furthest reachable node.
+
+        Args:
+            resource_id: Start node ID
+            direction: "out", "in" or "both"
+            max_depth: Maximum number of hops
+            relationship_types: Restrict to these relationship types (None = all)
+
+        Returns:
+            Depth of the dependency tree (0 if nothing is reachable)
+        """
+        distances = self.traverse(resource_id, direction, max_depth, relationship_types)
+        return max(distances.values(), default=0)
+
+    def tree_edges(
+        self,
+        resource_id: str,
+        direction: str = OUTGOING,
+        max_depth: int = 5,
+        relationship_types: Iterable[str] | None = None,
+    ) -> list[tuple[str, str]]:
+        """
+        Get every relationship on a path of at most ``max_depth`` hops from a node.
+
+        Args:
+            resource_id: Start node ID
+            direction: "out" or "in"
+            max_depth: Maximum number of hops
+            relationship_types: Restrict to these relationship types (None = all)
+
+        Returns:
+            Distinct (source_id, target_id) pairs in original relationship direction
+        """
+        idx = self._index.get(resource_id)
+        if idx is None:
+            return []
+        codes = self._type_codes(relationship_types)
+        distances, _ = self._bfs(idx, direction, max_depth, codes)
+
+        seen: set[tuple[int, int]] = set()
+        edges: list[tuple[str, str]] = []
+        for node, dist in distances.items():
+            if dist >= max_depth:
+                continue
+            for neighbor, _ in self._iter_adjacent(node, direction, codes):
+                pair = (node, neighbor) if direction == OUTGOING else (neighbor, node)
+                if pair not in seen:
+                    seen.add(pair)
+                    edges.append((self._ids[pair[0]], self._ids[pair[1]]))
+        return edges
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get snapshot statistics.
+
+        Returns:
+            Dictionary with node/edge counts and build time
+        """
+        return {
+            "nodes": self.node_count,
+            "edges": self.edge_count,
+            "relationship_types": list(self._rel_types),
+            "built_at": self.built_at.isoformat(),
+        }
+
+
+class GraphSnapshotStore:
+    """
+    Holder for the current graph snapshot.
+
+    Refreshes build a new snapshot off to the side and then swap the reference,
+    so concurrent readers never observe a partially built graph.
+    """
+
+    def __init__(self):
+        """Initialize an empty snapshot store."""
+        self._snapshot: GraphSnapshot | None = None
+        self._refresh_lock = threading.Lock()
+
+    def get(self) -> GraphSnapshot | None:
+        """Get the current snapshot (None if none has been built yet)."""
+        return self._snapshot
+
+    def set(self, snapshot: GraphSnapshot | None) -> None:
+        """Replace the current snapshot."""
+        self._snapshot = snapshot
+
+    def refresh(self, neo4j_client: Neo4jClient) -> GraphSnapshot:
+        """
+        Rebuild the snapshot from Neo4j and swap it in.
+
+        Concurrent refreshes are serialized; readers keep using the previous
+        snapshot until the new one is complete.
+
+        Args:
+            neo4j_client: Neo4j client to read from
+
+        Returns:
+            The newly built snapshot
+        """
+        with self._refresh_lock:
+            snapshot = GraphSnapshot.from_neo4j(neo4j_client)
+            self._snapshot = snapshot
+
+        logger.info(
+            f"Graph snapshot refreshed: {snapshot.node_count} nodes, "
+            f"{snapshot.edge_count} relationships"
+        )
+        return snapshot
+
+    def clear(self) -> None:
+        """Drop the current snapshot."""
+        self._snapshot = None
+
+
+# Global snapshot store
+_snapshot_store = GraphSnapshotStore()
+
+
+def get_graph_snapshot() -> GraphSnapshot | None:
+    """
+    Get the current global graph snapshot.
+
+    Returns:
+        Current GraphSnapshot, or None if no snapshot has been built yet
+    """
+    return _snapshot_store.get()
+
+
+def refresh_graph_snapshot(neo4j_client: Neo4jClient) -> GraphSnapshot:
+    """
+    Rebuild the global graph snapshot from Neo4j.
+
+    Args:
+        neo4j_client: Neo4j client to read from
+
+    Returns:
+        The newly built snapshot
+    """
+    return _snapshot_store.refresh(neo4j_client)
+
+
+def clear_graph_snapshot() -> None:
+    """Drop the global graph snapshot so analyzers fall back to Neo4j."""
+    _snapshot_store.clear()
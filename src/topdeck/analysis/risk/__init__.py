@@ -6,7 +6,9 @@ for infrastructure resources.
 """
 
 from .analyzer import RiskAnalyzer
+from .batch import BatchRiskEngine
 from .cost_impact import CostImpact, CostImpactAnalyzer
+from .cycles import CycleDetector, CycleReport, get_cycle_detector
 from .dependency import DependencyAnalyzer
 from .dependency_scanner import DependencyScanner
 from .impact import ImpactAnalyzer
@@ -27,11 +29,13 @@ from .models import (
 from .partial_failure import PartialFailureAnalyzer
 from .scoring import RiskScorer
 from .simulation import FailureSimulator
+from .spof import SPOFAnalysis, SPOFEngine, get_spof_analysis
 from .time_aware_scoring import TimeAwareRiskScorer, adjust_risk_score_for_timing
 from .trend_analysis import RiskSnapshot, RiskTrend, RiskTrendAnalyzer
 
 __all__ = [
     "RiskAnalyzer",
+    "BatchRiskEngine",
     "RiskAssessment",
     "BlastRadius",
     "FailureSimulation",
@@ -45,8 +49,14 @@ __all__ = [
     "DependencyVulnerability",
     "RiskScorer",
     "DependencyAnalyzer",
+    "CycleDetector",
+    "CycleReport",
+    "get_cycle_detector",
     "ImpactAnalyzer",
     "FailureSimulator",
+    "SPOFAnalysis",
+    "SPOFEngine",
+    "get_spof_analysis",
     "PartialFailureAnalyzer",
     "DependencyScanner",
     "CostImpact",
@@ -5,7 +5,9 @@ Main risk analysis orchestrator.
 import logging
 from typing import Any
 
+from topdeck.analysis.graph_snapshot import INCOMING, OUTGOING, GraphSnapshot
 from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.query_catalog import NODE_LABEL, QueryBuilder, register_query
 
 from .dependency import DependencyAnalyzer
 from .dependency_scanner import DependencyScanner
@@ -26,9 +28,53 @@ from .models import (
 from .partial_failure import PartialFailureAnalyzer
 from .scoring import RiskScorer
 from .simulation import FailureSimulator
+from .spof import get_spof_analysis
 
 logger = logging.getLogger(__name__)
 
+SPOF_QUERY = register_query(
+    "risk.single_points_of_failure",
+    f"""
+    MATCH (r:{NODE_LABEL})
+    WHERE r.id IS NOT NULL
+    AND EXISTS {{
+        MATCH (r)<-[:DEPENDS_ON]-(dependent)
+        WHERE dependent.id IS NOT NULL
+    }}
+    AND NOT EXISTS {{
+        MATCH (r)-[:REDUNDANT_WITH]->(alt)
+        WHERE alt.id IS NOT NULL
+    }}
+    WITH r
+    OPTIONAL MATCH (r)<-[:DEPENDS_ON]-(dependent)
+    WHERE dependent.id IS NOT NULL
+    WITH r, COUNT(DISTINCT dependent) as dependents_count
+    WHERE dependents_count > 0
+    RETURN r.id as id,
+           r.name as name,
+           {QueryBuilder.node_type("r")} as resource_type,
+           dependents_count
+    ORDER BY dependents_count DESC
+    """,
+)
+
+RESOURCE_DETAILS_QUERY = register_query(
+    "risk.resource_details",
+    f"""
+    MATCH {QueryBuilder.node("r")}
+    RETURN r
+    """,
+)
+
+REDUNDANCY_QUERY = register_query(
+    "risk.redundancy",
+    f"""
+    MATCH {QueryBuilder.node("r")}-[:REDUNDANT_WITH]->(alt)
+    WHERE alt.id IS NOT NULL
+    RETURN COUNT(alt) as redundant_count
+    """,
+)
+
 
 class RiskAnalyzer:
     """
@@ -38,17 +84,20 @@ class RiskAnalyzer:
     and failure simulation to provide comprehensive risk insights.
     """
 
-    def __init__(self, neo4j_client: Neo4jClient):
+    def __init__(self, neo4j_client: Neo4jClient, graph_snapshot: GraphSnapshot | None = None):
         """
         Initialize risk analyzer.
 
         Args:
             neo4j_client: Neo4j client for graph database access
+            graph_snapshot: Optional in-memory graph snapshot used for traversals
+                instead of per-call Neo4j queries
         """
         self.neo4j_client = neo4j_client
+        self.graph_snapshot = graph_snapshot
 
         # Initialize component analyzers
-        self.dependency_analyzer = DependencyAnalyzer(neo4j_client)
+        self.dependency_analyzer = DependencyAnalyzer(neo4j_client, graph_snapshot)
         self.risk_scorer = RiskScorer()
         self.impact_analyzer = ImpactAnalyzer(self.dependency_analyzer)
         self.failure_simulator = FailureSimulator(self.impact_analyzer)
@@ -243,32 +292,12 @@ class RiskAnalyzer:
         Returns:
             List of SinglePointOfFailure resources
         """
-        query = """
-        MATCH (r)
-        WHERE r.id IS NOT NULL
-        AND EXISTS {
-            MATCH (r)<-[:DEPENDS_ON]-(dependent)
-            WHERE dependent.id IS NOT NULL
-        }
-        AND NOT EXISTS {
-            MATCH (r)-[:REDUNDANT_WITH]->(alt)
-            WHERE alt.id IS NOT NULL
-        }
-        WITH r
-        OPTIONAL MATCH (r)<-[:DEPENDS_ON]-(dependent)
-        WHERE dependent.id IS NOT NULL
-        WITH r, COUNT(DISTINCT dependent) as dependents_count
-        WHERE dependents_count > 0
-        RETURN r.id as id,
-               r.name as name,
-               COALESCE(r.resource_type, labels(r)[0]) as resource_type,
-               dependents_count
-        ORDER BY dependents_count DESC
-        """
+        if self.graph_snapshot is not None:
+            return self._identify_spofs_from_snapshot()
 
         spofs = []
         with self.neo4j_client.session() as session:
-            result = session.run(query)
+            result = session.run(SPOF_QUERY)
             for record in result:
                 resource_id = record["id"]
 
@@ -306,6 +335,63 @@ class RiskAnalyzer:
 
         return spofs
 
+    def _identify_spofs_from_snapshot(self) -> list[SinglePointOfFailure]:
+        """
+        Find single points of failure using the structural SPOF engine.
+
+        Blast radius is the size of the resource's dominator subtree: the
+        resources that lose every path to a foundational resource if it fails.
+
+        Returns:
+            List of SinglePointOfFailure resources, most dependents first
+        """
+        snapshot = self.graph_snapshot
+        analysis = get_spof_analysis(snapshot)
+
+        spofs = []
+        for resource_id in snapshot.node_ids:
+            dependents_count = snapshot.degree(resource_id, INCOMING, ["DEPENDS_ON"])
+            if dependents_count == 0:
+                continue
+            if snapshot.degree(resource_id, OUTGOING, ["REDUNDANT_WITH"]) > 0:
+                continue
+
+            node = snapshot.get_node(resource_id)
+            risk_score = self.risk_scorer.calculate_risk_score(
+                dependency_count=0,  # Don't need for SPOF scoring
+                dependents_count=dependents_count,
+                resource_type=node["resource_type"],
+                is_single_point_of_failure=True,
+                has_redundancy=False,
+            )
+
+            recommendations = [
+                "⚠️ This is a Single Point of Failure",
+                "Add redundant instances across availability zones",
+                "Implement automatic failover mechanisms",
+                "Increase monitoring and alerting priority",
+            ]
+            if resource_id in analysis.articulation_points:
+                recommendations.append(
+                    "Removing this resource splits the dependency graph - "
+                    "add alternative paths between the resources it connects"
+                )
+
+            spofs.append(
+                SinglePointOfFailure(
+                    resource_id=resource_id,
+                    resource_name=node["name"],
+                    resource_type=node["resource_type"],
+                    dependents_count=dependents_count,
+                    blast_radius=analysis.blast_radius(resource_id),
+                    risk_score=risk_score,
+                    recommendations=recommendations,
+                )
+            )
+
+        spofs.sort(key=lambda spof: spof.dependents_count, reverse=True)
+        return spofs
+
     def get_change_risk_score(self, resource_id: str) -> float:
         """
         Get risk score for changing/deploying to this resource.
@@ -332,13 +418,8 @@ class RiskAnalyzer:
         Returns:
             Dictionary with resource details or None if not found
         """
-        query = """
-        MATCH (r {id: $id})
-        RETURN r
-        """
-
         with self.neo4j_client.session() as session:
-            result = session.run(query, id=resource_id)
+            result = session.run(RESOURCE_DETAILS_QUERY, id=resource_id)
             record = result.single()
             if record:
                 node = record["r"]
@@ -348,7 +429,7 @@ class RiskAnalyzer:
                 # Ensure required fields are present
                 if "resource_type" not in resource_dict or not resource_dict["resource_type"]:
                     # Try to get from labels
-                    labels = list(node.labels)
+                    labels = sorted(label for label in node.labels if label != NODE_LABEL)
                     resource_dict["resource_type"] = labels[0] if labels else "unknown"
                 
                 if "cloud_provider" not in resource_dict or not resource_dict["cloud_provider"]:
@@ -371,14 +452,11 @@ class RiskAnalyzer:
         Returns:
             True if redundancy exists
         """
-        query = """
-        MATCH (r {id: $id})-[:REDUNDANT_WITH]->(alt)
-        WHERE alt.id IS NOT NULL
-        RETURN COUNT(alt) as redundant_count
-        """
+        if self.graph_snapshot is not None and resource_id in self.graph_snapshot:
+            return self.graph_snapshot.degree(resource_id, OUTGOING, ["REDUNDANT_WITH"]) > 0
 
         with self.neo4j_client.session() as session:
-            result = session.run(query, id=resource_id)
+            result = session.run(REDUNDANCY_QUERY, id=resource_id)
             record = result.single()
             if record:
                 return record["redundant_count"] > 0
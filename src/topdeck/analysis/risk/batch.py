@@ -0,0 +1,376 @@
+"""
+Bulk risk assessment for the whole resource graph.
+
+Produces the same assessments as ``RiskAnalyzer.analyze_resource`` for every
+resource at once. Instead of ~6 queries per resource, all inputs are fetched
+with set-oriented queries (resources with their properties, and every
+dependency/redundancy relationship), degrees and blast radii are computed
+in-process, and risk scores are calculated in one vectorized pass.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from topdeck.analysis.graph_snapshot import (
+    DEPENDENCY_RELATIONSHIP_TYPES,
+    INCOMING,
+    OUTGOING,
+    GraphSnapshot,
+)
+from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.query_catalog import (
+    NODE_LABEL,
+    RESOURCE_LABEL,
+    QueryBuilder,
+    register_query,
+)
+
+from .dependency import DependencyAnalyzer
+from .impact import ImpactAnalyzer
+from .misconfiguration import MisconfigurationDetector, MisconfigurationReport
+from .models import RiskAssessment, RiskLevel
+from .scoring import RiskScorer
+
+logger = logging.getLogger(__name__)
+
+# Same cascade depth RiskAnalyzer uses for blast radius calculation
+BLAST_RADIUS_DEPTH = 10
+
+RESOURCES_QUERY = register_query(
+    "batch.resources",
+    f"""
+    MATCH (r:{RESOURCE_LABEL})
+    WHERE r.id IS NOT NULL
+    WITH r, {QueryBuilder.node_type("r")} as resource_type
+    WHERE ($cloud_provider IS NULL OR r.cloud_provider = $cloud_provider)
+      AND ($resource_type IS NULL OR resource_type = $resource_type)
+    RETURN r.id as id, resource_type, properties(r) as properties
+    """,
+)
+
+_SCORING_TYPES = QueryBuilder.relationship_types(
+    [*DEPENDENCY_RELATIONSHIP_TYPES, "REDUNDANT_WITH"]
+)
+
+SCORING_EDGES_QUERY = register_query(
+    "batch.scoring_edges",
+    f"""
+    MATCH (source:{NODE_LABEL})-[rel:{_SCORING_TYPES}]->(target:{NODE_LABEL})
+    RETURN source.id as source_id,
+           {QueryBuilder.node_type("source")} as source_type,
+           target.id as target_id,
+           {QueryBuilder.node_type("target")} as target_type,
+           type(rel) as relationship_type
+    """,
+)
+
+
+@dataclass
+class _ResourceInputs:
+    """Per-resource inputs gathered before scoring."""
+
+    resource: dict[str, Any]
+    dependencies_count: int
+    dependents_count: int
+    is_spof: bool
+    has_redundancy: bool
+    affected: list[dict[str, Any]]
+    misconfiguration_report: MisconfigurationReport
+
+
+class BatchRiskEngine:
+    """
+    Scores every resource in the graph in a single pass.
+
+    Uses the shared graph snapshot for relationship data when it covers all
+    requested resources, otherwise loads the relationships with one query.
+    """
+
+    def __init__(self, neo4j_client: Neo4jClient, graph_snapshot: GraphSnapshot | None = None):
+        """
+        Initialize batch risk engine.
+
+        Args:
+            neo4j_client: Neo4j client for graph database access
+            graph_snapshot: Optional in-memory graph snapshot used for
+                relationship data instead of loading it from Neo4j
+        """
+        self.neo4j_client = neo4j_client
+        self.graph_snapshot = graph_snapshot
+
+        self.risk_scorer = RiskScorer()
+        self.impact_analyzer = ImpactAnalyzer(DependencyAnalyzer(neo4j_client))
+        self.misconfiguration_detector = MisconfigurationDetector()
+
+    def assess_all(
+        self,
+        cloud_provider: str | None = None,
+        resource_type: str | None = None,
+        risk_level: RiskLevel | None = None,
+        min_score: float | None = None,
+    ) -> list[RiskAssessment]:
+        """
+        Assess all resources matching the filters.
+
+        Args:
+            cloud_provider: Only assess resources from this cloud provider
+            resource_type: Only assess resources of this type
+            risk_level: Only return assessments with this risk level
+            min_score: Only return assessments scoring at least this much
+
+        Returns:
+            Risk assessments ordered by descending risk score (ties by resource ID)
+        """
+        resources = self._load_resources(cloud_provider, resource_type)
+        if not resources:
+            return []
+
+        snapshot = self._relationship_snapshot(resources)
+        inputs = [self._gather_inputs(resource, snapshot) for resource in resources]
+        assessments = self._score(inputs)
+
+        if risk_level is not None:
+            assessments = [a for a in assessments if a.risk_level == risk_level]
+        if min_score is not None:
+            assessments = [a for a in assessments if a.risk_score >= min_score]
+
+        assessments.sort(key=lambda a: (-a.risk_score, a.resource_id))
+        return assessments
+
+    def _load_resources(
+        self, cloud_provider: str | None, resource_type: str | None
+    ) -> list[dict[str, Any]]:
+        """
+        Load all resources with their properties in one query.
+
+        Args:
+            cloud_provider: Optional cloud provider filter
+            resource_type: Optional resource type filter
+
+        Returns:
+            Resource dicts shaped like RiskAnalyzer._get_resource_details output
+        """
+        resources = []
+        with self.neo4j_client.session() as session:
+            result = session.run(
+                RESOURCES_QUERY, cloud_provider=cloud_provider, resource_type=resource_type
+            )
+            for record in result:
+                resource = dict(record["properties"]) if record["properties"] else {}
+                resource["id"] = record["id"]
+                if not resource.get("resource_type"):
+                    resource["resource_type"] = record["resource_type"] or "unknown"
+                if not resource.get("cloud_provider"):
+                    resource["cloud_provider"] = "azure"
+                if not resource.get("region"):
+                    resource["region"] = "unknown"
+                resources.append(resource)
+
+        return resources
+
+    def _relationship_snapshot(self, resources: list[dict[str, Any]]) -> GraphSnapshot:
+        """
+        Get a graph snapshot holding the relationships needed for scoring.
+
+        Reuses the shared snapshot when it knows every resource, otherwise
+        loads all dependency and redundancy relationships in one query.
+
+        Args:
+            resources: Resources being assessed
+
+        Returns:
+            GraphSnapshot covering the assessed resources
+        """
+        snapshot = self.graph_snapshot
+        if snapshot is not None and all(r["id"] in snapshot for r in resources):
+            return snapshot
+
+        nodes: dict[str, dict[str, Any]] = {
+            r["id"]: {"id": r["id"], "name": r.get("name"), "resource_type": r["resource_type"]}
+            for r in resources
+        }
+        edges = []
+        with self.neo4j_client.session() as session:
+            result = session.run(SCORING_EDGES_QUERY)
+            for record in result:
+                source_id = record["source_id"]
+                target_id = record["target_id"]
+                nodes.setdefault(
+                    source_id, {"id": source_id, "resource_type": record["source_type"]}
+                )
+                nodes.setdefault(
+                    target_id, {"id": target_id, "resource_type": record["target_type"]}
+                )
+                edges.append((source_id, target_id, record["relationship_type"]))
+
+        return GraphSnapshot(nodes.values(), edges)
+
+    def _gather_inputs(
+        self, resource: dict[str, Any], snapshot: GraphSnapshot
+    ) -> _ResourceInputs:
+        """
+        Collect degrees, redundancy, blast radius and misconfigurations for a resource.
+
+        Args:
+            resource: Resource dict
+            snapshot: Snapshot holding the resource's relationships
+
+        Returns:
+            Scoring inputs for the resource
+        """
+        resource_id = resource["id"]
+        dependencies_count, dependents_count = snapshot.dependency_counts(resource_id)
+        has_dependents = snapshot.degree(resource_id, INCOMING, ["DEPENDS_ON"]) > 0
+        has_redundancy = snapshot.degree(resource_id, OUTGOING, ["REDUNDANT_WITH"]) > 0
+
+        affected = []
+        if has_dependents:
+            affected = [
+                {"id": node["id"], "type": node["resource_type"] or ""}
+                for node, _ in snapshot.traverse_nodes(
+                    resource_id,
+                    INCOMING,
+                    max_depth=BLAST_RADIUS_DEPTH,
+                    relationship_types=["DEPENDS_ON"],
+                )
+            ]
+
+        misconfiguration_report = self.misconfiguration_detector.detect_misconfigurations(
+            resource_id=resource_id,
+            resource_name=resource.get("name", "Unknown"),
+            resource_type=resource["resource_type"],
+            properties=resource,
+        )
+
+        return _ResourceInputs(
+            resource=resource,
+            dependencies_count=dependencies_count,
+            dependents_count=dependents_count,
+            is_spof=has_dependents and not has_redundancy,
+            has_redundancy=has_redundancy,
+            affected=affected,
+            misconfiguration_report=misconfiguration_report,
+        )
+
+    def _score(self, inputs: list[_ResourceInputs]) -> list[RiskAssessment]:
+        """
+        Score all resources in one vectorized pass and build assessments.
+
+        Args:
+            inputs: Per-resource scoring inputs
+
+        Returns:
+            Risk assessments in input order
+        """
+        criticality_cache: dict[tuple, float] = {}
+
+        def criticality(resource_type: str, is_spof: bool, dependents: int, redundancy: bool):
+            # Criticality only depends on which dependents bucket a resource is in
+            bucket = 3 if dependents > 10 else 2 if dependents > 5 else 1 if dependents > 0 else 0
+            key = (resource_type, is_spof, bucket, redundancy)
+            if key not in criticality_cache:
+                criticality_cache[key] = self.risk_scorer._calculate_criticality(
+                    resource_type, is_spof, dependents, redundancy
+                )
+            return criticality_cache[key]
+
+        dependents = np.fromiter((i.dependents_count for i in inputs), dtype=np.int64)
+        redundancy = np.fromiter((i.has_redundancy for i in inputs), dtype=bool)
+        scoring_criticality = np.fromiter(
+            (
+                criticality(
+                    i.resource["resource_type"], i.is_spof, i.dependents_count, i.has_redundancy
+                )
+                for i in inputs
+            ),
+            dtype=np.float64,
+        )
+        misconfiguration_impact = np.fromiter(
+            (i.misconfiguration_report.risk_score_impact for i in inputs), dtype=np.float64
+        )
+
+        base_scores = self.risk_scorer.calculate_risk_scores(
+            dependents_counts=dependents,
+            criticality_scores=scoring_criticality,
+            has_redundancy=redundancy,
+        )
+        risk_scores = np.minimum(100.0, base_scores + misconfiguration_impact)
+
+        return [
+            self._build_assessment(item, float(score), criticality)
+            for item, score in zip(inputs, risk_scores, strict=True)
+        ]
+
+    def _build_assessment(
+        self, item: _ResourceInputs, risk_score: float, criticality
+    ) -> RiskAssessment:
+        """
+        Build a RiskAssessment matching RiskAnalyzer.analyze_resource output.
+
+        Args:
+            item: Scoring inputs for the resource
+            risk_score: Final risk score including misconfiguration impact
+            criticality: Memoized criticality function
+
+        Returns:
+            RiskAssessment for the resource
+        """
+        resource = item.resource
+        resource_id = resource["id"]
+        report = item.misconfiguration_report
+        deployment_failure_rate = 0.0  # Would be calculated from actual deployments
+
+        recommendations = self.risk_scorer.generate_recommendations(
+            risk_score=risk_score,
+            is_spof=item.is_spof,
+            has_redundancy=item.has_redundancy,
+            dependents_count=item.dependents_count,
+            deployment_failure_rate=deployment_failure_rate,
+        )
+        for issue in report.issues[:3]:  # Top 3 most important
+            recommendations.append(f"🔧 {issue.title}: {issue.recommendation}")
+
+        user_impact = self.impact_analyzer._estimate_user_impact(resource_id, item.affected, [])
+
+        return RiskAssessment(
+            resource_id=resource_id,
+            resource_name=resource.get("name") or resource_id,
+            resource_type=resource["resource_type"],
+            risk_score=risk_score,
+            risk_level=self.risk_scorer.get_risk_level(risk_score),
+            criticality_score=criticality(
+                resource["resource_type"], item.is_spof, item.dependents_count, False
+            ),
+            dependencies_count=item.dependencies_count,
+            dependents_count=item.dependents_count,
+            blast_radius=len(item.affected),
+            single_point_of_failure=item.is_spof,
+            deployment_failure_rate=deployment_failure_rate,
+            time_since_last_change=None,
+            recommendations=recommendations,
+            factors={
+                "dependencies_count": item.dependencies_count,
+                "dependents_count": item.dependents_count,
+                "is_spof": item.is_spof,
+                "has_redundancy": item.has_redundancy,
+                "blast_radius_size": len(item.affected),
+                "user_impact": user_impact.value,
+                "deployment_failure_rate": deployment_failure_rate,
+                "misconfiguration_impact": report.risk_score_impact,
+            },
+            misconfigurations=[
+                {
+                    "type": issue.issue_type,
+                    "severity": issue.severity,
+                    "title": issue.title,
+                    "description": issue.description,
+                    "recommendation": issue.recommendation,
+                    "affected_property": issue.affected_property,
+                }
+                for issue in report.issues
+            ],
+            misconfiguration_count=len(report.issues),
+        )
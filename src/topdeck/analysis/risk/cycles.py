@@ -0,0 +1,438 @@
+"""
+Circular dependency detection.
+
+Finds strongly connected components with Tarjan's algorithm (linear time) and
+enumerates the elementary cycles inside each component using Johnson's
+decomposition: cycles are rooted at their smallest resource ID and searched
+only among larger IDs, so every cycle is produced exactly once and no
+deduplication pass is needed.
+
+Cycle length is bounded (like the previous ``[*2..10]`` Cypher pattern).
+Johnson's blocking lists are not sound under a length bound, so the search
+instead prunes any branch whose shortest way back to the root would exceed
+the bound.
+"""
+
+import logging
+import threading
+import weakref
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from topdeck.analysis.graph_snapshot import DEPENDENCY_RELATIONSHIP_TYPES, GraphSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Defaults matching the original Cypher cycle query
+DEFAULT_MAX_CYCLE_LENGTH = 10
+DEFAULT_MAX_CYCLES = 1000
+
+
+@dataclass
+class CycleReport:
+    """
+    Circular dependencies found in a dependency graph.
+
+    Attributes:
+        cycles: Elementary cycles as closed paths ``[a, b, c, a]``, each
+            starting at its smallest resource ID, ordered by length
+        components: Strongly connected components with more than one member
+        truncated: True if enumeration stopped at the cycle limit
+    """
+
+    cycles: list[list[str]] = field(default_factory=list)
+    components: list[list[str]] = field(default_factory=list)
+    truncated: bool = False
+    _membership: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def component_of(self, resource_id: str) -> int | None:
+        """
+        Get the index of the component a resource belongs to.
+
+        Args:
+            resource_id: Resource ID
+
+        Returns:
+            Index into ``components`` or None if the resource is on no cycle
+        """
+        return self._membership.get(resource_id)
+
+    @property
+    def component_sizes(self) -> list[int]:
+        """Sizes of the strongly connected components."""
+        return [len(component) for component in self.components]
+
+    def cycles_for(self, resource_id: str) -> list[list[str]]:
+        """
+        Get the cycles that pass through a resource.
+
+        Args:
+            resource_id: Resource ID
+
+        Returns:
+            Cycles containing the resource
+        """
+        if resource_id not in self._membership:
+            return []
+        return [cycle for cycle in self.cycles if resource_id in cycle]
+
+
+class CycleDetector:
+    """
+    Detects circular dependencies, with an incremental mode for new edges.
+    """
+
+    def __init__(
+        self,
+        edges: Iterable[tuple[str, str]],
+        max_cycle_length: int = DEFAULT_MAX_CYCLE_LENGTH,
+        max_cycles: int = DEFAULT_MAX_CYCLES,
+    ):
+        """
+        Initialize cycle detector.
+
+        Args:
+            edges: (source_id, target_id) dependency edges; self-loops are ignored
+            max_cycle_length: Maximum number of edges in a reported cycle
+            max_cycles: Stop enumerating after this many cycles
+        """
+        self.max_cycle_length = max_cycle_length
+        self.max_cycles = max_cycles
+        self._successors: dict[str, set[str]] = {}
+        self._predecessors: dict[str, set[str]] = {}
+        for source, target in edges:
+            self._add_edge(source, target)
+        self._report: CycleReport | None = None
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        graph_snapshot: GraphSnapshot,
+        relationship_types: Iterable[str] = DEPENDENCY_RELATIONSHIP_TYPES,
+        **kwargs,
+    ) -> "CycleDetector":
+        """
+        Build a detector over the dependency relationships of a graph snapshot.
+
+        Args:
+            graph_snapshot: Snapshot of the resource graph
+            relationship_types: Relationship types treated as dependencies
+            **kwargs: Passed to the constructor
+
+        Returns:
+            New CycleDetector
+        """
+        node_ids = graph_snapshot.node_ids
+        edges = (
+            (node_ids[source], node_ids[target])
+            for source, target in graph_snapshot.index_edges(relationship_types)
+        )
+        return cls(edges, **kwargs)
+
+    def _add_edge(self, source: str, target: str) -> bool:
+        """Add an edge; returns False for self-loops and edges already present."""
+        if source == target or target in self._successors.get(source, ()):
+            return False
+        self._successors.setdefault(source, set()).add(target)
+        self._predecessors.setdefault(target, set()).add(source)
+        return True
+
+    def analyze(self) -> CycleReport:
+        """
+        Find all strongly connected components and their elementary cycles.
+
+        Returns:
+            CycleReport for the whole graph
+        """
+        if self._report is None:
+            components = self._strongly_connected_components(self._successors)
+            report = CycleReport()
+            self._set_components(report, components)
+            found: list[list[str]] = []
+            for component in report.components:
+                if self._collect(found, self._component_cycles(component)):
+                    report.truncated = True
+                    break
+            report.cycles = sorted(found, key=lambda cycle: (len(cycle), cycle))
+            self._report = report
+            logger.debug(
+                f"Cycle analysis: {len(report.components)} components, "
+                f"{len(report.cycles)} cycles, truncated={report.truncated}"
+            )
+        return self._report
+
+    def add_edges(self, edges: Iterable[tuple[str, str]]) -> list[list[str]]:
+        """
+        Add dependency edges and report only the cycles they create.
+
+        Only the region that can form a cycle through a new edge (reachable
+        from its target and reaching its source) is re-examined; components
+        not touched by the new edges are left as they are.
+
+        Args:
+            edges: New (source_id, target_id) dependency edges
+
+        Returns:
+            Newly created cycles, in the same format as CycleReport.cycles
+        """
+        report = self.analyze()
+        added = [(s, t) for s, t in edges if self._add_edge(s, t)]
+        if not added:
+            return []
+
+        # Nodes on a cycle through a new edge: reachable from a new target
+        # and able to reach a new source
+        forward = self._reachable({t for _, t in added}, self._successors)
+        backward = self._reachable({s for s, _ in added}, self._predecessors)
+        region = forward & backward
+        if not region:
+            return []
+
+        # Touched components merge with the region; everything else is untouched
+        touched = {report.component_of(node) for node in region} - {None}
+        region.update(node for idx in touched for node in report.components[idx])
+        region_successors = {
+            node: {succ for succ in self._successors.get(node, ()) if succ in region}
+            for node in region
+        }
+        new_components = self._strongly_connected_components(region_successors)
+
+        kept = [c for idx, c in enumerate(report.components) if idx not in touched]
+        self._set_components(report, kept + new_components)
+
+        new_cycles: set[tuple[str, ...]] = set()
+        for source, target in added:
+            component = report.component_of(source)
+            if component is None or report.component_of(target) != component:
+                continue
+            allowed = set(report.components[component])
+            for path in self._cycles_from(source, allowed, first_hop=target):
+                new_cycles.add(self._canonical(path))
+                if len(report.cycles) + len(new_cycles) >= self.max_cycles:
+                    report.truncated = True
+                    break
+
+        created = sorted(
+            ([*cycle, cycle[0]] for cycle in new_cycles), key=lambda c: (len(c), c)
+        )
+        report.cycles = sorted(report.cycles + created, key=lambda c: (len(c), c))
+        return created
+
+    def cycles_through(self, resource_id: str) -> list[list[str]]:
+        """
+        Enumerate the cycles passing through one resource.
+
+        Args:
+            resource_id: Resource ID
+
+        Returns:
+            Cycles containing the resource, each starting at its smallest ID
+        """
+        report = self.analyze()
+        component = report.component_of(resource_id)
+        if component is None:
+            return []
+        if not report.truncated:
+            return report.cycles_for(resource_id)
+
+        found: list[list[str]] = []
+        self._collect(
+            found,
+            (
+                self._canonical(path)
+                for path in self._cycles_from(resource_id, set(report.components[component]))
+            ),
+        )
+        return sorted(([*c, c[0]] for c in found), key=lambda c: (len(c), c))
+
+    def _collect(
+        self, found: list[list[str]], cycles: Iterable[tuple[str, ...] | list[str]]
+    ) -> bool:
+        """Append closed cycles to ``found``; returns True if the limit was hit."""
+        for cycle in cycles:
+            if len(found) >= self.max_cycles:
+                return True
+            found.append([*cycle, cycle[0]])
+        return False
+
+    @staticmethod
+    def _set_components(report: CycleReport, components: list[list[str]]) -> None:
+        """Store components (largest first) and rebuild the membership index."""
+        report.components = sorted(
+            (sorted(c) for c in components if len(c) > 1), key=lambda c: (-len(c), c)
+        )
+        report._membership = {
+            node: idx for idx, component in enumerate(report.components) for node in component
+        }
+
+    def _component_cycles(self, component: list[str]) -> Iterator[list[str]]:
+        """
+        Enumerate each elementary cycle of a component once.
+
+        Cycles are rooted at their smallest ID: for each root in sorted order
+        the search only visits members with larger IDs.
+        """
+        members = sorted(component)
+        for position, root in enumerate(members):
+            allowed = set(members[position:])
+            yield from self._cycles_from(root, allowed)
+
+    def _cycles_from(
+        self, root: str, allowed: set[str], first_hop: str | None = None
+    ) -> Iterator[list[str]]:
+        """
+        Enumerate elementary cycles through ``root`` using only ``allowed`` nodes.
+
+        Args:
+            root: Node every cycle starts and ends at
+            allowed: Nodes the cycle may visit (must include root)
+            first_hop: If set, only cycles whose first edge is root -> first_hop
+
+        Yields:
+            Cycles as open paths starting at root
+        """
+        # Shortest distance from each allowed node back to root, for pruning
+        distance = {root: 0}
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for pred in self._predecessors.get(node, ()):
+                if pred in allowed and pred not in distance:
+                    distance[pred] = distance[node] + 1
+                    queue.append(pred)
+
+        bound = self.max_cycle_length
+        start_hops = [first_hop] if first_hop is not None else self._successors.get(root, ())
+        path = [root]
+        on_path = {root}
+        # Stack of iterators over the successors still to try at each depth
+        stack: list[Iterator[str]] = [iter(sorted(start_hops))]
+        while stack:
+            successor = next(stack[-1], None)
+            if successor is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if successor == root:
+                if len(path) > 1:
+                    yield list(path)
+                continue
+            if successor in on_path or successor not in distance:
+                continue
+            # Edges used so far + edge to successor + shortest way home
+            if len(path) + distance[successor] > bound:
+                continue
+            path.append(successor)
+            on_path.add(successor)
+            stack.append(
+                iter(sorted(s for s in self._successors.get(successor, ()) if s in allowed))
+            )
+
+    @staticmethod
+    def _canonical(cycle: Iterable[str]) -> tuple[str, ...]:
+        """Rotate an open cycle to start at its smallest ID."""
+        nodes = list(cycle)
+        start = nodes.index(min(nodes))
+        return tuple(nodes[start:] + nodes[:start])
+
+    @staticmethod
+    def _reachable(starts: set[str], adjacency: dict[str, set[str]]) -> set[str]:
+        """Nodes reachable from ``starts`` (inclusive) following ``adjacency``."""
+        seen = set(starts)
+        queue = deque(starts)
+        while queue:
+            node = queue.popleft()
+            for neighbor in adjacency.get(node, ()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return seen
+
+    @staticmethod
+    def _strongly_connected_components(
+        successors: dict[str, set[str]],
+    ) -> list[list[str]]:
+        """
+        Tarjan's strongly connected components, iterative, O(V + E).
+
+        Args:
+            successors: Adjacency map
+
+        Returns:
+            List of components (each a list of node IDs)
+        """
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components: list[list[str]] = []
+        counter = 0
+
+        for start in list(successors):
+            if start in index:
+                continue
+            index[start] = low[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            work = [(start, iter(successors.get(start, ())))]
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = low[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(successors.get(neighbor, ()))))
+                        advanced = True
+                        break
+                    if neighbor in on_stack and index[neighbor] < low[node]:
+                        low[node] = index[neighbor]
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+
+# Detectors are cached per snapshot; snapshots are immutable and replaced wholesale
+_detector_cache: "weakref.WeakKeyDictionary[GraphSnapshot, CycleDetector]" = (
+    weakref.WeakKeyDictionary()
+)
+_detector_lock = threading.Lock()
+
+
+def get_cycle_detector(graph_snapshot: GraphSnapshot) -> CycleDetector:
+    """
+    Get the cycle detector for a snapshot, analysing it once.
+
+    Args:
+        graph_snapshot: Snapshot of the resource graph
+
+    Returns:
+        CycleDetector with its report already computed
+    """
+    with _detector_lock:
+        detector = _detector_cache.get(graph_snapshot)
+        if detector is None:
+            detector = CycleDetector.from_snapshot(graph_snapshot)
+            detector.analyze()
+            _detector_cache[graph_snapshot] = detector
+        return detector
@@ -2,7 +2,189 @@
 Dependency analysis for risk assessment.
 """
 
+from topdeck.analysis.graph_snapshot import (
+    DEPENDENCY_RELATIONSHIP_TYPES,
+    INCOMING,
+    OUTGOING,
+    GraphSnapshot,
+)
 from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.query_catalog import NODE_LABEL, QueryBuilder, register_query
+
+from .cycles import CycleDetector, CycleReport, get_cycle_detector
+
+_DEPENDENCY_TYPES = QueryBuilder.relationship_types(DEPENDENCY_RELATIONSHIP_TYPES)
+_DEPTH_TYPES = QueryBuilder.relationship_types(
+    ["DEPENDS_ON", "USES", "CONNECTS_TO", "ROUTES_TO"]
+)
+_RESOURCE = QueryBuilder.node("r")
+
+# Count upstream dependencies (what this depends on)
+UPSTREAM_COUNT_QUERY = register_query(
+    "dependency.upstream_count",
+    f"""
+    MATCH {_RESOURCE}-[:{_DEPENDENCY_TYPES}]->(dep)
+    WHERE dep.id IS NOT NULL
+    WITH DISTINCT dep
+    RETURN COUNT(dep) as count
+    """,
+)
+
+# Count downstream dependents (what depends on this)
+DOWNSTREAM_COUNT_QUERY = register_query(
+    "dependency.downstream_count",
+    f"""
+    MATCH {_RESOURCE}<-[:{_DEPENDENCY_TYPES}]-(dependent)
+    WHERE dependent.id IS NOT NULL
+    WITH DISTINCT dependent
+    RETURN COUNT(dependent) as count
+    """,
+)
+
+DEPENDENTS_BY_TYPE_QUERY = register_query(
+    "dependency.dependents_by_type",
+    f"""
+    MATCH {_RESOURCE}<-[rel]-(dependent)
+    WHERE dependent.id IS NOT NULL
+    RETURN type(rel) as relationship_type,
+           dependent.id as dep_id,
+           dependent.name as dep_name,
+           {QueryBuilder.node_type("dependent")} as dep_type
+    """,
+)
+
+CRITICAL_PATH_QUERY = register_query(
+    "dependency.critical_path",
+    f"""
+    MATCH path = {_RESOURCE}<-[*1..10]-(dependent)
+    WHERE dependent.id IS NOT NULL
+    WITH path, length(path) as depth
+    ORDER BY depth DESC
+    LIMIT 1
+    RETURN [node IN nodes(path) | node.id] as path_ids
+    """,
+)
+
+# Neo4j variable-length relationships cannot use query parameters for bounds,
+# so the tree queries use a hardcoded maximum and filter on $max_depth
+_TREE_RETURN = f"""
+    WHERE dep.id IS NOT NULL
+    WITH path, relationships(path) as rels, length(path) as pathLength
+    WHERE pathLength <= $max_depth
+    UNWIND rels as rel
+    WITH startNode(rel) as source, endNode(rel) as target
+    WHERE source.id IS NOT NULL AND target.id IS NOT NULL
+    RETURN DISTINCT
+        source.id as source_id,
+        source.name as source_name,
+        {QueryBuilder.node_type("source")} as source_type,
+        target.id as target_id,
+        target.name as target_name,
+        {QueryBuilder.node_type("target")} as target_type
+"""
+
+UPSTREAM_TREE_QUERY = register_query(
+    "dependency.upstream_tree",
+    f"""
+    MATCH path = {_RESOURCE}-[*1..10]->(dep){_TREE_RETURN}""",
+)
+
+DOWNSTREAM_TREE_QUERY = register_query(
+    "dependency.downstream_tree",
+    f"""
+    MATCH path = {_RESOURCE}<-[*1..10]-(dep){_TREE_RETURN}""",
+)
+
+IS_SPOF_QUERY = register_query(
+    "dependency.is_spof",
+    f"""
+    MATCH {_RESOURCE}
+
+    // Check if it has dependents
+    OPTIONAL MATCH (r)<-[:DEPENDS_ON]-(dependent)
+    WHERE dependent.id IS NOT NULL
+    WITH r, COUNT(dependent) as dependent_count
+
+    // Check if it has redundant alternatives
+    OPTIONAL MATCH (r)-[:REDUNDANT_WITH]->(alt)
+    WHERE alt.id IS NOT NULL
+    WITH r, dependent_count, COUNT(alt) as redundant_count
+
+    RETURN dependent_count > 0 AND redundant_count = 0 as is_spof
+    """,
+)
+
+DIRECTLY_AFFECTED_QUERY = register_query(
+    "dependency.directly_affected",
+    f"""
+    MATCH {_RESOURCE}<-[:DEPENDS_ON]-(dependent)
+    WHERE dependent.id IS NOT NULL
+    RETURN DISTINCT
+        dependent.id as id,
+        dependent.name as name,
+        {QueryBuilder.node_type("dependent")} as type,
+        dependent.cloud_provider as cloud_provider
+    """,
+)
+
+INDIRECTLY_AFFECTED_QUERY = register_query(
+    "dependency.indirectly_affected",
+    f"""
+    MATCH path = {_RESOURCE}<-[:DEPENDS_ON*2..20]-(dependent)
+    WHERE dependent.id IS NOT NULL AND length(path) <= $max_depth
+    RETURN DISTINCT
+        dependent.id as id,
+        dependent.name as name,
+        {QueryBuilder.node_type("dependent")} as type,
+        dependent.cloud_provider as cloud_provider,
+        length(path) as distance
+    ORDER BY distance
+    """,
+)
+
+RESOURCE_CYCLES_QUERY = register_query(
+    "dependency.resource_cycles",
+    f"""
+    MATCH path = {_RESOURCE}-[:{_DEPENDENCY_TYPES}*1..10]->(r)
+    WITH path, [node in nodes(path) | node.id] as cycle
+    WHERE size(cycle) > 2
+    RETURN DISTINCT cycle
+    ORDER BY size(cycle)
+    """,
+)
+
+DEPENDENCY_EDGES_QUERY = register_query(
+    "dependency.dependency_edges",
+    f"""
+    MATCH (source:{NODE_LABEL})-[:{_DEPENDENCY_TYPES}]->(target:{NODE_LABEL})
+    RETURN DISTINCT source.id as source_id, target.id as target_id
+    """,
+)
+
+SPOF_DEPENDENCIES_QUERY = register_query(
+    "dependency.spof_dependencies",
+    f"""
+    UNWIND $dep_ids as dep_id
+    MATCH {QueryBuilder.node_by("r", "dep_id")}
+    OPTIONAL MATCH (r)<-[:DEPENDS_ON]-(dependent)
+    WHERE dependent.id IS NOT NULL
+    WITH r, dep_id, COUNT(dependent) as dependent_count
+    OPTIONAL MATCH (r)-[:REDUNDANT_WITH]->(alt)
+    WHERE alt.id IS NOT NULL
+    WITH dep_id, dependent_count, COUNT(alt) as redundant_count
+    WHERE dependent_count > 0 AND redundant_count = 0
+    RETURN dep_id
+    """,
+)
+
+MAX_DEPENDENCY_DEPTH_QUERY = register_query(
+    "dependency.max_depth",
+    f"""
+    MATCH path = {_RESOURCE}-[:{_DEPTH_TYPES}*1..20]->(dep)
+    WHERE dep.id IS NOT NULL
+    RETURN max(length(path)) as max_depth
+    """,
+)
 
 
 class DependencyAnalyzer:
@@ -10,14 +192,34 @@ class DependencyAnalyzer:
     Analyzes resource dependencies for risk assessment.
     """
 
-    def __init__(self, neo4j_client: Neo4jClient):
+    def __init__(self, neo4j_client: Neo4jClient, graph_snapshot: GraphSnapshot | None = None):
         """
         Initialize dependency analyzer.
 
         Args:
             neo4j_client: Neo4j client for graph queries
+            graph_snapshot: Optional in-memory graph snapshot. When provided, traversals
+                for resources present in the snapshot are answered in-process instead
+                of querying Neo4j.
         """
         self.neo4j_client = neo4j_client
+        self.graph_snapshot = graph_snapshot
+
+    def _snapshot_for(self, resource_id: str) -> GraphSnapshot | None:
+        """Return the graph snapshot if it can answer queries for this resource."""
+        if self.graph_snapshot is not None and resource_id in self.graph_snapshot:
+            return self.graph_snapshot
+        return None
+
+    @staticmethod
+    def _snapshot_resource_summary(node: dict) -> dict:
+        """Convert a snapshot node into the affected-resource dict format."""
+        return {
+            "id": node["id"],
+            "name": node["name"],
+            "type": node["resource_type"],
+            "cloud_provider": node["cloud_provider"],
+        }
 
     def get_dependency_counts(self, resource_id: str) -> tuple[int, int]:
         """
@@ -32,36 +234,16 @@ class DependencyAnalyzer:
         Returns:
             Tuple of (dependencies_count, dependents_count)
         """
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            return snapshot.dependency_counts(resource_id)
+
         with self.neo4j_client.session() as session:
-            # Count upstream dependencies (what this depends on)
-            # Include all outgoing relationships that indicate dependency
-            upstream_query = """
-            MATCH (r {id: $id})-[rel]->(dep)
-            WHERE dep.id IS NOT NULL
-            AND type(rel) IN [
-                'DEPENDS_ON', 'USES', 'CONNECTS_TO', 'ROUTES_TO',
-                'ACCESSES', 'AUTHENTICATES_WITH', 'READS_FROM', 'WRITES_TO'
-            ]
-            WITH DISTINCT dep
-            RETURN COUNT(dep) as count
-            """
-            upstream_result = session.run(upstream_query, id=resource_id)
+            upstream_result = session.run(UPSTREAM_COUNT_QUERY, id=resource_id)
             upstream_record = upstream_result.single()
             dependencies_count = upstream_record["count"] if upstream_record else 0
 
-            # Count downstream dependents (what depends on this)
-            # Include all incoming relationships that indicate dependency
-            downstream_query = """
-            MATCH (r {id: $id})<-[rel]-(dependent)
-            WHERE dependent.id IS NOT NULL
-            AND type(rel) IN [
-                'DEPENDS_ON', 'USES', 'CONNECTS_TO', 'ROUTES_TO',
-                'ACCESSES', 'AUTHENTICATES_WITH', 'READS_FROM', 'WRITES_TO'
-            ]
-            WITH DISTINCT dependent
-            RETURN COUNT(dependent) as count
-            """
-            downstream_result = session.run(downstream_query, id=resource_id)
+            downstream_result = session.run(DOWNSTREAM_COUNT_QUERY, id=resource_id)
             downstream_record = downstream_result.single()
             dependents_count = downstream_record["count"] if downstream_record else 0
 
@@ -80,19 +262,20 @@ class DependencyAnalyzer:
         Returns:
             Dictionary mapping relationship type to list of dependencies
         """
-        query = """
-        MATCH (r {id: $id})<-[rel]-(dependent)
-        WHERE dependent.id IS NOT NULL
-        RETURN type(rel) as relationship_type,
-               dependent.id as dep_id,
-               dependent.name as dep_name,
-               COALESCE(dependent.resource_type, labels(dependent)[0]) as dep_type
-        """
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            by_type: dict[str, list[dict]] = {}
+            for dep_id, rel_type in snapshot.neighbors(resource_id, INCOMING):
+                node = snapshot.get_node(dep_id)
+                by_type.setdefault(rel_type, []).append(
+                    {"id": dep_id, "name": node["name"], "type": node["resource_type"]}
+                )
+            return by_type
 
         dependencies_by_type: dict[str, list[dict]] = {}
 
         with self.neo4j_client.session() as session:
-            result = session.run(query, id=resource_id)
+            result = session.run(DEPENDENTS_BY_TYPE_QUERY, id=resource_id)
             for record in result:
                 rel_type = record["relationship_type"]
                 if rel_type not in dependencies_by_type:
@@ -121,17 +304,12 @@ class DependencyAnalyzer:
         Returns:
             List of resource IDs in the critical path
         """
-        query = """
-        MATCH path = (r {id: $id})<-[*1..10]-(dependent)
-        WHERE dependent.id IS NOT NULL
-        WITH path, length(path) as depth
-        ORDER BY depth DESC
-        LIMIT 1
-        RETURN [node IN nodes(path) | node.id] as path_ids
-        """
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            return snapshot.deepest_path(resource_id, INCOMING, max_depth=10)
 
         with self.neo4j_client.session() as session:
-            result = session.run(query, id=resource_id)
+            result = session.run(CRITICAL_PATH_QUERY, id=resource_id)
             record = result.single()
             if record:
                 return record["path_ids"]
@@ -156,43 +334,20 @@ class DependencyAnalyzer:
         # Note: Neo4j variable-length relationships cannot use query parameters for bounds
         clamped_depth = max(1, min(max_depth, 10))
 
-        if direction == "upstream":
-            # Using hardcoded maximum to avoid f-string query construction
-            query = """
-            MATCH path = (r {id: $id})-[*1..10]->(dep)
-            WHERE dep.id IS NOT NULL
-            WITH path, relationships(path) as rels, length(path) as pathLength
-            WHERE pathLength <= $max_depth
-            UNWIND rels as rel
-            WITH startNode(rel) as source, endNode(rel) as target
-            WHERE source.id IS NOT NULL AND target.id IS NOT NULL
-            RETURN DISTINCT
-                source.id as source_id,
-                source.name as source_name,
-                COALESCE(source.resource_type, labels(source)[0]) as source_type,
-                target.id as target_id,
-                target.name as target_name,
-                COALESCE(target.resource_type, labels(target)[0]) as target_type
-            """
-        else:  # downstream
-            # Using hardcoded maximum to avoid f-string query construction
-            query = """
-            MATCH path = (r {id: $id})<-[*1..10]-(dep)
-            WHERE dep.id IS NOT NULL
-            WITH path, relationships(path) as rels, length(path) as pathLength
-            WHERE pathLength <= $max_depth
-            UNWIND rels as rel
-            WITH startNode(rel) as source, endNode(rel) as target
-            WHERE source.id IS NOT NULL AND target.id IS NOT NULL
-            RETURN DISTINCT
-                source.id as source_id,
-                source.name as source_name,
-                COALESCE(source.resource_type, labels(source)[0]) as source_type,
-                target.id as target_id,
-                target.name as target_name,
-                COALESCE(target.resource_type, labels(target)[0]) as target_type
-            """
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            snapshot_tree: dict[str, list[dict]] = {}
+            traversal = OUTGOING if direction == "upstream" else INCOMING
+            for source_id, target_id in snapshot.tree_edges(
+                resource_id, traversal, max_depth=clamped_depth
+            ):
+                target = snapshot.get_node(target_id)
+                snapshot_tree.setdefault(source_id, []).append(
+                    {"id": target_id, "name": target["name"], "type": target["resource_type"]}
+                )
+            return snapshot_tree
 
+        query = UPSTREAM_TREE_QUERY if direction == "upstream" else DOWNSTREAM_TREE_QUERY
         tree: dict[str, list[dict]] = {}
 
         with self.neo4j_client.session() as session:
@@ -226,24 +381,14 @@ class DependencyAnalyzer:
         Returns:
             True if this is a SPOF
         """
-        query = """
-        MATCH (r {id: $id})
-
-        // Check if it has dependents
-        OPTIONAL MATCH (r)<-[:DEPENDS_ON]-(dependent)
-        WHERE dependent.id IS NOT NULL
-        WITH r, COUNT(dependent) as dependent_count
-
-        // Check if it has redundant alternatives
-        OPTIONAL MATCH (r)-[:REDUNDANT_WITH]->(alt)
-        WHERE alt.id IS NOT NULL
-        WITH r, dependent_count, COUNT(alt) as redundant_count
-
-        RETURN dependent_count > 0 AND redundant_count = 0 as is_spof
-        """
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            has_dependents = snapshot.degree(resource_id, INCOMING, ["DEPENDS_ON"]) > 0
+            has_redundancy = snapshot.degree(resource_id, OUTGOING, ["REDUNDANT_WITH"]) > 0
+            return has_dependents and not has_redundancy
 
         with self.neo4j_client.session() as session:
-            result = session.run(query, id=resource_id)
+            result = session.run(IS_SPOF_QUERY, id=resource_id)
             record = result.single()
             if record:
                 return bool(record["is_spof"])
@@ -266,20 +411,25 @@ class DependencyAnalyzer:
         # Clamp max_depth to reasonable bounds
         clamped_depth = max(2, min(max_depth, 20))
 
-        # Get directly affected (immediate dependents)
-        direct_query = """
-        MATCH (r {id: $id})<-[:DEPENDS_ON]-(dependent)
-        WHERE dependent.id IS NOT NULL
-        RETURN DISTINCT
-            dependent.id as id,
-            dependent.name as name,
-            COALESCE(dependent.resource_type, labels(dependent)[0]) as type,
-            dependent.cloud_provider as cloud_provider
-        """
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            snapshot_direct = []
+            snapshot_indirect = []
+            for node, distance in snapshot.traverse_nodes(
+                resource_id, INCOMING, max_depth=clamped_depth, relationship_types=["DEPENDS_ON"]
+            ):
+                summary = self._snapshot_resource_summary(node)
+                if distance == 1:
+                    snapshot_direct.append(summary)
+                else:
+                    summary["distance"] = distance
+                    snapshot_indirect.append(summary)
+            return snapshot_direct, snapshot_indirect
 
+        # Get directly affected (immediate dependents)
         directly_affected = []
         with self.neo4j_client.session() as session:
-            result = session.run(direct_query, id=resource_id)
+            result = session.run(DIRECTLY_AFFECTED_QUERY, id=resource_id)
             for record in result:
                 directly_affected.append(
                     {
@@ -291,24 +441,13 @@ class DependencyAnalyzer:
                 )
 
         # Get indirectly affected (cascade effects)
-        # Using hardcoded maximum to avoid f-string query construction
-        indirect_query = """
-        MATCH path = (r {id: $id})<-[:DEPENDS_ON*2..20]-(dependent)
-        WHERE dependent.id IS NOT NULL AND length(path) <= $max_depth
-        RETURN DISTINCT
-            dependent.id as id,
-            dependent.name as name,
-            COALESCE(dependent.resource_type, labels(dependent)[0]) as type,
-            dependent.cloud_provider as cloud_provider,
-            length(path) as distance
-        ORDER BY distance
-        """
-
         indirectly_affected = []
         direct_ids = {r["id"] for r in directly_affected}
 
         with self.neo4j_client.session() as session:
-            result = session.run(indirect_query, id=resource_id, max_depth=clamped_depth)
+            result = session.run(
+                INDIRECTLY_AFFECTED_QUERY, id=resource_id, max_depth=clamped_depth
+            )
             for record in result:
                 # Don't include resources already in direct list
                 if record["id"] not in direct_ids:
@@ -338,55 +477,54 @@ class DependencyAnalyzer:
 
         Returns:
             List of circular dependency paths, where each path is a list of resource IDs
-            forming a cycle (last element connects back to first)
+            starting at the smallest ID and ending with it again
         """
-        if resource_id:
-            # Find cycles involving a specific resource
-            query = """
-            MATCH path = (r {id: $id})-[*1..10]->(r)
-            WHERE ALL(rel in relationships(path) WHERE type(rel) IN [
-                'DEPENDS_ON', 'USES', 'CONNECTS_TO', 'ROUTES_TO',
-                'ACCESSES', 'AUTHENTICATES_WITH', 'READS_FROM', 'WRITES_TO'
-            ])
-            WITH path, [node in nodes(path) | node.id] as cycle
-            WHERE size(cycle) > 2
-            RETURN DISTINCT cycle
-            ORDER BY size(cycle)
-            """
-            params = {"id": resource_id}
-        else:
-            # Find all cycles in the graph
-            query = """
-            MATCH path = (r)-[*2..10]->(r)
-            WHERE r.id IS NOT NULL
-            AND ALL(rel in relationships(path) WHERE type(rel) IN [
-                'DEPENDS_ON', 'USES', 'CONNECTS_TO', 'ROUTES_TO',
-                'ACCESSES', 'AUTHENTICATES_WITH', 'READS_FROM', 'WRITES_TO'
-            ])
-            WITH path, [node in nodes(path) | node.id] as cycle
-            WHERE size(cycle) > 2
-            WITH cycle
-            ORDER BY size(cycle), cycle[0]
-            RETURN DISTINCT cycle
-            LIMIT 50
-            """
-            params = {}
+        if not resource_id:
+            return self.analyze_circular_dependencies().cycles
+
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            return get_cycle_detector(snapshot).cycles_through(resource_id)
 
+        # Find cycles involving a specific resource
         cycles = []
+        seen = set()
         with self.neo4j_client.session() as session:
-            result = session.run(query, **params)
+            result = session.run(RESOURCE_CYCLES_QUERY, id=resource_id)
             for record in result:
-                cycle = record["cycle"]
-                # Normalize cycle to start with smallest ID (for deduplication)
-                min_idx = min(range(len(cycle)), key=lambda i: cycle[i])
-                normalized = cycle[min_idx:] + cycle[:min_idx]
-
-                # Only add if not already present (avoid duplicates)
-                if normalized not in cycles:
+                # Drop the repeated end node, rotate to start with the smallest ID
+                # and close the path again
+                nodes = record["cycle"][:-1]
+                min_idx = min(range(len(nodes)), key=lambda i: nodes[i])
+                normalized = nodes[min_idx:] + nodes[:min_idx]
+                normalized.append(normalized[0])
+
+                key = tuple(normalized)
+                if key not in seen:
+                    seen.add(key)
                     cycles.append(normalized)
 
         return cycles
 
+    def analyze_circular_dependencies(self) -> CycleReport:
+        """
+        Find all strongly connected components and cycles in the dependency graph.
+
+        Uses the graph snapshot when available; otherwise loads the dependency
+        relationships with a single query and analyses them in-process.
+
+        Returns:
+            CycleReport with cycles, component membership and sizes
+        """
+        if self.graph_snapshot is not None:
+            return get_cycle_detector(self.graph_snapshot).analyze()
+
+        with self.neo4j_client.session() as session:
+            result = session.run(DEPENDENCY_EDGES_QUERY)
+            edges = [(record["source_id"], record["target_id"]) for record in result]
+
+        return CycleDetector(edges).analyze()
+
     def get_dependency_health_score(self, resource_id: str) -> dict:
         """
         Calculate a health score for a resource's dependencies.
@@ -438,21 +576,8 @@ class DependencyAnalyzer:
 
         if dep_ids:
             # Query all at once to reduce database roundtrips
-            spof_query = """
-            UNWIND $dep_ids as dep_id
-            MATCH (r {id: dep_id})
-            OPTIONAL MATCH (r)<-[:DEPENDS_ON]-(dependent)
-            WHERE dependent.id IS NOT NULL
-            WITH r, dep_id, COUNT(dependent) as dependent_count
-            OPTIONAL MATCH (r)-[:REDUNDANT_WITH]->(alt)
-            WHERE alt.id IS NOT NULL
-            WITH dep_id, dependent_count, COUNT(alt) as redundant_count
-            WHERE dependent_count > 0 AND redundant_count = 0
-            RETURN dep_id
-            """
-
             with self.neo4j_client.session() as session:
-                result = session.run(spof_query, dep_ids=dep_ids)
+                result = session.run(SPOF_DEPENDENCIES_QUERY, dep_ids=dep_ids)
                 spof_in_deps = [record["dep_id"] for record in result]
 
         if spof_in_deps:
@@ -492,17 +617,17 @@ class DependencyAnalyzer:
         # Note: Neo4j variable-length relationships cannot use query parameters for bounds
         # Using hardcoded maximum to avoid f-string query construction
         # The max_depth parameter is kept for API compatibility but limited to 20
-        query = """
-        MATCH path = (r {id: $id})-[*1..20]->(dep)
-        WHERE dep.id IS NOT NULL
-        AND ALL(rel in relationships(path) WHERE type(rel) IN [
-            'DEPENDS_ON', 'USES', 'CONNECTS_TO', 'ROUTES_TO'
-        ])
-        RETURN max(length(path)) as max_depth
-        """
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            return snapshot.max_depth(
+                resource_id,
+                OUTGOING,
+                max_depth=max(1, min(max_depth, 20)),
+                relationship_types=["DEPENDS_ON", "USES", "CONNECTS_TO", "ROUTES_TO"],
+            )
 
         with self.neo4j_client.session() as session:
-            result = session.run(query, id=resource_id)
+            result = session.run(MAX_DEPENDENCY_DEPTH_QUERY, id=resource_id)
             record = result.single()
             calculated_depth = record["max_depth"] if record and record["max_depth"] else 0
             # Respect the requested max_depth by clamping the result
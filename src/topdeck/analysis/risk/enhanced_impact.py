@@ -10,7 +10,9 @@ This module provides detailed analysis of:
 import logging
 from typing import Any
 
+from topdeck.analysis.graph_snapshot import DEPENDENCY_RELATIONSHIP_TYPES
 from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.query_catalog import QueryBuilder, register_query
 
 from .dependency import DependencyAnalyzer
 from .models import (
@@ -24,6 +26,22 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+_DEPENDENCY_TYPES = QueryBuilder.relationship_types(DEPENDENCY_RELATIONSHIP_TYPES)
+
+UPSTREAM_DEPENDENCIES_QUERY = register_query(
+    "impact.upstream_dependencies",
+    f"""
+    MATCH {QueryBuilder.node("r")}-[rel:{_DEPENDENCY_TYPES}]->(dep)
+    WHERE dep.id IS NOT NULL
+    RETURN DISTINCT dep.id as id,
+           dep.name as name,
+           {QueryBuilder.node_type("dep")} as type,
+           type(rel) as relationship_type,
+           dep.is_critical as is_critical,
+           dep.risk_score as risk_score
+    """,
+)
+
 
 class EnhancedImpactAnalyzer:
     """
@@ -294,24 +312,9 @@ class EnhancedImpactAnalyzer:
         Returns:
             List of dependency dictionaries
         """
-        query = """
-        MATCH (r {id: $id})-[rel]->(dep)
-        WHERE dep.id IS NOT NULL
-        AND type(rel) IN [
-            'DEPENDS_ON', 'USES', 'CONNECTS_TO', 'ROUTES_TO',
-            'ACCESSES', 'AUTHENTICATES_WITH', 'READS_FROM', 'WRITES_TO'
-        ]
-        RETURN DISTINCT dep.id as id,
-               dep.name as name,
-               COALESCE(dep.resource_type, labels(dep)[0]) as type,
-               type(rel) as relationship_type,
-               dep.is_critical as is_critical,
-               dep.risk_score as risk_score
-        """
-
         dependencies = []
         with self.neo4j_client.session() as session:
-            result = session.run(query, id=resource_id)
+            result = session.run(UPSTREAM_DEPENDENCIES_QUERY, id=resource_id)
             for record in result:
                 dependencies.append(dict(record))
 
@@ -12,6 +12,8 @@ import logging
 from enum import Enum
 from typing import Any
 
+import numpy as np
+
 from .models import RiskLevel
 
 logger = logging.getLogger(__name__)
@@ -312,6 +314,54 @@ class RiskScorer:
         # Ensure score is within bounds
         return max(0.0, min(100.0, score))
 
+    def calculate_risk_scores(
+        self,
+        dependents_counts: np.ndarray,
+        criticality_scores: np.ndarray,
+        has_redundancy: np.ndarray,
+        deployment_failure_rates: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Vectorized form of :meth:`calculate_risk_score` for many resources at once.
+
+        Applies the same weighting as the scalar method to whole columns, so a
+        full-graph assessment is a handful of array operations instead of one
+        Python call per resource. Time-since-change is not considered (the
+        scalar method treats an unknown value the same way).
+
+        Args:
+            dependents_counts: Number of dependents per resource
+            criticality_scores: Criticality per resource (see _calculate_criticality)
+            has_redundancy: Boolean redundancy flag per resource
+            deployment_failure_rates: Historical failure rate per resource (default 0)
+
+        Returns:
+            Array of risk scores from 0-100
+        """
+        dependents = np.asarray(dependents_counts, dtype=np.float64)
+        criticality = np.asarray(criticality_scores, dtype=np.float64)
+        redundancy = np.asarray(has_redundancy, dtype=bool)
+
+        dependency_impact = np.minimum(100.0, (dependents / 50.0) * 100.0)
+        dependency_contribution = dependency_impact * (
+            self.weights["dependency_count"] / self.weights["criticality"]
+        )
+
+        failure_contribution = 0.0
+        if deployment_failure_rates is not None:
+            failure_contribution = (
+                np.asarray(deployment_failure_rates, dtype=np.float64)
+                * 100.0
+                * (self.weights["failure_rate"] / self.weights["criticality"])
+            )
+
+        redundancy_multiplier = np.where(redundancy, 0.85, 1.2)
+        scores = (
+            criticality + dependency_contribution + failure_contribution
+        ) * redundancy_multiplier
+
+        return np.clip(scores, 0.0, 100.0)
+
     def _calculate_criticality(
         self, resource_type: str, is_spof: bool, dependents_count: int, has_redundancy: bool = False
     ) -> float:
@@ -0,0 +1,374 @@
+"""
+Structural single point of failure detection.
+
+Runs classic graph algorithms over the in-memory graph snapshot instead of
+issuing per-resource Cypher traversals:
+
+- Articulation points and bridges of the undirected dependency graph
+  (Hopcroft-Tarjan lowlink), i.e. resources and links whose removal splits
+  the topology.
+- A dominator tree (Lengauer-Tarjan) of the failure-propagation graph. Edges
+  run from a dependency to its dependents and a virtual root feeds every
+  foundational resource (one that depends on nothing). Resource X dominates
+  Y when every path from a foundation to Y passes through X, so the
+  dominator subtree of X is exactly the set of resources that lose all
+  paths to a root when X fails.
+"""
+
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, field
+
+from topdeck.analysis.graph_snapshot import GraphSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Relationship types used to build the dependency graph
+SPOF_RELATIONSHIP_TYPES = ("DEPENDS_ON",)
+
+
+@dataclass
+class SPOFAnalysis:
+    """
+    Result of a structural SPOF analysis.
+
+    Attributes:
+        node_ids: Node IDs in snapshot index order
+        articulation_points: IDs of resources whose removal disconnects the graph
+        bridges: (source_id, target_id) dependencies whose removal disconnects the graph
+        immediate_dominators: Immediate dominator per node (None for roots)
+    """
+
+    node_ids: list[str]
+    articulation_points: set[str] = field(default_factory=set)
+    bridges: list[tuple[str, str]] = field(default_factory=list)
+    immediate_dominators: dict[str, str | None] = field(default_factory=dict)
+    _preorder: list[int] = field(default_factory=list, repr=False)
+    _entry: dict[str, int] = field(default_factory=dict, repr=False)
+    _subtree_size: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def blast_radius(self, resource_id: str) -> int:
+        """
+        Number of resources that lose all paths to a root if this one fails.
+
+        Args:
+            resource_id: Resource ID
+
+        Returns:
+            Size of the dominator subtree excluding the resource itself
+        """
+        size = self._subtree_size.get(resource_id)
+        return size - 1 if size else 0
+
+    def dominated_resources(self, resource_id: str) -> list[str]:
+        """
+        Get the resources that lose all paths to a root if this one fails.
+
+        Args:
+            resource_id: Resource ID
+
+        Returns:
+            IDs in the dominator subtree of the resource, excluding itself
+        """
+        start = self._entry.get(resource_id)
+        if start is None:
+            return []
+        end = start + self._subtree_size[resource_id]
+        return [self.node_ids[idx] for idx in self._preorder[start + 1 : end]]
+
+
+class SPOFEngine:
+    """
+    Computes articulation points, bridges and dominators over a graph snapshot.
+    """
+
+    def __init__(
+        self,
+        graph_snapshot: GraphSnapshot,
+        relationship_types: tuple[str, ...] = SPOF_RELATIONSHIP_TYPES,
+    ):
+        """
+        Initialize SPOF engine.
+
+        Args:
+            graph_snapshot: Snapshot of the resource graph
+            relationship_types: Relationship types treated as dependencies
+        """
+        self.graph_snapshot = graph_snapshot
+        self.relationship_types = relationship_types
+
+    def analyze(self) -> SPOFAnalysis:
+        """
+        Run the full structural analysis.
+
+        Returns:
+            SPOFAnalysis with articulation points, bridges and dominator tree
+        """
+        node_ids = self.graph_snapshot.node_ids
+        node_count = len(node_ids)
+        # Drop self-loops: they never affect connectivity or dominance
+        edges = [
+            (source, target)
+            for source, target in self.graph_snapshot.index_edges(self.relationship_types)
+            if source != target
+        ]
+
+        articulation, bridges = self._articulation_points_and_bridges(node_count, edges)
+        idom = self._dominators(node_count, edges)
+        preorder, entry, subtree_size = self._dominator_subtrees(node_count, idom)
+
+        analysis = SPOFAnalysis(
+            node_ids=node_ids,
+            articulation_points={node_ids[idx] for idx in articulation},
+            bridges=[(node_ids[s], node_ids[t]) for s, t in bridges],
+            immediate_dominators={
+                node_ids[idx]: (node_ids[parent] if parent < node_count else None)
+                for idx, parent in enumerate(idom)
+                if parent >= 0
+            },
+            _preorder=preorder,
+            _entry={node_ids[idx]: pos for idx, pos in entry.items()},
+            _subtree_size={node_ids[idx]: size for idx, size in subtree_size.items()},
+        )
+
+        logger.debug(
+            f"SPOF analysis: {node_count} nodes, {len(edges)} edges, "
+            f"{len(analysis.articulation_points)} articulation points, "
+            f"{len(analysis.bridges)} bridges"
+        )
+        return analysis
+
+    @staticmethod
+    def _articulation_points_and_bridges(
+        node_count: int, edges: list[tuple[int, int]]
+    ) -> tuple[set[int], list[tuple[int, int]]]:
+        """
+        Find articulation points and bridges of the undirected graph.
+
+        Iterative Hopcroft-Tarjan lowlink DFS. Parallel edges are told apart
+        by edge index so a doubled link is never reported as a bridge.
+
+        Args:
+            node_count: Number of nodes
+            edges: Directed (source, target) index pairs
+
+        Returns:
+            Tuple of (articulation point indexes, bridge edges)
+        """
+        adjacency: list[list[tuple[int, int]]] = [[] for _ in range(node_count)]
+        for edge_id, (source, target) in enumerate(edges):
+            adjacency[source].append((target, edge_id))
+            adjacency[target].append((source, edge_id))
+
+        discovery = [-1] * node_count
+        low = [0] * node_count
+        articulation: set[int] = set()
+        bridges: list[tuple[int, int]] = []
+        counter = 0
+
+        for start in range(node_count):
+            if discovery[start] != -1 or not adjacency[start]:
+                continue
+            discovery[start] = low[start] = counter
+            counter += 1
+            root_children = 0
+            # Stack frames: (node, edge used to reach it, next adjacency position)
+            stack = [(start, -1, 0)]
+            while stack:
+                node, via_edge, position = stack[-1]
+                if position < len(adjacency[node]):
+                    stack[-1] = (node, via_edge, position + 1)
+                    neighbor, edge_id = adjacency[node][position]
+                    if edge_id == via_edge:
+                        continue
+                    if discovery[neighbor] == -1:
+                        discovery[neighbor] = low[neighbor] = counter
+                        counter += 1
+                        if node == start:
+                            root_children += 1
+                        stack.append((neighbor, edge_id, 0))
+                    elif discovery[neighbor] < low[node]:
+                        low[node] = discovery[neighbor]
+                    continue
+
+                stack.pop()
+                if not stack:
+                    continue
+                parent = stack[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+                if low[node] > discovery[parent]:
+                    bridges.append(edges[via_edge])
+                if parent != start and low[node] >= discovery[parent]:
+                    articulation.add(parent)
+
+            if root_children > 1:
+                articulation.add(start)
+
+        return articulation, bridges
+
+    @staticmethod
+    def _dominators(node_count: int, edges: list[tuple[int, int]]) -> list[int]:
+        """
+        Compute immediate dominators of the failure-propagation graph.
+
+        Edges are reversed (dependency -> dependent) and a virtual root with
+        index ``node_count`` feeds every node that depends on nothing. Nodes
+        only reachable through dependency cycles are attached to the virtual
+        root as well. Uses Lengauer-Tarjan with path compression.
+
+        Args:
+            node_count: Number of nodes
+            edges: (dependent, dependency) index pairs
+
+        Returns:
+            Immediate dominator index per node; ``node_count`` for nodes
+            dominated only by the virtual root, -1 for nodes outside the graph
+        """
+        root = node_count
+        successors: list[list[int]] = [[] for _ in range(node_count + 1)]
+        predecessors: list[list[int]] = [[] for _ in range(node_count + 1)]
+        has_dependency = [False] * node_count
+        in_graph = [False] * node_count
+        for dependent, dependency in edges:
+            successors[dependency].append(dependent)
+            predecessors[dependent].append(dependency)
+            has_dependency[dependent] = True
+            in_graph[dependent] = in_graph[dependency] = True
+
+        for idx in range(node_count):
+            if in_graph[idx] and not has_dependency[idx]:
+                successors[root].append(idx)
+                predecessors[idx].append(root)
+
+        # Preorder DFS numbering from the virtual root
+        dfnum = [-1] * (node_count + 1)
+        vertex: list[int] = []
+        parent = [-1] * (node_count + 1)
+
+        def number_from(start: int, start_parent: int) -> None:
+            stack = [(start, start_parent)]
+            while stack:
+                node, node_parent = stack.pop()
+                if dfnum[node] != -1:
+                    continue
+                dfnum[node] = len(vertex)
+                vertex.append(node)
+                parent[node] = node_parent
+                for successor in reversed(successors[node]):
+                    if dfnum[successor] == -1:
+                        stack.append((successor, node))
+
+        number_from(root, -1)
+        for idx in range(node_count):
+            if in_graph[idx] and dfnum[idx] == -1:
+                # Cycle with no foundation: treat its entry node as a root
+                successors[root].append(idx)
+                predecessors[idx].append(root)
+                number_from(idx, root)
+
+        semi = dfnum[:]
+        idom = [-1] * (node_count + 1)
+        ancestor = [-1] * (node_count + 1)
+        label = list(range(node_count + 1))
+        bucket: list[list[int]] = [[] for _ in range(node_count + 1)]
+
+        def evaluate(node: int) -> int:
+            if ancestor[node] == -1:
+                return node
+            chain = []
+            while ancestor[ancestor[node]] != -1:
+                chain.append(node)
+                node = ancestor[node]
+            while chain:
+                node = chain.pop()
+                node_ancestor = ancestor[node]
+                if semi[label[node_ancestor]] < semi[label[node]]:
+                    label[node] = label[node_ancestor]
+                ancestor[node] = ancestor[node_ancestor]
+            return label[node]
+
+        for i in range(len(vertex) - 1, 0, -1):
+            w = vertex[i]
+            for v in predecessors[w]:
+                if dfnum[v] == -1:
+                    continue
+                u = evaluate(v)
+                if semi[u] < semi[w]:
+                    semi[w] = semi[u]
+            bucket[vertex[semi[w]]].append(w)
+            ancestor[w] = parent[w]
+            parent_bucket = bucket[parent[w]]
+            for v in parent_bucket:
+                u = evaluate(v)
+                idom[v] = u if semi[u] < semi[v] else parent[w]
+            parent_bucket.clear()
+
+        for i in range(1, len(vertex)):
+            w = vertex[i]
+            if idom[w] != vertex[semi[w]]:
+                idom[w] = idom[idom[w]]
+
+        return idom[:node_count]
+
+    @staticmethod
+    def _dominator_subtrees(
+        node_count: int, idom: list[int]
+    ) -> tuple[list[int], dict[int, int], dict[int, int]]:
+        """
+        Lay out the dominator tree in preorder so each subtree is a contiguous slice.
+
+        Args:
+            node_count: Number of nodes
+            idom: Immediate dominator per node (see _dominators)
+
+        Returns:
+            Tuple of (preorder node indexes, preorder position per node,
+            subtree size per node)
+        """
+        children: list[list[int]] = [[] for _ in range(node_count + 1)]
+        for idx, dominator in enumerate(idom):
+            if dominator >= 0:
+                children[dominator].append(idx)
+
+        preorder: list[int] = []
+        entry: dict[int, int] = {}
+        subtree_size: dict[int, int] = {}
+        stack = [(child, False) for child in reversed(children[node_count])]
+        while stack:
+            node, finished = stack.pop()
+            if finished:
+                subtree_size[node] = len(preorder) - entry[node]
+                continue
+            entry[node] = len(preorder)
+            preorder.append(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children[node]))
+
+        return preorder, entry, subtree_size
+
+
+# Analyses are cached per snapshot; snapshots are immutable and replaced wholesale
+_analysis_cache: "weakref.WeakKeyDictionary[GraphSnapshot, SPOFAnalysis]" = (
+    weakref.WeakKeyDictionary()
+)
+_analysis_lock = threading.Lock()
+
+
+def get_spof_analysis(graph_snapshot: GraphSnapshot) -> SPOFAnalysis:
+    """
+    Get the structural SPOF analysis for a snapshot, computing it once.
+
+    Args:
+        graph_snapshot: Snapshot of the resource graph
+
+    Returns:
+        SPOFAnalysis for the snapshot
+    """
+    with _analysis_lock:
+        analysis = _analysis_cache.get(graph_snapshot)
+        if analysis is None:
+            analysis = SPOFEngine(graph_snapshot).analyze()
+            _analysis_cache[graph_snapshot] = analysis
+        return analysis
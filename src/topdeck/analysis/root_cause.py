@@ -17,7 +17,7 @@ from typing import Any, Optional
 
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
 from topdeck.monitoring.live_diagnostics import LiveDiagnosticsService
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 logger = logging.getLogger(__name__)
 
@@ -110,7 +110,7 @@ class RootCauseAnalyzer:
     
     def __init__(
         self,
-        neo4j_client: Neo4jClient,
+        neo4j_client: AsyncNeo4jClient,
         prometheus_collector: PrometheusCollector,
         diagnostics_service: LiveDiagnosticsService,
         max_dependency_depth: int = 5,
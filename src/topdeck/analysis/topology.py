@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+from topdeck.analysis.graph_snapshot import BOTH, INCOMING, OUTGOING, GraphSnapshot
 from topdeck.storage.neo4j_client import Neo4jClient
 
 # Performance configuration constants
@@ -139,14 +140,45 @@ class ResourceAttachmentAnalysis:
 class TopologyService:
     """Service for building and analyzing network topology."""
 
-    def __init__(self, neo4j_client: Neo4jClient):
+    def __init__(self, neo4j_client: Neo4jClient, graph_snapshot: GraphSnapshot | None = None):
         """
         Initialize topology service.
 
         Args:
             neo4j_client: Neo4j client for accessing graph data
+            graph_snapshot: Optional in-memory graph snapshot used for multi-hop
+                traversals instead of variable-length Cypher queries
         """
         self.neo4j_client = neo4j_client
+        self.graph_snapshot = graph_snapshot
+
+    def _snapshot_for(self, resource_id: str) -> GraphSnapshot | None:
+        """Return the graph snapshot if it can answer queries for this resource."""
+        if self.graph_snapshot is not None and resource_id in self.graph_snapshot:
+            return self.graph_snapshot
+        return None
+
+    def _snapshot_neighbours(
+        self, snapshot: GraphSnapshot, resource_id: str, direction: str, depth: int
+    ) -> list[TopologyNode]:
+        """Get Resource nodes within ``depth`` hops from the snapshot, nearest first."""
+        reached = snapshot.traverse_nodes(
+            resource_id,
+            direction,
+            max_depth=min(depth, MAX_QUERY_DEPTH),
+            resources_only=True,
+        )
+        return [
+            TopologyNode(
+                id=node["id"],
+                resource_type=node["resource_type"],
+                name=node["name"],
+                cloud_provider=node["cloud_provider"],
+                region=node["properties"].get("region"),
+                properties=self._deserialize_json_properties(node["properties"]),
+            )
+            for node, _ in reached[:MAX_RESULT_LIMIT]
+        ]
 
     @staticmethod
     def _deserialize_json_properties(properties: dict[str, Any]) -> dict[str, Any]:
@@ -342,78 +374,86 @@ class TopologyService:
         downstream = []
         resource_name = ""
 
-        with self.neo4j_client.session() as session:
-            # Get resource name
-            name_result = session.run(
-                "MATCH (r:Resource {id: $id}) RETURN r.name as name", id=resource_id
-            )
-            name_record = name_result.single()
-            if name_record:
-                resource_name = name_record["name"]
-
-            # Get upstream dependencies (what this resource depends on)
+        snapshot = self._snapshot_for(resource_id)
+        if snapshot is not None:
+            resource_name = snapshot.get_node(resource_id)["name"] or ""
             if direction in ("upstream", "both"):
-                # Limit depth to MAX_QUERY_DEPTH for performance, add result limit
-                upstream_query = f"""
-                MATCH path = (r:Resource {{id: $id}})-[*1..{min(depth, MAX_QUERY_DEPTH)}]->(dep:Resource)
-                WITH DISTINCT dep, min(length(path)) as shortest_path
-                RETURN dep.id as id,
-                       dep.resource_type as resource_type,
-                       dep.name as name,
-                       dep.cloud_provider as cloud_provider,
-                       dep.region as region,
-                       dep as properties
-                ORDER BY shortest_path
-                LIMIT {MAX_RESULT_LIMIT}
-                """
-
-                result = session.run(upstream_query, id=resource_id)
-                for record in result:
-                    raw_props = dict(record["properties"]) if record["properties"] else {}
-                    deserialized_props = self._deserialize_json_properties(raw_props)
-
-                    upstream.append(
-                        TopologyNode(
-                            id=record["id"],
-                            resource_type=record["resource_type"],
-                            name=record["name"],
-                            cloud_provider=record["cloud_provider"],
-                            region=record["region"],
-                            properties=deserialized_props,
-                        )
-                    )
-
-            # Get downstream dependencies (what depends on this resource)
+                upstream = self._snapshot_neighbours(snapshot, resource_id, OUTGOING, depth)
             if direction in ("downstream", "both"):
-                # Limit depth to MAX_QUERY_DEPTH for performance, add result limit
-                downstream_query = f"""
-                MATCH path = (dep:Resource)-[*1..{min(depth, MAX_QUERY_DEPTH)}]->(r:Resource {{id: $id}})
-                WITH DISTINCT dep, min(length(path)) as shortest_path
-                RETURN dep.id as id,
-                       dep.resource_type as resource_type,
-                       dep.name as name,
-                       dep.cloud_provider as cloud_provider,
-                       dep.region as region,
-                       dep as properties
-                ORDER BY shortest_path
-                LIMIT {MAX_RESULT_LIMIT}
-                """
-
-                result = session.run(downstream_query, id=resource_id)
-                for record in result:
-                    raw_props = dict(record["properties"]) if record["properties"] else {}
-                    deserialized_props = self._deserialize_json_properties(raw_props)
+                downstream = self._snapshot_neighbours(snapshot, resource_id, INCOMING, depth)
+        else:
+            with self.neo4j_client.session() as session:
+                # Get resource name
+                name_result = session.run(
+                    "MATCH (r:Resource {id: $id}) RETURN r.name as name", id=resource_id
+                )
+                name_record = name_result.single()
+                if name_record:
+                    resource_name = name_record["name"]
+
+                # Get upstream dependencies (what this resource depends on)
+                if direction in ("upstream", "both"):
+                    # Limit depth to MAX_QUERY_DEPTH for performance, add result limit
+                    upstream_query = f"""
+                    MATCH path = (r:Resource {{id: $id}})-[*1..{min(depth, MAX_QUERY_DEPTH)}]->(dep:Resource)
+                    WITH DISTINCT dep, min(length(path)) as shortest_path
+                    RETURN dep.id as id,
+                           dep.resource_type as resource_type,
+                           dep.name as name,
+                           dep.cloud_provider as cloud_provider,
+                           dep.region as region,
+                           dep as properties
+                    ORDER BY shortest_path
+                    LIMIT {MAX_RESULT_LIMIT}
+                    """
+
+                    result = session.run(upstream_query, id=resource_id)
+                    for record in result:
+                        raw_props = dict(record["properties"]) if record["properties"] else {}
+                        deserialized_props = self._deserialize_json_properties(raw_props)
+
+                        upstream.append(
+                            TopologyNode(
+                                id=record["id"],
+                                resource_type=record["resource_type"],
+                                name=record["name"],
+                                cloud_provider=record["cloud_provider"],
+                                region=record["region"],
+                                properties=deserialized_props,
+                            )
+                        )
 
-                    downstream.append(
-                        TopologyNode(
-                            id=record["id"],
-                            resource_type=record["resource_type"],
-                            name=record["name"],
-                            cloud_provider=record["cloud_provider"],
-                            region=record["region"],
-                            properties=deserialized_props,
+                # Get downstream dependencies (what depends on this resource)
+                if direction in ("downstream", "both"):
+                    # Limit depth to MAX_QUERY_DEPTH for performance, add result limit
+                    downstream_query = f"""
+                    MATCH path = (dep:Resource)-[*1..{min(depth, MAX_QUERY_DEPTH)}]->(r:Resource {{id: $id}})
+                    WITH DISTINCT dep, min(length(path)) as shortest_path
+                    RETURN dep.id as id,
+                           dep.resource_type as resource_type,
+                           dep.name as name,
+                           dep.cloud_provider as cloud_provider,
+                           dep.region as region,
+                           dep as properties
+                    ORDER BY shortest_path
+                    LIMIT {MAX_RESULT_LIMIT}
+                    """
+
+                    result = session.run(downstream_query, id=resource_id)
+                    for record in result:
+                        raw_props = dict(record["properties"]) if record["properties"] else {}
+                        deserialized_props = self._deserialize_json_properties(raw_props)
+
+                        downstream.append(
+                            TopologyNode(
+                                id=record["id"],
+                                resource_type=record["resource_type"],
+                                name=record["name"],
+                                cloud_provider=record["cloud_provider"],
+                                region=record["region"],
+                                properties=deserialized_props,
+                            )
                         )
-                    )
 
         # Get detailed attachment information
         upstream_attachments = []
@@ -837,14 +877,20 @@ class TopologyService:
             all_chains = downstream_chains + upstream_chains
 
             # Calculate impact radius
-            impact_radius_query = """
-            MATCH (r:Resource {id: $id})-[*1..3]-(connected:Resource)
-            WITH DISTINCT connected
-            RETURN count(connected) as radius
-            """
-            radius_result = session.run(impact_radius_query, id=resource_id)
-            radius_record = radius_result.single()
-            impact_radius = radius_record["radius"] if radius_record else 0
+            snapshot = self._snapshot_for(resource_id)
+            if snapshot is not None:
+                impact_radius = len(
+                    snapshot.traverse_nodes(resource_id, BOTH, max_depth=3, resources_only=True)
+                )
+            else:
+                impact_radius_query = """
+                MATCH (r:Resource {id: $id})-[*1..3]-(connected:Resource)
+                WITH DISTINCT connected
+                RETURN count(connected) as radius
+                """
+                radius_result = session.run(impact_radius_query, id=resource_id)
+                radius_record = radius_result.single()
+                impact_radius = radius_record["radius"] if radius_record else 0
 
         return ResourceAttachmentAnalysis(
             resource_id=resource_id,
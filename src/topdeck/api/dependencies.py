@@ -0,0 +1,320 @@
+"""
+Application-scoped clients shared by the API routes.
+
+Routes get their Neo4j client and observability collectors from one
+ServiceContainer, created in the application lifespan, instead of opening a
+new driver or HTTP client (with cold TCP/TLS connections) per request. The
+container owns:
+
+- the pooled Neo4j clients (the async one for ``async def`` handlers and
+  services, the sync one for code running in worker threads), and
+- one pooled httpx client per observability backend (Prometheus, Loki,
+  Tempo, Elasticsearch), using HTTP/2 when the h2 package is installed.
+
+Collectors built on a shared client leave it open when they are closed, so
+routes can keep closing the collectors they use.
+"""
+
+import logging
+
+import httpx
+from fastapi import Depends, Request
+
+from topdeck.common.config import settings
+from topdeck.common.metrics import record_connection_pool
+from topdeck.monitoring.collectors.elasticsearch import ElasticsearchCollector
+from topdeck.monitoring.collectors.loki import LokiCollector
+from topdeck.monitoring.collectors.prometheus import PrometheusCollector
+from topdeck.monitoring.collectors.tempo import TempoCollector
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
+from topdeck.storage.neo4j_client import Neo4jClient
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Observability backends with a shared HTTP client
+HTTP_BACKENDS = ("prometheus", "loki", "tempo", "elasticsearch")
+
+
+class ServiceContainer:
+    """Owns the clients shared by all requests."""
+
+    def __init__(
+        self,
+        neo4j_client: Neo4jClient | None = None,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        timeout: float | None = None,
+        http2: bool | None = None,
+    ):
+        """
+        Initialize service container.
+
+        Args:
+            neo4j_client: Connected Neo4j client to share (one is created from
+                the settings on first use if None)
+            max_connections: Maximum open connections per backend
+                (defaults to settings.http_pool_max_connections)
+            max_keepalive_connections: Idle connections kept per backend
+                (defaults to settings.http_pool_max_keepalive_connections)
+            keepalive_expiry: Seconds an idle connection is kept open
+                (defaults to settings.http_pool_keepalive_expiry)
+            timeout: Request timeout in seconds
+                (defaults to settings.http_client_timeout)
+            http2: Whether to use HTTP/2 if available
+                (defaults to settings.http_client_http2)
+        """
+        self.max_connections = max_connections or settings.http_pool_max_connections
+        self.max_keepalive_connections = (
+            max_keepalive_connections
+            if max_keepalive_connections is not None
+            else settings.http_pool_max_keepalive_connections
+        )
+        self.keepalive_expiry = (
+            keepalive_expiry
+            if keepalive_expiry is not None
+            else settings.http_pool_keepalive_expiry
+        )
+        self.timeout = timeout or settings.http_client_timeout
+        self.http2 = (settings.http_client_http2 if http2 is None else http2) and HTTP2_AVAILABLE
+        self._neo4j_client = neo4j_client
+        self._owns_neo4j = False
+        self._async_neo4j_client: AsyncNeo4jClient | None = None
+        self._http_clients: dict[str, httpx.AsyncClient] = {}
+
+    @property
+    def neo4j(self) -> Neo4jClient:
+        """Shared Neo4j client (created from the settings on first use if none was given)."""
+        if self._neo4j_client is None:
+            client = Neo4jClient(**_neo4j_options())
+            client.connect()
+            self._neo4j_client = client
+            self._owns_neo4j = True
+        return self._neo4j_client
+
+    @property
+    def async_neo4j(self) -> AsyncNeo4jClient:
+        """Shared async Neo4j client (created from the settings on first use)."""
+        if self._async_neo4j_client is None:
+            client = AsyncNeo4jClient(**_neo4j_options())
+            client.connect()
+            self._async_neo4j_client = client
+        return self._async_neo4j_client
+
+    def http_client(self, backend: str) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client of a backend, creating it on first use.
+
+        Args:
+            backend: One of HTTP_BACKENDS
+
+        Returns:
+            Pooled HTTP client
+
+        Raises:
+            ValueError: If the backend is unknown
+        """
+        client = self._http_clients.get(backend)
+        if client is not None:
+            return client
+        if backend not in HTTP_BACKENDS:
+            raise ValueError(f"Unknown HTTP backend: {backend}")
+
+        options = {}
+        if backend == "elasticsearch":
+            headers, auth = ElasticsearchCollector.auth_options(
+                username=settings.elasticsearch_username or None,
+                password=settings.elasticsearch_password or None,
+                api_key=settings.elasticsearch_api_key or None,
+            )
+            options = {"headers": headers, "auth": auth}
+
+        client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            http2=self.http2,
+            **options,
+        )
+        self._http_clients[backend] = client
+        return client
+
+    def prometheus(self) -> PrometheusCollector | None:
+        """Prometheus collector on the shared client (None if not configured)."""
+        if not settings.prometheus_url:
+            return None
+        return PrometheusCollector(settings.prometheus_url, client=self.http_client("prometheus"))
+
+    def loki(self) -> LokiCollector | None:
+        """Loki collector on the shared client (None if not configured)."""
+        if not settings.loki_url:
+            return None
+        return LokiCollector(settings.loki_url, client=self.http_client("loki"))
+
+    def tempo(self) -> TempoCollector | None:
+        """Tempo collector on the shared client (None if not configured)."""
+        if not settings.tempo_url:
+            return None
+        return TempoCollector(settings.tempo_url, client=self.http_client("tempo"))
+
+    def elasticsearch(self) -> ElasticsearchCollector | None:
+        """Elasticsearch collector on the shared client (None if not configured)."""
+        if not settings.elasticsearch_url:
+            return None
+        return ElasticsearchCollector(
+            url=settings.elasticsearch_url,
+            index_pattern=settings.elasticsearch_index_pattern,
+            client=self.http_client("elasticsearch"),
+        )
+
+    def get_pool_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Get connection pool utilization and update the pool metrics.
+
+        Returns:
+            Per backend, the pool size limit and the open, in-use and idle
+            connections (only for pools created so far)
+        """
+        stats = {}
+        if self._neo4j_client is not None:
+            stats["neo4j"] = self._neo4j_client.get_pool_stats()
+        if self._async_neo4j_client is not None:
+            stats["neo4j_async"] = self._async_neo4j_client.get_pool_stats()
+        for backend, client in self._http_clients.items():
+            stats[backend] = _http_pool_stats(client, self.max_connections)
+        for backend, pool in stats.items():
+            record_connection_pool(backend, pool["in_use"], pool["idle"], pool["max_size"])
+        return stats
+
+    async def close(self) -> None:
+        """Close the HTTP and async Neo4j clients, and the Neo4j client if the container created it."""
+        for backend, client in self._http_clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close {backend} HTTP client: {e}")
+        self._http_clients.clear()
+        if self._async_neo4j_client is not None:
+            await self._async_neo4j_client.close()
+            self._async_neo4j_client = None
+        if self._owns_neo4j and self._neo4j_client is not None:
+            self._neo4j_client.close()
+        self._neo4j_client = None
+        self._owns_neo4j = False
+
+
+def _neo4j_options() -> dict[str, object]:
+    """Neo4j client arguments from the settings."""
+    return {
+        "uri": settings.neo4j_uri,
+        "username": settings.neo4j_username,
+        "password": settings.neo4j_password,
+        "encrypted": settings.neo4j_encrypted,
+        "max_connection_pool_size": settings.neo4j_max_connection_pool_size,
+        "connection_acquisition_timeout": settings.neo4j_connection_acquisition_timeout,
+        "max_transaction_retry_time": settings.neo4j_max_transaction_retry_time,
+    }
+
+
+def _http_pool_stats(client: httpx.AsyncClient, max_size: int) -> dict[str, int]:
+    """Count the connections of an httpx client's pool."""
+    # httpx does not expose its transport's connection pool publicly
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        "max_size": max_size,
+        "open": len(connections),
+        "in_use": len(connections) - idle,
+        "idle": idle,
+    }
+
+
+# Global container, set by the application lifespan
+_service_container: ServiceContainer | None = None
+
+
+def get_service_container() -> ServiceContainer:
+    """
+    Get the global service container.
+
+    Returns the container of the application lifespan, or creates one on
+    first use outside of it (e.g. in tests and scripts).
+
+    Returns:
+        Service container
+    """
+    global _service_container
+    if _service_container is None:
+        _service_container = ServiceContainer()
+    return _service_container
+
+
+def set_service_container(container: ServiceContainer | None) -> None:
+    """
+    Set (or clear) the global service container.
+
+    Args:
+        container: Container to use, or None
+    """
+    global _service_container
+    _service_container = container
+
+
+# FastAPI dependencies
+
+
+def get_container(request: Request) -> ServiceContainer:
+    """Get the service container of the application handling a request."""
+    container = getattr(request.app.state, "services", None)
+    return container if container is not None else get_service_container()
+
+
+def get_neo4j_client(container: ServiceContainer = Depends(get_container)) -> Neo4jClient:
+    """Get the shared Neo4j client."""
+    return container.neo4j
+
+
+def get_async_neo4j_client(
+    container: ServiceContainer = Depends(get_container),
+) -> AsyncNeo4jClient:
+    """Get the shared async Neo4j client."""
+    return container.async_neo4j
+
+
+def get_prometheus_collector(
+    container: ServiceContainer = Depends(get_container),
+) -> PrometheusCollector | None:
+    """Get a Prometheus collector on the shared client (None if not configured)."""
+    return container.prometheus()
+
+
+def get_loki_collector(
+    container: ServiceContainer = Depends(get_container),
+) -> LokiCollector | None:
+    """Get a Loki collector on the shared client (None if not configured)."""
+    return container.loki()
+
+
+def get_tempo_collector(
+    container: ServiceContainer = Depends(get_container),
+) -> TempoCollector | None:
+    """Get a Tempo collector on the shared client (None if not configured)."""
+    return container.tempo()
+
+
+def get_elasticsearch_collector(
+    container: ServiceContainer = Depends(get_container),
+) -> ElasticsearchCollector | None:
+    """Get an Elasticsearch collector on the shared client (None if not configured)."""
+    return container.elasticsearch()
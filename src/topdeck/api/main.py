@@ -8,6 +8,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from topdeck import __version__
+from topdeck.api.dependencies import ServiceContainer, get_service_container, set_service_container
 from topdeck.api.routes import (
     alerts,
     change_management,
@@ -68,13 +69,36 @@ async def lifespan(app: FastAPI):
             username=settings.neo4j_username,
             password=settings.neo4j_password,
             encrypted=settings.neo4j_encrypted if hasattr(settings, 'neo4j_encrypted') else False,
-            max_connection_pool_size=50,
-            connection_acquisition_timeout=60.0,
+            max_connection_pool_size=settings.neo4j_max_connection_pool_size,
+            connection_acquisition_timeout=settings.neo4j_connection_acquisition_timeout,
             auto_create_schema=True,
         )
         print("DEBUG: Neo4j initialized with connection pooling and schema")
     except Exception as e:
         print(f"Warning: Failed to initialize Neo4j: {e}")
+
+    # Share the pooled Neo4j driver and one pooled HTTP client per backend
+    # between all routes
+    from topdeck.storage import get_neo4j_client, is_neo4j_initialized
+
+    services = ServiceContainer(neo4j_client=get_neo4j_client() if is_neo4j_initialized() else None)
+    app.state.services = services
+    set_service_container(services)
+    print(f"DEBUG: Service container ready (HTTP/2: {services.http2})")
+
+    # Build the in-memory graph snapshot used by risk/topology analysis
+    if settings.enable_graph_snapshot:
+        try:
+            from topdeck.analysis.graph_snapshot import refresh_graph_snapshot
+            from topdeck.storage import get_neo4j_client
+
+            snapshot = await asyncio.to_thread(refresh_graph_snapshot, get_neo4j_client())
+            print(
+                f"DEBUG: Graph snapshot built: {snapshot.node_count} nodes, "
+                f"{snapshot.edge_count} relationships"
+            )
+        except Exception as e:
+            print(f"Warning: Failed to build graph snapshot: {e}")
     
     # Initialize Redis client for rate limiting if enabled
     redis_client = None
@@ -95,6 +119,41 @@ async def lifespan(app: FastAPI):
             print(f"Warning: Failed to connect to Redis for rate limiting: {e}")
             app.state.redis_client = None
     
+    # Share cached query results between replicas (L1 in-process, L2 Redis)
+    tiered_cache = None
+    shared_cache = None
+    try:
+        from topdeck.common.cache import Cache, CacheConfig
+        from topdeck.storage.query_cache import get_query_cache
+        from topdeck.storage.tiered_cache import TieredQueryCache, set_tiered_cache
+
+        if settings.cache_shared_enabled:
+            shared_cache = Cache(
+                CacheConfig(
+                    host=settings.redis_host,
+                    port=settings.redis_port,
+                    db=settings.redis_db,
+                    password=settings.redis_password or None,
+                    ssl=settings.redis_ssl,
+                    ssl_cert_reqs=settings.redis_ssl_cert_reqs,
+                )
+            )
+            await shared_cache.connect()
+            if not shared_cache.enabled:
+                shared_cache = None
+        tiered_cache = TieredQueryCache(
+            l1=get_query_cache(),
+            l2=shared_cache,
+            default_ttl=settings.cache_ttl_resources,
+            early_refresh_beta=settings.cache_early_refresh_beta,
+            lock_timeout=settings.cache_lock_timeout_seconds,
+        )
+        await tiered_cache.start()
+        set_tiered_cache(tiered_cache)
+        print(f"DEBUG: Query cache started (shared: {shared_cache is not None})")
+    except Exception as e:
+        print(f"Warning: Failed to start shared query cache: {e}")
+
     try:
         print("DEBUG: About to start scheduler...")
         start_scheduler()
@@ -108,6 +167,15 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     print("DEBUG: Shutting down application...")
+
+    # Close the shared HTTP clients before the Neo4j driver they may share
+    try:
+        set_service_container(None)
+        app.state.services = None
+        await services.close()
+        print("DEBUG: Shared clients closed")
+    except Exception as e:
+        print(f"Warning: Failed to close shared clients: {e}")
     
     # Close Neo4j connection
     try:
@@ -120,6 +188,14 @@ async def lifespan(app: FastAPI):
     stop_scheduler()
     print("DEBUG: Scheduler stopped")
     
+    if tiered_cache:
+        from topdeck.storage.tiered_cache import set_tiered_cache
+
+        set_tiered_cache(None)
+        await tiered_cache.stop()
+    if shared_cache:
+        await shared_cache.close()
+
     # Close Redis connection
     if redis_client:
         await redis_client.close()
@@ -280,6 +356,8 @@ async def metrics():
 
     Exposes application metrics in Prometheus format for scraping.
     """
+    # Refresh the connection pool gauges
+    get_service_container().get_pool_stats()
     return get_metrics_handler()
 
 
@@ -301,6 +379,17 @@ async def info() -> dict[str, object]:
     }
 
 
+@app.get("/api/pools/stats")
+async def pool_stats() -> dict[str, Any]:
+    """
+    Get connection pool statistics.
+
+    Returns the size limit and open, in-use and idle connections of the
+    shared Neo4j and backend HTTP client pools.
+    """
+    return get_service_container().get_pool_stats()
+
+
 @app.get("/api/cache/stats")
 async def cache_stats() -> dict[str, Any]:
     """
@@ -310,9 +399,14 @@ async def cache_stats() -> dict[str, Any]:
     """
     try:
         from topdeck.storage import get_neo4j_client
+        from topdeck.storage.tiered_cache import get_tiered_cache
 
         neo4j_client = get_neo4j_client()
-        return neo4j_client.get_cache_stats()
+        stats = neo4j_client.get_cache_stats()
+        tiered_cache = get_tiered_cache()
+        if tiered_cache is not None:
+            stats["tiered"] = tiered_cache.get_stats()
+        return stats
     except Exception as e:
         return {
             "error": str(e),
@@ -16,7 +16,8 @@ from topdeck.analysis.accuracy import (
 from topdeck.analysis.accuracy.multi_source_verifier import (
     MultiSourceDependencyVerifier,
 )
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.api.dependencies import ServiceContainer, get_async_neo4j_client, get_container
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 router = APIRouter(prefix="/api/v1/accuracy", tags=["accuracy"])
 
@@ -102,49 +103,34 @@ class MultiSourceVerificationResponse(BaseModel):
 
 
 # Dependency injection
-def get_neo4j_client() -> Neo4jClient:
-    """Get Neo4j client instance."""
-    # This would be properly injected in production
-    # For now, return a configured instance with default test values
-    import os
-    
-    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-    username = os.getenv("NEO4J_USERNAME", "neo4j")
-    password = os.getenv("NEO4J_PASSWORD", "password")
-    
-    return Neo4jClient(uri, username, password)
-
-
 def get_prediction_tracker(
-    neo4j_client: Neo4jClient = Depends(get_neo4j_client),
+    neo4j_client: AsyncNeo4jClient = Depends(get_async_neo4j_client),
 ) -> PredictionTracker:
     """Get prediction tracker instance."""
     return PredictionTracker(neo4j_client)
 
 
 def get_dependency_validator(
-    neo4j_client: Neo4jClient = Depends(get_neo4j_client),
+    neo4j_client: AsyncNeo4jClient = Depends(get_async_neo4j_client),
 ) -> DependencyValidator:
     """Get dependency validator instance."""
     return DependencyValidator(neo4j_client)
 
 
 def get_prediction_calibrator(
-    neo4j_client: Neo4jClient = Depends(get_neo4j_client),
+    neo4j_client: AsyncNeo4jClient = Depends(get_async_neo4j_client),
 ) -> PredictionCalibrator:
     """Get prediction calibrator instance."""
     return PredictionCalibrator(neo4j_client)
 
 
 def get_multi_source_verifier(
-    neo4j_client: Neo4jClient = Depends(get_neo4j_client),
+    container: ServiceContainer = Depends(get_container),
 ) -> MultiSourceDependencyVerifier:
     """Get multi-source dependency verifier instance."""
     import os
     
     from topdeck.discovery.azure.devops import AzureDevOpsDiscoverer
-    from topdeck.monitoring.collectors.prometheus import PrometheusCollector
-    from topdeck.monitoring.collectors.tempo import TempoCollector
     
     # Initialize optional collectors based on environment variables
     ado_discoverer = None
@@ -155,19 +141,11 @@ def get_multi_source_verifier(
             personal_access_token=os.getenv("AZURE_DEVOPS_PAT"),
         )
     
-    prometheus_collector = None
-    if os.getenv("PROMETHEUS_URL"):
-        prometheus_collector = PrometheusCollector(os.getenv("PROMETHEUS_URL"))
-    
-    tempo_collector = None
-    if os.getenv("TEMPO_URL"):
-        tempo_collector = TempoCollector(os.getenv("TEMPO_URL"))
-    
     return MultiSourceDependencyVerifier(
-        neo4j_client=neo4j_client,
+        neo4j_client=container.async_neo4j,
         ado_discoverer=ado_discoverer,
-        prometheus_collector=prometheus_collector,
-        tempo_collector=tempo_collector,
+        prometheus_collector=container.prometheus(),
+        tempo_collector=container.tempo(),
     )
 
 
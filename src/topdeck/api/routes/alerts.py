@@ -13,6 +13,7 @@ from typing import Any, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from topdeck.api.dependencies import get_service_container
 from topdeck.monitoring.alerting import (
     AlertDestination,
     AlertDestinationType,
@@ -22,9 +23,8 @@ from topdeck.monitoring.alerting import (
     AlertStatus,
     TriggerType,
 )
-from topdeck.monitoring.live_diagnostics import LiveDiagnosticsService
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.monitoring.live_diagnostics import LiveDiagnosticsService
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +40,7 @@ def get_alerting_engine() -> AlertingEngine:
     
     if _alerting_engine is None:
         # Initialize dependencies
-        neo4j_client = Neo4jClient()
+        neo4j_client = get_service_container().async_neo4j
         prometheus_collector = PrometheusCollector()
         diagnostics_service = LiveDiagnosticsService(
             neo4j_client=neo4j_client,
@@ -8,12 +8,12 @@ and change calendar.
 from datetime import UTC, datetime
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from topdeck.api.dependencies import get_neo4j_client
 from topdeck.change_management.models import ChangeType
 from topdeck.change_management.service import ChangeManagementService
-from topdeck.common.config import settings
 from topdeck.storage.neo4j_client import Neo4jClient
 
 
@@ -88,30 +88,29 @@ class ChangeCalendarItem(BaseModel):
     requester: str | None = None
 
 
-# Create router
+# Create router. Handlers calling the synchronous Neo4j client are plain
+# functions, which FastAPI runs in its threadpool off the event loop.
 router = APIRouter(prefix="/api/v1/changes", tags=["change-management"])
 
 
-def get_change_service() -> ChangeManagementService:
+def get_change_service(
+    neo4j_client: Neo4jClient = Depends(get_neo4j_client),
+) -> ChangeManagementService:
     """Get change management service instance"""
-    neo4j_client = Neo4jClient(
-        uri=settings.neo4j_uri,
-        username=settings.neo4j_user,
-        password=settings.neo4j_password,
-    )
     return ChangeManagementService(neo4j_client)
 
 
 @router.post("", response_model=ChangeRequestResponse, status_code=201)
-async def create_change_request(request: ChangeRequestCreate) -> ChangeRequestResponse:
+def create_change_request(
+    request: ChangeRequestCreate,
+    service: ChangeManagementService = Depends(get_change_service),
+) -> ChangeRequestResponse:
     """
     Create a new change request.
 
     Creates a change request with the specified details and affected resources.
     """
     try:
-        service = get_change_service()
-
         # Parse change type
         try:
             change_type = ChangeType(request.change_type.lower())
@@ -164,9 +163,10 @@ async def create_change_request(request: ChangeRequestCreate) -> ChangeRequestRe
 
 
 @router.post("/{change_id}/assess", response_model=ImpactAssessmentResponse)
-async def assess_change_impact(
+def assess_change_impact(
     change_id: str,
     resource_id: str | None = Query(None, description="Specific resource to analyze"),
+    service: ChangeManagementService = Depends(get_change_service),
 ) -> ImpactAssessmentResponse:
     """
     Assess the impact of a change request.
@@ -175,8 +175,6 @@ async def assess_change_impact(
     and risk level of the proposed change.
     """
     try:
-        service = get_change_service()
-
         # Get the change request
         # Note: In a full implementation, we'd retrieve this from Neo4j
         # For now, create a minimal change request for the assessment
@@ -208,9 +206,10 @@ async def assess_change_impact(
 
 
 @router.get("/calendar", response_model=list[ChangeCalendarItem])
-async def get_change_calendar(
+def get_change_calendar(
     start_date: str | None = Query(None, description="Start date (ISO format)"),
     end_date: str | None = Query(None, description="End date (ISO format)"),
+    service: ChangeManagementService = Depends(get_change_service),
 ) -> list[ChangeCalendarItem]:
     """
     Get scheduled changes within a date range.
@@ -219,8 +218,6 @@ async def get_change_calendar(
     within the specified date range.
     """
     try:
-        service = get_change_service()
-
         # Parse dates
         start = None
         end = None
@@ -261,8 +258,9 @@ async def get_change_types() -> list[str]:
 
 
 @router.get("/metrics", response_model=dict[str, Any])
-async def get_change_metrics(
-    days: int = Query(30, description="Number of days to analyze", ge=1, le=365)
+def get_change_metrics(
+    days: int = Query(30, description="Number of days to analyze", ge=1, le=365),
+    service: ChangeManagementService = Depends(get_change_service),
 ) -> dict[str, Any]:
     """
     Get change management metrics.
@@ -275,8 +273,6 @@ async def get_change_metrics(
 
         from topdeck.change_management.metrics import ChangeMetricsCalculator
 
-        service = get_change_service()
-
         # Get changes from the last N days
         start_date = datetime.now(UTC) - timedelta(days=days)
 
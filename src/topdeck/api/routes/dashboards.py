@@ -13,22 +13,17 @@ from typing import Any, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.api.dependencies import get_service_container
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/dashboards", tags=["dashboards"])
 
-# Global service instances (in production, use dependency injection)
-_neo4j_client: Optional[Neo4jClient] = None
 
-
-def get_neo4j_client() -> Neo4jClient:
-    """Get or create Neo4j client instance."""
-    global _neo4j_client
-    if _neo4j_client is None:
-        _neo4j_client = Neo4jClient()
-    return _neo4j_client
+def get_neo4j_client() -> AsyncNeo4jClient:
+    """Get the shared async Neo4j client."""
+    return get_service_container().async_neo4j
 
 
 # Pydantic models for API
@@ -142,7 +137,7 @@ async def create_dashboard(
         # Convert widgets to JSON-serializable format
         widgets_data = [w.model_dump() for w in dashboard.widgets]
         
-        result = neo4j.query(
+        result = await neo4j.execute_query(
             query,
             {
                 "id": dashboard_id,
@@ -212,7 +207,7 @@ async def list_dashboards(
             ORDER BY d.updated_at DESC
             """
         
-        results = neo4j.query(query, {"owner": owner})
+        results = await neo4j.execute_query(query, {"owner": owner})
         
         dashboards = []
         for record in results:
@@ -256,7 +251,7 @@ async def get_dashboard(dashboard_id: str) -> Dashboard:
         RETURN d
         """
         
-        results = neo4j.query(query, {"id": dashboard_id})
+        results = await neo4j.execute_query(query, {"id": dashboard_id})
         
         if not results:
             raise HTTPException(status_code=404, detail="Dashboard not found")
@@ -302,7 +297,7 @@ async def update_dashboard(
         
         # First check if dashboard exists
         check_query = "MATCH (d:Dashboard {id: $id}) RETURN d"
-        check_results = neo4j.query(check_query, {"id": dashboard_id})
+        check_results = await neo4j.execute_query(check_query, {"id": dashboard_id})
         
         if not check_results:
             raise HTTPException(status_code=404, detail="Dashboard not found")
@@ -340,7 +335,7 @@ async def update_dashboard(
         RETURN d
         """
         
-        results = neo4j.query(query, params)
+        results = await neo4j.execute_query(query, params)
         
         if not results:
             raise HTTPException(status_code=500, detail="Failed to update dashboard")
@@ -385,7 +380,7 @@ async def delete_dashboard(dashboard_id: str) -> None:
         RETURN count(d) as deleted_count
         """
         
-        results = neo4j.query(query, {"id": dashboard_id})
+        results = await neo4j.execute_query(query, {"id": dashboard_id})
         
         if not results or results[0]["deleted_count"] == 0:
             raise HTTPException(status_code=404, detail="Dashboard not found")
@@ -4,11 +4,15 @@ Discovery API endpoints.
 Provides API endpoints for managing automated resource discovery.
 """
 
-from fastapi import APIRouter, HTTPException
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from topdeck.api.dependencies import get_async_neo4j_client
 from topdeck.common.logging_config import get_logger
 from topdeck.common.scheduler import get_scheduler
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 logger = get_logger(__name__)
 
@@ -22,6 +26,7 @@ class DiscoveryStatusResponse(BaseModel):
     last_discovery_time: str | None
     interval_hours: int
     enabled_providers: dict[str, bool]
+    last_change_set: dict[str, Any] | None = None
 
 
 class DiscoveryTriggerResponse(BaseModel):
@@ -58,6 +63,7 @@ async def get_discovery_status() -> DiscoveryStatusResponse:
             last_discovery_time=status["last_discovery_time"],
             interval_hours=status["interval_hours"],
             enabled_providers=status["enabled_providers"],
+            last_change_set=status.get("last_change_set"),
         )
     except Exception as e:
         raise HTTPException(
@@ -99,7 +105,10 @@ class RepositoryScanResponse(BaseModel):
 
 
 @router.post("/scan-repositories", response_model=RepositoryScanResponse)
-async def scan_repositories(scan_all_projects: bool = False) -> RepositoryScanResponse:
+async def scan_repositories(
+    scan_all_projects: bool = False,
+    neo4j_client: AsyncNeo4jClient = Depends(get_async_neo4j_client),
+) -> RepositoryScanResponse:
     """
     Scan Azure DevOps repositories for Service Bus and resource dependencies.
 
@@ -120,7 +129,6 @@ async def scan_repositories(scan_all_projects: bool = False) -> RepositoryScanRe
         from topdeck.common.config import settings
         from topdeck.discovery.azure.devops import AzureDevOpsDiscoverer
         from topdeck.discovery.azure.code_scanner import CodeRepositoryScanner
-        from topdeck.storage.neo4j_client import Neo4jClient
 
         # Validate Azure DevOps configuration
         org_required = settings.azure_devops_organization
@@ -146,15 +154,9 @@ async def scan_repositories(scan_all_projects: bool = False) -> RepositoryScanRe
             )
 
         # Get discovered resources from Neo4j
-        neo4j_client = Neo4jClient(
-            settings.neo4j_uri,
-            settings.neo4j_username,
-            settings.neo4j_password
-        )
-        
-        with neo4j_client.session() as session:
+        async with neo4j_client.session() as session:
             # Get all resources
-            result = session.run(
+            result = await session.run(
                 """
                 MATCH (r:Resource)
                 RETURN r.id as id, r.name as name, r.resource_type as resource_type, 
@@ -168,7 +170,7 @@ async def scan_repositories(scan_all_projects: bool = False) -> RepositoryScanRe
             all_namespaces = set()
             all_topics = set()
             
-            for record in result:
+            async for record in result:
                 # properties might be a dict or JSON string from Neo4j
                 props = record["properties"] if record["properties"] else {}
                 # If it's a string, parse it as JSON
@@ -306,10 +308,10 @@ async def scan_repositories(scan_all_projects: bool = False) -> RepositoryScanRe
         # Store dependencies in Neo4j
         repos_scanned = 0
         if dependencies:
-            with neo4j_client.session() as session:
+            async with neo4j_client.session() as session:
                 for dep in dependencies:
                     # Check if dependency already exists
-                    existing = session.run(
+                    result = await session.run(
                         """
                         MATCH (source:Resource {id: $source_id})
                         MATCH (target:Resource {id: $target_id})
@@ -320,11 +322,12 @@ async def scan_repositories(scan_all_projects: bool = False) -> RepositoryScanRe
                         source_id=dep.source_id,
                         target_id=dep.target_id,
                         method=dep.discovered_method,
-                    ).single()
+                    )
+                    existing = await result.single()
                     
                     if not existing:
                         # Create new dependency
-                        session.run(
+                        result = await session.run(
                             """
                             MATCH (source:Resource {id: $source_id})
                             MATCH (target:Resource {id: $target_id})
@@ -344,6 +347,7 @@ async def scan_repositories(scan_all_projects: bool = False) -> RepositoryScanRe
                             discovered_method=dep.discovered_method,
                             description=dep.description,
                         )
+                        await result.consume()
                         repos_scanned += 1
 
         return RepositoryScanResponse(
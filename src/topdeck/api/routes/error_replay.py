@@ -12,6 +12,7 @@ from typing import Any
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from topdeck.api.dependencies import ServiceContainer, get_service_container
 from topdeck.common.config import settings
 from topdeck.monitoring.error_replay import (
     ErrorReplayService,
@@ -20,7 +21,6 @@ from topdeck.monitoring.error_replay import (
     ErrorSnapshot,
     ErrorSource,
 )
-from topdeck.storage.neo4j_client import Neo4jClient
 
 logger = logging.getLogger(__name__)
 
@@ -112,29 +112,26 @@ class ErrorStatisticsResponse(BaseModel):
     time_range: dict[str, str]
 
 
-# Initialize service (will be done in app startup)
+# Service on the clients of the service container it was built from
 _error_replay_service: ErrorReplayService | None = None
+_error_replay_container: ServiceContainer | None = None
 
 
 def get_error_replay_service() -> ErrorReplayService:
-    """Get or create error replay service instance."""
-    global _error_replay_service
-
-    if _error_replay_service is None:
-        neo4j_client = Neo4jClient(
-            uri=settings.NEO4J_URI,
-            username=settings.NEO4J_USERNAME,
-            password=settings.NEO4J_PASSWORD,
-        )
+    """Get or create error replay service instance on the shared clients."""
+    global _error_replay_service, _error_replay_container
 
+    container = get_service_container()
+    if _error_replay_service is None or _error_replay_container is not container:
         _error_replay_service = ErrorReplayService(
-            neo4j_client=neo4j_client,
-            prometheus_url=settings.PROMETHEUS_URL,
-            loki_url=settings.LOKI_URL,
-            tempo_url=settings.TEMPO_URL,
-            elasticsearch_url=settings.ELASTICSEARCH_URL,
-            azure_workspace_id=settings.AZURE_LOG_ANALYTICS_WORKSPACE_ID,
+            neo4j_client=container.async_neo4j,
+            azure_workspace_id=settings.azure_log_analytics_workspace_id or None,
+            prometheus_collector=container.prometheus(),
+            loki_collector=container.loki(),
+            tempo_collector=container.tempo(),
+            elasticsearch_collector=container.elasticsearch(),
         )
+        _error_replay_container = container
 
     return _error_replay_service
 
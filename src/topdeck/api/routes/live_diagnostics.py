@@ -14,12 +14,14 @@ from pydantic import BaseModel
 
 from topdeck.analysis.prediction.feature_extractor import FeatureExtractor
 from topdeck.analysis.prediction.predictor import Predictor
+from topdeck.api.dependencies import get_service_container
 from topdeck.common.config import settings
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
 from topdeck.monitoring.live_diagnostics import (
+    RESOURCE_IDS_QUERY,
     LiveDiagnosticsService,
 )
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 if TYPE_CHECKING:
     from topdeck.analysis.baseline import BaselineAnalyzer
@@ -95,11 +97,12 @@ class LiveDiagnosticsSnapshotResponse(BaseModel):
     anomalies: list[AnomalyAlertResponse]
     traffic_patterns: list[TrafficPatternResponse]
     failing_dependencies: list[FailingDependencyResponse]
+    incomplete_stages: list[str] = []
+    anomaly_scores: dict[str, float] = {}
 
 
 # Dependency injection helpers
 _prometheus_collector: PrometheusCollector | None = None
-_neo4j_client: Neo4jClient | None = None
 _diagnostics_service: LiveDiagnosticsService | None = None
 
 
@@ -112,16 +115,9 @@ def get_prometheus_collector() -> PrometheusCollector:
     return _prometheus_collector
 
 
-def get_neo4j_client() -> Neo4jClient:
-    """Get Neo4j client instance."""
-    global _neo4j_client
-    if _neo4j_client is None:
-        _neo4j_client = Neo4jClient(
-            uri=settings.get("NEO4J_URI", "bolt://localhost:7687"),
-            username=settings.get("NEO4J_USERNAME", "neo4j"),
-            password=settings.get("NEO4J_PASSWORD", "password"),
-        )
-    return _neo4j_client
+def get_neo4j_client() -> AsyncNeo4jClient:
+    """Get the shared async Neo4j client."""
+    return get_service_container().async_neo4j
 
 
 def get_diagnostics_service() -> LiveDiagnosticsService:
@@ -221,6 +217,8 @@ async def get_live_snapshot(
             failing_dependencies=[
                 FailingDependencyResponse(**fd) for fd in snapshot.failing_dependencies
             ],
+            incomplete_stages=snapshot.incomplete_stages,
+            anomaly_scores=snapshot.anomaly_scores,
         )
 
     except Exception as e:
@@ -327,8 +325,7 @@ async def get_anomalies(
 
         # Get all resources
         neo4j = get_neo4j_client()
-        query = "MATCH (n) WHERE n.id IS NOT NULL RETURN n.id as id LIMIT 1000"
-        results = await neo4j.execute_query(query)
+        results = await neo4j.execute_query(RESOURCE_IDS_QUERY)
         resource_ids = [r["id"] for r in results]
 
         # Detect anomalies
@@ -764,15 +761,22 @@ def get_baseline_analyzer():
 
     if _baseline_analyzer is None:
         from topdeck.analysis.baseline import BaselineAnalyzer
+        from topdeck.analysis.baseline_store import BaselineStore
+        from topdeck.storage.tiered_cache import get_tiered_cache
 
         prometheus = get_prometheus_collector()
         neo4j = get_neo4j_client()
 
+        # Persist baseline aggregates in the shared Redis cache when there is one
+        tiered_cache = get_tiered_cache()
+        shared_cache = tiered_cache.l2 if tiered_cache is not None else None
+
         _baseline_analyzer = BaselineAnalyzer(
             prometheus_collector=prometheus,
             neo4j_client=neo4j,
             baseline_period_days=7,
             anomaly_threshold_stdev=2.0,
+            baseline_store=BaselineStore(cache=shared_cache),
         )
 
     return _baseline_analyzer
@@ -6,6 +6,10 @@ Clients receive instant notifications when:
 - Service health status changes
 - New anomalies are detected
 - Traffic patterns become abnormal
+
+Snapshots are streamed incrementally: each client gets a full snapshot of its
+subscription once and then only what changed, through its own bounded send
+queue.
 """
 
 import asyncio
@@ -18,91 +22,259 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 
 from topdeck.analysis.prediction.feature_extractor import FeatureExtractor
 from topdeck.analysis.prediction.predictor import Predictor
+from topdeck.api.dependencies import get_service_container
 from topdeck.common.config import settings
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
 from topdeck.monitoring.live_diagnostics import LiveDiagnosticsService
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.monitoring.live_diagnostics_delta import (
+    SnapshotView,
+    SubscriptionFilter,
+    diff_views,
+    snapshot_view,
+)
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["live-diagnostics-websocket"])
 
 
+class ClientConnection:
+    """
+    One WebSocket client with its own send queue.
+
+    Messages are queued without waiting and sent by a per-client task, so a
+    slow client never delays the others. When the queue is full, its backlog
+    is dropped and the client is resynced with a full snapshot, since the
+    deltas it missed cannot be replayed.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue_size: int | None = None,
+        send_timeout: float | None = None,
+    ):
+        """
+        Initialize client connection.
+
+        Args:
+            websocket: Accepted WebSocket connection
+            max_queue_size: Messages queued before the backlog is dropped
+                (defaults to settings.live_diagnostics_ws_queue_size)
+            send_timeout: Seconds one send may take before the client is
+                disconnected (defaults to settings.live_diagnostics_ws_send_timeout)
+        """
+        self.websocket = websocket
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+            maxsize=max_queue_size or settings.live_diagnostics_ws_queue_size
+        )
+        self.send_timeout = send_timeout or settings.live_diagnostics_ws_send_timeout
+        self.subscription = SubscriptionFilter()
+        # Last view queued for the client; None until it gets a full snapshot
+        self.view: SnapshotView | None = None
+        self.sequence = 0
+        self.dropped_messages = 0
+        self.resyncs = 0
+        self.closed = False
+        self._sender: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the task sending queued messages."""
+        if self._sender is None:
+            self._sender = asyncio.create_task(self._send_loop())
+
+    async def close(self) -> None:
+        """Stop sending and drop queued messages."""
+        self.closed = True
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+            self._sender = None
+
+    def send(self, message: dict[str, Any]) -> bool:
+        """
+        Queue a message without waiting.
+
+        Args:
+            message: JSON-serializable message
+
+        Returns:
+            True if queued; False if the client is closed or its queue
+            overflowed (the backlog is then dropped and a resync is due)
+        """
+        if self.closed:
+            return False
+        self.sequence += 1
+        try:
+            self.queue.put_nowait({**message, "seq": self.sequence})
+            return True
+        except asyncio.QueueFull:
+            self._drop_backlog()
+            return False
+
+    def publish(self, view: SnapshotView) -> None:
+        """
+        Queue what changed in a snapshot view for this client.
+
+        Args:
+            view: View of the latest snapshot (unfiltered)
+        """
+        filtered = view.filtered(self.subscription)
+        if self.view is None:
+            self.resync(view)
+            return
+        delta = diff_views(self.view, filtered)
+        if delta is None:
+            return
+        if self.send(_message("snapshot_delta", delta)):
+            self.view = filtered
+        else:
+            self.resync(view)
+
+    def resync(self, view: SnapshotView) -> None:
+        """
+        Queue a full snapshot, replacing what the client had.
+
+        Args:
+            view: View of the latest snapshot (unfiltered)
+        """
+        filtered = view.filtered(self.subscription)
+        message = _message("snapshot", filtered.to_message_data())
+        message["subscription"] = self.subscription.to_dict()
+        queued = self.send(message)
+        if not queued and not self.closed:
+            # The overflowing backlog was dropped, so the snapshot fits now
+            queued = self.send(message)
+        if queued:
+            self.view = filtered
+            self.resyncs += 1
+
+    def _drop_backlog(self) -> None:
+        """Drop queued messages; the client needs a full snapshot next."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.dropped_messages += 1
+        self.view = None
+        logger.warning(
+            "WebSocket client too slow, dropped queued messages",
+            extra={"client": self.websocket.client, "dropped": self.dropped_messages},
+        )
+
+    async def _send_loop(self) -> None:
+        """Send queued messages in order until a send fails."""
+        while True:
+            message = await self.queue.get()
+            try:
+                async with asyncio.timeout(self.send_timeout):
+                    await self.websocket.send_json(message)
+            except Exception as e:
+                logger.warning(
+                    "Failed to send message to client",
+                    extra={"error": str(e) or type(e).__name__, "client": self.websocket.client},
+                )
+                self.closed = True
+                try:
+                    await self.websocket.close()
+                except Exception:
+                    # The connection is already gone
+                    pass
+                return
+
+
 class ConnectionManager:
-    """Manages WebSocket connections and broadcasts updates to clients."""
+    """Manages WebSocket connections and fans messages out to client queues."""
 
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
-        self._lock = asyncio.Lock()
+        self.clients: dict[WebSocket, ClientConnection] = {}
+
+    @property
+    def active_connections(self) -> list[WebSocket]:
+        """WebSockets of the connected clients."""
+        return list(self.clients)
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket) -> ClientConnection:
         """Accept a new WebSocket connection."""
         await websocket.accept()
-        async with self._lock:
-            self.active_connections.append(websocket)
-            conn_count = len(self.active_connections)
+        client = ClientConnection(websocket)
+        client.start()
+        self.clients[websocket] = client
         logger.info(
             "WebSocket connected",
             extra={
                 "client": websocket.client,
-                "total_connections": conn_count,
+                "total_connections": len(self.clients),
             },
         )
+        return client
 
     async def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection."""
-        async with self._lock:
-            if websocket in self.active_connections:
-                self.active_connections.remove(websocket)
-            conn_count = len(self.active_connections)
+        client = self.clients.pop(websocket, None)
+        if client is not None:
+            await client.close()
         logger.info(
             "WebSocket disconnected",
             extra={
                 "client": websocket.client,
-                "total_connections": conn_count,
+                "total_connections": len(self.clients),
             },
         )
 
     async def has_connections(self) -> bool:
-        """Check if there are any active connections (thread-safe)."""
-        async with self._lock:
-            return len(self.active_connections) > 0
+        """Check if there are any active connections."""
+        return bool(self.clients)
 
     async def get_connection_count(self) -> int:
-        """Get the number of active connections (thread-safe)."""
-        async with self._lock:
-            return len(self.active_connections)
-
-    async def broadcast(self, message: dict[str, Any]):
-        """Broadcast a message to all connected clients."""
-        async with self._lock:
-            disconnected = []
-            for connection in self.active_connections:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.warning(
-                        "Failed to send message to client",
-                        extra={"error": str(e), "client": connection.client},
-                    )
-                    disconnected.append(connection)
-
-            # Remove failed connections
-            for conn in disconnected:
-                if conn in self.active_connections:
-                    self.active_connections.remove(conn)
+        """Get the number of active connections."""
+        return len(self.clients)
+
+    def get_client(self, websocket: WebSocket) -> ClientConnection | None:
+        """Get the client of a WebSocket connection."""
+        return self.clients.get(websocket)
+
+    async def publish_view(self, view: SnapshotView):
+        """Queue each client's changes in a snapshot view."""
+        for client in list(self.clients.values()):
+            client.publish(view)
+
+    async def broadcast(self, message: dict[str, Any], resource_ids: list[str] | None = None):
+        """
+        Queue a message for all connected clients.
+
+        Args:
+            message: JSON-serializable message
+            resource_ids: Resources the message is about; only clients
+                subscribed to one of them get it (all clients if None)
+        """
+        for client in list(self.clients.values()):
+            if resource_ids is None or client.subscription.matches(
+                resource_ids, client.view.namespaces if client.view else {}
+            ):
+                client.send(message)
 
     async def send_personal_message(self, message: dict[str, Any], websocket: WebSocket):
-        """Send a message to a specific client."""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
+        """Queue a message for a specific client."""
+        client = self.clients.get(websocket)
+        if client is None or not client.send(message):
             logger.warning(
                 "Failed to send personal message",
-                extra={"error": str(e), "client": websocket.client},
+                extra={"client": websocket.client},
             )
 
 
+def _message(message_type: str, data: dict[str, Any]) -> dict[str, Any]:
+    """Build a message of the given type."""
+    return {
+        "type": message_type,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "data": data,
+    }
+
+
 # Global connection manager instance
 manager = ConnectionManager()
 
@@ -115,19 +287,17 @@ class DiagnosticsUpdatePublisher:
         self._running = False
         self._task: asyncio.Task | None = None
         # Initialize service instances once for reuse
-        self._neo4j_client: Neo4jClient | None = None
+        self._neo4j_client: AsyncNeo4jClient | None = None
         self._prometheus: PrometheusCollector | None = None
         self._predictor: Predictor | None = None
         self._service: LiveDiagnosticsService | None = None
+        # View of the latest snapshot, for resyncing clients between updates
+        self.latest_view: SnapshotView | None = None
 
     def _initialize_services(self):
         """Initialize service instances for reuse."""
         if self._service is None:
-            self._neo4j_client = Neo4jClient(
-                uri=settings.neo4j_uri,
-                username=settings.neo4j_username,
-                password=settings.neo4j_password,
-            )
+            self._neo4j_client = get_service_container().async_neo4j
             self._prometheus = PrometheusCollector(settings.prometheus_url)
             self._predictor = Predictor()
             self._service = LiveDiagnosticsService(
@@ -140,8 +310,7 @@ class DiagnosticsUpdatePublisher:
         """Clean up service instances."""
         if self._prometheus and hasattr(self._prometheus, 'close'):
             await self._prometheus.close()
-        if self._neo4j_client:
-            self._neo4j_client.close()
+        # The Neo4j client is shared and closed with the service container
         self._neo4j_client = None
         self._prometheus = None
         self._predictor = None
@@ -197,78 +366,17 @@ class DiagnosticsUpdatePublisher:
                 await asyncio.sleep(interval)
 
     async def _publish_update(self):
-        """Fetch and publish diagnostic updates."""
+        """Fetch a snapshot and queue each client's changes."""
         try:
             # Use initialized service instances
             if self._service is None:
                 self._initialize_services()
 
-            # Get snapshot data
-            snapshot = self._service.get_diagnostics_snapshot(duration_hours=1)
+            snapshot = await self._service.get_live_snapshot(duration_hours=1)
 
-            # Convert to dict for JSON serialization
-            message = {
-                "type": "snapshot_update",
-                "timestamp": datetime.now(UTC).isoformat(),
-                "data": {
-                    "services": [
-                        {
-                            "resource_id": s.resource_id,
-                            "resource_name": s.resource_name,
-                            "resource_type": s.resource_type,
-                            "status": s.status,
-                            "health_score": s.health_score,
-                            "anomalies": s.anomalies,
-                            "metrics": s.metrics,
-                            "last_updated": s.last_updated.isoformat(),
-                        }
-                        for s in snapshot.services
-                    ],
-                    "anomalies": [
-                        {
-                            "alert_id": a.alert_id,
-                            "resource_id": a.resource_id,
-                            "resource_name": a.resource_name,
-                            "severity": a.severity,
-                            "metric_name": a.metric_name,
-                            "current_value": a.current_value,
-                            "expected_value": a.expected_value,
-                            "deviation_percentage": a.deviation_percentage,
-                            "timestamp": a.timestamp.isoformat(),
-                            "description": a.description,
-                        }
-                        for a in snapshot.anomalies
-                    ],
-                    "traffic_patterns": [
-                        {
-                            "source_id": t.source_id,
-                            "target_id": t.target_id,
-                            "request_rate": t.request_rate,
-                            "error_rate": t.error_rate,
-                            "avg_latency_ms": t.avg_latency_ms,
-                            "is_abnormal": t.is_abnormal,
-                            "last_updated": t.last_updated.isoformat(),
-                        }
-                        for t in snapshot.traffic_patterns
-                    ],
-                    "failing_dependencies": [
-                        {
-                            "resource_id": f.resource_id,
-                            "resource_name": f.resource_name,
-                            "dependency_id": f.dependency_id,
-                            "dependency_name": f.dependency_name,
-                            "status": f.status,
-                            "error_message": f.error_message,
-                            "last_error_time": f.last_error_time.isoformat() if f.last_error_time else None,
-                        }
-                        for f in snapshot.failing_dependencies
-                    ],
-                    "overall_health": snapshot.overall_health,
-                    "timestamp": snapshot.timestamp.isoformat(),
-                },
-            }
-
-            await self.manager.broadcast(message)
+            # Serialized once; clients only get the part they subscribed to
+            self.latest_view = snapshot_view(snapshot)
+            await self.manager.publish_view(self.latest_view)
 
         except Exception as e:
             logger.error(
@@ -291,7 +399,7 @@ class DiagnosticsUpdatePublisher:
                 "health_score": health_score,
             },
         }
-        await self.manager.broadcast(message)
+        await self.manager.broadcast(message, resource_ids=[resource_id])
 
     async def publish_anomaly_detected(
         self, resource_id: str, metric_name: str, severity: str, description: str
@@ -307,7 +415,7 @@ class DiagnosticsUpdatePublisher:
                 "description": description,
             },
         }
-        await self.manager.broadcast(message)
+        await self.manager.broadcast(message, resource_ids=[resource_id])
 
     async def publish_traffic_anomaly(
         self, source_id: str, target_id: str, anomaly_type: str, description: str
@@ -323,11 +431,22 @@ class DiagnosticsUpdatePublisher:
                 "description": description,
             },
         }
-        await self.manager.broadcast(message)
+        await self.manager.broadcast(message, resource_ids=[source_id, target_id])
 
-    async def request_snapshot(self):
-        """Request an immediate snapshot update (public method)."""
-        await self._publish_update()
+    async def request_snapshot(self, websocket: WebSocket | None = None):
+        """
+        Send a full snapshot (public method).
+
+        Args:
+            websocket: Client to resync from the latest snapshot; without one,
+                or before the first snapshot, a new snapshot is published
+        """
+        client = self.manager.get_client(websocket) if websocket is not None else None
+        if client is None or self.latest_view is None:
+            await self._publish_update()
+            if client is None or client.view is not None:
+                return
+        client.resync(self.latest_view)
 
 
 # Global publisher instance
@@ -347,7 +466,12 @@ async def websocket_live_diagnostics(
         update_interval: How often to send updates (1-60 seconds)
     
     Message Types Sent:
-        - snapshot_update: Complete diagnostics snapshot
+        - snapshot: Complete diagnostics snapshot for the client's subscription;
+          sent first, after subscription changes and after the client fell
+          too far behind
+        - snapshot_delta: Per section ("services", "anomalies",
+          "traffic_patterns", "failing_dependencies") the "upserted" items and
+          "removed" item keys since the previous message
         - health_change: Service health status changed
         - anomaly_detected: New anomaly detected
         - traffic_anomaly: Traffic pattern anomaly detected
@@ -355,15 +479,19 @@ async def websocket_live_diagnostics(
         - error: Error message
     
     Message Types Received:
-        - subscribe: Subscribe to specific resources
-        - unsubscribe: Unsubscribe from resources
+        - subscribe: Subscribe to "resource_ids" and/or "namespaces"
+          (all resources while there is no subscription)
+        - unsubscribe: Unsubscribe from resources or namespaces
         - get_snapshot: Request immediate snapshot
         - ping: Client ping (respond with pong)
     
+    Every message carries a per-client "seq" number; a gap means queued
+    messages were dropped and a full snapshot follows.
+    
     Example:
         ws://localhost:8000/api/v1/ws/live-diagnostics?update_interval=10
     """
-    await manager.connect(websocket)
+    client = await manager.connect(websocket)
     
     try:
         # Start publisher if not already running (using public method)
@@ -380,6 +508,8 @@ async def websocket_live_diagnostics(
             },
             websocket,
         )
+        if publisher.latest_view is not None:
+            client.resync(publisher.latest_view)
         
         # Handle incoming messages
         while True:
@@ -401,40 +531,34 @@ async def websocket_live_diagnostics(
                     )
                 
                 elif message_type == "get_snapshot":
-                    # Send immediate snapshot using public method
-                    await publisher.request_snapshot()
-                
-                elif message_type == "subscribe":
-                    # Future: Implement resource-specific subscriptions
-                    resource_ids = message.get("resource_ids", [])
-                    logger.info(
-                        "Client subscribed to resources",
-                        extra={"resource_ids": resource_ids},
-                    )
-                    await manager.send_personal_message(
-                        {
-                            "type": "subscribed",
-                            "timestamp": datetime.now(UTC).isoformat(),
-                            "resource_ids": resource_ids,
-                        },
-                        websocket,
-                    )
+                    # Send a full snapshot to this client using public method
+                    await publisher.request_snapshot(websocket)
                 
-                elif message_type == "unsubscribe":
-                    # Future: Implement resource-specific unsubscriptions
+                elif message_type in ("subscribe", "unsubscribe"):
                     resource_ids = message.get("resource_ids", [])
+                    namespaces = message.get("namespaces", [])
+                    if message_type == "subscribe":
+                        client.subscription.add(resource_ids, namespaces)
+                    else:
+                        client.subscription.remove(resource_ids, namespaces)
                     logger.info(
-                        "Client unsubscribed from resources",
-                        extra={"resource_ids": resource_ids},
+                        f"Client {message_type}d",
+                        extra={"resource_ids": resource_ids, "namespaces": namespaces},
                     )
                     await manager.send_personal_message(
                         {
-                            "type": "unsubscribed",
+                            "type": f"{message_type}d",
                             "timestamp": datetime.now(UTC).isoformat(),
                             "resource_ids": resource_ids,
+                            "namespaces": namespaces,
+                            "subscription": client.subscription.to_dict(),
                         },
                         websocket,
                     )
+                    # The client's view changed shape, so deltas start over
+                    client.view = None
+                    if publisher.latest_view is not None:
+                        client.resync(publisher.latest_view)
                 
                 else:
                     logger.warning(
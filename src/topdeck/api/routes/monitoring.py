@@ -10,17 +10,23 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
 import httpx
 
+from topdeck.api.dependencies import (
+    ServiceContainer,
+    get_container,
+    get_loki_collector,
+    get_prometheus_collector,
+    get_tempo_collector,
+)
 from topdeck.common.config import settings
 from topdeck.monitoring.collectors.loki import LokiCollector
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
 from topdeck.monitoring.collectors.tempo import TempoCollector
 from topdeck.monitoring.transaction_flow import TransactionFlowService
-from topdeck.storage.neo4j_client import Neo4jClient
 
 logger = logging.getLogger(__name__)
 
@@ -170,6 +176,7 @@ async def get_resource_metrics(
     resource_id: str,
     resource_type: str = Query(..., description="Type of resource (pod, service, database, etc.)"),
     duration_hours: int = Query(1, ge=1, le=24, description="Duration in hours to query"),
+    collector: PrometheusCollector | None = Depends(get_prometheus_collector),
 ) -> ResourceMetricsResponse:
     """
     Get metrics for a specific resource from Prometheus.
@@ -184,38 +191,33 @@ async def get_resource_metrics(
         )
 
     try:
-        collector = PrometheusCollector(settings.prometheus_url)
-
-        try:
-            metrics = await collector.get_resource_metrics(
-                resource_id=resource_id,
-                resource_type=resource_type,
-                duration=timedelta(hours=duration_hours),
-            )
+        metrics = await collector.get_resource_metrics(
+            resource_id=resource_id,
+            resource_type=resource_type,
+            duration=timedelta(hours=duration_hours),
+        )
 
-            return ResourceMetricsResponse(
-                resource_id=metrics.resource_id,
-                resource_type=metrics.resource_type,
-                metrics={
-                    name: MetricSeriesResponse(
-                        metric_name=series.metric_name,
-                        labels=series.labels,
-                        values=[
-                            MetricValueResponse(
-                                timestamp=v.timestamp,
-                                value=v.value,
-                                labels=v.labels,
-                            )
-                            for v in series.values
-                        ],
-                    )
-                    for name, series in metrics.metrics.items()
-                },
-                anomalies=metrics.anomalies,
-                health_score=metrics.health_score,
-            )
-        finally:
-            await collector.close()
+        return ResourceMetricsResponse(
+            resource_id=metrics.resource_id,
+            resource_type=metrics.resource_type,
+            metrics={
+                name: MetricSeriesResponse(
+                    metric_name=series.metric_name,
+                    labels=series.labels,
+                    values=[
+                        MetricValueResponse(
+                            timestamp=v.timestamp,
+                            value=v.value,
+                            labels=v.labels,
+                        )
+                        for v in series.values
+                    ],
+                )
+                for name, series in metrics.metrics.items()
+            },
+            anomalies=metrics.anomalies,
+            health_score=metrics.health_score,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get metrics: {str(e)}") from e
 
@@ -223,6 +225,7 @@ async def get_resource_metrics(
 @router.get("/flows/bottlenecks", response_model=list[BottleneckResponse])
 async def detect_flow_bottlenecks(
     flow_path: list[str] = Query(..., description="List of resource IDs in the flow path"),
+    collector: PrometheusCollector | None = Depends(get_prometheus_collector),
 ) -> list[BottleneckResponse]:
     """
     Detect bottlenecks in a data flow.
@@ -238,22 +241,17 @@ async def detect_flow_bottlenecks(
         )
 
     try:
-        collector = PrometheusCollector(settings.prometheus_url)
-
-        try:
-            bottlenecks = await collector.detect_bottlenecks(flow_path)
-
-            return [
-                BottleneckResponse(
-                    resource_id=b["resource_id"],
-                    type=b["type"],
-                    severity=b["severity"],
-                    details=b["details"],
-                )
-                for b in bottlenecks
-            ]
-        finally:
-            await collector.close()
+        bottlenecks = await collector.detect_bottlenecks(flow_path)
+
+        return [
+            BottleneckResponse(
+                resource_id=b["resource_id"],
+                type=b["type"],
+                severity=b["severity"],
+                details=b["details"],
+            )
+            for b in bottlenecks
+        ]
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to detect bottlenecks: {str(e)}"
@@ -264,6 +262,7 @@ async def detect_flow_bottlenecks(
 async def get_resource_errors(
     resource_id: str,
     duration_hours: int = Query(1, ge=1, le=24, description="Duration in hours to analyze"),
+    collector: LokiCollector | None = Depends(get_loki_collector),
 ) -> ErrorAnalysisResponse:
     """
     Get error analysis for a specific resource from Loki logs.
@@ -278,30 +277,25 @@ async def get_resource_errors(
         )
 
     try:
-        collector = LokiCollector(settings.loki_url)
-
-        try:
-            analysis = await collector.analyze_errors(
-                resource_id=resource_id, duration=timedelta(hours=duration_hours)
-            )
+        analysis = await collector.analyze_errors(
+            resource_id=resource_id, duration=timedelta(hours=duration_hours)
+        )
 
-            return ErrorAnalysisResponse(
-                resource_id=analysis.resource_id,
-                error_count=analysis.error_count,
-                error_types=analysis.error_types,
-                recent_errors=[
-                    LogEntryResponse(
-                        timestamp=e.timestamp,
-                        message=e.message,
-                        labels=e.labels,
-                        level=e.level,
-                    )
-                    for e in analysis.recent_errors
-                ],
-                error_rate=analysis.error_rate,
-            )
-        finally:
-            await collector.close()
+        return ErrorAnalysisResponse(
+            resource_id=analysis.resource_id,
+            error_count=analysis.error_count,
+            error_types=analysis.error_types,
+            recent_errors=[
+                LogEntryResponse(
+                    timestamp=e.timestamp,
+                    message=e.message,
+                    labels=e.labels,
+                    level=e.level,
+                )
+                for e in analysis.recent_errors
+            ],
+            error_rate=analysis.error_rate,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze errors: {str(e)}") from e
 
@@ -311,6 +305,7 @@ async def find_flow_failure_point(
     flow_id: str,
     flow_path: list[str] = Query(..., description="List of resource IDs in the flow path"),
     duration_minutes: int = Query(30, ge=5, le=120, description="Duration in minutes to analyze"),
+    collector: LokiCollector | None = Depends(get_loki_collector),
 ) -> FailurePointResponse | None:
     """
     Find the failure point in a data flow.
@@ -327,25 +322,20 @@ async def find_flow_failure_point(
         )
 
     try:
-        collector = LokiCollector(settings.loki_url)
-
-        try:
-            failure = await collector.find_failure_point(
-                flow_path=flow_path, duration=timedelta(minutes=duration_minutes)
-            )
+        failure = await collector.find_failure_point(
+            flow_path=flow_path, duration=timedelta(minutes=duration_minutes)
+        )
 
-            if not failure:
-                return None
+        if not failure:
+            return None
 
-            return FailurePointResponse(
-                resource_id=failure["resource_id"],
-                error_rate=failure["error_rate"],
-                error_count=failure["error_count"],
-                error_types=failure["error_types"],
-                recent_errors=failure["recent_errors"],
-            )
-        finally:
-            await collector.close()
+        return FailurePointResponse(
+            resource_id=failure["resource_id"],
+            error_rate=failure["error_rate"],
+            error_count=failure["error_count"],
+            error_types=failure["error_types"],
+            recent_errors=failure["recent_errors"],
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to find failure point: {str(e)}"
@@ -357,6 +347,7 @@ async def get_resource_correlation_ids(
     resource_id: str,
     duration_hours: int = Query(1, ge=1, le=24, description="Duration in hours to search"),
     limit: int = Query(50, ge=1, le=200, description="Maximum number of correlation IDs"),
+    container: ServiceContainer = Depends(get_container),
 ) -> list[str]:
     """
     Get correlation/transaction IDs for a specific resource (pod).
@@ -373,37 +364,29 @@ async def get_resource_correlation_ids(
         )
 
     try:
-        neo4j_client = Neo4jClient(
-            uri=settings.neo4j_uri,
-            username=settings.neo4j_username,
-            password=settings.neo4j_password,
+        service = TransactionFlowService(
+            neo4j_client=container.async_neo4j,
+            loki_url=settings.loki_url if settings.loki_url else None,
+            prometheus_url=settings.prometheus_url if settings.prometheus_url else None,
+            azure_workspace_id=getattr(settings, "azure_log_analytics_workspace_id", None)
+            or None,
+            loki_collector=container.loki(),
+            prometheus_collector=container.prometheus(),
         )
-        neo4j_client.connect()
 
-        try:
-            service = TransactionFlowService(
-                neo4j_client=neo4j_client,
-                loki_url=settings.loki_url if settings.loki_url else None,
-                prometheus_url=settings.prometheus_url if settings.prometheus_url else None,
-                azure_workspace_id=getattr(settings, "azure_log_analytics_workspace_id", None)
-                or None,
-            )
+        correlation_ids = await service.find_correlation_ids_for_pod(
+            pod_resource_id=resource_id,
+            duration=timedelta(hours=duration_hours),
+            limit=limit,
+        )
 
-            correlation_ids = await service.find_correlation_ids_for_pod(
-                pod_resource_id=resource_id,
-                duration=timedelta(hours=duration_hours),
-                limit=limit,
+        if not correlation_ids:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No correlation IDs found for resource {resource_id} in the specified time range",
             )
 
-            if not correlation_ids:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No correlation IDs found for resource {resource_id} in the specified time range",
-                )
-
-            return correlation_ids
-        finally:
-            neo4j_client.close()
+        return correlation_ids
     except HTTPException:
         raise
     except Exception as e:
@@ -422,6 +405,7 @@ async def trace_transaction_flow(
         description="Data source to use for tracing",
     ),
     enrich: bool = Query(True, description="Enrich with topology and metrics data"),
+    container: ServiceContainer = Depends(get_container),
 ) -> TransactionFlowResponse:
     """
     Trace a transaction through the network using correlation ID.
@@ -459,78 +443,70 @@ async def trace_transaction_flow(
         )
 
     try:
-        neo4j_client = Neo4jClient(
-            uri=settings.neo4j_uri,
-            username=settings.neo4j_username,
-            password=settings.neo4j_password,
+        service = TransactionFlowService(
+            neo4j_client=container.async_neo4j,
+            loki_url=settings.loki_url if loki_configured else None,
+            prometheus_url=settings.prometheus_url if settings.prometheus_url else None,
+            azure_workspace_id=(
+                getattr(settings, "azure_log_analytics_workspace_id", None)
+                if azure_configured
+                else None
+            ),
+            loki_collector=container.loki() if loki_configured else None,
+            prometheus_collector=container.prometheus(),
         )
-        neo4j_client.connect()
 
-        try:
-            service = TransactionFlowService(
-                neo4j_client=neo4j_client,
-                loki_url=settings.loki_url if loki_configured else None,
-                prometheus_url=settings.prometheus_url if settings.prometheus_url else None,
-                azure_workspace_id=(
-                    getattr(settings, "azure_log_analytics_workspace_id", None)
-                    if azure_configured
-                    else None
-                ),
+        if enrich:
+            flow = await service.get_flow_with_enrichment(
+                correlation_id=correlation_id,
+                duration=timedelta(hours=duration_hours),
+            )
+        else:
+            flow = await service.trace_transaction(
+                correlation_id=correlation_id,
+                duration=timedelta(hours=duration_hours),
+                source=source,
             )
 
-            if enrich:
-                flow = await service.get_flow_with_enrichment(
-                    correlation_id=correlation_id,
-                    duration=timedelta(hours=duration_hours),
-                )
-            else:
-                flow = await service.trace_transaction(
-                    correlation_id=correlation_id,
-                    duration=timedelta(hours=duration_hours),
-                    source=source,
-                )
+        if not flow:
+            raise HTTPException(
+                status_code=404, detail=f"No flow found for correlation ID: {correlation_id}"
+            )
 
-            if not flow:
-                raise HTTPException(
-                    status_code=404, detail=f"No flow found for correlation ID: {correlation_id}"
+        return TransactionFlowResponse(
+            transaction_id=flow.transaction_id,
+            start_time=flow.start_time,
+            end_time=flow.end_time,
+            total_duration_ms=flow.total_duration_ms,
+            nodes=[
+                FlowNodeResponse(
+                    resource_id=node.resource_id,
+                    resource_name=node.resource_name,
+                    resource_type=node.resource_type,
+                    timestamp=node.timestamp,
+                    duration_ms=node.duration_ms,
+                    status=node.status,
+                    log_count=len(node.log_entries),
+                    metrics=node.metrics,
                 )
-
-            return TransactionFlowResponse(
-                transaction_id=flow.transaction_id,
-                start_time=flow.start_time,
-                end_time=flow.end_time,
-                total_duration_ms=flow.total_duration_ms,
-                nodes=[
-                    FlowNodeResponse(
-                        resource_id=node.resource_id,
-                        resource_name=node.resource_name,
-                        resource_type=node.resource_type,
-                        timestamp=node.timestamp,
-                        duration_ms=node.duration_ms,
-                        status=node.status,
-                        log_count=len(node.log_entries),
-                        metrics=node.metrics,
-                    )
-                    for node in flow.nodes
-                ],
-                edges=[
-                    FlowEdgeResponse(
-                        source_id=edge.source_id,
-                        target_id=edge.target_id,
-                        protocol=edge.protocol,
-                        duration_ms=edge.duration_ms,
-                        status_code=edge.status_code,
-                    )
-                    for edge in flow.edges
-                ],
-                status=flow.status,
-                error_count=flow.error_count,
-                warning_count=flow.warning_count,
-                source=flow.source,
-                metadata=flow.metadata,
-            )
-        finally:
-            neo4j_client.close()
+                for node in flow.nodes
+            ],
+            edges=[
+                FlowEdgeResponse(
+                    source_id=edge.source_id,
+                    target_id=edge.target_id,
+                    protocol=edge.protocol,
+                    duration_ms=edge.duration_ms,
+                    status_code=edge.status_code,
+                )
+                for edge in flow.edges
+            ],
+            status=flow.status,
+            error_count=flow.error_count,
+            warning_count=flow.warning_count,
+            source=flow.source,
+            metadata=flow.metadata,
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -538,7 +514,10 @@ async def trace_transaction_flow(
 
 
 @router.get("/traces/{trace_id}", response_model=TraceResponse)
-async def get_trace(trace_id: str) -> TraceResponse:
+async def get_trace(
+    trace_id: str,
+    collector: TempoCollector | None = Depends(get_tempo_collector),
+) -> TraceResponse:
     """
     Get a distributed trace by ID from Tempo.
 
@@ -556,42 +535,37 @@ async def get_trace(trace_id: str) -> TraceResponse:
         )
 
     try:
-        collector = TempoCollector(settings.tempo_url)
+        trace = await collector.get_trace(trace_id)
 
-        try:
-            trace = await collector.get_trace(trace_id)
+        if not trace:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Trace not found: {trace_id}",
+            )
 
-            if not trace:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Trace not found: {trace_id}",
+        return TraceResponse(
+            trace_id=trace.trace_id,
+            spans=[
+                TraceSpanResponse(
+                    trace_id=span.trace_id,
+                    span_id=span.span_id,
+                    parent_span_id=span.parent_span_id,
+                    operation_name=span.operation_name,
+                    service_name=span.service_name,
+                    start_time=span.start_time,
+                    duration_ms=span.duration_ms,
+                    tags=span.tags,
+                    status=span.status,
                 )
-
-            return TraceResponse(
-                trace_id=trace.trace_id,
-                spans=[
-                    TraceSpanResponse(
-                        trace_id=span.trace_id,
-                        span_id=span.span_id,
-                        parent_span_id=span.parent_span_id,
-                        operation_name=span.operation_name,
-                        service_name=span.service_name,
-                        start_time=span.start_time,
-                        duration_ms=span.duration_ms,
-                        tags=span.tags,
-                        status=span.status,
-                    )
-                    for span in trace.spans
-                ],
-                start_time=trace.start_time,
-                end_time=trace.end_time,
-                duration_ms=trace.duration_ms,
-                service_count=trace.service_count,
-                error_count=trace.error_count,
-                root_service=trace.root_service,
-            )
-        finally:
-            await collector.close()
+                for span in trace.spans
+            ],
+            start_time=trace.start_time,
+            end_time=trace.end_time,
+            duration_ms=trace.duration_ms,
+            service_count=trace.service_count,
+            error_count=trace.error_count,
+            root_service=trace.root_service,
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -603,6 +577,7 @@ async def get_resource_traces(
     resource_id: str,
     duration_hours: int = Query(1, ge=1, le=24, description="Duration in hours to search"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of traces"),
+    collector: TempoCollector | None = Depends(get_tempo_collector),
 ) -> list[TraceResponse]:
     """
     Get distributed traces for a specific resource from Tempo.
@@ -621,43 +596,38 @@ async def get_resource_traces(
         )
 
     try:
-        collector = TempoCollector(settings.tempo_url)
+        traces = await collector.find_traces_by_resource(
+            resource_id=resource_id,
+            duration=timedelta(hours=duration_hours),
+            limit=limit,
+        )
 
-        try:
-            traces = await collector.find_traces_by_resource(
-                resource_id=resource_id,
-                duration=timedelta(hours=duration_hours),
-                limit=limit,
+        return [
+            TraceResponse(
+                trace_id=trace.trace_id,
+                spans=[
+                    TraceSpanResponse(
+                        trace_id=span.trace_id,
+                        span_id=span.span_id,
+                        parent_span_id=span.parent_span_id,
+                        operation_name=span.operation_name,
+                        service_name=span.service_name,
+                        start_time=span.start_time,
+                        duration_ms=span.duration_ms,
+                        tags=span.tags,
+                        status=span.status,
+                    )
+                    for span in trace.spans
+                ],
+                start_time=trace.start_time,
+                end_time=trace.end_time,
+                duration_ms=trace.duration_ms,
+                service_count=trace.service_count,
+                error_count=trace.error_count,
+                root_service=trace.root_service,
             )
-
-            return [
-                TraceResponse(
-                    trace_id=trace.trace_id,
-                    spans=[
-                        TraceSpanResponse(
-                            trace_id=span.trace_id,
-                            span_id=span.span_id,
-                            parent_span_id=span.parent_span_id,
-                            operation_name=span.operation_name,
-                            service_name=span.service_name,
-                            start_time=span.start_time,
-                            duration_ms=span.duration_ms,
-                            tags=span.tags,
-                            status=span.status,
-                        )
-                        for span in trace.spans
-                    ],
-                    start_time=trace.start_time,
-                    end_time=trace.end_time,
-                    duration_ms=trace.duration_ms,
-                    service_count=trace.service_count,
-                    error_count=trace.error_count,
-                    root_service=trace.root_service,
-                )
-                for trace in traces
-            ]
-        finally:
-            await collector.close()
+            for trace in traces
+        ]
     except HTTPException:
         raise
     except Exception as e:
@@ -667,7 +637,9 @@ async def get_resource_traces(
 
 
 @router.get("/health", response_model=dict[str, Any])
-async def get_monitoring_health() -> dict[str, Any]:
+async def get_monitoring_health(
+    container: ServiceContainer = Depends(get_container),
+) -> dict[str, Any]:
     """
     Get health status of monitoring integrations.
 
@@ -686,7 +658,7 @@ async def get_monitoring_health() -> dict[str, Any]:
     # Check Prometheus (only if configured)
     if settings.prometheus_url:
         try:
-            collector = PrometheusCollector(settings.prometheus_url)
+            collector = container.prometheus()
             try:
                 # Try a simple query to check connectivity
                 await collector.query("up")
@@ -701,7 +673,7 @@ async def get_monitoring_health() -> dict[str, Any]:
     # Check Tempo (only if configured)
     if settings.tempo_url:
         try:
-            collector = TempoCollector(settings.tempo_url)
+            collector = container.tempo()
             try:
                 # Try multiple health check endpoints for compatibility
                 # Different Tempo versions expose different endpoints
@@ -724,7 +696,7 @@ async def get_monitoring_health() -> dict[str, Any]:
     # Check Loki (only if configured)
     if settings.loki_url:
         try:
-            collector = LokiCollector(settings.loki_url)
+            collector = container.loki()
             try:
                 # Try a simple query to check connectivity
                 await collector.query('{job="test"}', limit=1)
@@ -764,21 +736,7 @@ async def get_monitoring_health() -> dict[str, Any]:
     elasticsearch_url = getattr(settings, "elasticsearch_url", None)
     if elasticsearch_url:
         try:
-            from topdeck.monitoring.collectors.elasticsearch import ElasticsearchCollector
-
-            # Get optional auth settings
-            es_username = getattr(settings, "elasticsearch_username", None)
-            es_password = getattr(settings, "elasticsearch_password", None)
-            es_api_key = getattr(settings, "elasticsearch_api_key", None)
-            es_index = getattr(settings, "elasticsearch_index_pattern", "logs-*")
-
-            collector = ElasticsearchCollector(
-                url=elasticsearch_url,
-                index_pattern=es_index,
-                username=es_username,
-                password=es_password,
-                api_key=es_api_key,
-            )
+            collector = container.elasticsearch()
             try:
                 # Try a simple search to check connectivity (lightweight query)
                 await collector.search({"size": 1, "query": {"match_all": {}}})
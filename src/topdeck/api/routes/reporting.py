@@ -12,13 +12,14 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
-from topdeck.common.config import settings
+from topdeck.api.dependencies import get_async_neo4j_client, get_neo4j_client
 from topdeck.reporting import (
     ReportFormat,
     ReportingService,
     ReportType,
 )
 from topdeck.reporting.models import ReportConfig
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 from topdeck.storage.neo4j_client import Neo4jClient
 
 logger = logging.getLogger(__name__)
@@ -65,31 +66,18 @@ class ReportListResponse(BaseModel):
     page_size: int
 
 
-# Dependency for Neo4j client
-def get_neo4j_client():
-    """Get Neo4j client instance with proper lifecycle management."""
-    client = Neo4jClient(
-        uri=settings.NEO4J_URI,
-        username=settings.NEO4J_USERNAME,
-        password=settings.NEO4J_PASSWORD,
-    )
-    try:
-        yield client
-    finally:
-        client.close()
-
-
 # Dependency for reporting service
 def get_reporting_service(neo4j_client: Neo4jClient = Depends(get_neo4j_client)) -> ReportingService:
     """Get reporting service instance."""
     return ReportingService(neo4j_client)
 
 
-# API Endpoints
+# API Endpoints. Handlers calling the synchronous reporting service are plain
+# functions, which FastAPI runs in its threadpool off the event loop.
 
 
 @router.post("/generate", response_model=None)
-async def generate_report(
+def generate_report(
     request: GenerateReportRequest,
     reporting_service: ReportingService = Depends(get_reporting_service),
 ) -> Response | dict[str, Any]:
@@ -207,7 +195,7 @@ async def get_report_formats() -> list[str]:
 
 
 @router.post("/resource/{resource_id}", response_model=None)
-async def generate_resource_report(
+def generate_resource_report(
     resource_id: str,
     reporting_service: ReportingService = Depends(get_reporting_service),
     report_type: ReportType = Query(
@@ -278,7 +266,9 @@ async def generate_resource_report(
 
 
 @router.get("/health")
-async def health_check(neo4j_client: Neo4jClient = Depends(get_neo4j_client)) -> dict[str, str]:
+async def health_check(
+    neo4j_client: AsyncNeo4jClient = Depends(get_async_neo4j_client),
+) -> dict[str, str]:
     """
     Health check endpoint for the reporting service.
 
@@ -287,7 +277,7 @@ async def health_check(neo4j_client: Neo4jClient = Depends(get_neo4j_client)) ->
     """
     try:
         # Test Neo4j connection
-        neo4j_client.execute_query("RETURN 1", {})
+        await neo4j_client.execute_query("RETURN 1", {})
         return {"status": "healthy", "service": "reporting"}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
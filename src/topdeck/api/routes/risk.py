@@ -7,11 +7,15 @@ failure simulation, and single point of failure detection.
 
 import logging
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from topdeck.analysis.risk import (
+    BatchRiskEngine,
     RiskAnalyzer,
+    RiskAssessment,
+    RiskLevel,
 )
 from topdeck.common.config import settings
 from topdeck.storage.neo4j_client import Neo4jClient
@@ -188,16 +192,18 @@ class WhatIfAnalysisResponse(BaseModel):
     rollback_steps: list[str]
 
 
-# Create router
+# Create router. Handlers calling the synchronous Neo4j client are plain
+# functions, which FastAPI runs in its threadpool off the event loop.
 router = APIRouter(prefix="/api/v1/risk", tags=["risk"])
 
 
 def get_risk_analyzer() -> RiskAnalyzer:
-    """Get risk analyzer instance with shared Neo4j client."""
+    """Get risk analyzer instance with shared Neo4j client and graph snapshot."""
+    from topdeck.analysis.graph_snapshot import get_graph_snapshot
     from topdeck.storage import get_neo4j_client
 
     neo4j_client = get_neo4j_client()
-    return RiskAnalyzer(neo4j_client)
+    return RiskAnalyzer(neo4j_client, graph_snapshot=get_graph_snapshot())
 
 
 def convert_categorized_resources(resources: list) -> list[CategorizedResourceResponse]:
@@ -226,59 +232,149 @@ def convert_categorized_resources(resources: list) -> list[CategorizedResourceRe
     ]
 
 
+def get_batch_risk_engine() -> BatchRiskEngine:
+    """Get batch risk engine instance with shared Neo4j client and graph snapshot."""
+    from topdeck.analysis.graph_snapshot import get_graph_snapshot
+    from topdeck.storage import get_neo4j_client
+
+    return BatchRiskEngine(get_neo4j_client(), graph_snapshot=get_graph_snapshot())
+
+
+def convert_risk_assessment(assessment: RiskAssessment) -> RiskAssessmentResponse:
+    """
+    Convert a RiskAssessment to API response format.
+
+    Args:
+        assessment: Risk assessment to convert
+
+    Returns:
+        RiskAssessmentResponse
+    """
+    return RiskAssessmentResponse(
+        resource_id=assessment.resource_id,
+        resource_name=assessment.resource_name,
+        resource_type=assessment.resource_type,
+        risk_score=assessment.risk_score,
+        risk_level=assessment.risk_level.value,
+        criticality_score=assessment.criticality_score,
+        dependencies_count=assessment.dependencies_count,
+        dependents_count=assessment.dependents_count,
+        blast_radius=assessment.blast_radius,
+        single_point_of_failure=assessment.single_point_of_failure,
+        deployment_failure_rate=assessment.deployment_failure_rate,
+        time_since_last_change=assessment.time_since_last_change,
+        recommendations=assessment.recommendations,
+        factors=assessment.factors,
+        misconfigurations=assessment.misconfigurations,
+        misconfiguration_count=assessment.misconfiguration_count,
+        assessed_at=assessment.assessed_at.isoformat(),
+    )
+
+
+def _assess_all(
+    cloud_provider: str | None,
+    resource_type: str | None,
+    risk_level: str | None,
+    min_score: float | None,
+    offset: int,
+    limit: int | None,
+) -> tuple[list[RiskAssessment], int]:
+    """
+    Run the batch risk engine and apply pagination.
+
+    Returns:
+        Tuple of (page of assessments, total matching assessments)
+
+    Raises:
+        HTTPException: If risk_level is not a valid level
+    """
+    level = None
+    if risk_level is not None:
+        try:
+            level = RiskLevel(risk_level.lower())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid risk_level '{risk_level}'. "
+                f"Must be one of: {', '.join(lvl.value for lvl in RiskLevel)}",
+            ) from e
+
+    assessments = get_batch_risk_engine().assess_all(
+        cloud_provider=cloud_provider,
+        resource_type=resource_type,
+        risk_level=level,
+        min_score=min_score,
+    )
+    end = offset + limit if limit is not None else None
+    return assessments[offset:end], len(assessments)
+
+
 @router.get("/all", response_model=list[RiskAssessmentResponse])
-async def get_all_risk_assessments() -> list[RiskAssessmentResponse]:
+def get_all_risk_assessments(
+    response: Response,
+    cloud_provider: str | None = Query(None, description="Filter by cloud provider"),
+    resource_type: str | None = Query(None, description="Filter by resource type"),
+    risk_level: str | None = Query(None, description="Filter by risk level"),
+    min_score: float | None = Query(None, ge=0, le=100, description="Minimum risk score"),
+    offset: int = Query(0, ge=0, description="Number of assessments to skip"),
+    limit: int | None = Query(None, ge=1, le=10000, description="Maximum assessments to return"),
+) -> list[RiskAssessmentResponse]:
     """
     Get risk assessments for all resources.
-    
-    Returns a list of risk assessments for all resources in the infrastructure.
+
+    Scores the whole graph in one batch (a handful of queries regardless of
+    resource count). Results are ordered by descending risk score; the total
+    number of matches is returned in the X-Total-Count header.
     """
     try:
-        analyzer = get_risk_analyzer()
-        # Get all resources from Neo4j
-        query = """
-        MATCH (r:Resource)
-        RETURN r.id as id
-        """
-        
-        assessments = []
-        with analyzer.neo4j_client.session() as session:
-            result = session.run(query)
-            for record in result:
-                resource_id = record["id"]
-                try:
-                    assessment = analyzer.analyze_resource(resource_id)
-                    assessments.append(RiskAssessmentResponse(
-                        resource_id=assessment.resource_id,
-                        resource_name=assessment.resource_name,
-                        resource_type=assessment.resource_type,
-                        risk_score=assessment.risk_score,
-                        risk_level=assessment.risk_level.value,
-                        criticality_score=assessment.criticality_score,
-                        dependencies_count=assessment.dependencies_count,
-                        dependents_count=assessment.dependents_count,
-                        blast_radius=assessment.blast_radius,
-                        single_point_of_failure=assessment.single_point_of_failure,
-                        deployment_failure_rate=assessment.deployment_failure_rate,
-                        time_since_last_change=assessment.time_since_last_change,
-                        recommendations=assessment.recommendations,
-                        factors=assessment.factors,
-                        misconfigurations=assessment.misconfigurations,
-                        misconfiguration_count=assessment.misconfiguration_count,
-                        assessed_at=assessment.assessed_at.isoformat(),
-                    ))
-                except Exception as e:
-                    # Skip resources that fail to analyze
-                    logger.warning(f"Failed to analyze resource {resource_id}: {str(e)}")
-                    continue
-        
-        return assessments
+        assessments, total = _assess_all(
+            cloud_provider, resource_type, risk_level, min_score, offset, limit
+        )
+        response.headers["X-Total-Count"] = str(total)
+        return [convert_risk_assessment(a) for a in assessments]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get all risk assessments: {str(e)}") from e
+
+
+@router.get("/all/stream")
+def stream_all_risk_assessments(
+    cloud_provider: str | None = Query(None, description="Filter by cloud provider"),
+    resource_type: str | None = Query(None, description="Filter by resource type"),
+    risk_level: str | None = Query(None, description="Filter by risk level"),
+    min_score: float | None = Query(None, ge=0, le=100, description="Minimum risk score"),
+    offset: int = Query(0, ge=0, description="Number of assessments to skip"),
+    limit: int | None = Query(None, ge=1, description="Maximum assessments to return"),
+) -> StreamingResponse:
+    """
+    Stream risk assessments for all resources as NDJSON.
+
+    Same filters and ordering as /all, but emits one JSON object per line so
+    clients can process large graphs incrementally.
+    """
+    try:
+        assessments, total = _assess_all(
+            cloud_provider, resource_type, risk_level, min_score, offset, limit
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get all risk assessments: {str(e)}") from e
 
+    def generate():
+        for assessment in assessments:
+            yield convert_risk_assessment(assessment).model_dump_json() + "\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"X-Total-Count": str(total)},
+    )
+
 
 @router.get("/resources/{resource_id}", response_model=RiskAssessmentResponse)
-async def get_risk_assessment(resource_id: str) -> RiskAssessmentResponse:
+def get_risk_assessment(resource_id: str) -> RiskAssessmentResponse:
     """
     Get complete risk assessment for a resource.
 
@@ -315,7 +411,7 @@ async def get_risk_assessment(resource_id: str) -> RiskAssessmentResponse:
 
 
 @router.get("/blast-radius/{resource_id}", response_model=BlastRadiusResponse)
-async def get_blast_radius(resource_id: str) -> BlastRadiusResponse:
+def get_blast_radius(resource_id: str) -> BlastRadiusResponse:
     """
     Calculate blast radius for a resource failure.
 
@@ -346,7 +442,7 @@ async def get_blast_radius(resource_id: str) -> BlastRadiusResponse:
 
 
 @router.post("/simulate", response_model=FailureSimulationResponse)
-async def simulate_failure(
+def simulate_failure(
     resource_id: str = Query(..., description="Resource ID to simulate failure for"),
     scenario: str = Query("Complete service outage", description="Failure scenario description"),
 ) -> FailureSimulationResponse:
@@ -387,7 +483,7 @@ async def simulate_failure(
 
 
 @router.get("/spof", response_model=list[SinglePointOfFailureResponse])
-async def get_single_points_of_failure() -> list[SinglePointOfFailureResponse]:
+def get_single_points_of_failure() -> list[SinglePointOfFailureResponse]:
     """
     Identify all single points of failure.
 
@@ -415,7 +511,7 @@ async def get_single_points_of_failure() -> list[SinglePointOfFailureResponse]:
 
 
 @router.get("/resources/{resource_id}/score", response_model=dict)
-async def get_change_risk_score(resource_id: str) -> dict:
+def get_change_risk_score(resource_id: str) -> dict:
     """
     Get risk score for deploying changes to a resource.
 
@@ -441,7 +537,7 @@ async def get_change_risk_score(resource_id: str) -> dict:
 @router.get(
     "/resources/{resource_id}/degraded-performance", response_model=PartialFailureScenarioResponse
 )
-async def analyze_degraded_performance(
+def analyze_degraded_performance(
     resource_id: str,
     current_load: float = Query(0.7, ge=0.0, le=1.0, description="Current load factor (0-1)"),
 ) -> PartialFailureScenarioResponse:
@@ -492,7 +588,7 @@ async def analyze_degraded_performance(
 @router.get(
     "/resources/{resource_id}/intermittent-failure", response_model=PartialFailureScenarioResponse
 )
-async def analyze_intermittent_failure(
+def analyze_intermittent_failure(
     resource_id: str,
     failure_frequency: float = Query(
         0.05, ge=0.0, le=1.0, description="Percentage of requests that fail (0-1)"
@@ -545,7 +641,7 @@ async def analyze_intermittent_failure(
 @router.get(
     "/resources/{resource_id}/partial-outage", response_model=PartialFailureScenarioResponse
 )
-async def analyze_partial_outage(
+def analyze_partial_outage(
     resource_id: str,
     affected_zones: str | None = Query(None, description="Comma-separated list of affected zones"),
 ) -> PartialFailureScenarioResponse:
@@ -597,7 +693,7 @@ async def analyze_partial_outage(
 @router.get(
     "/resources/{resource_id}/comprehensive", response_model=ComprehensiveRiskAnalysisResponse
 )
-async def get_comprehensive_risk_analysis(
+def get_comprehensive_risk_analysis(
     resource_id: str,
     project_path: str | None = Query(None, description="Path to project for dependency scanning"),
     current_load: float = Query(0.7, ge=0.0, le=1.0, description="Current load factor (0-1)"),
@@ -714,7 +810,7 @@ async def get_comprehensive_risk_analysis(
 
 
 @router.get("/dependencies/circular")
-async def detect_circular_dependencies(
+def detect_circular_dependencies(
     resource_id: str | None = Query(
         None, description="Specific resource to check, or all if omitted"
     )
@@ -733,12 +829,25 @@ async def detect_circular_dependencies(
     """
     try:
         analyzer = get_risk_analyzer()
-        cycles = analyzer.dependency_analyzer.detect_circular_dependencies(resource_id)
+        components = None
+        truncated = False
+        if resource_id:
+            cycles = analyzer.dependency_analyzer.detect_circular_dependencies(resource_id)
+        else:
+            report = analyzer.dependency_analyzer.analyze_circular_dependencies()
+            cycles = report.cycles
+            truncated = report.truncated
+            components = [
+                {"resources": component, "size": len(component)}
+                for component in report.components
+            ]
 
         return {
             "resource_id": resource_id,
             "circular_dependencies_found": len(cycles),
             "cycles": cycles,
+            "strongly_connected_components": components,
+            "truncated": truncated,
             "severity": "critical" if len(cycles) > 0 else "none",
             "recommendations": (
                 [
@@ -758,7 +867,7 @@ async def detect_circular_dependencies(
 
 
 @router.get("/dependencies/{resource_id}/health")
-async def get_dependency_health(resource_id: str) -> dict:
+def get_dependency_health(resource_id: str) -> dict:
     """
     Get health score for a resource's dependencies.
 
@@ -785,7 +894,7 @@ async def get_dependency_health(resource_id: str) -> dict:
 
 
 @router.get("/compare")
-async def compare_risk_scores(
+def compare_risk_scores(
     resource_ids: str = Query(..., description="Comma-separated list of resource IDs")
 ) -> dict:
     """
@@ -825,7 +934,7 @@ async def compare_risk_scores(
 
 
 @router.get("/cascading-failure/{resource_id}")
-async def analyze_cascading_failure(
+def analyze_cascading_failure(
     resource_id: str,
     initial_probability: float = Query(
         1.0, ge=0.0, le=1.0, description="Initial failure probability (0-1)"
@@ -858,7 +967,7 @@ async def analyze_cascading_failure(
 
 
 @router.get("/resources/{resource_id}/time-aware-risk")
-async def get_time_aware_risk(
+def get_time_aware_risk(
     resource_id: str,
     deployment_time: str | None = Query(None, description="ISO format deployment time (defaults to now)"),
 ) -> dict:
@@ -919,7 +1028,7 @@ async def get_time_aware_risk(
 
 
 @router.get("/resources/{resource_id}/cost-impact")
-async def get_cost_impact(
+def get_cost_impact(
     resource_id: str,
     downtime_hours: float = Query(1.0, ge=0.1, description="Expected downtime in hours"),
     affected_users: int = Query(1000, ge=0, description="Number of affected users"),
@@ -998,7 +1107,7 @@ async def get_cost_impact(
 
 
 @router.post("/resources/{resource_id}/trend-snapshot")
-async def add_risk_snapshot(
+def add_risk_snapshot(
     resource_id: str,
 ) -> dict:
     """
@@ -1051,7 +1160,7 @@ class SnapshotRequest(BaseModel):
 
 
 @router.post("/resources/{resource_id}/analyze-trend")
-async def analyze_risk_trend(
+def analyze_risk_trend(
     resource_id: str,
     request: SnapshotRequest,
 ) -> dict:
@@ -1123,7 +1232,7 @@ async def analyze_risk_trend(
 
 
 @router.get("/resources/{resource_id}/downstream-impact", response_model=DownstreamImpactResponse)
-async def get_downstream_impact(resource_id: str) -> DownstreamImpactResponse:
+def get_downstream_impact(resource_id: str) -> DownstreamImpactResponse:
     """
     Analyze what services and clients will be affected if this resource fails.
 
@@ -1171,7 +1280,7 @@ async def get_downstream_impact(resource_id: str) -> DownstreamImpactResponse:
 @router.get(
     "/resources/{resource_id}/upstream-dependencies", response_model=UpstreamDependencyHealthResponse
 )
-async def get_upstream_dependencies(resource_id: str) -> UpstreamDependencyHealthResponse:
+def get_upstream_dependencies(resource_id: str) -> UpstreamDependencyHealthResponse:
     """
     Analyze what this resource depends on and the health of those dependencies.
 
@@ -1218,7 +1327,7 @@ async def get_upstream_dependencies(resource_id: str) -> UpstreamDependencyHealt
 
 
 @router.get("/resources/{resource_id}/what-if", response_model=WhatIfAnalysisResponse)
-async def get_what_if_analysis(
+def get_what_if_analysis(
     resource_id: str,
     scenario_type: str = Query(
         default="failure",
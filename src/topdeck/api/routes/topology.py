@@ -14,6 +14,8 @@ from topdeck.analysis.topology import (
 )
 from topdeck.common.config import settings
 from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.query_cache import ANY_RELATIONSHIP, label_tag, relationship_tag
+from topdeck.storage.tiered_cache import cached_result
 
 
 # Pydantic models for API responses
@@ -113,16 +115,18 @@ class ResourceAttachmentAnalysisResponse(BaseModel):
     metadata: dict = Field(default_factory=dict)
 
 
-# Create router
+# Create router. Handlers calling the synchronous Neo4j client are plain
+# functions, which FastAPI runs in its threadpool off the event loop.
 router = APIRouter(prefix="/api/v1/topology", tags=["topology"])
 
 
 def get_topology_service() -> TopologyService:
-    """Get topology service instance with shared Neo4j client."""
+    """Get topology service instance with shared Neo4j client and graph snapshot."""
+    from topdeck.analysis.graph_snapshot import get_graph_snapshot
     from topdeck.storage import get_neo4j_client
 
     neo4j_client = get_neo4j_client()
-    return TopologyService(neo4j_client)
+    return TopologyService(neo4j_client, graph_snapshot=get_graph_snapshot())
 
 
 @router.get("", response_model=TopologyGraphResponse)
@@ -140,7 +144,7 @@ async def get_topology(
     network topology. Supports filtering by cloud provider, resource type,
     and region.
     """
-    try:
+    def build() -> dict:
         service = get_topology_service()
         topology = service.get_topology(
             cloud_provider=cloud_provider,
@@ -172,13 +176,23 @@ async def get_topology(
                 for edge in topology.edges
             ],
             metadata=topology.metadata,
+        ).model_dump(mode="json")
+
+    try:
+        # Shared between replicas; dropped whenever any node or relationship is written
+        response = await cached_result(
+            f"topology:{cloud_provider or ''}:{resource_type or ''}:{region or ''}",
+            build,
+            ttl=settings.cache_ttl_topology,
+            tags={label_tag("Node"), relationship_tag(ANY_RELATIONSHIP)},
         )
+        return TopologyGraphResponse(**response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get topology: {str(e)}") from e
 
 
 @router.get("/resources/{resource_id}/dependencies", response_model=ResourceDependenciesResponse)
-async def get_resource_dependencies(
+def get_resource_dependencies(
     resource_id: str,
     depth: int = Query(3, ge=1, le=10, description="Maximum depth to traverse"),
     direction: str = Query(
@@ -263,7 +277,7 @@ async def get_resource_dependencies(
 
 
 @router.get("/flows", response_model=list[DataFlowResponse])
-async def get_data_flows(
+def get_data_flows(
     flow_type: str | None = Query(
         None, description="Filter by flow type (http, https, database, storage, cache, etc.)"
     ),
@@ -335,7 +349,7 @@ async def get_data_flows(
 
 
 @router.get("/resources/{resource_id}/attachments", response_model=list[ResourceAttachmentResponse])
-async def get_resource_attachments(
+def get_resource_attachments(
     resource_id: str,
     direction: str = Query(
         "both",
@@ -378,7 +392,7 @@ async def get_resource_attachments(
 
 
 @router.get("/resources/{resource_id}/chains", response_model=list[DependencyChainResponse])
-async def get_dependency_chains(
+def get_dependency_chains(
     resource_id: str,
     max_depth: int = Query(5, ge=1, le=10, description="Maximum chain depth"),
     direction: str = Query(
@@ -421,7 +435,7 @@ async def get_dependency_chains(
 
 
 @router.get("/resources/{resource_id}/analysis", response_model=ResourceAttachmentAnalysisResponse)
-async def get_attachment_analysis(
+def get_attachment_analysis(
     resource_id: str,
 ) -> ResourceAttachmentAnalysisResponse:
     """
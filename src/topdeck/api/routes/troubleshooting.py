@@ -13,13 +13,10 @@ from datetime import UTC, datetime
 from typing import Any
 
 import structlog
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
-from topdeck.common.config import settings
-from topdeck.monitoring.collectors.loki import LokiCollector
-from topdeck.monitoring.collectors.prometheus import PrometheusCollector
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.api.dependencies import ServiceContainer, get_container
 from topdeck.troubleshooting.dependency_health import (
     DependencyHealthMonitor,
 )
@@ -149,68 +146,34 @@ class DashboardSummaryResponse(BaseModel):
 # ============================================================================
 
 
-def get_log_correlation_engine() -> LogCorrelationEngine:
+def get_log_correlation_engine(
+    container: ServiceContainer = Depends(get_container),
+) -> LogCorrelationEngine:
     """Get the log correlation engine instance."""
-    loki_collector = None
-    if settings.loki_url:
-        loki_collector = LokiCollector(settings.loki_url)
-
-    neo4j_client = None
-    if settings.neo4j_uri:
-        neo4j_client = Neo4jClient(
-            uri=settings.neo4j_uri,
-            user=settings.neo4j_user,
-            password=settings.neo4j_password,
-        )
-
     return LogCorrelationEngine(
-        loki_collector=loki_collector,
-        neo4j_client=neo4j_client,
+        loki_collector=container.loki(),
+        neo4j_client=container.async_neo4j,
     )
 
 
-def get_error_context_aggregator() -> ErrorContextAggregator:
+def get_error_context_aggregator(
+    container: ServiceContainer = Depends(get_container),
+) -> ErrorContextAggregator:
     """Get the error context aggregator instance."""
-    prometheus_collector = None
-    if settings.prometheus_url:
-        prometheus_collector = PrometheusCollector(settings.prometheus_url)
-
-    loki_collector = None
-    if settings.loki_url:
-        loki_collector = LokiCollector(settings.loki_url)
-
-    neo4j_client = None
-    if settings.neo4j_uri:
-        neo4j_client = Neo4jClient(
-            uri=settings.neo4j_uri,
-            user=settings.neo4j_user,
-            password=settings.neo4j_password,
-        )
-
     return ErrorContextAggregator(
-        prometheus_collector=prometheus_collector,
-        loki_collector=loki_collector,
-        neo4j_client=neo4j_client,
+        prometheus_collector=container.prometheus(),
+        loki_collector=container.loki(),
+        neo4j_client=container.async_neo4j,
     )
 
 
-def get_dependency_health_monitor() -> DependencyHealthMonitor:
+def get_dependency_health_monitor(
+    container: ServiceContainer = Depends(get_container),
+) -> DependencyHealthMonitor:
     """Get the dependency health monitor instance."""
-    prometheus_collector = None
-    if settings.prometheus_url:
-        prometheus_collector = PrometheusCollector(settings.prometheus_url)
-
-    neo4j_client = None
-    if settings.neo4j_uri:
-        neo4j_client = Neo4jClient(
-            uri=settings.neo4j_uri,
-            user=settings.neo4j_user,
-            password=settings.neo4j_password,
-        )
-
     return DependencyHealthMonitor(
-        prometheus_collector=prometheus_collector,
-        neo4j_client=neo4j_client,
+        prometheus_collector=container.prometheus(),
+        neo4j_client=container.async_neo4j,
     )
 
 
@@ -228,6 +191,7 @@ def get_dependency_health_monitor() -> DependencyHealthMonitor:
 async def correlate_logs(
     correlation_id: str,
     time_window_minutes: int = Query(default=30, ge=1, le=1440),
+    engine: LogCorrelationEngine = Depends(get_log_correlation_engine),
 ) -> CorrelatedLogsResponse:
     """
     Correlate logs across distributed services using a correlation ID.
@@ -237,7 +201,6 @@ async def correlate_logs(
     reduces that to seconds.
     """
     try:
-        engine = get_log_correlation_engine()
         result = await engine.correlate_by_correlation_id(
             correlation_id=correlation_id,
             time_window_minutes=time_window_minutes,
@@ -267,6 +230,7 @@ async def correlate_logs(
 async def get_error_chain(
     error_id: str,
     depth: int = Query(default=5, ge=1, le=10),
+    engine: LogCorrelationEngine = Depends(get_log_correlation_engine),
 ) -> ErrorChainResponse:
     """
     Trace an error through the dependency chain.
@@ -275,7 +239,6 @@ async def get_error_chain(
     the root cause and all affected services.
     """
     try:
-        engine = get_log_correlation_engine()
         result = await engine.find_error_chain(
             error_id=error_id,
             depth=depth,
@@ -304,6 +267,7 @@ async def get_error_chain(
 async def get_transaction_timeline(
     transaction_id: str,
     time_window_minutes: int = Query(default=30, ge=1, le=1440),
+    engine: LogCorrelationEngine = Depends(get_log_correlation_engine),
 ) -> TransactionTimelineResponse:
     """
     Get a complete timeline of a transaction across services.
@@ -312,7 +276,6 @@ async def get_transaction_timeline(
     different services, making it easy to identify where issues occurred.
     """
     try:
-        engine = get_log_correlation_engine()
         result = await engine.get_transaction_timeline(
             transaction_id=transaction_id,
             time_window_minutes=time_window_minutes,
@@ -344,6 +307,7 @@ async def find_correlation_ids(
     error_pattern: str = Query(..., description="Regex pattern to match error messages"),
     time_window_minutes: int = Query(default=60, ge=1, le=1440),
     limit: int = Query(default=10, ge=1, le=100),
+    engine: LogCorrelationEngine = Depends(get_log_correlation_engine),
 ) -> list[str]:
     """
     Find correlation IDs for errors matching a pattern.
@@ -352,7 +316,6 @@ async def find_correlation_ids(
     but need to find specific instances to investigate.
     """
     try:
-        engine = get_log_correlation_engine()
         return await engine.find_correlation_ids_for_error(
             resource_id=resource_id,
             error_pattern=error_pattern,
@@ -377,6 +340,7 @@ async def find_correlation_ids(
 )
 async def capture_error_context(
     request: CaptureContextRequest,
+    aggregator: ErrorContextAggregator = Depends(get_error_context_aggregator),
 ) -> ErrorContextResponse:
     """
     Capture complete error context for a resource.
@@ -386,8 +350,6 @@ async def capture_error_context(
     context (logs, metrics, traces, topology) in one call.
     """
     try:
-        aggregator = get_error_context_aggregator()
-
         error_time = None
         if request.error_time:
             # Handle various ISO format variations safely
@@ -423,6 +385,7 @@ async def capture_error_context(
 )
 async def get_error_context(
     context_id: str,
+    aggregator: ErrorContextAggregator = Depends(get_error_context_aggregator),
 ) -> ErrorContextResponse:
     """
     Retrieve a previously captured error context.
@@ -431,7 +394,6 @@ async def get_error_context(
     analysis even after the original data has been rotated.
     """
     try:
-        aggregator = get_error_context_aggregator()
         result = await aggregator.get_context(context_id)
 
         if not result:
@@ -455,6 +417,7 @@ async def get_error_context(
 async def get_contexts_by_resource(
     resource_id: str,
     limit: int = Query(default=10, ge=1, le=50),
+    aggregator: ErrorContextAggregator = Depends(get_error_context_aggregator),
 ) -> list[ErrorContextResponse]:
     """
     Get recent error contexts for a resource.
@@ -462,7 +425,6 @@ async def get_contexts_by_resource(
     Useful for reviewing the history of errors for a particular service.
     """
     try:
-        aggregator = get_error_context_aggregator()
         results = await aggregator.get_contexts_by_resource(
             resource_id=resource_id,
             limit=limit,
@@ -487,6 +449,7 @@ async def get_contexts_by_resource(
 )
 async def get_dependency_health(
     resource_id: str,
+    monitor: DependencyHealthMonitor = Depends(get_dependency_health_monitor),
 ) -> DependencyHealthResponse:
     """
     Get comprehensive health status of all dependencies.
@@ -496,7 +459,6 @@ async def get_dependency_health(
     This API provides a complete health view in one call.
     """
     try:
-        monitor = get_dependency_health_monitor()
         result = await monitor.get_dependency_health(resource_id)
 
         response_data = result.to_dict()
@@ -516,6 +478,7 @@ async def get_dependency_timeline(
     resource_id: str,
     dependency_id: str,
     hours: int = Query(default=24, ge=1, le=168),
+    monitor: DependencyHealthMonitor = Depends(get_dependency_health_monitor),
 ) -> DependencyTimelineResponse:
     """
     Get historical health timeline for a dependency.
@@ -524,7 +487,6 @@ async def get_dependency_timeline(
     helping identify patterns and degradation trends.
     """
     try:
-        monitor = get_dependency_health_monitor()
         result = await monitor.get_dependency_timeline(
             resource_id=resource_id,
             dependency_id=dependency_id,
@@ -544,7 +506,9 @@ async def get_dependency_timeline(
     summary="Get dashboard summary",
     description="Get summary for the dependency health dashboard.",
 )
-async def get_dashboard_summary() -> DashboardSummaryResponse:
+async def get_dashboard_summary(
+    monitor: DependencyHealthMonitor = Depends(get_dependency_health_monitor),
+) -> DashboardSummaryResponse:
     """
     Get summary for the dependency health dashboard.
 
@@ -552,7 +516,6 @@ async def get_dashboard_summary() -> DashboardSummaryResponse:
     highlighting critical issues that need attention.
     """
     try:
-        monitor = get_dependency_health_monitor()
         result = await monitor.get_dashboard_summary()
 
         response_data = result.to_dict()
@@ -15,7 +15,8 @@ from topdeck.integration.jira import JiraWebhookHandler
 from topdeck.integration.servicenow import ServiceNowWebhookHandler
 from topdeck.storage.neo4j_client import Neo4jClient
 
-# Create router
+# Create router. Handlers calling the synchronous Neo4j client are plain
+# functions, which FastAPI runs in its threadpool off the event loop.
 router = APIRouter(prefix="/api/v1/webhooks", tags=["webhooks"])
 
 
@@ -36,7 +37,7 @@ def get_change_service() -> ChangeManagementService:
 
 
 @router.post("/servicenow", response_model=WebhookResponse)
-async def servicenow_webhook(
+def servicenow_webhook(
     payload: dict[str, Any],
     x_servicenow_signature: str | None = Header(None),
 ) -> WebhookResponse:
@@ -74,7 +75,7 @@ async def servicenow_webhook(
 
 
 @router.post("/jira", response_model=WebhookResponse)
-async def jira_webhook(
+def jira_webhook(
     payload: dict[str, Any],
     x_hub_signature: str | None = Header(None),
 ) -> WebhookResponse:
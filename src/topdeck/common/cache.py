@@ -3,11 +3,16 @@ Caching layer with Redis backend.
 
 Provides distributed caching for resource discovery results,
 API responses, and other frequently accessed data.
+
+Values are stored in a compact binary form: msgpack when installed,
+otherwise orjson or the standard library JSON encoder. A one-byte header
+records the format so every replica can read values written by the others,
+and plain JSON values written by older versions are still understood.
 """
 
 import json
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from functools import wraps
 from typing import Any
 
@@ -19,8 +24,74 @@ except ImportError:
     REDIS_AVAILABLE = False
     aioredis = None
 
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+_MSGPACK_HEADER = b"\x01"
+_JSON_HEADER = b"\x02"
+
+
+def serialize(value: Any) -> bytes:
+    """
+    Serialize a value for storage in Redis.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        Format header followed by the encoded value
+
+    Raises:
+        TypeError: If the value holds objects other than lists, dicts and
+            scalars (e.g. datetimes), which would not be read back as the
+            same type
+    """
+    if MSGPACK_AVAILABLE:
+        return _MSGPACK_HEADER + msgpack.packb(value, use_bin_type=True)
+    if ORJSON_AVAILABLE:
+        return _JSON_HEADER + orjson.dumps(
+            value, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+    return _JSON_HEADER + json.dumps(value, separators=(",", ":")).encode()
+
+
+def deserialize(data: bytes | str) -> Any:
+    """
+    Deserialize a value read from Redis.
+
+    Args:
+        data: Stored value, with or without a format header
+
+    Returns:
+        Decoded value
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+    header, payload = data[:1], data[1:]
+    if header == _MSGPACK_HEADER:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Value was written with msgpack, which is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    if header == _JSON_HEADER:
+        return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+    # Plain JSON written before values carried a header
+    return json.loads(data)
+
 
 class CacheConfig:
     """Configuration for cache."""
@@ -63,7 +134,8 @@ class Cache:
     """
     Distributed cache using Redis.
 
-    Provides get/set operations with TTL support and JSON serialization.
+    Provides get/set operations with TTL support and binary serialization,
+    tag sets for grouped deletes, and pub/sub for cross-replica messages.
     """
 
     def __init__(self, config: CacheConfig | None = None):
@@ -83,6 +155,11 @@ class Cache:
                 "Install redis package to enable caching."
             )
 
+    @property
+    def enabled(self) -> bool:
+        """Whether Redis is available and, once connect() ran, reachable."""
+        return self._enabled
+
     async def connect(self) -> None:
         """Connect to Redis server with optional SSL/TLS encryption."""
         if not self._enabled:
@@ -94,7 +171,8 @@ class Cache:
                 "port": self.config.port,
                 "db": self.config.db,
                 "password": self.config.password,
-                "decode_responses": True,
+                # Values are binary; see serialize()
+                "decode_responses": False,
             }
 
             # Add SSL parameters if encryption is enabled
@@ -149,7 +227,7 @@ class Cache:
 
             if value is not None:
                 logger.debug(f"Cache hit: {key}")
-                return json.loads(value)
+                return deserialize(value)
 
             logger.debug(f"Cache miss: {key}")
             return None
@@ -169,7 +247,8 @@ class Cache:
 
         Args:
             key: Cache key
-            value: Value to cache (must be JSON serializable)
+            value: Value to cache (lists, dicts and scalars; other values
+                are not cached)
             ttl: Time to live in seconds (uses default if None)
 
         Returns:
@@ -182,12 +261,14 @@ class Cache:
             full_key = self._make_key(key)
             ttl = ttl or self.config.default_ttl
 
-            serialized = json.dumps(value)
-            await self._client.setex(full_key, ttl, serialized)
+            await self._client.setex(full_key, ttl, serialize(value))
 
             logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
             return True
 
+        except TypeError as e:
+            logger.warning(f"Not caching {key}, value cannot be serialized: {e}")
+            return False
         except Exception as e:
             logger.error(f"Error setting cache: {e}")
             return False
@@ -216,6 +297,137 @@ class Cache:
             logger.error(f"Error deleting from cache: {e}")
             return False
 
+    async def set_if_absent(self, key: str, value: Any, ttl: int | None = None) -> bool:
+        """
+        Set a value only if the key does not exist (e.g. to take a lock).
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds (uses default if None)
+
+        Returns:
+            True if the value was set, False if the key existed or on error
+        """
+        if not self._enabled or not self._client:
+            return False
+
+        try:
+            full_key = self._make_key(key)
+            ttl = ttl or self.config.default_ttl
+            return bool(await self._client.set(full_key, serialize(value), ex=ttl, nx=True))
+
+        except Exception as e:
+            logger.error(f"Error setting cache key if absent: {e}")
+            return False
+
+    async def tag_key(self, key: str, tags: Iterable[str], ttl: int | None = None) -> bool:
+        """
+        Record a key under tags so it can be deleted with delete_tagged().
+
+        Each tag is a Redis set of keys that lives at least as long as its
+        longest-lived member.
+
+        Args:
+            key: Cache key
+            tags: Tags to record the key under
+            ttl: TTL of the key in seconds (uses default if None)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        tags = list(tags)
+        if not self._enabled or not self._client or not tags:
+            return False
+
+        try:
+            full_key = self._make_key(key)
+            ttl = ttl or self.config.default_ttl
+            pipeline = self._client.pipeline(transaction=False)
+            for tag in tags:
+                tag_key = self._make_key(f"tag:{tag}")
+                pipeline.sadd(tag_key, full_key)
+                pipeline.expire(tag_key, ttl, nx=True)
+                pipeline.expire(tag_key, ttl, gt=True)
+            await pipeline.execute()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error tagging cache key: {e}")
+            return False
+
+    async def delete_tagged(self, tags: Iterable[str]) -> int:
+        """
+        Delete all keys recorded under any of the given tags.
+
+        Args:
+            tags: Tags to delete
+
+        Returns:
+            Number of keys deleted
+        """
+        if not self._enabled or not self._client:
+            return 0
+
+        try:
+            tag_keys = [self._make_key(f"tag:{tag}") for tag in tags]
+            if not tag_keys:
+                return 0
+            keys = await self._client.sunion(tag_keys)
+            deleted = await self._client.delete(*keys) if keys else 0
+            await self._client.delete(*tag_keys)
+            logger.debug(f"Deleted {deleted} keys for {len(tag_keys)} tags")
+            return deleted
+
+        except Exception as e:
+            logger.error(f"Error deleting tagged keys: {e}")
+            return 0
+
+    async def publish(self, channel: str, message: Any) -> bool:
+        """
+        Publish a message to all subscribers of a channel.
+
+        Args:
+            channel: Channel name (prefixed like keys)
+            message: Message to publish
+
+        Returns:
+            True if published, False otherwise
+        """
+        if not self._enabled or not self._client:
+            return False
+
+        try:
+            await self._client.publish(self._make_key(channel), serialize(message))
+            return True
+
+        except Exception as e:
+            logger.error(f"Error publishing to {channel}: {e}")
+            return False
+
+    async def subscribe(self, channel: str) -> Any | None:
+        """
+        Subscribe to a channel.
+
+        Args:
+            channel: Channel name (prefixed like keys)
+
+        Returns:
+            Redis PubSub object (message data can be read with
+            deserialize()), or None if Redis is unavailable
+        """
+        if not self._enabled or not self._client:
+            return None
+
+        try:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self._make_key(channel))
+            return pubsub
+
+        except Exception as e:
+            logger.error(f"Error subscribing to {channel}: {e}")
+            return None
+
     async def exists(self, key: str) -> bool:
         """
         Check if key exists in cache.
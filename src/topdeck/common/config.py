@@ -28,6 +28,11 @@ class Settings(BaseSettings):
     azure_client_id: str = Field(default="", description="Azure client ID")
     azure_client_secret: str = Field(default="", description="Azure client secret")
     azure_subscription_id: str = Field(default="", description="Azure subscription ID")
+    azure_subscription_ids: str = Field(
+        default="",
+        description="Comma-separated additional Azure subscription IDs, discovered "
+        "concurrently with azure_subscription_id",
+    )
 
     # Azure DevOps Configuration
     azure_devops_organization: str = Field(default="", description="Azure DevOps organization")
@@ -60,6 +65,26 @@ class Settings(BaseSettings):
         default=False,
         description="Enable TLS encryption for Neo4j (auto-upgrades bolt:// to bolt+s://)",
     )
+    neo4j_write_batch_size: int = Field(
+        default=1000,
+        description="Rows per UNWIND batch when persisting discovery results",
+        ge=1,
+    )
+    neo4j_max_transaction_retry_time: float = Field(
+        default=30.0,
+        description="Seconds the driver keeps retrying a failed managed transaction",
+        ge=0,
+    )
+    neo4j_max_connection_pool_size: int = Field(
+        default=50,
+        description="Maximum connections in the application's shared Neo4j driver pool",
+        ge=1,
+    )
+    neo4j_connection_acquisition_timeout: float = Field(
+        default=60.0,
+        description="Seconds to wait for a free connection from the Neo4j pool",
+        gt=0,
+    )
 
     # Redis Configuration
     redis_host: str = Field(default="localhost", description="Redis host")
@@ -90,6 +115,71 @@ class Settings(BaseSettings):
     tempo_url: str = Field(default="", description="Tempo server URL (for distributed tracing)")
     loki_url: str = Field(default="", description="Loki server URL (for logs)")
     grafana_url: str = Field(default="", description="Grafana server URL")
+    http_pool_max_connections: int = Field(
+        default=100,
+        description="Maximum open connections per observability backend HTTP client",
+        ge=1,
+    )
+    http_pool_max_keepalive_connections: int = Field(
+        default=20,
+        description="Idle connections kept alive per observability backend HTTP client",
+        ge=0,
+    )
+    http_pool_keepalive_expiry: float = Field(
+        default=30.0,
+        description="Seconds an idle pooled HTTP connection is kept alive",
+        ge=0,
+    )
+    http_client_timeout: float = Field(
+        default=30.0,
+        description="Request timeout in seconds of the shared observability backend clients",
+        gt=0,
+    )
+    http_client_http2: bool = Field(
+        default=True,
+        description="Use HTTP/2 for observability backends when the h2 package is installed",
+    )
+    live_diagnostics_max_concurrency: int = Field(
+        default=20,
+        description="Maximum concurrent per-service lookups when building a live diagnostics "
+        "snapshot",
+    )
+    live_diagnostics_stage_timeout: float = Field(
+        default=30.0,
+        description="Time budget in seconds for each live diagnostics snapshot stage; "
+        "results that are not ready are left out of the snapshot",
+    )
+    live_diagnostics_anomaly_z_threshold: float = Field(
+        default=3.5,
+        description="Robust z-score against similar resources at which a resource is "
+        "reported as a medium anomaly",
+    )
+    live_diagnostics_anomaly_refit_interval: float = Field(
+        default=3600.0,
+        description="Seconds between refits of the per resource type anomaly models",
+    )
+    live_diagnostics_ws_queue_size: int = Field(
+        default=32,
+        description="Messages queued per live diagnostics WebSocket client before its "
+        "backlog is dropped and it is resynced with a full snapshot",
+    )
+    live_diagnostics_ws_send_timeout: float = Field(
+        default=10.0,
+        description="Seconds a live diagnostics WebSocket send may take before the client "
+        "is disconnected",
+    )
+    error_replay_capture_timeout: float = Field(
+        default=5.0,
+        description="Seconds an error capture waits for its context collectors; slower "
+        "collectors keep enriching the stored snapshot in the background",
+        gt=0,
+    )
+    error_replay_enrichment_timeout: float = Field(
+        default=60.0,
+        description="Seconds background enrichment of a captured error may take before "
+        "the remaining collectors are cancelled",
+        gt=0,
+    )
 
     # Elasticsearch Configuration
     elasticsearch_url: str = Field(default="", description="Elasticsearch server URL")
@@ -132,6 +222,28 @@ class Settings(BaseSettings):
         default=5, description="Number of parallel discovery workers"
     )
     discovery_timeout: int = Field(default=300, description="Discovery timeout in seconds")
+    discovery_incremental_writes: bool = Field(
+        default=True,
+        description="Only write new, changed or deleted resources and dependencies "
+        "(compared by content hash) instead of re-upserting everything each run",
+    )
+    discovery_dependency_profile: bool = Field(
+        default=False,
+        description="Time dependency rule matching per phase and rule, and log where the "
+        "time goes after each discovery run",
+    )
+    azure_discovery_streaming: bool = Field(
+        default=False,
+        description="Write Azure resources to Neo4j in batches while they are listed, "
+        "keeping only a compact index in memory instead of every resource",
+    )
+
+    # Graph Snapshot Configuration
+    enable_graph_snapshot: bool = Field(
+        default=True,
+        description="Keep an in-memory graph snapshot for risk/topology traversals "
+        "(rebuilt after each discovery run)",
+    )
 
     # Cache Configuration
     cache_ttl_resources: int = Field(default=300, description="Cache TTL for resources in seconds")
@@ -139,6 +251,19 @@ class Settings(BaseSettings):
         default=900, description="Cache TTL for risk scores in seconds"
     )
     cache_ttl_topology: int = Field(default=600, description="Cache TTL for topology in seconds")
+    cache_shared_enabled: bool = Field(
+        default=True,
+        description="Share cached query results between API replicas through Redis",
+    )
+    cache_early_refresh_beta: float = Field(
+        default=1.0,
+        description="Probabilistic early refresh factor for shared cache entries "
+        "(0 disables early refresh, higher values refresh earlier)",
+    )
+    cache_lock_timeout_seconds: float = Field(
+        default=5.0,
+        description="Seconds a replica waits for another replica computing the same entry",
+    )
 
     # Logging Configuration
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
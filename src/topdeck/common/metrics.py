@@ -95,6 +95,39 @@ cache_misses_total = Counter(
     ["cache_key_prefix"],
 )
 
+# Alerting metrics
+alert_rule_evaluation_duration_seconds = Histogram(
+    "topdeck_alert_rule_evaluation_duration_seconds",
+    "Alert rule evaluation duration in seconds (excluding the shared snapshot)",
+    ["trigger_type"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+alert_rule_evaluations_total = Counter(
+    "topdeck_alert_rule_evaluations_total",
+    "Total alert rule evaluations",
+    ["trigger_type", "result"],
+)
+
+alert_snapshot_duration_seconds = Histogram(
+    "topdeck_alert_snapshot_duration_seconds",
+    "Duration of the live diagnostics snapshot shared by one alert evaluation tick",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+# Connection pool metrics
+connection_pool_connections = Gauge(
+    "topdeck_connection_pool_connections",
+    "Pooled connections of a shared backend client by state",
+    ["backend", "state"],
+)
+
+connection_pool_max_connections = Gauge(
+    "topdeck_connection_pool_max_connections",
+    "Connection limit of a shared backend client's pool",
+    ["backend"],
+)
+
 
 def get_metrics_handler() -> Response:
     """
@@ -181,6 +214,19 @@ def record_resources_found(cloud_provider: str, resource_type: str, count: int)
     ).set(count)
 
 
+def record_neo4j_query(query_type: str, status: str, duration: float) -> None:
+    """
+    Record a Neo4j query or batch write.
+
+    Args:
+        query_type: Query category (e.g. batch_resources)
+        status: Query status (success, error)
+        duration: Query duration in seconds
+    """
+    neo4j_queries_total.labels(query_type=query_type, status=status).inc()
+    neo4j_query_duration_seconds.labels(query_type=query_type).observe(duration)
+
+
 def record_risk_assessment(resource_type: str, risk_score: float) -> None:
     """
     Record a risk assessment.
@@ -191,3 +237,41 @@ def record_risk_assessment(resource_type: str, risk_score: float) -> None:
     """
     risk_assessments_total.labels(resource_type=resource_type).inc()
     risk_score_distribution.labels(resource_type=resource_type).observe(risk_score)
+
+
+def record_alert_rule_evaluation(trigger_type: str, result: str, duration: float) -> None:
+    """
+    Record the evaluation of one alert rule.
+
+    Args:
+        trigger_type: Rule trigger type
+        result: Evaluation result (triggered, not_triggered, deduplicated, error)
+        duration: Evaluation duration in seconds
+    """
+    alert_rule_evaluations_total.labels(trigger_type=trigger_type, result=result).inc()
+    alert_rule_evaluation_duration_seconds.labels(trigger_type=trigger_type).observe(duration)
+
+
+def record_alert_snapshot(duration: float) -> None:
+    """
+    Record the snapshot fetched for an alert evaluation tick.
+
+    Args:
+        duration: Snapshot duration in seconds
+    """
+    alert_snapshot_duration_seconds.observe(duration)
+
+
+def record_connection_pool(backend: str, in_use: int, idle: int, max_connections: int) -> None:
+    """
+    Record the utilization of a shared connection pool.
+
+    Args:
+        backend: Backend the pool connects to (neo4j, prometheus, ...)
+        in_use: Connections currently serving a request
+        idle: Open connections waiting to be reused
+        max_connections: Connection limit of the pool
+    """
+    connection_pool_connections.labels(backend=backend, state="in_use").set(in_use)
+    connection_pool_connections.labels(backend=backend, state="idle").set(idle)
+    connection_pool_max_connections.labels(backend=backend).set(max_connections)
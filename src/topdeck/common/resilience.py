@@ -60,6 +60,12 @@ class RateLimiter:
             # Record this call
             self.calls.append(now)
 
+    async def refund(self):
+        """Return the most recently acquired call, e.g. when no request was made."""
+        async with self._lock:
+            if self.calls:
+                self.calls.pop()
+
 
 class RetryConfig:
     """Configuration for retry logic."""
@@ -7,12 +7,15 @@ Handles periodic background tasks like automated resource discovery.
 import asyncio
 import logging
 from datetime import datetime
+from typing import Any
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from topdeck.common.config import settings
+from topdeck.discovery.change_set import ChangeSet
 from topdeck.discovery.models import DiscoveryResult
+from topdeck.storage.batch_writer import GraphBatchWriter, StreamingGraphWriter
 from topdeck.storage.neo4j_client import Neo4jClient
 
 logger = logging.getLogger(__name__)
@@ -32,6 +35,7 @@ class DiscoveryScheduler:
         self.neo4j_client: Neo4jClient | None = None
         self.last_discovery_time: datetime | None = None
         self.discovery_in_progress = False
+        self.last_change_set: ChangeSet | None = None
 
     def start(self) -> None:
         """Start the scheduler."""
@@ -42,6 +46,7 @@ class DiscoveryScheduler:
                     uri=settings.neo4j_uri,
                     username=settings.neo4j_username,
                     password=settings.neo4j_password,
+                    max_transaction_retry_time=settings.neo4j_max_transaction_retry_time,
                 )
                 self.neo4j_client.connect()
                 logger.info("Connected to Neo4j for scheduled discovery")
@@ -97,7 +102,7 @@ class DiscoveryScheduler:
                 settings.azure_tenant_id
                 and settings.azure_client_id
                 and settings.azure_client_secret
-                and settings.azure_subscription_id
+                and self._azure_subscription_ids()
             ):
                 return True
 
@@ -139,16 +144,24 @@ class DiscoveryScheduler:
             logger.info("=" * 60)
 
             results = {}
+            azure_streamed = False
+            streamed_changes: ChangeSet | None = None
 
             # Discover Azure resources
             if settings.enable_azure_discovery and self._has_azure_credentials():
-                logger.info("Discovering Azure resources...")
                 try:
-                    azure_result = await self._discover_azure()
-                    results["azure"] = azure_result
-                    logger.info(
-                        f"Azure discovery completed: {azure_result.resource_count} resources"
-                    )
+                    if settings.azure_discovery_streaming and self.neo4j_client:
+                        logger.info("Streaming Azure resources into Neo4j...")
+                        streamed_changes = await self._stream_azure()
+                        azure_streamed = True
+                        logger.info("Azure streaming discovery completed")
+                    else:
+                        logger.info("Discovering Azure resources...")
+                        azure_result = await self._discover_azure()
+                        results["azure"] = azure_result
+                        logger.info(
+                            f"Azure discovery completed: {azure_result.resource_count} resources"
+                        )
                 except Exception as e:
                     logger.error(f"Azure discovery failed: {e}", exc_info=True)
 
@@ -173,8 +186,12 @@ class DiscoveryScheduler:
                     logger.error(f"GCP discovery failed: {e}", exc_info=True)
 
             # Store results in Neo4j
-            if results:
-                await self._store_results(results)
+            if results or azure_streamed:
+                change_set = await self._store_results(results, streamed_changes)
+                if change_set is None or not change_set.is_empty:
+                    await self._refresh_graph_snapshot()
+                else:
+                    logger.info("No topology changes detected, keeping graph snapshot")
 
             self.last_discovery_time = datetime.now()
             elapsed = (self.last_discovery_time - start_time).total_seconds()
@@ -196,15 +213,35 @@ class DiscoveryScheduler:
         finally:
             self.discovery_in_progress = False
 
+    async def _refresh_graph_snapshot(self) -> None:
+        """Rebuild the in-memory graph snapshot so analyzers see the new topology."""
+        if not settings.enable_graph_snapshot or not self.neo4j_client:
+            return
+
+        from topdeck.analysis.graph_snapshot import refresh_graph_snapshot
+
+        try:
+            await asyncio.to_thread(refresh_graph_snapshot, self.neo4j_client)
+        except Exception as e:
+            logger.error(f"Failed to refresh graph snapshot: {e}", exc_info=True)
+
     def _has_azure_credentials(self) -> bool:
         """Check if Azure credentials are configured."""
         return bool(
             settings.azure_tenant_id
             and settings.azure_client_id
             and settings.azure_client_secret
-            and settings.azure_subscription_id
+            and self._azure_subscription_ids()
         )
 
+    def _azure_subscription_ids(self) -> list[str]:
+        """Get the configured Azure subscription IDs, without duplicates."""
+        subscription_ids = [
+            settings.azure_subscription_id,
+            *settings.azure_subscription_ids.split(","),
+        ]
+        return list(dict.fromkeys(s.strip() for s in subscription_ids if s and s.strip()))
+
     def _has_aws_credentials(self) -> bool:
         """Check if AWS credentials are configured."""
         return bool(settings.aws_access_key_id and settings.aws_secret_access_key)
@@ -213,24 +250,67 @@ class DiscoveryScheduler:
         """Check if GCP credentials are configured."""
         return bool(settings.google_application_credentials and settings.gcp_project_id)
 
-    async def _discover_azure(self) -> DiscoveryResult:
-        """Discover Azure resources."""
-        from azure.identity import ClientSecretCredential
-
+    def _azure_discoverer(self, subscription_id: str, credential: Any) -> Any:
+        """Create the discoverer of one Azure subscription."""
         from topdeck.discovery.azure import AzureDiscoverer
 
-        credential = ClientSecretCredential(
+        return AzureDiscoverer(
+            subscription_id=subscription_id,
+            credential=credential,
+            enable_parallel=True,
+            max_workers=settings.discovery_parallel_workers,
+            profile_dependencies=settings.discovery_dependency_profile,
+        )
+
+    @staticmethod
+    def _azure_credential() -> Any:
+        """Create the service principal credential used for every subscription."""
+        from azure.identity import ClientSecretCredential
+
+        return ClientSecretCredential(
             tenant_id=settings.azure_tenant_id,
             client_id=settings.azure_client_id,
             client_secret=settings.azure_client_secret,
         )
 
-        discoverer = AzureDiscoverer(
-            subscription_id=settings.azure_subscription_id,
-            credential=credential,
-            enable_parallel=True,
-            max_workers=settings.discovery_parallel_workers,
+    async def _discover_azure(self) -> DiscoveryResult:
+        """
+        Discover Azure resources of every configured subscription.
+
+        Subscriptions are discovered concurrently. With more than one, the
+        results are merged into a result without a subscription ID, and a
+        failed subscription is recorded as an error of the merged result.
+        """
+        credential = self._azure_credential()
+        subscription_ids = self._azure_subscription_ids()
+        if len(subscription_ids) == 1:
+            return await self._discover_azure_subscription(subscription_ids[0], credential)
+
+        outcomes = await asyncio.gather(
+            *(self._discover_azure_subscription(s, credential) for s in subscription_ids),
+            return_exceptions=True,
         )
+        merged = DiscoveryResult()
+        for subscription_id, outcome in zip(subscription_ids, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                error_msg = f"Azure subscription {subscription_id} failed: {outcome}"
+                logger.error(error_msg, exc_info=outcome)
+                merged.add_error(error_msg)
+                continue
+            for resource in outcome.resources:
+                merged.add_resource(resource)
+            for dependency in outcome.dependencies:
+                merged.add_dependency(dependency)
+            merged.applications.extend(outcome.applications)
+            merged.errors.extend(outcome.errors)
+        merged.complete()
+        return merged
+
+    async def _discover_azure_subscription(
+        self, subscription_id: str, credential: Any
+    ) -> DiscoveryResult:
+        """Discover the resources of one Azure subscription."""
+        discoverer = self._azure_discoverer(subscription_id, credential)
 
         # First discover all resources using generic Azure API
         logger.info("Phase 1: Discovering all Azure resources...")
@@ -258,6 +338,82 @@ class DiscoveryScheduler:
         logger.info(f"Phase 2 complete: Final count = {result.resource_count} resources")
         return result
 
+    async def _stream_azure(self) -> ChangeSet | None:
+        """
+        Stream the resources of every configured Azure subscription into Neo4j.
+
+        Subscriptions are streamed concurrently, each through its own
+        StreamingGraphWriter, so stale resources are deleted per subscription.
+
+        Returns:
+            Combined change-set, or None when writes are not incremental
+        """
+        credential = self._azure_credential()
+        writer = GraphBatchWriter(self.neo4j_client, batch_size=settings.neo4j_write_batch_size)
+        incremental = settings.discovery_incremental_writes
+        subscription_ids = self._azure_subscription_ids()
+
+        outcomes = await asyncio.gather(
+            *(
+                self._stream_azure_subscription(s, credential, writer, incremental)
+                for s in subscription_ids
+            ),
+            return_exceptions=True,
+        )
+        change_set = ChangeSet() if incremental else None
+        for subscription_id, outcome in zip(subscription_ids, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.error(
+                    f"Azure subscription {subscription_id} failed: {outcome}", exc_info=outcome
+                )
+            elif change_set is not None and outcome is not None:
+                change_set.merge(outcome)
+        return change_set
+
+    async def _stream_azure_subscription(
+        self,
+        subscription_id: str,
+        credential: Any,
+        writer: GraphBatchWriter,
+        incremental: bool,
+    ) -> ChangeSet | None:
+        """
+        Stream the resources of one Azure subscription into Neo4j.
+
+        Specialized discovery runs first, so its detailed resources replace
+        the generic ones as chunks are written instead of being merged into
+        a complete result afterwards.
+
+        Returns:
+            Change-set of the subscription, or None when writes are not incremental
+        """
+        discoverer = self._azure_discoverer(subscription_id, credential)
+        sink = StreamingGraphWriter(writer, incremental=incremental)
+
+        specialized = await discoverer.discover_specialized_resources_parallel()
+        specialized_by_id = {r.id: r for r in specialized.resources}
+
+        async def write_chunk(resources: list) -> None:
+            chunk = [specialized_by_id.pop(r.id, r) for r in resources]
+            await asyncio.to_thread(sink.write_resources, chunk)
+
+        result, index = await discoverer.stream_all_resources(
+            write_chunk, chunk_size=settings.neo4j_write_batch_size
+        )
+        # Specialized resources the generic listing did not return
+        for resource in specialized_by_id.values():
+            result.add_resource(resource)
+
+        report, changes = await asyncio.to_thread(sink.finish, result, "azure")
+        summary = report.summary()
+        logger.info(
+            f"Streamed {len(sink.resource_ids)} resources of Azure subscription "
+            f"{subscription_id} ({len(index.retained)} kept in memory): "
+            f"{summary['written']} items written, {summary['failed']} failed, "
+            f"{len(result.errors)} errors"
+        )
+        return changes
+
     async def _discover_aws(self) -> DiscoveryResult:
         """Discover AWS resources."""
         from topdeck.discovery.aws import AWSDiscoverer
@@ -266,6 +422,8 @@ class DiscoveryScheduler:
             access_key_id=settings.aws_access_key_id,
             secret_access_key=settings.aws_secret_access_key,
             region=settings.aws_region,
+            profile_dependencies=settings.discovery_dependency_profile,
+            max_workers=settings.discovery_parallel_workers,
         )
 
         return await discoverer.discover_all_resources()
@@ -277,53 +435,70 @@ class DiscoveryScheduler:
         discoverer = GCPDiscoverer(
             project_id=settings.gcp_project_id,
             credentials_path=settings.google_application_credentials,
+            profile_dependencies=settings.discovery_dependency_profile,
         )
 
         return await discoverer.discover_all_resources()
 
-    async def _store_results(self, results: dict[str, DiscoveryResult]) -> None:
+    async def _store_results(
+        self,
+        results: dict[str, DiscoveryResult],
+        streamed_changes: ChangeSet | None = None,
+    ) -> ChangeSet | None:
         """
         Store discovery results in Neo4j.
 
+        Nodes and dependencies are written in UNWIND batches of
+        ``neo4j_write_batch_size`` rows, each in a managed write transaction.
+        With ``discovery_incremental_writes`` only new, changed or deleted
+        items are written and the combined change-set of the run is kept in
+        ``last_change_set``. The blocking writes run in a worker thread so the
+        event loop stays responsive.
+
         Args:
             results: Dictionary mapping cloud provider to discovery result
+            streamed_changes: Change-set of discoveries already written while
+                streaming, merged into the change-set of the run
+
+        Returns:
+            Change-set of the run, or None when everything was rewritten
         """
         if not self.neo4j_client:
             logger.error("Neo4j client not initialized, cannot store results")
-            return
+            return None
 
+        writer = GraphBatchWriter(self.neo4j_client, batch_size=settings.neo4j_write_batch_size)
+        incremental = settings.discovery_incremental_writes
+        change_set = ChangeSet() if incremental else None
+        if change_set is not None and streamed_changes is not None:
+            change_set.merge(streamed_changes)
         total_stored = 0
 
         for cloud_provider, result in results.items():
             logger.info(f"Storing {cloud_provider.upper()} resources in Neo4j...")
 
-            # Store resources
-            for resource in result.resources:
-                try:
-                    neo4j_props = resource.to_neo4j_properties()
-                    self.neo4j_client.upsert_resource(neo4j_props)
-                    total_stored += 1
-                except Exception as e:
-                    logger.error(
-                        f"Failed to store resource {resource.name}: {e}",
-                        exc_info=True,
-                    )
+            if change_set is not None:
+                report, changes = await asyncio.to_thread(
+                    writer.write_discovery_changes, result, cloud_provider
+                )
+                change_set.merge(changes)
+                logger.info(f"{cloud_provider.upper()} changes: {changes.summary()}")
+            else:
+                report = await asyncio.to_thread(writer.write_discovery_result, result)
+            total_stored += report.written.get("resources", 0)
 
-            # Store dependencies
-            for dependency in result.dependencies:
-                try:
-                    self.neo4j_client.create_dependency(
-                        dependency.source_id,
-                        dependency.target_id,
-                        dependency.to_neo4j_properties(),
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to store dependency: {e}",
-                        exc_info=True,
-                    )
+            summary = report.summary()
+            logger.info(
+                f"Stored {summary['written']} {cloud_provider.upper()} items "
+                f"({summary['failed']} failed) in {len(report.batches)} batches, "
+                f"{summary['duration_seconds']:.2f}s"
+            )
+            for kind, stats in summary["kinds"].items():
+                logger.debug(f"{cloud_provider.upper()} {kind}: {stats}")
 
         logger.info(f"Stored {total_stored} resources in Neo4j")
+        self.last_change_set = change_set
+        return change_set
 
     async def trigger_manual_discovery(self) -> dict:
         """
@@ -363,6 +538,9 @@ class DiscoveryScheduler:
                 self.last_discovery_time.isoformat() if self.last_discovery_time else None
             ),
             "interval_hours": settings.discovery_scan_interval // 3600,
+            "last_change_set": (
+                self.last_change_set.summary() if self.last_change_set else None
+            ),
             "enabled_providers": {
                 "azure": settings.enable_azure_discovery and self._has_azure_credentials(),
                 "aws": settings.enable_aws_discovery and self._has_aws_credentials(),
@@ -50,6 +50,7 @@ class WorkerPool:
         self.config = config or WorkerPoolConfig()
         self._semaphore = asyncio.Semaphore(self.config.max_workers)
         self._error_tracker = ErrorTracker()
+        self._cancelled = 0
 
     async def execute(
         self,
@@ -139,6 +140,65 @@ class WorkerPool:
 
         return await self.execute(tasks, task_args)
 
+    async def map_partial(
+        self,
+        func: Callable,
+        items: list[Any],
+        deadline: float | None = None,
+    ) -> list[Any | None]:
+        """
+        Map an async function over items, keeping whatever finishes in time.
+
+        Unlike map(), results stay aligned with items and the whole batch is
+        bounded by a deadline: calls still queued or running when it passes
+        are cancelled (counted as ``cancelled`` in get_summary()). Failed,
+        timed-out and cancelled calls yield None.
+
+        Args:
+            func: Async callable to apply to each item
+            items: List of items to process
+            deadline: Optional time budget for the whole batch in seconds
+
+        Returns:
+            List with one result (or None) per item
+        """
+        if not items:
+            return []
+
+        tasks = [
+            asyncio.create_task(self._execute_task(i, func, (item,), {}))
+            for i, item in enumerate(items)
+        ]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=deadline)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results: list[Any | None] = []
+        for i, task in enumerate(tasks):
+            if task in pending:
+                self._cancelled += 1
+                results.append(None)
+            elif task.exception() is not None:
+                self._error_tracker.record_error(str(i), task.exception())
+                results.append(None)
+            else:
+                self._error_tracker.record_success(str(i))
+                results.append(task.result())
+
+        if pending:
+            logger.warning(
+                f"Worker pool deadline of {deadline}s reached: "
+                f"{len(pending)} of {len(tasks)} tasks cancelled"
+            )
+        return results
+
     async def _execute_task(
         self,
         task_id: int,
@@ -189,7 +249,7 @@ class WorkerPool:
         Returns:
             Dictionary with execution statistics
         """
-        return self._error_tracker.get_summary()
+        return {**self._error_tracker.get_summary(), "cancelled": self._cancelled}
 
     def has_errors(self) -> bool:
         """Check if any tasks failed."""
@@ -6,6 +6,7 @@ This module contains discovery engines for different cloud providers:
 - GCP: GKE, Compute Engine, Cloud SQL, Cloud Storage, Load Balancers
 """
 
+from .change_set import ChangeSet, content_hash
 from .models import (
     Application,
     AppRegistration,
@@ -40,4 +41,6 @@ __all__ = [
     "ResourceStatus",
     "DependencyCategory",
     "DependencyType",
+    "ChangeSet",
+    "content_hash",
 ]
@@ -4,10 +4,20 @@ AWS Resource Discoverer.
 Main orchestrator for discovering AWS resources across accounts and regions.
 """
 
+import asyncio
 import logging
 from typing import Any
 
-from ..models import Application, DiscoveredResource, DiscoveryResult, ResourceDependency
+from ..dependency_rules import DependencyRule, DependencyRuleEngine, rules_from_patterns
+from ..models import (
+    Application,
+    DependencyCategory,
+    DependencyType,
+    DiscoveredResource,
+    DiscoveryResult,
+    ResourceDependency,
+)
+from .executor import AWSCallExecutor
 from .mapper import AWSResourceMapper
 
 logger = logging.getLogger(__name__)
@@ -37,12 +47,39 @@ class AWSDiscoverer:
     - Relationship detection
     """
 
+    # Resource type filter -> discovery method, in the order resources are added
+    SERVICE_DISCOVERERS = {
+        "ec2": "_discover_ec2_instances",
+        "eks": "_discover_eks_clusters",
+        "rds": "_discover_rds_databases",
+        "s3": "_discover_s3_buckets",
+        "lambda": "_discover_lambda_functions",
+        "dynamodb": "_discover_dynamodb_tables",
+        "vpc": "_discover_vpcs",
+        "load_balancer": "_discover_load_balancers",
+    }
+
+    # Resource type filter -> AWS resource type its discovery method lists
+    SERVICE_RESOURCE_TYPES = {
+        "ec2": "AWS::EC2::Instance",
+        "eks": "AWS::EKS::Cluster",
+        "rds": "AWS::RDS::DBInstance",
+        "s3": "AWS::S3::Bucket",
+        "lambda": "AWS::Lambda::Function",
+        "dynamodb": "AWS::DynamoDB::Table",
+        "vpc": "AWS::EC2::VPC",
+        "load_balancer": "AWS::ElasticLoadBalancingV2::LoadBalancer",
+    }
+
     def __init__(
         self,
         access_key_id: str | None = None,
         secret_access_key: str | None = None,
         region: str = "us-east-1",
         session_token: str | None = None,
+        profile_dependencies: bool = False,
+        max_workers: int = 10,
+        rate_limits: dict[str, int] | None = None,
     ):
         """
         Initialize AWS discoverer.
@@ -52,12 +89,21 @@ class AWSDiscoverer:
             secret_access_key: AWS secret access key
             region: Default AWS region
             session_token: AWS session token (for temporary credentials)
+            profile_dependencies: Log where dependency rule matching spends its time
+            max_workers: Maximum concurrent AWS API calls
+            rate_limits: Maximum API calls per second by service (e.g. {"ec2": 20})
         """
         self.access_key_id = access_key_id
         self.secret_access_key = secret_access_key
         self.region = region
         self.session_token = session_token
+        self.profile_dependencies = profile_dependencies
         self.mapper = AWSResourceMapper()
+        self.executor = AWSCallExecutor(
+            self._create_client, max_workers=max_workers, rate_limits=rate_limits
+        )
+        self._account_id: str | None = None
+        self._bucket_regions: asyncio.Future | None = None
 
         # Initialize boto3 session if available
         if BOTO3_AVAILABLE:
@@ -73,6 +119,10 @@ class AWSDiscoverer:
             self.session = None
             logger.warning("boto3 not available, AWS discovery will be limited")
 
+    def _create_client(self, service: str, region: str | None) -> Any:
+        """Create a boto3 client for the executor."""
+        return self.session.client(service, region_name=region)
+
     async def discover_all_resources(
         self,
         regions: list[str] | None = None,
@@ -81,6 +131,13 @@ class AWSDiscoverer:
         """
         Discover all AWS resources across specified regions.
 
+        Every (region, service) pair is discovered concurrently; API calls go
+        through the executor's thread pool and per-service, per-region rate
+        limits. A service that fails in a region is recorded in the result's
+        errors instead of yielding no resources; every other (region,
+        resource type) partition is marked as scanned, so incremental writes
+        only delete stale resources of those partitions.
+
         Args:
             regions: List of AWS regions to scan (if None, uses default region)
             resource_types: List of resource types to discover (if None, discovers all)
@@ -90,7 +147,7 @@ class AWSDiscoverer:
         """
         if not BOTO3_AVAILABLE:
             logger.error("boto3 not available, cannot discover AWS resources")
-            result = DiscoveryResult(cloud_provider="aws")
+            result = DiscoveryResult()
             result.add_error("boto3 not available")
             result.complete()
             return result
@@ -99,69 +156,51 @@ class AWSDiscoverer:
         if regions is None:
             regions = [self.region]
 
-        result = DiscoveryResult(cloud_provider="aws")
-        account_id = self.get_account_id()
+        # S3 buckets are listed once per run and shared by all regions
+        self._bucket_regions = None
+        account_id = await self.executor.run(self.get_account_id)
+        result = DiscoveryResult(subscription_id=account_id)
+        if account_id is None:
+            # Without the account, ARNs cannot be built and stale resources
+            # cannot be scoped to it
+            error_msg = "Could not resolve the AWS account ID"
+            result.add_error(error_msg)
+            logger.error(error_msg)
+            result.complete()
+            return result
 
         try:
             logger.info(f"Discovering AWS resources in account {account_id}...")
 
-            # Discover resources for each region
-            for region_name in regions:
-                logger.info(f"Scanning region: {region_name}")
-
-                try:
-                    # Discover EC2 instances
-                    if not resource_types or "ec2" in resource_types:
-                        ec2_resources = await self._discover_ec2_instances(region_name)
-                        for resource in ec2_resources:
-                            result.add_resource(resource)
-
-                    # Discover EKS clusters
-                    if not resource_types or "eks" in resource_types:
-                        eks_resources = await self._discover_eks_clusters(region_name)
-                        for resource in eks_resources:
-                            result.add_resource(resource)
-
-                    # Discover RDS databases
-                    if not resource_types or "rds" in resource_types:
-                        rds_resources = await self._discover_rds_databases(region_name)
-                        for resource in rds_resources:
-                            result.add_resource(resource)
-
-                    # Discover S3 buckets (S3 is global but we list it per region for organization)
-                    if not resource_types or "s3" in resource_types:
-                        s3_resources = await self._discover_s3_buckets(region_name)
-                        for resource in s3_resources:
-                            result.add_resource(resource)
-
-                    # Discover Lambda functions
-                    if not resource_types or "lambda" in resource_types:
-                        lambda_resources = await self._discover_lambda_functions(region_name)
-                        for resource in lambda_resources:
-                            result.add_resource(resource)
-
-                    # Discover DynamoDB tables
-                    if not resource_types or "dynamodb" in resource_types:
-                        dynamodb_resources = await self._discover_dynamodb_tables(region_name)
-                        for resource in dynamodb_resources:
-                            result.add_resource(resource)
-
-                    # Discover VPCs
-                    if not resource_types or "vpc" in resource_types:
-                        vpc_resources = await self._discover_vpcs(region_name)
-                        for resource in vpc_resources:
-                            result.add_resource(resource)
-
-                    # Discover Load Balancers
-                    if not resource_types or "load_balancer" in resource_types:
-                        lb_resources = await self._discover_load_balancers(region_name)
-                        for resource in lb_resources:
-                            result.add_resource(resource)
-
-                except Exception as e:
-                    error_msg = f"Error discovering resources in region {region_name}: {e}"
+            services = [
+                service
+                for service in self.SERVICE_DISCOVERERS
+                if not resource_types or service in resource_types
+            ]
+            scans = [(region_name, service) for region_name in regions for service in services]
+            logger.info(f"Scanning {len(services)} services in {len(regions)} regions")
+
+            outcomes = await asyncio.gather(
+                *(
+                    getattr(self, self.SERVICE_DISCOVERERS[service])(region_name, account_id)
+                    for region_name, service in scans
+                ),
+                return_exceptions=True,
+            )
+            for (region_name, service), outcome in zip(scans, outcomes, strict=True):
+                if isinstance(outcome, Exception):
+                    error_msg = (
+                        f"Error discovering {service} resources in region {region_name}: {outcome}"
+                    )
                     result.add_error(error_msg)
                     logger.error(error_msg)
+                    continue
+                for resource in outcome:
+                    result.add_resource(resource)
+                result.mark_scanned(
+                    region_name,
+                    self.mapper.map_resource_type(self.SERVICE_RESOURCE_TYPES[service]),
+                )
 
             logger.info(f"Discovered {len(result.resources)} resources")
 
@@ -195,540 +234,587 @@ class AWSDiscoverer:
 
         return result
 
-    async def _discover_ec2_instances(self, region: str) -> list[DiscoveredResource]:
-        """Discover EC2 instances in a region."""
-        resources = []
-        try:
-            ec2 = self.session.client("ec2", region_name=region)
-            response = ec2.describe_instances()
-
-            for reservation in response.get("Reservations", []):
-                for instance in reservation.get("Instances", []):
-                    # Extract basic info
-                    instance_id = instance.get("InstanceId")
-                    instance_type = instance.get("InstanceType")
-                    state = instance.get("State", {}).get("Name")
-                    vpc_id = instance.get("VpcId")
-                    subnet_id = instance.get("SubnetId")
-
-                    # Build ARN
-                    account_id = self.get_account_id()
-                    arn = f"arn:aws:ec2:{region}:{account_id}:instance/{instance_id}"
-
-                    # Extract tags
-                    tags = {}
-                    for tag in instance.get("Tags", []):
-                        tags[tag["Key"]] = tag["Value"]
-
-                    # Map to DiscoveredResource
-                    resource = self.mapper.map_resource(
-                        resource_id=arn,
-                        resource_type="AWS::EC2::Instance",
-                        tags=tags,
-                        region=region,
-                        account_id=account_id,
-                    )
-
-                    # Add EC2-specific properties
-                    resource.properties["instance_type"] = instance_type
-                    resource.properties["state"] = state
-                    resource.properties["vpc_id"] = vpc_id
-                    resource.properties["subnet_id"] = subnet_id
-
-                    resources.append(resource)
-
-        except Exception as e:
-            logger.error(f"Error discovering EC2 instances in {region}: {e}")
+    async def _call_each(
+        self,
+        service: str,
+        region: str | None,
+        operation: str,
+        params: list[dict[str, Any]],
+        required: bool = False,
+    ) -> list[dict | None]:
+        """
+        Call an operation concurrently for each parameter set.
 
-        return resources
+        Args:
+            service: AWS service name
+            region: AWS region
+            operation: Client method name
+            params: Parameters of each call
+            required: Whether a failed call raises instead of returning None,
+                for calls that describe the resources themselves
 
-    async def _discover_eks_clusters(self, region: str) -> list[DiscoveredResource]:
-        """Discover EKS clusters in a region."""
+        Returns:
+            Response of each call, in order, or None for calls that failed
+        """
+        responses = await asyncio.gather(
+            *(self.executor.call(service, region, operation, **kwargs) for kwargs in params),
+            return_exceptions=not required,
+        )
+        results = []
+        for kwargs, response in zip(params, responses, strict=True):
+            if isinstance(response, Exception):
+                logger.debug(f"Error calling {service}.{operation}({kwargs}): {response}")
+                response = None
+            results.append(response)
+        return results
+
+    async def _discover_ec2_instances(
+        self, region: str, account_id: str
+    ) -> list[DiscoveredResource]:
+        """Discover EC2 instances in a region."""
         resources = []
-        try:
-            eks = self.session.client("eks", region_name=region)
-            response = eks.list_clusters()
-
-            for cluster_name in response.get("clusters", []):
-                cluster_info = eks.describe_cluster(name=cluster_name)
-                cluster = cluster_info.get("cluster", {})
+        reservations = await self.executor.paginate(
+            "ec2", region, "describe_instances", "Reservations"
+        )
 
+        for reservation in reservations:
+            for instance in reservation.get("Instances", []):
                 # Extract basic info
-                arn = cluster.get("arn")
-                status = cluster.get("status")
-                version = cluster.get("version")
-                endpoint = cluster.get("endpoint")
+                instance_id = instance.get("InstanceId")
+                instance_type = instance.get("InstanceType")
+                state = instance.get("State", {}).get("Name")
+                vpc_id = instance.get("VpcId")
+                subnet_id = instance.get("SubnetId")
+
+                # Build ARN
+                arn = f"arn:aws:ec2:{region}:{account_id}:instance/{instance_id}"
 
                 # Extract tags
-                tags = cluster.get("tags", {})
+                tags = {}
+                for tag in instance.get("Tags", []):
+                    tags[tag["Key"]] = tag["Value"]
 
                 # Map to DiscoveredResource
-                account_id = self.get_account_id()
-                resource = self.mapper.map_resource(
-                    resource_id=arn,
-                    resource_type="AWS::EKS::Cluster",
-                    tags=tags,
+                resource = self.mapper.map_aws_resource(
+                    arn=arn,
+                    resource_name=tags.get("Name", instance_id),
+                    resource_type="AWS::EC2::Instance",
                     region=region,
-                    account_id=account_id,
+                    tags=tags,
+                    state=state,
                 )
 
-                # Add EKS-specific properties
-                resource.properties["status"] = status
-                resource.properties["version"] = version
-                resource.properties["endpoint"] = endpoint
+                # Add EC2-specific properties
+                resource.properties["instance_type"] = instance_type
+                resource.properties["state"] = state
+                resource.properties["vpc_id"] = vpc_id
+                resource.properties["subnet_id"] = subnet_id
 
                 resources.append(resource)
 
-        except Exception as e:
-            logger.error(f"Error discovering EKS clusters in {region}: {e}")
-
         return resources
 
-    async def _discover_rds_databases(self, region: str) -> list[DiscoveredResource]:
-        """Discover RDS databases in a region."""
+    async def _discover_eks_clusters(
+        self, region: str, account_id: str
+    ) -> list[DiscoveredResource]:
+        """Discover EKS clusters in a region."""
         resources = []
-        try:
-            rds = self.session.client("rds", region_name=region)
-            response = rds.describe_db_instances()
-
-            for db_instance in response.get("DBInstances", []):
-                # Extract basic info
-                db_instance.get("DBInstanceIdentifier")
-                engine = db_instance.get("Engine")
-                engine_version = db_instance.get("EngineVersion")
-                status = db_instance.get("DBInstanceStatus")
-                endpoint = db_instance.get("Endpoint", {})
+        cluster_names = await self.executor.paginate(
+            "eks", region, "list_clusters", "clusters"
+        )
+        responses = await self._call_each(
+            "eks",
+            region,
+            "describe_cluster",
+            [{"name": name} for name in cluster_names],
+            required=True,
+        )
 
-                # Build ARN
-                account_id = self.get_account_id()
-                arn = db_instance.get("DBInstanceArn")
+        for response in responses:
+            cluster = response.get("cluster", {})
 
-                # Extract tags
-                tags = {}
-                for tag in db_instance.get("TagList", []):
-                    tags[tag["Key"]] = tag["Value"]
+            # Extract basic info
+            arn = cluster.get("arn")
+            status = cluster.get("status")
+            version = cluster.get("version")
+            endpoint = cluster.get("endpoint")
 
-                # Map to DiscoveredResource
-                resource = self.mapper.map_resource(
-                    resource_id=arn,
-                    resource_type="AWS::RDS::DBInstance",
-                    tags=tags,
-                    region=region,
-                    account_id=account_id,
-                )
+            # Extract tags
+            tags = cluster.get("tags", {})
 
-                # Add RDS-specific properties
-                resource.properties["engine"] = engine
-                resource.properties["engine_version"] = engine_version
-                resource.properties["status"] = status
-                if endpoint:
-                    resource.properties["endpoint_address"] = endpoint.get("Address")
-                    resource.properties["endpoint_port"] = endpoint.get("Port")
+            # Map to DiscoveredResource
+            resource = self.mapper.map_aws_resource(
+                arn=arn,
+                resource_name=cluster.get("name"),
+                resource_type="AWS::EKS::Cluster",
+                region=region,
+                tags=tags,
+                state=status,
+            )
 
-                resources.append(resource)
+            # Add EKS-specific properties
+            resource.properties["status"] = status
+            resource.properties["version"] = version
+            resource.properties["endpoint"] = endpoint
+            resource.properties["vpc_id"] = cluster.get("resourcesVpcConfig", {}).get("vpcId")
 
-        except Exception as e:
-            logger.error(f"Error discovering RDS databases in {region}: {e}")
+            resources.append(resource)
 
         return resources
 
-    async def _discover_s3_buckets(self, region: str) -> list[DiscoveredResource]:
-        """Discover S3 buckets (global service)."""
+    async def _discover_rds_databases(
+        self, region: str, account_id: str
+    ) -> list[DiscoveredResource]:
+        """Discover RDS databases in a region."""
         resources = []
-        try:
-            s3 = self.session.client("s3")
-            response = s3.list_buckets()
+        db_instances = await self.executor.paginate(
+            "rds", region, "describe_db_instances", "DBInstances"
+        )
 
-            for bucket in response.get("Buckets", []):
-                bucket_name = bucket.get("Name")
+        for db_instance in db_instances:
+            # Extract basic info
+            engine = db_instance.get("Engine")
+            engine_version = db_instance.get("EngineVersion")
+            status = db_instance.get("DBInstanceStatus")
+            endpoint = db_instance.get("Endpoint", {})
+            arn = db_instance.get("DBInstanceArn")
+
+            # Extract tags
+            tags = {}
+            for tag in db_instance.get("TagList", []):
+                tags[tag["Key"]] = tag["Value"]
+
+            # Map to DiscoveredResource
+            resource = self.mapper.map_aws_resource(
+                arn=arn,
+                resource_name=db_instance.get("DBInstanceIdentifier"),
+                resource_type="AWS::RDS::DBInstance",
+                region=region,
+                tags=tags,
+                state=status,
+            )
+
+            # Add RDS-specific properties
+            resource.properties["engine"] = engine
+            resource.properties["engine_version"] = engine_version
+            resource.properties["status"] = status
+            if endpoint:
+                resource.properties["endpoint_address"] = endpoint.get("Address")
+                resource.properties["endpoint_port"] = endpoint.get("Port")
+            resource.properties["vpc_id"] = db_instance.get("DBSubnetGroup", {}).get("VpcId")
+
+            resources.append(resource)
 
-                # Get bucket location
-                try:
-                    location = s3.get_bucket_location(Bucket=bucket_name)
-                    bucket_region = location.get("LocationConstraint") or "us-east-1"
-                except Exception:
-                    bucket_region = region
+        return resources
 
-                # Only include buckets in the specified region
-                if bucket_region != region:
-                    continue
+    async def _get_bucket_regions(self) -> dict[str, str | None]:
+        """
+        Get the region of every S3 bucket, listing the buckets once per run.
 
-                # Build ARN
-                account_id = self.get_account_id()
-                arn = f"arn:aws:s3:::{bucket_name}"
+        Returns:
+            Bucket name -> region, or None if the location lookup failed
+        """
+        if self._bucket_regions is None:
+            self._bucket_regions = asyncio.ensure_future(self._list_bucket_regions())
+        return await self._bucket_regions
+
+    async def _list_bucket_regions(self) -> dict[str, str | None]:
+        """List S3 buckets and look up their locations concurrently."""
+        buckets = await self.executor.paginate("s3", None, "list_buckets", "Buckets")
+        names = [bucket.get("Name") for bucket in buckets]
+        locations = await self._call_each(
+            "s3", None, "get_bucket_location", [{"Bucket": name} for name in names]
+        )
+        return {
+            name: (location.get("LocationConstraint") or "us-east-1") if location is not None else None
+            for name, location in zip(names, locations, strict=True)
+        }
 
-                # Get tags
-                tags = {}
-                try:
-                    tag_response = s3.get_bucket_tagging(Bucket=bucket_name)
-                    for tag in tag_response.get("TagSet", []):
-                        tags[tag["Key"]] = tag["Value"]
-                except Exception:
-                    pass
+    async def _discover_s3_buckets(self, region: str, account_id: str) -> list[DiscoveredResource]:
+        """Discover S3 buckets (global service) located in a region."""
+        resources = []
+        # Only include buckets in the specified region (or of unknown location)
+        bucket_names = [
+            name
+            for name, bucket_region in (await self._get_bucket_regions()).items()
+            if bucket_region in (region, None)
+        ]
+        tag_responses = await self._call_each(
+            "s3", None, "get_bucket_tagging", [{"Bucket": name} for name in bucket_names]
+        )
 
-                # Map to DiscoveredResource
-                resource = self.mapper.map_resource(
-                    resource_id=arn,
-                    resource_type="AWS::S3::Bucket",
-                    tags=tags,
-                    region=bucket_region,
-                    account_id=account_id,
-                )
+        for bucket_name, tag_response in zip(bucket_names, tag_responses, strict=True):
+            # Build ARN
+            arn = f"arn:aws:s3:::{bucket_name}"
 
-                resources.append(resource)
+            # Get tags
+            tags = {}
+            for tag in (tag_response or {}).get("TagSet", []):
+                tags[tag["Key"]] = tag["Value"]
 
-        except Exception as e:
-            logger.error(f"Error discovering S3 buckets: {e}")
+            # Map to DiscoveredResource
+            resource = self.mapper.map_aws_resource(
+                arn=arn,
+                resource_name=bucket_name,
+                resource_type="AWS::S3::Bucket",
+                region=region,
+                tags=tags,
+            )
+
+            resources.append(resource)
 
         return resources
 
-    async def _discover_lambda_functions(self, region: str) -> list[DiscoveredResource]:
+    async def _discover_lambda_functions(
+        self, region: str, account_id: str
+    ) -> list[DiscoveredResource]:
         """Discover Lambda functions in a region."""
         resources = []
-        try:
-            lambda_client = self.session.client("lambda", region_name=region)
-            response = lambda_client.list_functions()
-
-            for function in response.get("Functions", []):
-                # Extract basic info
-                function.get("FunctionName")
-                arn = function.get("FunctionArn")
-                runtime = function.get("Runtime")
-                handler = function.get("Handler")
+        functions = await self.executor.paginate(
+            "lambda", region, "list_functions", "Functions"
+        )
+        tag_responses = await self._call_each(
+            "lambda",
+            region,
+            "list_tags",
+            [{"Resource": function.get("FunctionArn")} for function in functions],
+        )
 
-                # Get tags
-                tags = {}
-                try:
-                    tag_response = lambda_client.list_tags(Resource=arn)
-                    tags = tag_response.get("Tags", {})
-                except Exception:
-                    pass
+        for function, tag_response in zip(functions, tag_responses, strict=True):
+            # Extract basic info
+            arn = function.get("FunctionArn")
+            runtime = function.get("Runtime")
+            handler = function.get("Handler")
 
-                # Map to DiscoveredResource
-                account_id = self.get_account_id()
-                resource = self.mapper.map_resource(
-                    resource_id=arn,
-                    resource_type="AWS::Lambda::Function",
-                    tags=tags,
-                    region=region,
-                    account_id=account_id,
-                )
+            # Get tags
+            tags = (tag_response or {}).get("Tags", {})
 
-                # Add Lambda-specific properties
-                resource.properties["runtime"] = runtime
-                resource.properties["handler"] = handler
+            # Map to DiscoveredResource
+            resource = self.mapper.map_aws_resource(
+                arn=arn,
+                resource_name=function.get("FunctionName"),
+                resource_type="AWS::Lambda::Function",
+                region=region,
+                tags=tags,
+                state=function.get("State"),
+            )
 
-                resources.append(resource)
+            # Add Lambda-specific properties
+            resource.properties["runtime"] = runtime
+            resource.properties["handler"] = handler
+            resource.properties["vpc_id"] = function.get("VpcConfig", {}).get("VpcId") or None
 
-        except Exception as e:
-            logger.error(f"Error discovering Lambda functions in {region}: {e}")
+            resources.append(resource)
 
         return resources
 
-    async def _discover_dynamodb_tables(self, region: str) -> list[DiscoveredResource]:
+    async def _discover_dynamodb_tables(
+        self, region: str, account_id: str
+    ) -> list[DiscoveredResource]:
         """Discover DynamoDB tables in a region."""
         resources = []
-        try:
-            dynamodb = self.session.client("dynamodb", region_name=region)
-            response = dynamodb.list_tables()
-
-            for table_name in response.get("TableNames", []):
-                # Get table details
-                table_info = dynamodb.describe_table(TableName=table_name)
-                table = table_info.get("Table", {})
-
-                # Extract basic info
-                arn = table.get("TableArn")
-                status = table.get("TableStatus")
-                item_count = table.get("ItemCount")
-
-                # Get tags
-                tags = {}
-                try:
-                    tag_response = dynamodb.list_tags_of_resource(ResourceArn=arn)
-                    for tag in tag_response.get("Tags", []):
-                        tags[tag["Key"]] = tag["Value"]
-                except Exception:
-                    pass
-
-                # Map to DiscoveredResource
-                account_id = self.get_account_id()
-                resource = self.mapper.map_resource(
-                    resource_id=arn,
-                    resource_type="AWS::DynamoDB::Table",
-                    tags=tags,
-                    region=region,
-                    account_id=account_id,
-                )
-
-                # Add DynamoDB-specific properties
-                resource.properties["status"] = status
-                resource.properties["item_count"] = item_count
-
-                resources.append(resource)
+        table_names = await self.executor.paginate(
+            "dynamodb", region, "list_tables", "TableNames"
+        )
+        # Get table details
+        tables = [
+            response.get("Table", {})
+            for response in await self._call_each(
+                "dynamodb",
+                region,
+                "describe_table",
+                [{"TableName": name} for name in table_names],
+                required=True,
+            )
+        ]
+        tag_responses = await self._call_each(
+            "dynamodb",
+            region,
+            "list_tags_of_resource",
+            [{"ResourceArn": table.get("TableArn")} for table in tables],
+        )
 
-        except Exception as e:
-            logger.error(f"Error discovering DynamoDB tables in {region}: {e}")
+        for table, tag_response in zip(tables, tag_responses, strict=True):
+            # Extract basic info
+            arn = table.get("TableArn")
+            status = table.get("TableStatus")
+            item_count = table.get("ItemCount")
+
+            # Get tags
+            tags = {}
+            for tag in (tag_response or {}).get("Tags", []):
+                tags[tag["Key"]] = tag["Value"]
+
+            # Map to DiscoveredResource
+            resource = self.mapper.map_aws_resource(
+                arn=arn,
+                resource_name=table.get("TableName"),
+                resource_type="AWS::DynamoDB::Table",
+                region=region,
+                tags=tags,
+                state=status,
+            )
+
+            # Add DynamoDB-specific properties
+            resource.properties["status"] = status
+            resource.properties["item_count"] = item_count
+
+            resources.append(resource)
 
         return resources
 
-    async def _discover_vpcs(self, region: str) -> list[DiscoveredResource]:
+    async def _discover_vpcs(self, region: str, account_id: str) -> list[DiscoveredResource]:
         """Discover VPCs in a region."""
         resources = []
-        try:
-            ec2 = self.session.client("ec2", region_name=region)
-            response = ec2.describe_vpcs()
-
-            for vpc in response.get("Vpcs", []):
-                # Extract basic info
-                vpc_id = vpc.get("VpcId")
-                cidr_block = vpc.get("CidrBlock")
-                is_default = vpc.get("IsDefault")
-
-                # Build ARN
-                account_id = self.get_account_id()
-                arn = f"arn:aws:ec2:{region}:{account_id}:vpc/{vpc_id}"
-
-                # Extract tags
-                tags = {}
-                for tag in vpc.get("Tags", []):
-                    tags[tag["Key"]] = tag["Value"]
-
-                # Map to DiscoveredResource
-                resource = self.mapper.map_resource(
-                    resource_id=arn,
-                    resource_type="AWS::EC2::VPC",
-                    tags=tags,
-                    region=region,
-                    account_id=account_id,
-                )
-
-                # Add VPC-specific properties
-                resource.properties["cidr_block"] = cidr_block
-                resource.properties["is_default"] = is_default
-
-                resources.append(resource)
-
-        except Exception as e:
-            logger.error(f"Error discovering VPCs in {region}: {e}")
+        vpcs = await self.executor.paginate("ec2", region, "describe_vpcs", "Vpcs")
+
+        for vpc in vpcs:
+            # Extract basic info
+            vpc_id = vpc.get("VpcId")
+            cidr_block = vpc.get("CidrBlock")
+            is_default = vpc.get("IsDefault")
+
+            # Build ARN
+            arn = f"arn:aws:ec2:{region}:{account_id}:vpc/{vpc_id}"
+
+            # Extract tags
+            tags = {}
+            for tag in vpc.get("Tags", []):
+                tags[tag["Key"]] = tag["Value"]
+
+            # Map to DiscoveredResource
+            resource = self.mapper.map_aws_resource(
+                arn=arn,
+                resource_name=tags.get("Name", vpc_id),
+                resource_type="AWS::EC2::VPC",
+                region=region,
+                tags=tags,
+                state=vpc.get("State"),
+            )
+
+            # Add VPC-specific properties
+            resource.properties["cidr_block"] = cidr_block
+            resource.properties["is_default"] = is_default
+            resource.properties["vpc_id"] = vpc_id
+
+            resources.append(resource)
 
         return resources
 
-    async def _discover_load_balancers(self, region: str) -> list[DiscoveredResource]:
+    async def _discover_load_balancers(
+        self, region: str, account_id: str
+    ) -> list[DiscoveredResource]:
         """Discover Load Balancers in a region."""
         resources = []
-        try:
-            elbv2 = self.session.client("elbv2", region_name=region)
-            response = elbv2.describe_load_balancers()
-
-            for lb in response.get("LoadBalancers", []):
-                # Extract basic info
-                arn = lb.get("LoadBalancerArn")
-                lb_type = lb.get("Type")
-                scheme = lb.get("Scheme")
-                state = lb.get("State", {}).get("Code")
-
-                # Get tags
-                tags = {}
-                try:
-                    tag_response = elbv2.describe_tags(ResourceArns=[arn])
-                    for tag_desc in tag_response.get("TagDescriptions", []):
-                        for tag in tag_desc.get("Tags", []):
-                            tags[tag["Key"]] = tag["Value"]
-                except Exception:
-                    pass
-
-                # Map to DiscoveredResource
-                account_id = self.get_account_id()
-                resource = self.mapper.map_resource(
-                    resource_id=arn,
-                    resource_type="AWS::ElasticLoadBalancingV2::LoadBalancer",
-                    tags=tags,
-                    region=region,
-                    account_id=account_id,
-                )
-
-                # Add LB-specific properties
-                resource.properties["load_balancer_type"] = lb_type
-                resource.properties["scheme"] = scheme
-                resource.properties["state"] = state
-
-                resources.append(resource)
+        load_balancers = await self.executor.paginate(
+            "elbv2", region, "describe_load_balancers", "LoadBalancers"
+        )
 
-        except Exception as e:
-            logger.error(f"Error discovering Load Balancers in {region}: {e}")
+        # Get tags, for up to 20 load balancers per call
+        arns = [lb.get("LoadBalancerArn") for lb in load_balancers]
+        tag_responses = await self._call_each(
+            "elbv2",
+            region,
+            "describe_tags",
+            [{"ResourceArns": arns[i : i + 20]} for i in range(0, len(arns), 20)],
+        )
+        tags_by_arn: dict[str, dict[str, str]] = {}
+        for tag_response in tag_responses:
+            for tag_desc in (tag_response or {}).get("TagDescriptions", []):
+                tags_by_arn[tag_desc.get("ResourceArn")] = {
+                    tag["Key"]: tag["Value"] for tag in tag_desc.get("Tags", [])
+                }
+
+        for lb in load_balancers:
+            # Extract basic info
+            arn = lb.get("LoadBalancerArn")
+            lb_type = lb.get("Type")
+            scheme = lb.get("Scheme")
+            state = lb.get("State", {}).get("Code")
+
+            # Map to DiscoveredResource
+            resource = self.mapper.map_aws_resource(
+                arn=arn,
+                resource_name=lb.get("LoadBalancerName"),
+                resource_type="AWS::ElasticLoadBalancingV2::LoadBalancer",
+                region=region,
+                tags=tags_by_arn.get(arn, {}),
+                state=state,
+            )
+
+            # Add LB-specific properties
+            resource.properties["load_balancer_type"] = lb_type
+            resource.properties["scheme"] = scheme
+            resource.properties["state"] = state
+            resource.properties["vpc_id"] = lb.get("VpcId")
+
+            resources.append(resource)
 
         return resources
 
-    async def _discover_dependencies(
-        self,
-        resources: list[DiscoveredResource],
-    ) -> list[ResourceDependency]:
+    def _get_dependency_rules(self) -> list[DependencyRule]:
         """
-        Discover dependencies between AWS resources.
-
-        This implementation uses a comprehensive mapping of common AWS resource
-        dependencies to detect relationships. It considers:
-        - Compute resources depending on data stores
-        - Application services depending on caching and storage
-        - Container orchestration depending on storage and networking
-        - Network dependencies and VPC relationships
+        Get AWS resource dependency rules.
 
-        Args:
-            resources: List of discovered resources
+        Networking dependencies between VPC-bound resources are scoped to the
+        same VPC; dependencies on regional services (S3, DynamoDB, Secrets
+        Manager, ...) and Lambda functions outside a VPC are scoped to the
+        same region.
 
         Returns:
-            List of ResourceDependency objects
+            List of dependency rules
         """
-        from ..models import (
-            DependencyCategory,
-            DependencyType,
-            ResourceDependency,
-        )
-
-        dependencies = []
-
-        # Define comprehensive dependency patterns for AWS
         # Format: (source_type, target_type, category, dependency_type, strength, description)
-        dependency_patterns = [
+        same_vpc_patterns = [
             # Lambda dependencies
-            ("lambda", "rds", DependencyCategory.DATA, DependencyType.REQUIRED, 0.9,
-             "Lambda function may depend on RDS database"),
-            ("lambda", "dynamodb", DependencyCategory.DATA, DependencyType.REQUIRED, 0.8,
-             "Lambda function may depend on DynamoDB table"),
-            ("lambda", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.7,
-             "Lambda function may use S3 bucket"),
-            ("lambda", "elasticache", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
-             "Lambda function may use ElastiCache"),
-            ("lambda", "secrets_manager", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.7,
-             "Lambda function may use Secrets Manager"),
             ("lambda", "vpc", DependencyCategory.NETWORK, DependencyType.OPTIONAL, 0.6,
              "Lambda function may run in VPC"),
-            
+
             # EC2 dependencies
             ("ec2", "vpc", DependencyCategory.NETWORK, DependencyType.REQUIRED, 0.9,
              "EC2 instance requires VPC for networking"),
-            ("ec2", "ebs", DependencyCategory.DATA, DependencyType.REQUIRED, 0.9,
-             "EC2 instance uses EBS for storage"),
-            ("ec2", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
-             "EC2 instance may use S3 bucket"),
             ("ec2", "rds", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.7,
              "EC2 instance may connect to RDS database"),
             ("ec2", "elasticache", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
              "EC2 instance may use ElastiCache"),
-            ("ec2", "secrets_manager", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.6,
-             "EC2 instance may use Secrets Manager"),
             ("ec2", "security_group", DependencyCategory.NETWORK, DependencyType.OPTIONAL, 0.7,
              "EC2 instance may use Security Group"),
-            
+
             # EKS dependencies
             ("eks", "vpc", DependencyCategory.NETWORK, DependencyType.REQUIRED, 0.9,
              "EKS cluster requires VPC for networking"),
-            ("eks", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
-             "EKS workloads may use S3 bucket"),
             ("eks", "rds", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
              "EKS workloads may depend on RDS database"),
-            ("eks", "dynamodb", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
-             "EKS workloads may depend on DynamoDB table"),
             ("eks", "elasticache", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
              "EKS workloads may use ElastiCache"),
-            ("eks", "secrets_manager", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.7,
-             "EKS workloads may use Secrets Manager"),
             ("eks", "elb", DependencyCategory.NETWORK, DependencyType.OPTIONAL, 0.7,
              "EKS may use ELB for service exposure"),
-            
+
             # ECS dependencies
             ("ecs", "vpc", DependencyCategory.NETWORK, DependencyType.REQUIRED, 0.9,
              "ECS task requires VPC for networking"),
-            ("ecs", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
-             "ECS task may use S3 bucket"),
             ("ecs", "rds", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.7,
              "ECS task may depend on RDS database"),
-            ("ecs", "dynamodb", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.7,
-             "ECS task may depend on DynamoDB table"),
             ("ecs", "elasticache", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
              "ECS task may use ElastiCache"),
-            ("ecs", "secrets_manager", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.8,
-             "ECS task may use Secrets Manager"),
             ("ecs", "elb", DependencyCategory.NETWORK, DependencyType.OPTIONAL, 0.7,
              "ECS service may use ELB"),
-            
+
             # Load Balancer dependencies
             ("elb", "vpc", DependencyCategory.NETWORK, DependencyType.REQUIRED, 0.9,
              "ELB requires VPC for networking"),
             ("elb", "security_group", DependencyCategory.NETWORK, DependencyType.OPTIONAL, 0.7,
              "ELB may use Security Group"),
-            
+
             # RDS dependencies
             ("rds", "vpc", DependencyCategory.NETWORK, DependencyType.REQUIRED, 0.9,
              "RDS instance requires VPC for networking"),
             ("rds", "security_group", DependencyCategory.NETWORK, DependencyType.OPTIONAL, 0.7,
              "RDS instance may use Security Group"),
+        ]
+        same_region_patterns = [
+            # Lambda dependencies
+            ("lambda", "rds", DependencyCategory.DATA, DependencyType.REQUIRED, 0.9,
+             "Lambda function may depend on RDS database"),
+            ("lambda", "dynamodb", DependencyCategory.DATA, DependencyType.REQUIRED, 0.8,
+             "Lambda function may depend on DynamoDB table"),
+            ("lambda", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.7,
+             "Lambda function may use S3 bucket"),
+            ("lambda", "elasticache", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
+             "Lambda function may use ElastiCache"),
+            ("lambda", "secrets_manager", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.7,
+             "Lambda function may use Secrets Manager"),
+
+            # EC2 dependencies
+            ("ec2", "ebs", DependencyCategory.DATA, DependencyType.REQUIRED, 0.9,
+             "EC2 instance uses EBS for storage"),
+            ("ec2", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
+             "EC2 instance may use S3 bucket"),
+            ("ec2", "secrets_manager", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.6,
+             "EC2 instance may use Secrets Manager"),
+
+            # EKS dependencies
+            ("eks", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
+             "EKS workloads may use S3 bucket"),
+            ("eks", "dynamodb", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
+             "EKS workloads may depend on DynamoDB table"),
+            ("eks", "secrets_manager", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.7,
+             "EKS workloads may use Secrets Manager"),
+
+            # ECS dependencies
+            ("ecs", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
+             "ECS task may use S3 bucket"),
+            ("ecs", "dynamodb", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.7,
+             "ECS task may depend on DynamoDB table"),
+            ("ecs", "secrets_manager", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.8,
+             "ECS task may use Secrets Manager"),
+
+            # RDS dependencies
             ("rds", "s3", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.5,
              "RDS may backup to S3"),
         ]
+        return rules_from_patterns(
+            same_vpc_patterns,
+            scope=("region", "vpc"),
+            discovered_method="heuristic_same_vpc",
+            description_suffix=" in same VPC",
+        ) + rules_from_patterns(
+            same_region_patterns,
+            scope=("region",),
+            discovered_method="heuristic_same_region",
+            description_suffix=" in same region",
+        )
+
+    async def _discover_dependencies(
+        self,
+        resources: list[DiscoveredResource],
+    ) -> list[ResourceDependency]:
+        """
+        Discover dependencies between AWS resources.
+
+        Dependencies are detected in two phases:
+        - Precise: EC2 instances are linked to the VPC of their vpc_id property
+        - Heuristic: the rules of _get_dependency_rules are matched through
+          DependencyRuleEngine, within the same VPC or region
+
+        Args:
+            resources: List of discovered resources
+
+        Returns:
+            List of ResourceDependency objects
+        """
+        dependencies = []
 
         # First, detect precise dependencies based on properties (VPC IDs, etc.)
+        vpcs_by_id = {}
+        for resource in resources:
+            if resource.resource_type == "vpc":
+                vpc_id = resource.properties.get("vpc_id") or resource.id.rsplit("/", 1)[-1]
+                vpcs_by_id.setdefault(vpc_id, resource)
+
         for resource in resources:
             # EC2 -> VPC (precise based on vpc_id property)
             if resource.resource_type == "ec2":
-                vpc_id = resource.properties.get("vpc_id")
-                if vpc_id:
-                    for vpc_resource in resources:
-                        if vpc_resource.resource_type == "vpc" and vpc_id in vpc_resource.id:
-                            dep = ResourceDependency(
-                                source_id=resource.id,
-                                target_id=vpc_resource.id,
-                                category=DependencyCategory.NETWORK,
-                                dependency_type=DependencyType.REQUIRED,
-                                strength=1.0,
-                                discovered_method="property_reference",
-                                description="EC2 instance in VPC (verified by vpc_id property)",
-                            )
-                            dependencies.append(dep)
-                            break
-
-        # Second, apply heuristic-based dependency patterns
-        # Build a set of existing dependency pairs for O(1) lookup performance
-        existing_pairs = {(d.source_id, d.target_id) for d in dependencies}
-        
-        # AWS resources are typically grouped by VPC or region
-        for source_resource in resources:
-            for target_resource in resources:
-                # Skip self-dependencies
-                if source_resource.id == target_resource.id:
-                    continue
-                
-                # Check if resources are in the same region (common pattern in AWS)
-                same_region = source_resource.region == target_resource.region
-                
-                # Only create dependencies for resources in the same region
-                if not same_region:
-                    continue
-                
-                # Check each dependency pattern
-                for pattern in dependency_patterns:
-                    source_type, target_type, category, dep_type, strength, description = pattern
-                    
-                    if (source_resource.resource_type == source_type and 
-                        target_resource.resource_type == target_type):
-                        
-                        # Skip if we already have a dependency (O(1) lookup using set)
-                        pair = (source_resource.id, target_resource.id)
-                        if pair in existing_pairs:
-                            continue
-                        
-                        dep = ResourceDependency(
-                            source_id=source_resource.id,
-                            target_id=target_resource.id,
-                            category=category,
-                            dependency_type=dep_type,
-                            strength=strength,
-                            discovered_method="heuristic_same_region",
-                            description=f"{description} in same region",
+                vpc_resource = vpcs_by_id.get(resource.properties.get("vpc_id"))
+                if vpc_resource is not None:
+                    dependencies.append(
+                        ResourceDependency(
+                            source_id=resource.id,
+                            target_id=vpc_resource.id,
+                            category=DependencyCategory.NETWORK,
+                            dependency_type=DependencyType.REQUIRED,
+                            strength=1.0,
+                            discovered_method="property_reference",
+                            description="EC2 instance in VPC (verified by vpc_id property)",
                         )
-                        dependencies.append(dep)
-                        existing_pairs.add(pair)  # Track to avoid duplicates
+                    )
+
+        # Second, apply heuristic-based dependency rules
+        existing_pairs = {(d.source_id, d.target_id) for d in dependencies}
+        engine = DependencyRuleEngine(
+            self._get_dependency_rules(), profile=self.profile_dependencies
+        )
+        dependencies.extend(engine.match(resources, existing_pairs))
 
         return dependencies
 
@@ -767,16 +853,21 @@ class AWSDiscoverer:
         """
         Get the AWS account ID for the current credentials.
 
+        The account ID is looked up once (via STS) and memoized.
+
         Returns:
             AWS account ID or None
         """
         if not BOTO3_AVAILABLE or not self.session:
             return None
+        if self._account_id is not None:
+            return self._account_id
 
         try:
-            sts = self.session.client("sts")
+            sts = self.executor.client("sts")
             response = sts.get_caller_identity()
-            return response.get("Account")
+            self._account_id = response.get("Account")
+            return self._account_id
         except Exception as e:
             logger.error(f"Error getting AWS account ID: {e}")
             return None
@@ -0,0 +1,164 @@
+"""
+Concurrent executor for AWS API calls.
+
+boto3 clients are blocking, so AWS discovery runs every API call on a
+shared thread pool instead of the event loop. Calls are throttled per
+(service, region) with a RateLimiter, list/describe APIs are walked through their
+paginators, and clients are created once per (service, region).
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from ...common.resilience import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Maximum API calls per second for each service in each region (AWS throttles
+# per account and region)
+DEFAULT_RATE_LIMITS: dict[str, int] = {
+    "ec2": 20,
+    "eks": 10,
+    "rds": 10,
+    "s3": 50,
+    "lambda": 15,
+    "dynamodb": 10,
+    "elbv2": 10,
+    "sts": 5,
+}
+DEFAULT_RATE_LIMIT = 10
+
+
+class AWSCallExecutor:
+    """Runs boto3 calls on a thread pool with per-service, per-region rate limits."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[str, str | None], Any],
+        max_workers: int = 10,
+        rate_limits: dict[str, int] | None = None,
+    ):
+        """
+        Initialize AWS call executor.
+
+        Args:
+            client_factory: Creates a boto3 client from a service name and region
+            max_workers: Maximum concurrent API calls
+            rate_limits: Maximum calls per second by service (applied in each
+                region), overriding DEFAULT_RATE_LIMITS
+        """
+        self._client_factory = client_factory
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aws-discovery")
+        self._rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self._limiters: dict[tuple[str, str | None], RateLimiter] = {}
+        self._clients: dict[tuple[str, str | None], Any] = {}
+        # boto3 sessions are not thread-safe, so clients are created one at a time
+        self._clients_lock = threading.Lock()
+
+    def client(self, service: str, region: str | None = None) -> Any:
+        """
+        Get the client of a service in a region, creating it on first use.
+
+        Args:
+            service: AWS service name (e.g. "ec2")
+            region: AWS region (None for the session's default)
+
+        Returns:
+            boto3 client
+        """
+        key = (service, region)
+        with self._clients_lock:
+            if key not in self._clients:
+                self._clients[key] = self._client_factory(service, region)
+            return self._clients[key]
+
+    def _limiter(self, service: str, region: str | None) -> RateLimiter:
+        """Get the rate limiter of a service in a region."""
+        key = (service, region)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            max_calls = self._rate_limits.get(service, DEFAULT_RATE_LIMIT)
+            limiter = self._limiters[key] = RateLimiter(max_calls=max_calls, time_window=1.0)
+        return limiter
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking function on the thread pool.
+
+        Args:
+            func: Function to run
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Result of the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, partial(func, *args, **kwargs))
+
+    async def call(self, service: str, region: str | None, operation: str, **kwargs: Any) -> dict:
+        """
+        Call an API operation once.
+
+        Args:
+            service: AWS service name
+            region: AWS region (None for the session's default)
+            operation: Client method name (e.g. "describe_cluster")
+            **kwargs: Operation parameters
+
+        Returns:
+            API response
+        """
+        await self._limiter(service, region).acquire()
+        client = await self.run(self.client, service, region)
+        return await self.run(getattr(client, operation), **kwargs)
+
+    async def paginate(
+        self,
+        service: str,
+        region: str | None,
+        operation: str,
+        result_key: str,
+        **kwargs: Any,
+    ) -> list:
+        """
+        Collect the items of every page of a list/describe operation.
+
+        Each page counts as one call against the service's rate limit in the region.
+        Operations without a paginator are called once.
+
+        Args:
+            service: AWS service name
+            region: AWS region (None for the session's default)
+            operation: Client method name (e.g. "describe_instances")
+            result_key: Key of the items in each page (e.g. "Reservations")
+            **kwargs: Operation parameters
+
+        Returns:
+            Items of all pages, in order
+        """
+        client = await self.run(self.client, service, region)
+        if not client.can_paginate(operation):
+            response = await self.call(service, region, operation, **kwargs)
+            return list(response.get(result_key, []))
+
+        limiter = self._limiter(service, region)
+        pages = iter(client.get_paginator(operation).paginate(**kwargs))
+        items: list = []
+        while True:
+            await limiter.acquire()
+            page = await self.run(next, pages, None)
+            if page is None:
+                # The last page had no next token, so no request was made
+                await limiter.refund()
+                return items
+            items.extend(page.get(result_key, []))
+
+    def shutdown(self) -> None:
+        """Stop the thread pool once running calls finish."""
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,211 @@
+"""
+Indexed dependency matching for Azure resources.
+
+Dependencies are inferred in two phases (see
+AzureDiscoverer._discover_dependencies):
+
+- Hierarchical parents (e.g. the SQL server of a database) are resolved
+  through a trie of resource ID path segments, walking only the child's own
+  ID instead of scanning every resource.
+- Heuristic patterns become rules of the shared DependencyRuleEngine,
+  scoped to the resource group, so each source is only paired with the
+  resources of its own group that a pattern can match.
+
+Matching is linear in the number of resources plus the number of matches.
+"""
+
+from collections.abc import Iterable, Iterator
+
+from ..dependency_rules import DependencyPattern, DependencyRuleEngine, rules_from_patterns
+from ..models import DependencyCategory, DependencyType, DiscoveredResource, ResourceDependency
+
+# Child resource type -> (parent resource type, description)
+HIERARCHICAL_PARENTS = {
+    "sql_database": (
+        "sql_server",
+        "SQL Database is hosted on SQL Server (verified by resource ID)",
+    ),
+    "servicebus_topic": (
+        "servicebus_namespace",
+        "Service Bus Topic is in Namespace (verified by resource ID)",
+    ),
+    "servicebus_queue": (
+        "servicebus_namespace",
+        "Service Bus Queue is in Namespace (verified by resource ID)",
+    ),
+}
+
+
+class _TrieNode:
+    """Node of a resource ID trie."""
+
+    __slots__ = ("children", "resources")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.resources: list[DiscoveredResource] = []
+
+
+class ResourceIdTrie:
+    """Trie of resource IDs split into case-insensitive path segments."""
+
+    def __init__(self, resources: Iterable[DiscoveredResource] = ()):
+        """
+        Initialize resource ID trie.
+
+        Args:
+            resources: Resources to add
+        """
+        self._root = _TrieNode()
+        for resource in resources:
+            self.add(resource)
+
+    @staticmethod
+    def _segments(resource_id: str) -> list[str]:
+        """Split a resource ID into lowercase path segments."""
+        return [segment for segment in resource_id.lower().split("/") if segment]
+
+    def add(self, resource: DiscoveredResource) -> None:
+        """
+        Add a resource under its ID.
+
+        Args:
+            resource: Resource to add
+        """
+        node = self._root
+        for segment in self._segments(resource.id):
+            node = node.children.setdefault(segment, _TrieNode())
+        node.resources.append(resource)
+
+    def ancestors(self, resource_id: str) -> Iterator[DiscoveredResource]:
+        """
+        Iterate over the resources whose ID is a path prefix of an ID.
+
+        Args:
+            resource_id: Resource ID to look up
+
+        Yields:
+            Resources at every proper prefix of the ID, nearest first
+        """
+        found = []
+        node = self._root
+        segments = self._segments(resource_id)
+        for segment in segments[:-1]:
+            node = node.children.get(segment)
+            if node is None:
+                break
+            found.append(node.resources)
+        for resources in reversed(found):
+            yield from resources
+
+    def find_parent(self, resource_id: str, parent_type: str) -> DiscoveredResource | None:
+        """
+        Find the nearest ancestor of a resource with a given type.
+
+        Args:
+            resource_id: ID of the child resource
+            parent_type: Resource type of the parent
+
+        Returns:
+            Nearest ancestor of that type, or None
+        """
+        for resource in self.ancestors(resource_id):
+            if resource.resource_type == parent_type:
+                return resource
+        return None
+
+
+class DependencyMatcher:
+    """Infers resource dependencies from the hierarchy and indexed patterns."""
+
+    def __init__(self, patterns: Iterable[DependencyPattern], profile: bool = False):
+        """
+        Initialize dependency matcher.
+
+        Args:
+            patterns: Dependency patterns; for a pair of resources matched by
+                more than one pattern, the first one wins
+            profile: Whether the rule engine times its phases and rules
+        """
+        self.engine = DependencyRuleEngine(
+            rules_from_patterns(
+                patterns,
+                scope=("resource_group",),
+                discovered_method="heuristic_same_rg",
+                description_suffix=" in same resource group",
+            ),
+            profile=profile,
+        )
+
+    def match(self, resources: list[DiscoveredResource]) -> list[ResourceDependency]:
+        """
+        Infer hierarchical and pattern-based dependencies.
+
+        Args:
+            resources: Discovered resources
+
+        Returns:
+            Hierarchical dependencies followed by the pattern-based ones,
+            without duplicate (source, target) pairs
+        """
+        dependencies = self.hierarchical_dependencies(resources)
+        existing_pairs = {(d.source_id, d.target_id) for d in dependencies}
+        dependencies.extend(self.pattern_dependencies(resources, existing_pairs))
+        return dependencies
+
+    @staticmethod
+    def hierarchical_dependencies(
+        resources: list[DiscoveredResource],
+    ) -> list[ResourceDependency]:
+        """
+        Link child resources to the parent their resource ID is nested under.
+
+        Args:
+            resources: Discovered resources
+
+        Returns:
+            One dependency per child resource whose parent was discovered
+        """
+        parent_types = {parent_type for parent_type, _ in HIERARCHICAL_PARENTS.values()}
+        trie = ResourceIdTrie(r for r in resources if r.resource_type in parent_types)
+
+        dependencies = []
+        for resource in resources:
+            hierarchy = HIERARCHICAL_PARENTS.get(resource.resource_type)
+            if hierarchy is None:
+                continue
+            parent_type, description = hierarchy
+            parent = trie.find_parent(resource.id, parent_type)
+            if parent is None:
+                continue
+            dependencies.append(
+                ResourceDependency(
+                    source_id=resource.id,
+                    target_id=parent.id,
+                    category=DependencyCategory.COMPUTE,
+                    dependency_type=DependencyType.STRONG,
+                    strength=1.0,
+                    discovered_method="resource_hierarchy",
+                    description=description,
+                )
+            )
+        return dependencies
+
+    def pattern_dependencies(
+        self,
+        resources: list[DiscoveredResource],
+        existing_pairs: set[tuple[str, str]] | None = None,
+    ) -> list[ResourceDependency]:
+        """
+        Apply the patterns to resources of the same resource group.
+
+        Args:
+            resources: Discovered resources
+            existing_pairs: (source, target) pairs that already have a
+                dependency; pairs added here are recorded in it
+
+        Returns:
+            Dependencies ordered by source, then target, as they appear in
+            resources
+        """
+        return self.engine.match(resources, existing_pairs)
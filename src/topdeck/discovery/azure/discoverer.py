@@ -4,7 +4,9 @@ Azure Resource Discoverer.
 Main orchestrator for discovering Azure resources across subscriptions.
 """
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
 from datetime import datetime
 from typing import Any
 
@@ -15,6 +17,7 @@ from azure.mgmt.resource import ResourceManagementClient
 from ...common.cache import Cache, CacheConfig
 from ...common.worker_pool import WorkerPool, WorkerPoolConfig
 from ..models import Application, DiscoveredResource, DiscoveryResult, ResourceDependency
+from .dependency_matcher import DependencyMatcher
 from .devops import AzureDevOpsDiscoverer
 from .mapper import AzureResourceMapper
 from .resources import (
@@ -25,10 +28,17 @@ from .resources import (
     discover_messaging_resources,
     discover_networking_resources,
 )
+from .streaming import ResourceIndex, ResourceRef
 
 logger = logging.getLogger(__name__)
 
 
+def _next_page(pages: Iterator[Iterable[Any]]) -> list[Any] | None:
+    """Fetch the next page of a paged Azure listing, or None after the last one."""
+    page = next(pages, None)
+    return None if page is None else list(page)
+
+
 class AzureDiscoverer:
     """
     Main class for discovering Azure resources.
@@ -51,6 +61,7 @@ class AzureDiscoverer:
         max_workers: int = 5,
         enable_cache: bool = False,
         cache_config: CacheConfig | None = None,
+        profile_dependencies: bool = False,
     ):
         """
         Initialize Azure discoverer.
@@ -65,8 +76,10 @@ class AzureDiscoverer:
             max_workers: Maximum concurrent workers for parallel discovery
             enable_cache: Enable Redis caching (default: False)
             cache_config: Optional cache configuration
+            profile_dependencies: Log where dependency rule matching spends its time
         """
         self.subscription_id = subscription_id
+        self.profile_dependencies = profile_dependencies
 
         # Set up credentials
         if credential:
@@ -124,22 +137,85 @@ class AzureDiscoverer:
             # Get all resources using Azure SDK
             logger.info(f"Discovering resources in subscription {self.subscription_id}...")
 
-            resources_iterator = self.resource_client.resources.list()
-            all_resources = []
+            listed: set[tuple[str, str]] = set()
+            async for discovered in self.iter_resources(resource_groups, errors=result.errors):
+                listed.add((discovered.region, discovered.resource_type))
+                result.add_resource(discovered)
+            self._mark_listed(result, listed, resource_groups)
+
+            logger.info(f"Found {result.resource_count} resources")
+
+            # Discover Kubernetes pods before dependency analysis
+            # This ensures pods are available for dependency pattern matching
+            pod_resources, pod_storage_deps = await self._discover_aks_pods(
+                result.resources, result
+            )
+            # Add discovered pods to the resources list BEFORE dependency analysis
+            for pod in pod_resources:
+                result.add_resource(pod)
+
+            # Discover dependencies
+            logger.info("Analyzing dependencies...")
+            dependencies = await self._discover_dependencies(result.resources)
+            for dep in dependencies:
+                result.add_dependency(dep)
+            # Add pod storage dependencies
+            for dep in pod_storage_deps:
+                result.add_dependency(dep)
+
+            logger.info(f"Found {len(dependencies) + len(pod_storage_deps)} dependencies")
+
+            # Infer applications from resources
+            logger.info("Inferring applications from resources...")
+            applications = await self._infer_applications(result.resources)
+            for app in applications:
+                result.add_application(app)
+
+            logger.info(f"Found {len(applications)} applications")
+
+        except AzureError as e:
+            error_msg = f"Azure API error: {e}"
+            result.add_error(error_msg)
+            logger.error(error_msg)
+        except Exception as e:
+            error_msg = f"Unexpected error: {e}"
+            result.add_error(error_msg)
+            logger.error(error_msg)
+
+        result.complete()
+        logger.info(result.summary())
+
+        return result
+
+    async def iter_resources(
+        self,
+        resource_groups: list[str] | None = None,
+        errors: list[str] | None = None,
+    ) -> AsyncIterator[DiscoveredResource]:
+        """
+        Iterate over the resources of the subscription as they are listed.
+
+        Resources are fetched one page at a time in a worker thread and
+        mapped as they arrive, so the SDK objects of a page are released
+        before the next page is fetched.
+
+        Args:
+            resource_groups: Optional list of resource groups to scan
+                           (if None, scans all resource groups)
+            errors: List to append mapping errors to
 
-            for resource in resources_iterator:
+        Yields:
+            Mapped resources, in listing order
+        """
+        pages = self.resource_client.resources.list().by_page()
+        while (page := await asyncio.to_thread(_next_page, pages)) is not None:
+            for resource in page:
                 # Filter by resource group if specified
                 if resource_groups:
                     resource_rg = self.mapper.extract_resource_group(resource.id)
                     if resource_rg not in resource_groups:
                         continue
 
-                all_resources.append(resource)
-
-            logger.info(f"Found {len(all_resources)} resources")
-
-            # Map Azure resources to DiscoveredResource
-            for resource in all_resources:
                 try:
                     discovered = self.mapper.map_azure_resource(
                         resource_id=resource.id,
@@ -150,37 +226,92 @@ class AzureDiscoverer:
                         properties={},  # Simplified for now
                         provisioning_state=None,
                     )
-                    result.add_resource(discovered)
                 except Exception as e:
                     error_msg = f"Failed to map resource {resource.id}: {e}"
-                    result.add_error(error_msg)
+                    if errors is not None:
+                        errors.append(error_msg)
                     logger.warning(error_msg)
+                    continue
+                yield discovered
 
-            # Discover Kubernetes pods before dependency analysis
-            # This ensures pods are available for dependency pattern matching
-            pod_resources, pod_storage_deps = await self._discover_aks_pods(result.resources)
-            # Add discovered pods to the resources list BEFORE dependency analysis
+    async def stream_all_resources(
+        self,
+        write_chunk: Callable[[list[DiscoveredResource]], Awaitable[Any]],
+        resource_groups: list[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> tuple[DiscoveryResult, ResourceIndex]:
+        """
+        Discover all resources, handing them over in chunks as they are listed.
+
+        Unlike discover_all_resources, resources are not collected in the
+        result. Each chunk of ``chunk_size`` resources is passed to
+        ``write_chunk``, which runs while the next pages are fetched, and
+        only a compact ResourceIndex of the resources is kept. Pods,
+        dependencies and applications are then derived from the index as in
+        discover_all_resources.
+
+        Args:
+            write_chunk: Coroutine function storing a chunk of resources; calls
+                never overlap
+            resource_groups: Optional list of resource groups to scan
+                           (if None, scans all resource groups)
+            chunk_size: Maximum resources per chunk
+
+        Returns:
+            Tuple of (result with dependencies, applications and errors but
+            without resources, index of the streamed resources)
+        """
+        result = DiscoveryResult(subscription_id=self.subscription_id)
+        index = ResourceIndex()
+        chunk: list[DiscoveredResource] = []
+        pending: asyncio.Task | None = None
+
+        async def drain() -> None:
+            nonlocal pending
+            if pending is not None:
+                task, pending = pending, None
+                await task
+
+        async def flush() -> None:
+            nonlocal chunk, pending
+            await drain()
+            pending = asyncio.create_task(write_chunk(chunk))
+            chunk = []
+
+        async def add(resource: DiscoveredResource) -> None:
+            if index.add(resource):
+                chunk.append(resource)
+            if len(chunk) >= chunk_size:
+                await flush()
+
+        try:
+            logger.info(f"Streaming resources of subscription {self.subscription_id}...")
+            listed: set[tuple[str, str]] = set()
+            async for discovered in self.iter_resources(resource_groups, errors=result.errors):
+                listed.add((discovered.region, discovered.resource_type))
+                await add(discovered)
+            self._mark_listed(result, listed, resource_groups)
+
+            pod_resources, pod_storage_deps = await self._discover_aks_pods(index.retained, result)
             for pod in pod_resources:
-                result.add_resource(pod)
+                await add(pod)
+            if chunk:
+                await flush()
+            logger.info(f"Streamed {len(index)} resources ({len(index.retained)} retained)")
 
-            # Discover dependencies
+            # The last chunk is written while dependencies are analyzed
             logger.info("Analyzing dependencies...")
-            dependencies = await self._discover_dependencies(result.resources)
-            for dep in dependencies:
-                result.add_dependency(dep)
-            # Add pod storage dependencies
-            for dep in pod_storage_deps:
+            dependencies = await self._discover_dependencies(index.refs, retained=index.retained)
+            for dep in dependencies + pod_storage_deps:
                 result.add_dependency(dep)
+            logger.info(f"Found {result.dependency_count} dependencies")
 
-            logger.info(f"Found {len(dependencies) + len(pod_storage_deps)} dependencies")
-
-            # Infer applications from resources
             logger.info("Inferring applications from resources...")
-            applications = await self._infer_applications(result.resources)
-            for app in applications:
+            for app in await self._infer_applications(index.retained):
                 result.add_application(app)
+            logger.info(f"Found {result.application_count} applications")
 
-            logger.info(f"Found {len(applications)} applications")
+            await drain()
 
         except AzureError as e:
             error_msg = f"Azure API error: {e}"
@@ -191,23 +322,47 @@ class AzureDiscoverer:
             result.add_error(error_msg)
             logger.error(error_msg)
 
+        if pending is not None:
+            # Discovery failed while a chunk was being written
+            await asyncio.gather(pending, return_exceptions=True)
+
         result.complete()
-        logger.info(result.summary())
+        return result, index
+
+    @staticmethod
+    def _mark_listed(
+        result: DiscoveryResult,
+        listed: set[tuple[str, str]],
+        resource_groups: list[str] | None,
+    ) -> None:
+        """
+        Record the partitions of a complete subscription listing as scanned.
 
-        return result
+        Only a listing of every resource group that mapped every resource is
+        complete. Partitions without any listed resource are not known to the
+        listing and are not recorded, so their stored resources are kept.
+        """
+        if resource_groups or result.has_errors:
+            return
+        for region, resource_type in listed:
+            result.mark_scanned(region, resource_type)
 
     async def _discover_aks_pods(
         self,
         resources: list[DiscoveredResource],
+        result: DiscoveryResult,
     ) -> tuple[list[DiscoveredResource], list[ResourceDependency]]:
         """
         Discover Kubernetes pods and their storage dependencies from AKS clusters.
         
         Helper method to discover pods before dependency analysis, ensuring they're
-        available for dependency pattern matching.
+        available for dependency pattern matching. Failures are added to the
+        result's errors; if the run had none, the pods of the clusters' regions
+        are recorded as scanned.
         
         Args:
             resources: List of discovered resources (must include AKS clusters)
+            result: Discovery result to record errors and scanned partitions in
             
         Returns:
             Tuple of (pod resources, pod storage dependencies)
@@ -219,9 +374,17 @@ class AzureDiscoverer:
             return [], []
             
         logger.info(f"Discovering pods for {len(aks_resources)} AKS clusters...")
+        errors: list[str] = []
         pod_resources, pod_storage_deps = await discover_aks_pods_and_storage(
-            self.subscription_id, self.credential, aks_resources
+            self.subscription_id, self.credential, aks_resources, errors=errors
         )
+        # After an earlier error a cluster sharing a region with these may
+        # not have been listed, so its pods would look stale
+        if not errors and not result.has_errors:
+            for aks in aks_resources:
+                result.mark_scanned(aks.region, "pod")
+        for error in errors:
+            result.add_error(error)
         logger.info(f"Discovered {len(pod_resources)} pods with {len(pod_storage_deps)} storage dependencies")
         
         return pod_resources, pod_storage_deps
@@ -435,7 +598,8 @@ class AzureDiscoverer:
 
     async def _discover_dependencies(
         self,
-        resources: list[DiscoveredResource],
+        resources: list[DiscoveredResource] | list[ResourceRef],
+        retained: list[DiscoveredResource] | None = None,
     ) -> list[ResourceDependency]:
         """
         Discover dependencies between resources using a two-phase approach.
@@ -450,129 +614,36 @@ class AzureDiscoverer:
         - Scoped to same resource group (Azure best practice)
         - Confidence based on typical usage patterns (strength 0.6-0.9)
 
+        Both phases use the indexes of DependencyMatcher, so they scale
+        linearly with the number of resources.
+
         Args:
-            resources: List of discovered resources
+            resources: List of discovered resources, or references to them
+            retained: Full resources for the Service Bus and AKS detectors
+                when ``resources`` are references (defaults to ``resources``)
 
         Returns:
             List of discovered dependencies
         """
         from .resources import detect_servicebus_dependencies
-        from ..models import (
-            DependencyCategory,
-            DependencyType,
-            ResourceDependency,
-        )
 
-        dependencies = []
+        if retained is None:
+            retained = resources
 
-        # Get dependency patterns
-        dependency_patterns = self._get_dependency_patterns()
-
-        # Phase 1: Detect precise hierarchical dependencies based on resource IDs
-        # These are the most accurate as they're based on actual Azure resource structure
-        for resource in resources:
-            resource_id = resource.id.lower()
-            
-            # SQL Database -> SQL Server (precise: database ID contains server ID)
-            if resource.resource_type == "sql_database":
-                # Resource ID format: /subscriptions/{sub}/resourceGroups/{rg}/providers/Microsoft.Sql/servers/{server}/databases/{db}
-                for other in resources:
-                    if other.resource_type == "sql_server" and other.id.lower() in resource_id:
-                        dep = ResourceDependency(
-                            source_id=resource.id,
-                            target_id=other.id,
-                            category=DependencyCategory.COMPUTE,
-                            dependency_type=DependencyType.STRONG,
-                            strength=1.0,
-                            discovered_method="resource_hierarchy",
-                            description="SQL Database is hosted on SQL Server (verified by resource ID)",
-                        )
-                        dependencies.append(dep)
-                        break
-            
-            # Service Bus Topic -> Service Bus Namespace (precise: topic ID contains namespace ID)
-            elif resource.resource_type == "servicebus_topic":
-                for other in resources:
-                    if other.resource_type == "servicebus_namespace" and other.id.lower() in resource_id:
-                        dep = ResourceDependency(
-                            source_id=resource.id,
-                            target_id=other.id,
-                            category=DependencyCategory.COMPUTE,
-                            dependency_type=DependencyType.STRONG,
-                            strength=1.0,
-                            discovered_method="resource_hierarchy",
-                            description="Service Bus Topic is in Namespace (verified by resource ID)",
-                        )
-                        dependencies.append(dep)
-                        break
-            
-            # Service Bus Queue -> Service Bus Namespace
-            elif resource.resource_type == "servicebus_queue":
-                for other in resources:
-                    if other.resource_type == "servicebus_namespace" and other.id.lower() in resource_id:
-                        dep = ResourceDependency(
-                            source_id=resource.id,
-                            target_id=other.id,
-                            category=DependencyCategory.COMPUTE,
-                            dependency_type=DependencyType.STRONG,
-                            strength=1.0,
-                            discovered_method="resource_hierarchy",
-                            description="Service Bus Queue is in Namespace (verified by resource ID)",
-                        )
-                        dependencies.append(dep)
-                        break
-
-        # Phase 2: Apply heuristic-based dependency patterns
-        # Build a set of existing dependency pairs for O(1) lookup performance
-        existing_pairs = {(d.source_id, d.target_id) for d in dependencies}
-        
-        for source_resource in resources:
-            for target_resource in resources:
-                # Skip self-dependencies
-                if source_resource.id == target_resource.id:
-                    continue
-                
-                # Check if resources are in the same resource group (common pattern in Azure)
-                same_rg = source_resource.resource_group == target_resource.resource_group
-                
-                # Only create dependencies for resources in the same resource group
-                # This is a reasonable heuristic as Azure resources typically interact within the same RG
-                if not same_rg:
-                    continue
-                
-                # Check each dependency pattern
-                for pattern in dependency_patterns:
-                    source_type, target_type, category, dep_type, strength, description = pattern
-                    
-                    if (source_resource.resource_type == source_type and 
-                        target_resource.resource_type == target_type):
-                        
-                        # Skip if we already have a dependency (O(1) lookup using set)
-                        pair = (source_resource.id, target_resource.id)
-                        if pair in existing_pairs:
-                            continue
-                        
-                        dep = ResourceDependency(
-                            source_id=source_resource.id,
-                            target_id=target_resource.id,
-                            category=category,
-                            dependency_type=dep_type,
-                            strength=strength,
-                            discovered_method="heuristic_same_rg",
-                            description=f"{description} in same resource group",
-                        )
-                        dependencies.append(dep)
-                        existing_pairs.add(pair)  # Track to avoid duplicates
+        matcher = DependencyMatcher(
+            self._get_dependency_patterns(), profile=self.profile_dependencies
+        )
+        dependencies = matcher.match(resources)
 
         # Detect Service Bus messaging dependencies (more specific detection)
         servicebus_deps = await detect_servicebus_dependencies(
-            resources, self.subscription_id, self.credential
+            retained, self.subscription_id, self.credential
         )
         dependencies.extend(servicebus_deps)
 
         # Detect comprehensive AKS resource dependencies from ConfigMaps, Secrets, and env vars
         aks_deps = await detect_aks_resource_dependencies(
-            resources, self.subscription_id, self.credential
+            retained, self.subscription_id, self.credential
         )
         dependencies.extend(aks_deps)
 
@@ -771,9 +842,17 @@ class AzureDiscoverer:
 
             logger.info(f"Discovered {len(result.resources)} resources across all types")
 
+            summary = self._worker_pool.get_summary()
+            if summary["failure"] > 0:
+                error_msg = f"{summary['failure']} discovery tasks failed"
+                result.add_error(error_msg)
+                logger.error(error_msg)
+
             # Discover Kubernetes pods before dependency analysis
             # This ensures pods are available for dependency pattern matching
-            pod_resources, pod_storage_deps = await self._discover_aks_pods(result.resources)
+            pod_resources, pod_storage_deps = await self._discover_aks_pods(
+                result.resources, result
+            )
             # Add discovered pods to the resources list BEFORE dependency analysis
             for pod in pod_resources:
                 result.add_resource(pod)
@@ -795,11 +874,6 @@ class AzureDiscoverer:
                 result.add_application(app)
             logger.info(f"Found {len(applications)} applications")
 
-            # Log worker pool summary
-            summary = self._worker_pool.get_summary()
-            if summary["failure"] > 0:
-                logger.warning(f"{summary['failure']} discovery tasks failed")
-
         except Exception as e:
             error_msg = f"Parallel discovery error: {e}"
             result.add_error(error_msg)
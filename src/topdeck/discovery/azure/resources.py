@@ -944,6 +944,7 @@ async def discover_aks_pods_and_storage(
     subscription_id: str,
     credential,
     aks_resources: list[DiscoveredResource],
+    errors: list[str] | None = None,
 ) -> tuple[list[DiscoveredResource], list[ResourceDependency]]:
     """
     Discover Kubernetes pods and their storage dependencies from AKS clusters.
@@ -964,6 +965,7 @@ async def discover_aks_pods_and_storage(
         subscription_id: Azure subscription ID
         credential: Azure credential object
         aks_resources: List of AKS cluster resources
+        errors: List to append errors to for pods that could not be listed
         
     Returns:
         Tuple of (discovered pods as DiscoveredResource, storage dependencies)
@@ -973,9 +975,14 @@ async def discover_aks_pods_and_storage(
     pods = []
     dependencies = []
     mapper = AzureResourceMapper()
+
+    def record_error(error_msg: str) -> None:
+        if errors is not None:
+            errors.append(error_msg)
+        logger.error(error_msg)
     
     if ContainerServiceClient is None or k8s_client is None or yaml is None:
-        logger.warning("Kubernetes client or yaml not available, skipping pod discovery")
+        record_error("Kubernetes client or yaml not available, skipping pod discovery")
         return pods, dependencies
         
     try:
@@ -985,6 +992,7 @@ async def discover_aks_pods_and_storage(
             try:
                 resource_group = aks.resource_group
                 if not resource_group:
+                    record_error(f"No resource group for AKS cluster {aks.name}, skipping its pods")
                     continue
                     
                 # Get cluster credentials
@@ -994,6 +1002,7 @@ async def discover_aks_pods_and_storage(
                     )
                     
                     if not hasattr(creds, "kubeconfigs") or not creds.kubeconfigs:
+                        record_error(f"No kubeconfig for AKS cluster {aks.name}, skipping its pods")
                         continue
                         
                     # Load kubeconfig
@@ -1131,21 +1140,21 @@ async def discover_aks_pods_and_storage(
                                                     dependencies.append(dep)
                                                     
                                 except Exception as e:
-                                    logger.error(f"Error discovering pod {pod.metadata.name}: {e}")
+                                    record_error(f"Error discovering pod {pod.metadata.name}: {e}")
                                     
                         except Exception as e:
-                            logger.debug(f"Error listing pods in {ns_name}: {e}")
+                            record_error(f"Error listing pods in {aks.name}/{ns_name}: {e}")
                             
                 except Exception as e:
-                    logger.debug(f"Error getting AKS credentials for {aks.name}: {e}")
+                    record_error(f"Error getting AKS credentials for {aks.name}: {e}")
                     
             except Exception as e:
-                logger.error(f"Error processing AKS cluster {aks.name}: {e}")
+                record_error(f"Error processing AKS cluster {aks.name}: {e}")
                 
         logger.info(f"Discovered {len(pods)} pods and {len(dependencies)} storage dependencies")
         
     except Exception as e:
-        logger.error(f"Error discovering AKS pods and storage: {e}")
+        record_error(f"Error discovering AKS pods and storage: {e}")
         
     return pods, dependencies
 
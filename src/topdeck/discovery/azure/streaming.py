@@ -0,0 +1,114 @@
+"""
+Compact resource index for streamed Azure discovery.
+
+When resources are streamed to storage (see
+AzureDiscoverer.stream_all_resources), only a ResourceRef (ID, name, type,
+region, resource group and subscription) of each resource is kept for
+dependency matching. Full DiscoveredResource objects are retained only for
+the types that later phases read in detail: AKS clusters for pod discovery
+and the resources that the Service Bus/AKS detectors and application
+inference inspect.
+"""
+
+from collections.abc import Iterable
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+from ..models import DiscoveredResource
+
+# Resource types kept in full for pod discovery, the Service Bus/AKS
+# dependency detectors and application inference
+RETAINED_TYPES = frozenset(
+    {
+        "aks",
+        "app_service",
+        "function_app",
+        "virtual_machine",
+        "container_instance",
+        "servicebus_namespace",
+        "servicebus_topic",
+        "servicebus_queue",
+        "servicebus_subscription",
+        "sql_server",
+        "redis",
+        "storage_account",
+    }
+)
+
+_NO_PROPERTIES: MappingProxyType[str, Any] = MappingProxyType({})
+
+
+class ResourceRef(NamedTuple):
+    """Fields of a resource needed to match dependencies."""
+
+    id: str
+    name: str
+    resource_type: str
+    region: str
+    resource_group: str | None
+    subscription_id: str | None
+
+    @property
+    def properties(self) -> MappingProxyType[str, Any]:
+        """Empty properties, so refs can be matched like resources."""
+        return _NO_PROPERTIES
+
+    @classmethod
+    def from_resource(cls, resource: DiscoveredResource) -> "ResourceRef":
+        """
+        Create a reference to a discovered resource.
+
+        Args:
+            resource: Discovered resource
+
+        Returns:
+            ResourceRef with the resource's identifying fields
+        """
+        return cls(
+            resource.id,
+            resource.name,
+            resource.resource_type,
+            resource.region,
+            resource.resource_group,
+            resource.subscription_id,
+        )
+
+
+class ResourceIndex:
+    """References to every streamed resource, plus the retained ones in full."""
+
+    def __init__(self, retained_types: Iterable[str] = RETAINED_TYPES):
+        """
+        Initialize resource index.
+
+        Args:
+            retained_types: Resource types kept as full DiscoveredResource objects
+        """
+        self.retained_types = frozenset(retained_types)
+        self.refs: list[ResourceRef] = []
+        self.retained: list[DiscoveredResource] = []
+        self._ids: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __contains__(self, resource_id: object) -> bool:
+        return resource_id in self._ids
+
+    def add(self, resource: DiscoveredResource) -> bool:
+        """
+        Index a resource.
+
+        Args:
+            resource: Discovered resource
+
+        Returns:
+            False if a resource with the same ID was already indexed
+        """
+        if resource.id in self._ids:
+            return False
+        self._ids.add(resource.id)
+        self.refs.append(ResourceRef.from_resource(resource))
+        if resource.resource_type in self.retained_types:
+            self.retained.append(resource)
+        return True
@@ -0,0 +1,235 @@
+"""
+Content fingerprints and change-sets for incremental discovery.
+
+Every discovered node and relationship is fingerprinted with a stable hash
+of its Neo4j properties. Comparing fingerprints with the ones stored in the
+graph tells which items are new, changed or gone, so a discovery run only
+writes the delta. The resulting :class:`ChangeSet` is handed to downstream
+caches and analyzers so they can invalidate selectively.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+# Property storing the fingerprint on nodes and relationships
+CONTENT_HASH_PROPERTY = "content_hash"
+
+# Properties that change on every run without the item changing
+VOLATILE_PROPERTIES = frozenset({"discovered_at", "last_seen", CONTENT_HASH_PROPERTY})
+
+# Relationship identity: (source_id, target_id, discovered_method)
+EdgeKey = tuple[str, str, str]
+
+
+def content_hash(properties: dict[str, Any]) -> str:
+    """
+    Compute a stable fingerprint of node or relationship properties.
+
+    Volatile timestamps are ignored and keys are sorted, so the hash only
+    changes when the discovered content changes.
+
+    Args:
+        properties: Properties as returned by ``to_neo4j_properties()``
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    stable = {
+        key: value for key, value in properties.items() if key not in VOLATILE_PROPERTIES
+    }
+    encoded = json.dumps(stable, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def edge_key(row: dict[str, Any]) -> EdgeKey:
+    """
+    Get the identity of a relationship upsert row.
+
+    Args:
+        row: Row with source_id, target_id and discovered_method
+
+    Returns:
+        (source_id, target_id, discovered_method)
+    """
+    return (row["source_id"], row["target_id"], row["discovered_method"])
+
+
+@dataclass
+class ChangeSet:
+    """
+    Nodes and relationships changed by a discovery run.
+
+    Attributes:
+        added: New node IDs per kind (e.g. ``resources``)
+        updated: Node IDs whose content changed, per kind
+        deleted: Node IDs no longer discovered, per kind
+        added_edges: New relationships
+        updated_edges: Relationships whose properties changed
+        deleted_edges: Relationships no longer discovered
+        unchanged: Number of nodes and relationships skipped as unchanged
+    """
+
+    added: dict[str, set[str]] = field(default_factory=dict)
+    updated: dict[str, set[str]] = field(default_factory=dict)
+    deleted: dict[str, set[str]] = field(default_factory=dict)
+    added_edges: set[EdgeKey] = field(default_factory=set)
+    updated_edges: set[EdgeKey] = field(default_factory=set)
+    deleted_edges: set[EdgeKey] = field(default_factory=set)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the run changed nothing."""
+        return not (
+            any(self.added.values())
+            or any(self.updated.values())
+            or any(self.deleted.values())
+            or self.added_edges
+            or self.updated_edges
+            or self.deleted_edges
+        )
+
+    @property
+    def node_ids(self) -> set[str]:
+        """IDs of all added, updated or deleted nodes."""
+        ids: set[str] = set()
+        for changes in (self.added, self.updated, self.deleted):
+            for kind_ids in changes.values():
+                ids.update(kind_ids)
+        return ids
+
+    @property
+    def affected_ids(self) -> set[str]:
+        """
+        IDs of nodes whose own data or relationships changed.
+
+        This is the set caches keyed by resource should invalidate.
+        """
+        ids = self.node_ids
+        for edges in (self.added_edges, self.updated_edges, self.deleted_edges):
+            for source_id, target_id, _ in edges:
+                ids.add(source_id)
+                ids.add(target_id)
+        return ids
+
+    @property
+    def topology_changed(self) -> bool:
+        """Whether nodes or relationships were added or removed."""
+        return bool(
+            any(self.added.values())
+            or any(self.deleted.values())
+            or self.added_edges
+            or self.deleted_edges
+        )
+
+    def diff_nodes(
+        self, kind: str, rows: list[dict[str, Any]], stored: dict[str, str | None]
+    ) -> list[dict[str, Any]]:
+        """
+        Record node changes and return the rows that need writing.
+
+        Args:
+            kind: Node kind, e.g. ``resources``
+            rows: Discovered node rows carrying ``content_hash``
+            stored: Stored fingerprint per node ID (None for nodes written
+                before fingerprints existed)
+
+        Returns:
+            Rows that are new or changed
+        """
+        changed = []
+        for row in rows:
+            node_id = row["id"]
+            if node_id not in stored:
+                self.added.setdefault(kind, set()).add(node_id)
+            elif stored[node_id] != row[CONTENT_HASH_PROPERTY]:
+                self.updated.setdefault(kind, set()).add(node_id)
+            else:
+                self.unchanged += 1
+                continue
+            changed.append(row)
+        return changed
+
+    def diff_edges(
+        self, rows: list[dict[str, Any]], stored: dict[EdgeKey, str | None]
+    ) -> list[dict[str, Any]]:
+        """
+        Record relationship changes and return the rows that need writing.
+
+        Args:
+            rows: Discovered relationship upsert rows whose properties carry
+                ``content_hash``
+            stored: Stored fingerprint per relationship key
+
+        Returns:
+            Rows that are new or changed
+        """
+        changed = []
+        for row in rows:
+            key = edge_key(row)
+            if key not in stored:
+                self.added_edges.add(key)
+            elif stored[key] != row["properties"][CONTENT_HASH_PROPERTY]:
+                self.updated_edges.add(key)
+            else:
+                self.unchanged += 1
+                continue
+            changed.append(row)
+        return changed
+
+    def record_deleted(self, kind: str, ids: Iterable[str]) -> None:
+        """
+        Record deleted nodes.
+
+        Args:
+            kind: Node kind, e.g. ``resources``
+            ids: Deleted node IDs
+        """
+        ids = set(ids)
+        if ids:
+            self.deleted.setdefault(kind, set()).update(ids)
+
+    def merge(self, other: "ChangeSet") -> None:
+        """
+        Add the changes of another change-set to this one.
+
+        Args:
+            other: Change-set to merge in
+        """
+        for mine, theirs in (
+            (self.added, other.added),
+            (self.updated, other.updated),
+            (self.deleted, other.deleted),
+        ):
+            for kind, ids in theirs.items():
+                mine.setdefault(kind, set()).update(ids)
+        self.added_edges |= other.added_edges
+        self.updated_edges |= other.updated_edges
+        self.deleted_edges |= other.deleted_edges
+        self.unchanged += other.unchanged
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Summarize the change-set for logging and API responses.
+
+        Returns:
+            Dictionary with counts per change type
+        """
+
+        def counts(changes: dict[str, set[str]]) -> dict[str, int]:
+            return {kind: len(ids) for kind, ids in changes.items() if ids}
+
+        return {
+            "added": counts(self.added),
+            "updated": counts(self.updated),
+            "deleted": counts(self.deleted),
+            "edges": {
+                "added": len(self.added_edges),
+                "updated": len(self.updated_edges),
+                "deleted": len(self.deleted_edges),
+            },
+            "unchanged": self.unchanged,
+        }
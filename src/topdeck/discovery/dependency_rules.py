@@ -0,0 +1,296 @@
+"""
+Declarative dependency rules shared by the cloud discoverers.
+
+A rule states that resources of a source type likely depend on resources of
+a target type within a scope, e.g. the same region, resource group, project
+or VPC. The rule engine compiles the rules into hash joins: resources are
+indexed once by (target type, scope key), and each source only looks up the
+buckets of its own rules. Matching is linear in the number of resources plus
+the number of matches, instead of comparing every pair of resources against
+every rule.
+
+Scopes:
+
+- ``region``: same region
+- ``resource_group``: same Azure resource group
+- ``project``: same GCP project, AWS account or Azure subscription
+  (``subscription_id``)
+- ``vpc``: same VPC or VPC network (``properties["vpc_id"]``); resources
+  whose VPC is unknown are not matched by VPC-scoped rules
+"""
+
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+
+from .models import DependencyCategory, DependencyType, DiscoveredResource, ResourceDependency
+
+logger = logging.getLogger(__name__)
+
+# (source_type, target_type, category, dependency_type, strength, description)
+DependencyPattern = tuple[str, str, DependencyCategory, DependencyType, float, str]
+
+
+@dataclass(frozen=True)
+class Scope:
+    """How resources are partitioned for a scope."""
+
+    key: Callable[[DiscoveredResource], Hashable]
+    # Whether resources without a key are left out (instead of sharing one partition)
+    strict: bool = False
+
+
+SCOPES: dict[str, Scope] = {
+    "region": Scope(lambda r: r.region),
+    "resource_group": Scope(lambda r: r.resource_group),
+    "project": Scope(lambda r: r.subscription_id),
+    "vpc": Scope(lambda r: r.properties.get("vpc_id"), strict=True),
+}
+
+
+@dataclass(frozen=True)
+class DependencyRule:
+    """Likely dependency between two resource types within a scope."""
+
+    source_type: str
+    target_type: str
+    category: DependencyCategory
+    dependency_type: DependencyType
+    strength: float
+    description: str
+    scope: tuple[str, ...] = ("region",)
+    discovered_method: str = "heuristic"
+
+    @property
+    def name(self) -> str:
+        """Readable rule name."""
+        return f"{self.source_type}->{self.target_type} [{', '.join(self.scope)}]"
+
+
+@dataclass
+class RuleStats:
+    """Counters of one rule."""
+
+    candidates: int = 0  # Same-scope targets looked at
+    hits: int = 0  # Dependencies created
+    seconds: float = 0.0  # Join time (profile mode only)
+
+
+def rules_from_patterns(
+    patterns: Iterable[DependencyPattern],
+    scope: tuple[str, ...],
+    discovered_method: str,
+    description_suffix: str = "",
+) -> list[DependencyRule]:
+    """
+    Build rules from dependency pattern tuples.
+
+    Args:
+        patterns: (source_type, target_type, category, dependency_type,
+            strength, description) tuples
+        scope: Scope names of every rule
+        discovered_method: Discovery method recorded on the dependencies
+        description_suffix: Text appended to every description
+
+    Returns:
+        One rule per pattern
+    """
+    return [
+        DependencyRule(
+            source_type=source_type,
+            target_type=target_type,
+            category=category,
+            dependency_type=dependency_type,
+            strength=strength,
+            description=f"{description}{description_suffix}",
+            scope=scope,
+            discovered_method=discovered_method,
+        )
+        for source_type, target_type, category, dependency_type, strength, description in patterns
+    ]
+
+
+class DependencyRuleEngine:
+    """Matches dependency rules against resources through hash joins on scope keys."""
+
+    def __init__(self, rules: Iterable[DependencyRule], profile: bool = False):
+        """
+        Initialize dependency rule engine.
+
+        Args:
+            rules: Rules to apply; for a pair of resources matched by more than
+                one rule, the first one wins
+            profile: Whether to time the match phases and every rule
+
+        Raises:
+            ValueError: If a rule uses an unknown scope
+        """
+        self.rules = list(rules)
+        self.profile = profile
+        self._rules_by_source: dict[str, list[int]] = defaultdict(list)
+        self._scopes_by_target: dict[str, set[tuple[str, ...]]] = defaultdict(set)
+        for position, rule in enumerate(self.rules):
+            unknown = [name for name in rule.scope if name not in SCOPES]
+            if unknown:
+                raise ValueError(f"Unknown scope {unknown[0]!r} in rule {rule.name}")
+            self._rules_by_source[rule.source_type].append(position)
+            self._scopes_by_target[rule.target_type].add(rule.scope)
+
+        self._stats = [RuleStats() for _ in self.rules]
+        self._phase_seconds = {"index": 0.0, "join": 0.0, "emit": 0.0}
+        self._runs = 0
+
+    @staticmethod
+    def _scope_key(scope: tuple[str, ...], resource: DiscoveredResource) -> tuple | None:
+        """Key of a resource in a scope (None if a strict scope has no key)."""
+        key = []
+        for name in scope:
+            definition = SCOPES[name]
+            value = definition.key(resource)
+            if value is None and definition.strict:
+                return None
+            key.append(value)
+        return tuple(key)
+
+    def match(
+        self,
+        resources: list[DiscoveredResource],
+        existing_pairs: set[tuple[str, str]] | None = None,
+    ) -> list[ResourceDependency]:
+        """
+        Apply the rules to resources.
+
+        Args:
+            resources: Discovered resources
+            existing_pairs: (source, target) pairs that already have a
+                dependency; pairs added here are recorded in it
+
+        Returns:
+            Dependencies ordered by source, then target, as they appear in
+            resources
+        """
+        existing_pairs = existing_pairs if existing_pairs is not None else set()
+        clock = time.perf_counter
+        started = clock()
+
+        # Index every possible target by (type, scope) and scope key
+        index: dict[tuple[str, tuple[str, ...]], dict[tuple, list]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for position, resource in enumerate(resources):
+            for scope in self._scopes_by_target.get(resource.resource_type, ()):
+                key = self._scope_key(scope, resource)
+                if key is not None:
+                    index[(resource.resource_type, scope)][key].append((position, resource))
+        indexed = clock()
+
+        join_seconds = emit_seconds = 0.0
+        dependencies = []
+        for source in resources:
+            positions = self._rules_by_source.get(source.resource_type)
+            if not positions:
+                continue
+
+            join_started = clock()
+            source_keys: dict[tuple[str, ...], tuple | None] = {}
+            candidates = []
+            for rule_position in positions:
+                rule_started = clock() if self.profile else 0.0
+                rule = self.rules[rule_position]
+                if rule.scope not in source_keys:
+                    source_keys[rule.scope] = self._scope_key(rule.scope, source)
+                key = source_keys[rule.scope]
+                if key is None:
+                    continue
+                bucket = index.get((rule.target_type, rule.scope), {}).get(key, ())
+                self._stats[rule_position].candidates += len(bucket)
+                candidates.extend(
+                    (target_position, rule_position, target)
+                    for target_position, target in bucket
+                    if target.id != source.id
+                )
+                if self.profile:
+                    self._stats[rule_position].seconds += clock() - rule_started
+            candidates.sort(key=lambda candidate: candidate[:2])
+            emit_started = clock()
+            join_seconds += emit_started - join_started
+
+            for _, rule_position, target in candidates:
+                pair = (source.id, target.id)
+                if pair in existing_pairs:
+                    continue
+                rule = self.rules[rule_position]
+                dependencies.append(
+                    ResourceDependency(
+                        source_id=source.id,
+                        target_id=target.id,
+                        category=rule.category,
+                        dependency_type=rule.dependency_type,
+                        strength=rule.strength,
+                        discovered_method=rule.discovered_method,
+                        description=rule.description,
+                    )
+                )
+                existing_pairs.add(pair)
+                self._stats[rule_position].hits += 1
+            emit_seconds += clock() - emit_started
+
+        self._runs += 1
+        self._phase_seconds["index"] += indexed - started
+        self._phase_seconds["join"] += join_seconds
+        self._phase_seconds["emit"] += emit_seconds
+        if self.profile:
+            logger.info(self._profile_summary(len(resources), clock() - started))
+        return dependencies
+
+    def get_stats(self) -> list[dict[str, object]]:
+        """
+        Get the counters of every rule, summed over all match calls.
+
+        Returns:
+            Per rule (in rule order), its name, candidates looked at and
+            dependencies created, plus its join time in profile mode
+        """
+        stats = []
+        for rule, rule_stats in zip(self.rules, self._stats, strict=True):
+            entry: dict[str, object] = {
+                "rule": rule.name,
+                "candidates": rule_stats.candidates,
+                "hits": rule_stats.hits,
+            }
+            if self.profile:
+                entry["seconds"] = rule_stats.seconds
+            stats.append(entry)
+        return stats
+
+    def get_profile(self, top: int = 10) -> dict[str, object]:
+        """
+        Get where matching time went, summed over all match calls.
+
+        Args:
+            top: Number of slowest rules to include (profile mode only)
+
+        Returns:
+            Dictionary with the number of match calls, seconds spent per phase
+            (indexing, joining, creating dependencies) and the slowest rules
+        """
+        slowest = sorted(self.get_stats(), key=lambda s: s.get("seconds", 0.0), reverse=True)
+        return {
+            "runs": self._runs,
+            "phase_seconds": dict(self._phase_seconds),
+            "slowest_rules": slowest[:top] if self.profile else [],
+        }
+
+    def _profile_summary(self, resource_count: int, seconds: float) -> str:
+        """Describe the last match call and the slowest rules so far."""
+        phases = ", ".join(f"{name} {value:.3f}s" for name, value in self._phase_seconds.items())
+        slowest = "; ".join(
+            f"{s['rule']} {s['seconds']:.3f}s ({s['candidates']} candidates, {s['hits']} hits)"
+            for s in self.get_profile(top=5)["slowest_rules"]
+        )
+        return (
+            f"Matched {len(self.rules)} dependency rules against {resource_count} resources "
+            f"in {seconds:.3f}s (total {phases}); slowest rules: {slowest or 'none'}"
+        )
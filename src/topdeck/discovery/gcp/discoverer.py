@@ -6,19 +6,29 @@ Main orchestrator for discovering GCP resources across projects and regions.
 
 import logging
 
-from ..models import Application, DiscoveredResource, DiscoveryResult, ResourceDependency
+from ..dependency_rules import DependencyRule, DependencyRuleEngine, rules_from_patterns
+from ..models import (
+    Application,
+    DependencyCategory,
+    DependencyType,
+    DiscoveredResource,
+    DiscoveryResult,
+    ResourceDependency,
+)
 from .mapper import GCPResourceMapper
 
 logger = logging.getLogger(__name__)
 
 # Try importing GCP libraries, but make them optional for testing
 try:
+    from google.api_core.exceptions import NotFound
     from google.cloud import compute_v1, container_v1, storage
     from google.cloud.sql.connector import Connector
     from google.oauth2 import service_account
 
     GCP_AVAILABLE = True
 except ImportError:
+    NotFound = None
     compute_v1 = None
     container_v1 = None
     storage = None
@@ -27,6 +37,11 @@ except ImportError:
     GCP_AVAILABLE = False
 
 
+def _network_name(network: str | None) -> str | None:
+    """Get the VPC network name from a network name or URL."""
+    return network.rsplit("/", 1)[-1] if network else None
+
+
 class GCPDiscoverer:
     """
     Main class for discovering GCP resources.
@@ -39,10 +54,32 @@ class GCPDiscoverer:
     - Relationship detection
     """
 
+    # Resource type filter -> method discovering it in a region
+    REGIONAL_DISCOVERERS = {
+        "compute_engine": "_discover_compute_instances",
+        "gke_cluster": "_discover_gke_clusters",
+        "cloud_sql": "_discover_cloud_sql_instances",
+        "vpc_network": "_discover_vpcs",
+        "cloud_function": "_discover_cloud_functions",
+        "cloud_run": "_discover_cloud_run_services",
+    }
+
+    # Resource type filter -> GCP resource type its discovery method lists
+    # (placeholder discoverers list nothing and are not recorded as scanned)
+    SERVICE_RESOURCE_TYPES = {
+        "compute_engine": "compute.googleapis.com/Instance",
+        "gke_cluster": "container.googleapis.com/Cluster",
+        "vpc_network": "compute.googleapis.com/Network",
+    }
+
+    # Services whose resources are global rather than regional
+    GLOBAL_SERVICES = {"vpc_network"}
+
     def __init__(
         self,
         project_id: str,
         credentials_path: str | None = None,
+        profile_dependencies: bool = False,
     ):
         """
         Initialize GCP discoverer.
@@ -50,9 +87,11 @@ class GCPDiscoverer:
         Args:
             project_id: GCP project ID
             credentials_path: Path to service account JSON (if None, uses Application Default Credentials)
+            profile_dependencies: Log where dependency rule matching spends its time
         """
         self.project_id = project_id
         self.credentials_path = credentials_path
+        self.profile_dependencies = profile_dependencies
         self.mapper = GCPResourceMapper()
 
         # Initialize credentials if available
@@ -105,53 +144,40 @@ class GCPDiscoverer:
             for region_name in regions:
                 logger.info(f"Scanning region: {region_name}")
 
-                try:
-                    # Discover Compute Engine instances
-                    if not resource_types or "compute_engine" in resource_types:
-                        compute_resources = await self._discover_compute_instances(region_name)
-                        for resource in compute_resources:
-                            result.add_resource(resource)
-
-                    # Discover GKE clusters
-                    if not resource_types or "gke_cluster" in resource_types:
-                        gke_resources = await self._discover_gke_clusters(region_name)
-                        for resource in gke_resources:
-                            result.add_resource(resource)
-
-                    # Discover Cloud SQL instances
-                    if not resource_types or "cloud_sql" in resource_types:
-                        sql_resources = await self._discover_cloud_sql_instances(region_name)
-                        for resource in sql_resources:
-                            result.add_resource(resource)
-
-                    # Discover VPCs (global but we list per region)
-                    if not resource_types or "vpc_network" in resource_types:
-                        vpc_resources = await self._discover_vpcs(region_name)
-                        for resource in vpc_resources:
-                            result.add_resource(resource)
-
-                    # Discover Cloud Functions
-                    if not resource_types or "cloud_function" in resource_types:
-                        function_resources = await self._discover_cloud_functions(region_name)
-                        for resource in function_resources:
-                            result.add_resource(resource)
-
-                    # Discover Cloud Run services
-                    if not resource_types or "cloud_run" in resource_types:
-                        run_resources = await self._discover_cloud_run_services(region_name)
-                        for resource in run_resources:
-                            result.add_resource(resource)
+                for service, method in self.REGIONAL_DISCOVERERS.items():
+                    if resource_types and service not in resource_types:
+                        continue
+                    try:
+                        resources = await getattr(self, method)(region_name)
+                    except Exception as e:
+                        error_msg = (
+                            f"Error discovering {service} resources in region {region_name}: {e}"
+                        )
+                        result.add_error(error_msg)
+                        logger.error(error_msg)
+                        continue
+                    for resource in resources:
+                        result.add_resource(resource)
+                    if service in self.SERVICE_RESOURCE_TYPES:
+                        result.mark_scanned(
+                            "global" if service in self.GLOBAL_SERVICES else region_name,
+                            self.mapper.map_resource_type(self.SERVICE_RESOURCE_TYPES[service]),
+                        )
 
+            # Discover Cloud Storage buckets (global)
+            if not resource_types or "cloud_storage" in resource_types:
+                try:
+                    storage_resources = await self._discover_storage_buckets()
                 except Exception as e:
-                    error_msg = f"Error discovering resources in region {region_name}: {e}"
+                    error_msg = f"Error discovering Cloud Storage buckets: {e}"
                     result.add_error(error_msg)
                     logger.error(error_msg)
-
-            # Discover Cloud Storage buckets (global)
-            if not resource_types or "cloud_storage" in resource_types:
-                storage_resources = await self._discover_storage_buckets()
-                for resource in storage_resources:
-                    result.add_resource(resource)
+                else:
+                    for resource in storage_resources:
+                        result.add_resource(resource)
+                        # Buckets are listed project-wide but carry their location
+                        # as region, so only locations that still hold one are known
+                        result.mark_scanned(resource.region, resource.resource_type)
 
             logger.info(f"Discovered {len(result.resources)} resources")
 
@@ -184,90 +210,87 @@ class GCPDiscoverer:
     async def _discover_compute_instances(self, region: str) -> list[DiscoveredResource]:
         """Discover Compute Engine instances in a region."""
         resources = []
-        try:
-            instances_client = compute_v1.InstancesClient(credentials=self.credentials)
-
-            # List zones in region
-            zones = [f"{region}-a", f"{region}-b", f"{region}-c"]
+        instances_client = compute_v1.InstancesClient(credentials=self.credentials)
 
-            for zone in zones:
-                try:
-                    request = compute_v1.ListInstancesRequest(
-                        project=self.project_id,
-                        zone=zone,
-                    )
-                    instances = instances_client.list(request=request)
+        # List zones in region
+        zones = [f"{region}-a", f"{region}-b", f"{region}-c"]
 
-                    for instance in instances:
-                        # Build resource name
-                        resource_name = (
-                            f"projects/{self.project_id}/zones/{zone}/instances/{instance.name}"
-                        )
+        for zone in zones:
+            try:
+                request = compute_v1.ListInstancesRequest(
+                    project=self.project_id,
+                    zone=zone,
+                )
+                instances = instances_client.list(request=request)
 
-                        # Extract labels (GCP's version of tags)
-                        labels = dict(instance.labels) if instance.labels else {}
+                for instance in instances:
+                    # Build resource name
+                    resource_name = (
+                        f"projects/{self.project_id}/zones/{zone}/instances/{instance.name}"
+                    )
 
-                        # Map to DiscoveredResource
-                        resource = self.mapper.map_resource(
-                            resource_id=resource_name,
-                            resource_type="compute.googleapis.com/Instance",
-                            labels=labels,
-                            region=region,
-                            project_id=self.project_id,
-                        )
+                    # Extract labels (GCP's version of tags)
+                    labels = dict(instance.labels) if instance.labels else {}
 
-                        # Add Compute Engine-specific properties
-                        resource.properties["machine_type"] = instance.machine_type
-                        resource.properties["status"] = instance.status
-                        resource.properties["zone"] = zone
+                    # Map to DiscoveredResource
+                    resource = self.mapper.map_resource(
+                        resource_id=resource_name,
+                        resource_type="compute.googleapis.com/Instance",
+                        labels=labels,
+                        region=region,
+                        project_id=self.project_id,
+                    )
 
-                        resources.append(resource)
+                    # Add Compute Engine-specific properties
+                    resource.properties["machine_type"] = instance.machine_type
+                    resource.properties["status"] = instance.status
+                    resource.properties["zone"] = zone
+                    resource.properties["vpc_id"] = _network_name(
+                        instance.network_interfaces[0].network
+                        if instance.network_interfaces
+                        else None
+                    )
 
-                except Exception as e:
-                    logger.debug(f"Error discovering instances in zone {zone}: {e}")
+                    resources.append(resource)
 
-        except Exception as e:
-            logger.error(f"Error discovering Compute Engine instances in {region}: {e}")
+            except NotFound:
+                # Not every region has all of the a-c zones
+                logger.debug(f"Zone {zone} does not exist")
 
         return resources
 
     async def _discover_gke_clusters(self, region: str) -> list[DiscoveredResource]:
         """Discover GKE clusters in a region."""
         resources = []
-        try:
-            cluster_client = container_v1.ClusterManagerClient(credentials=self.credentials)
-
-            # List clusters in region
-            parent = f"projects/{self.project_id}/locations/{region}"
-            response = cluster_client.list_clusters(parent=parent)
-
-            for cluster in response.clusters:
-                # Build resource name
-                resource_name = (
-                    f"projects/{self.project_id}/locations/{region}/clusters/{cluster.name}"
-                )
-
-                # Extract labels
-                labels = dict(cluster.resource_labels) if cluster.resource_labels else {}
-
-                # Map to DiscoveredResource
-                resource = self.mapper.map_resource(
-                    resource_id=resource_name,
-                    resource_type="container.googleapis.com/Cluster",
-                    labels=labels,
-                    region=region,
-                    project_id=self.project_id,
-                )
-
-                # Add GKE-specific properties
-                resource.properties["status"] = cluster.status
-                resource.properties["current_node_count"] = cluster.current_node_count
-                resource.properties["endpoint"] = cluster.endpoint
+        cluster_client = container_v1.ClusterManagerClient(credentials=self.credentials)
+
+        # List clusters in region
+        parent = f"projects/{self.project_id}/locations/{region}"
+        response = cluster_client.list_clusters(parent=parent)
+
+        for cluster in response.clusters:
+            # Build resource name
+            resource_name = f"projects/{self.project_id}/locations/{region}/clusters/{cluster.name}"
+
+            # Extract labels
+            labels = dict(cluster.resource_labels) if cluster.resource_labels else {}
+
+            # Map to DiscoveredResource
+            resource = self.mapper.map_resource(
+                resource_id=resource_name,
+                resource_type="container.googleapis.com/Cluster",
+                labels=labels,
+                region=region,
+                project_id=self.project_id,
+            )
 
-                resources.append(resource)
+            # Add GKE-specific properties
+            resource.properties["status"] = cluster.status
+            resource.properties["current_node_count"] = cluster.current_node_count
+            resource.properties["endpoint"] = cluster.endpoint
+            resource.properties["vpc_id"] = _network_name(cluster.network)
 
-        except Exception as e:
-            logger.error(f"Error discovering GKE clusters in {region}: {e}")
+            resources.append(resource)
 
         return resources
 
@@ -290,38 +313,34 @@ class GCPDiscoverer:
     async def _discover_storage_buckets(self) -> list[DiscoveredResource]:
         """Discover Cloud Storage buckets (global service)."""
         resources = []
-        try:
-            storage_client = storage.Client(
-                project=self.project_id,
-                credentials=self.credentials,
-            )
+        storage_client = storage.Client(
+            project=self.project_id,
+            credentials=self.credentials,
+        )
 
-            buckets = storage_client.list_buckets()
+        buckets = storage_client.list_buckets()
 
-            for bucket in buckets:
-                # Build resource name
-                resource_name = f"projects/{self.project_id}/buckets/{bucket.name}"
+        for bucket in buckets:
+            # Build resource name
+            resource_name = f"projects/{self.project_id}/buckets/{bucket.name}"
 
-                # Extract labels
-                labels = dict(bucket.labels) if bucket.labels else {}
+            # Extract labels
+            labels = dict(bucket.labels) if bucket.labels else {}
 
-                # Map to DiscoveredResource
-                resource = self.mapper.map_resource(
-                    resource_id=resource_name,
-                    resource_type="storage.googleapis.com/Bucket",
-                    labels=labels,
-                    region=bucket.location.lower(),
-                    project_id=self.project_id,
-                )
-
-                # Add Storage-specific properties
-                resource.properties["storage_class"] = bucket.storage_class
-                resource.properties["location_type"] = bucket.location_type
+            # Map to DiscoveredResource
+            resource = self.mapper.map_resource(
+                resource_id=resource_name,
+                resource_type="storage.googleapis.com/Bucket",
+                labels=labels,
+                region=bucket.location.lower(),
+                project_id=self.project_id,
+            )
 
-                resources.append(resource)
+            # Add Storage-specific properties
+            resource.properties["storage_class"] = bucket.storage_class
+            resource.properties["location_type"] = bucket.location_type
 
-        except Exception as e:
-            logger.error(f"Error discovering Cloud Storage buckets: {e}")
+            resources.append(resource)
 
         return resources
 
@@ -356,71 +375,51 @@ class GCPDiscoverer:
         resources = []
         seen_resource_ids = set()  # O(1) lookup for deduplication
 
-        try:
-            networks_client = compute_v1.NetworksClient(credentials=self.credentials)
-
-            request = compute_v1.ListNetworksRequest(project=self.project_id)
-            networks = networks_client.list(request=request)
+        networks_client = compute_v1.NetworksClient(credentials=self.credentials)
 
-            for network in networks:
-                # Build resource name
-                resource_name = f"projects/{self.project_id}/global/networks/{network.name}"
+        request = compute_v1.ListNetworksRequest(project=self.project_id)
+        networks = networks_client.list(request=request)
 
-                # Skip if already seen (avoid duplicates across regions)
-                if resource_name in seen_resource_ids:
-                    continue
+        for network in networks:
+            # Build resource name
+            resource_name = f"projects/{self.project_id}/global/networks/{network.name}"
 
-                seen_resource_ids.add(resource_name)
+            # Skip if already seen (avoid duplicates across regions)
+            if resource_name in seen_resource_ids:
+                continue
 
-                # Map to DiscoveredResource (VPCs are global)
-                resource = self.mapper.map_resource(
-                    resource_id=resource_name,
-                    resource_type="compute.googleapis.com/Network",
-                    labels={},
-                    region="global",
-                    project_id=self.project_id,
-                )
+            seen_resource_ids.add(resource_name)
 
-                # Add VPC-specific properties
-                resource.properties["auto_create_subnetworks"] = network.auto_create_subnetworks
-                resource.properties["routing_mode"] = network.routing_config.routing_mode
+            # Map to DiscoveredResource (VPCs are global)
+            resource = self.mapper.map_resource(
+                resource_id=resource_name,
+                resource_type="compute.googleapis.com/Network",
+                labels={},
+                region="global",
+                project_id=self.project_id,
+            )
 
-                resources.append(resource)
+            # Add VPC-specific properties
+            resource.properties["auto_create_subnetworks"] = network.auto_create_subnetworks
+            resource.properties["routing_mode"] = network.routing_config.routing_mode
+            resource.properties["vpc_id"] = network.name
 
-        except Exception as e:
-            logger.error(f"Error discovering VPC networks: {e}")
+            resources.append(resource)
 
         return resources
 
-    async def _discover_dependencies(
-        self,
-        resources: list[DiscoveredResource],
-    ) -> list[ResourceDependency]:
+    def _get_dependency_rules(self) -> list[DependencyRule]:
         """
-        Discover dependencies between GCP resources.
-
-        This implementation uses a comprehensive mapping of common GCP resource
-        dependencies to detect relationships between resources. It considers:
-        - Compute resources depending on data stores
-        - Application services depending on caching and storage
-        - Container orchestration depending on storage and networking
-        - Network dependencies between components
+        Get GCP resource dependency rules.
 
-        Args:
-            resources: List of discovered resources
+        GCP resources are grouped by project rather than resource group, so
+        rules are scoped to the same project and region. VPC networks are
+        global, so dependencies on them are scoped to the same project and
+        network instead.
 
         Returns:
-            List of ResourceDependency objects
+            List of dependency rules
         """
-        from ..models import (
-            DependencyCategory,
-            DependencyType,
-            ResourceDependency,
-        )
-
-        dependencies = []
-
-        # Define comprehensive dependency patterns for GCP
         # Format: (source_type, target_type, category, dependency_type, strength, description)
         dependency_patterns = [
             # Cloud Run dependencies
@@ -481,51 +480,48 @@ class GCPDiscoverer:
             ("load_balancer", "vpc", DependencyCategory.NETWORK, DependencyType.REQUIRED, 0.9,
              "Load Balancer requires VPC"),
         ]
+        same_region = [p for p in dependency_patterns if p[1] != "vpc"]
+        same_network = [p for p in dependency_patterns if p[1] == "vpc"]
+        return rules_from_patterns(
+            same_region,
+            scope=("project", "region"),
+            discovered_method="heuristic",
+            description_suffix=" in same region",
+        ) + rules_from_patterns(
+            same_network,
+            scope=("project", "vpc"),
+            discovered_method="heuristic",
+            description_suffix=" in same VPC network",
+        )
 
-        # Apply dependency patterns
-        # GCP resources are typically grouped by project, not resource groups
-        # We'll detect dependencies within the same project and region
-        # Build a set of existing dependency pairs for O(1) lookup performance
-        existing_pairs = {(d.source_id, d.target_id) for d in dependencies}
-        
-        for source_resource in resources:
-            for target_resource in resources:
-                # Skip self-dependencies
-                if source_resource.id == target_resource.id:
-                    continue
-                
-                # Check if resources are in the same region (common pattern in GCP)
-                same_region = source_resource.region == target_resource.region
-                
-                # Only create dependencies for resources in the same region
-                if not same_region:
-                    continue
-                
-                # Check each dependency pattern
-                for pattern in dependency_patterns:
-                    source_type, target_type, category, dep_type, strength, description = pattern
-                    
-                    if (source_resource.resource_type == source_type and 
-                        target_resource.resource_type == target_type):
-                        
-                        # Skip if we already have a dependency (O(1) lookup using set)
-                        pair = (source_resource.id, target_resource.id)
-                        if pair in existing_pairs:
-                            continue
-                        
-                        dep = ResourceDependency(
-                            source_id=source_resource.id,
-                            target_id=target_resource.id,
-                            category=category,
-                            dependency_type=dep_type,
-                            strength=strength,
-                            discovered_method="heuristic",
-                            description=f"{description} in same region",
-                        )
-                        dependencies.append(dep)
-                        existing_pairs.add(pair)  # Track to avoid duplicates
+    async def _discover_dependencies(
+        self,
+        resources: list[DiscoveredResource],
+    ) -> list[ResourceDependency]:
+        """
+        Discover dependencies between GCP resources.
+
+        This implementation uses a comprehensive mapping of common GCP resource
+        dependencies to detect relationships between resources. It considers:
+        - Compute resources depending on data stores
+        - Application services depending on caching and storage
+        - Container orchestration depending on storage and networking
+        - Network dependencies between components
 
-        return dependencies
+        The rules of _get_dependency_rules are matched through
+        DependencyRuleEngine, which scales linearly with the number of
+        resources.
+
+        Args:
+            resources: List of discovered resources
+
+        Returns:
+            List of ResourceDependency objects
+        """
+        engine = DependencyRuleEngine(
+            self._get_dependency_rules(), profile=self.profile_dependencies
+        )
+        return engine.match(resources)
 
     async def _infer_applications(
         self,
@@ -3,14 +3,26 @@ Data models for resource discovery.
 
 These models represent discovered cloud resources and relationships
 in a cloud-agnostic format before they are stored in Neo4j.
+
+Resources, dependencies and pods are held by the hundred thousand during
+large discovery runs, so they are slotted (no per-instance ``__dict__``)
+and intern the low-cardinality strings they repeat, such as regions,
+resource groups and discovery methods.
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 
 
+def _intern(value: Any) -> Any:
+    """Intern a string so that equal values share one object; other values are returned as is."""
+    # Exact type check: sys.intern rejects str subclasses such as str Enums
+    return sys.intern(value) if type(value) is str else value  # noqa: E721
+
+
 class CloudProvider(str, Enum):
     """Supported cloud providers"""
 
@@ -47,7 +59,7 @@ class DependencyType(str, Enum):
     WEAK = "weak"
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoveredResource:
     """
     Represents a discovered cloud resource.
@@ -81,6 +93,14 @@ class DiscoveredResource:
     # Optional cost information
     cost_per_day: float | None = None
 
+    def __post_init__(self) -> None:
+        self.resource_type = _intern(self.resource_type)
+        self.region = _intern(self.region)
+        self.resource_group = _intern(self.resource_group)
+        self.subscription_id = _intern(self.subscription_id)
+        self.environment = _intern(self.environment)
+        self.discovered_method = _intern(self.discovered_method)
+
     def to_neo4j_properties(self) -> dict[str, Any]:
         """Convert to Neo4j node properties"""
         import json
@@ -112,7 +132,7 @@ class DiscoveredResource:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ResourceDependency:
     """
     Represents a dependency between two resources.
@@ -131,6 +151,9 @@ class ResourceDependency:
     discovered_method: str = "configuration"
     description: str | None = None
 
+    def __post_init__(self) -> None:
+        self.discovered_method = _intern(self.discovered_method)
+
     def to_neo4j_properties(self) -> dict[str, Any]:
         """Convert to Neo4j relationship properties"""
         return {
@@ -391,7 +414,7 @@ class Namespace:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Pod:
     """
     Represents a Kubernetes pod.
@@ -436,6 +459,14 @@ class Pod:
     last_seen: datetime = field(default_factory=datetime.utcnow)
     discovered_at: datetime = field(default_factory=datetime.utcnow)
 
+    def __post_init__(self) -> None:
+        self.namespace = _intern(self.namespace)
+        self.cluster_id = _intern(self.cluster_id)
+        self.service_account = _intern(self.service_account)
+        self.phase = _intern(self.phase)
+        self.node_name = _intern(self.node_name)
+        self.owner_kind = _intern(self.owner_kind)
+
     def to_neo4j_properties(self) -> dict[str, Any]:
         """Convert to Neo4j node properties"""
         import json
@@ -673,8 +704,11 @@ class DiscoveryResult:
     service_principals: list[ServicePrincipal] = field(default_factory=list)
     app_registrations: list[AppRegistration] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
+    # (region, resource_type) partitions that were scanned without errors
+    scanned_partitions: set[tuple[str, str]] = field(default_factory=set)
 
     subscription_id: str | None = None
+    cloud_provider: str | None = None
     discovery_started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     discovery_completed_at: datetime | None = None
 
@@ -815,6 +849,15 @@ class DiscoveryResult:
         """Add an error message"""
         self.errors.append(error)
 
+    def mark_scanned(self, region: str, resource_type: str) -> None:
+        """
+        Record that every resource of a type in a region was listed successfully.
+
+        Incremental writes only delete stale resources of scanned partitions,
+        so a failed or skipped scan does not delete what it missed.
+        """
+        self.scanned_partitions.add((region, resource_type))
+
     def complete(self) -> None:
         """Mark discovery as completed"""
         self.discovery_completed_at = datetime.now(UTC)
@@ -19,7 +19,7 @@ from topdeck.monitoring.alerting import (
     AlertStatus,
     TriggerType,
 )
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +36,7 @@ class AlertPersistence:
     - Automatic cleanup of old alerts
     """
     
-    def __init__(self, neo4j_client: Neo4jClient):
+    def __init__(self, neo4j_client: AsyncNeo4jClient):
         """
         Initialize alert persistence.
         
@@ -6,7 +6,9 @@ Supports multiple notification channels: Email, Slack, PagerDuty, custom webhook
 Now supports persistent storage via Neo4j.
 """
 
+import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum
@@ -16,10 +18,20 @@ import aiohttp
 import aiosmtplib
 from email.message import EmailMessage
 
-from topdeck.monitoring.live_diagnostics import LiveDiagnosticsService
+from topdeck.common.metrics import record_alert_rule_evaluation, record_alert_snapshot
+from topdeck.monitoring.live_diagnostics import (
+    AnomalyAlert,
+    LiveDiagnosticsService,
+    LiveDiagnosticsSnapshot,
+    ServiceHealthStatus,
+    TrafficPattern,
+)
 
 logger = logging.getLogger(__name__)
 
+# Rule metadata key limiting a rule to a list of resource IDs
+RULE_RESOURCE_SCOPE_KEY = "resource_ids"
+
 
 class AlertSeverity(str, Enum):
     """Alert severity levels."""
@@ -71,6 +83,14 @@ class AlertRule:
     destinations: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def resource_scope(self) -> Optional[tuple[str, ...]]:
+        """Resource IDs the rule is limited to (None for all resources)."""
+        resource_ids = self.metadata.get(RULE_RESOURCE_SCOPE_KEY)
+        if not resource_ids:
+            return None
+        return tuple(dict.fromkeys(resource_ids))
+
 
 @dataclass
 class AlertDestination:
@@ -102,6 +122,103 @@ class Alert:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+class RuleEvaluationContext:
+    """
+    Data shared by all rules evaluated in one tick.
+
+    The live diagnostics snapshot is fetched at most once, when the first
+    rule needs it, and indexed by resource so rules scoped to a few
+    resources only look at those.
+    """
+
+    def __init__(self, diagnostics_service: LiveDiagnosticsService, duration_hours: int):
+        """
+        Initialize the evaluation context.
+
+        Args:
+            diagnostics_service: Live diagnostics service for health data
+            duration_hours: Time window for evaluation
+        """
+        self.diagnostics_service = diagnostics_service
+        self.duration_hours = duration_hours
+        self.snapshot_seconds: Optional[float] = None
+        self._snapshot: Optional[LiveDiagnosticsSnapshot] = None
+        self._snapshot_error: Optional[Exception] = None
+        self._lock = asyncio.Lock()
+        self._services_by_id: dict[str, ServiceHealthStatus] = {}
+        self._anomalies_by_id: dict[str, list[AnomalyAlert]] = {}
+        self._traffic_by_id: dict[str, list[TrafficPattern]] = {}
+
+    async def snapshot(self) -> LiveDiagnosticsSnapshot:
+        """
+        Get the tick's snapshot, fetching it on first use.
+
+        Returns:
+            Live diagnostics snapshot
+
+        Raises:
+            Exception: If fetching the snapshot failed (it is not retried
+                within the tick)
+        """
+        async with self._lock:
+            if self._snapshot is None and self._snapshot_error is None:
+                started = time.perf_counter()
+                try:
+                    self._snapshot = await self.diagnostics_service.get_live_snapshot(
+                        self.duration_hours
+                    )
+                except Exception as e:
+                    self._snapshot_error = e
+                finally:
+                    self.snapshot_seconds = time.perf_counter() - started
+                    record_alert_snapshot(self.snapshot_seconds)
+                if self._snapshot is not None:
+                    self._index(self._snapshot)
+        if self._snapshot_error is not None:
+            raise self._snapshot_error
+        return self._snapshot
+
+    async def services(self, rule: AlertRule) -> list[ServiceHealthStatus]:
+        """Get the service health statuses in the rule's scope."""
+        snapshot = await self.snapshot()
+        scope = rule.resource_scope
+        if scope is None:
+            return list(snapshot.services)
+        return [self._services_by_id[rid] for rid in scope if rid in self._services_by_id]
+
+    async def anomalies(self, rule: AlertRule) -> list[AnomalyAlert]:
+        """Get the anomalies of resources in the rule's scope."""
+        snapshot = await self.snapshot()
+        scope = rule.resource_scope
+        if scope is None:
+            return list(snapshot.anomalies)
+        return [anomaly for rid in scope for anomaly in self._anomalies_by_id.get(rid, [])]
+
+    async def traffic_patterns(self, rule: AlertRule) -> list[TrafficPattern]:
+        """Get the traffic patterns from or to resources in the rule's scope."""
+        snapshot = await self.snapshot()
+        scope = rule.resource_scope
+        if scope is None:
+            return list(snapshot.traffic_patterns)
+
+        # A pattern between two scoped resources is indexed under both
+        patterns = {}
+        for rid in scope:
+            for pattern in self._traffic_by_id.get(rid, []):
+                patterns[id(pattern)] = pattern
+        return list(patterns.values())
+
+    def _index(self, snapshot: LiveDiagnosticsSnapshot) -> None:
+        """Index the snapshot by resource ID."""
+        self._services_by_id = {service.resource_id: service for service in snapshot.services}
+        for anomaly in snapshot.anomalies:
+            self._anomalies_by_id.setdefault(anomaly.resource_id, []).append(anomaly)
+        for pattern in snapshot.traffic_patterns:
+            self._traffic_by_id.setdefault(pattern.source_id, []).append(pattern)
+            if pattern.target_id != pattern.source_id:
+                self._traffic_by_id.setdefault(pattern.target_id, []).append(pattern)
+
+
 class AlertingEngine:
     """
     Alerting engine that evaluates rules and sends notifications.
@@ -112,6 +229,7 @@ class AlertingEngine:
     - Alert deduplication
     - Alert history and acknowledgment
     - Persistent storage via Neo4j (optional, falls back to in-memory)
+    - One shared, lazily fetched snapshot per evaluation tick
     """
     
     def __init__(
@@ -152,6 +270,10 @@ class AlertingEngine:
         
         # Alert deduplication tracking
         self.last_alert_times: dict[str, datetime] = {}
+
+        # Timing of the last evaluation tick
+        self.rule_evaluation_seconds: dict[str, float] = {}
+        self.last_snapshot_seconds: Optional[float] = None
     
     async def add_rule(self, rule: AlertRule) -> None:
         """Add or update an alert rule."""
@@ -222,6 +344,9 @@ class AlertingEngine:
     async def evaluate_rules(self, duration_hours: int = 1) -> list[Alert]:
         """
         Evaluate all enabled alert rules.
+
+        All rules evaluate against one evaluation context, so the live
+        diagnostics snapshot is fetched at most once per call.
         
         Args:
             duration_hours: Time window for evaluation
@@ -233,25 +358,66 @@ class AlertingEngine:
         
         # Get rules from persistence or in-memory storage
         rules = await self.list_rules(enabled_only=True)
+        context = RuleEvaluationContext(self.diagnostics_service, duration_hours)
+        rule_seconds = {}
         
         for rule in rules:
             if not rule.enabled:
                 continue
             
+            started = time.perf_counter()
+            result = "not_triggered"
             try:
-                triggered = await self._evaluate_rule(rule, duration_hours)
-                if triggered:
+                if self._is_deduplicated(rule):
+                    result = "deduplicated"
+                elif triggered := await self._evaluate_rule(rule, context):
+                    result = "triggered"
                     alert = await self._create_alert(rule, triggered)
                     new_alerts.append(alert)
             except Exception as e:
+                result = "error"
                 logger.error(f"Error evaluating rule {rule.id}: {e}", exc_info=True)
+            finally:
+                rule_seconds[rule.id] = time.perf_counter() - started
+                record_alert_rule_evaluation(
+                    rule.trigger_type.value, result, rule_seconds[rule.id]
+                )
+        
+        self.rule_evaluation_seconds = rule_seconds
+        self.last_snapshot_seconds = context.snapshot_seconds
         
         return new_alerts
+
+    def get_evaluation_stats(self) -> dict[str, Any]:
+        """
+        Get timings of the last evaluation tick.
+
+        Rule timings include the shared snapshot for the rule that fetched it.
+
+        Returns:
+            Dictionary with the snapshot duration and duration per rule ID
+        """
+        return {
+            "snapshot_seconds": self.last_snapshot_seconds,
+            "rule_seconds": dict(self.rule_evaluation_seconds),
+        }
     
+    def _is_deduplicated(self, rule: AlertRule) -> bool:
+        """
+        Check whether a rule is inside its deduplication window.
+
+        Returns:
+            True if the rule triggered too recently to trigger again
+        """
+        last_time = self.last_alert_times.get(rule.id)
+        if not last_time:
+            return False
+        return datetime.now(UTC) - last_time < timedelta(minutes=rule.duration_minutes)
+
     async def _evaluate_rule(
         self,
         rule: AlertRule,
-        duration_hours: int,
+        context: RuleEvaluationContext,
     ) -> Optional[dict[str, Any]]:
         """
         Evaluate a single alert rule.
@@ -259,38 +425,29 @@ class AlertingEngine:
         Returns:
             Trigger context if rule triggered, None otherwise
         """
-        # Check deduplication - don't re-trigger too soon
-        last_time = self.last_alert_times.get(rule.id)
-        if last_time:
-            time_since = datetime.now(UTC) - last_time
-            if time_since < timedelta(minutes=rule.duration_minutes):
-                return None
-        
         if rule.trigger_type == TriggerType.HEALTH_SCORE_DROP:
-            return await self._check_health_score_drop(rule, duration_hours)
+            return await self._check_health_score_drop(rule, context)
         elif rule.trigger_type == TriggerType.CRITICAL_ANOMALY:
-            return await self._check_critical_anomaly(rule, duration_hours)
+            return await self._check_critical_anomaly(rule, context)
         elif rule.trigger_type == TriggerType.MULTIPLE_SERVICES_DEGRADED:
-            return await self._check_multiple_degraded(rule, duration_hours)
+            return await self._check_multiple_degraded(rule, context)
         elif rule.trigger_type == TriggerType.TRAFFIC_PATTERN_ANOMALY:
-            return await self._check_traffic_anomaly(rule, duration_hours)
+            return await self._check_traffic_anomaly(rule, context)
         elif rule.trigger_type == TriggerType.SERVICE_FAILURE:
-            return await self._check_service_failure(rule, duration_hours)
+            return await self._check_service_failure(rule, context)
         
         return None
     
     async def _check_health_score_drop(
         self,
         rule: AlertRule,
-        duration_hours: int,
+        context: RuleEvaluationContext,
     ) -> Optional[dict[str, Any]]:
         """Check if any service health score dropped below threshold."""
         threshold = rule.threshold or 50.0
         
         try:
-            snapshot = await self.diagnostics_service.get_live_snapshot(duration_hours)
-            
-            for service in snapshot.services:
+            for service in await context.services(rule):
                 if service.health_score < threshold:
                     return {
                         "service_id": service.resource_id,
@@ -306,15 +463,11 @@ class AlertingEngine:
     async def _check_critical_anomaly(
         self,
         rule: AlertRule,
-        duration_hours: int,
+        context: RuleEvaluationContext,
     ) -> Optional[dict[str, Any]]:
         """Check for critical anomalies."""
         try:
-            anomalies = await self.diagnostics_service.detect_anomalies(
-                duration_hours=duration_hours,
-                severity="critical",
-                limit=1,
-            )
+            anomalies = [a for a in await context.anomalies(rule) if a.severity == "critical"]
             
             if anomalies:
                 anomaly = anomalies[0]
@@ -323,7 +476,7 @@ class AlertingEngine:
                     "service_name": anomaly.resource_name,
                     "metric_name": anomaly.metric_name,
                     "severity": anomaly.severity,
-                    "deviation": anomaly.deviation,
+                    "deviation": anomaly.deviation_percentage,
                 }
         except Exception as e:
             logger.error(f"Error checking critical anomalies: {e}")
@@ -333,15 +486,15 @@ class AlertingEngine:
     async def _check_multiple_degraded(
         self,
         rule: AlertRule,
-        duration_hours: int,
+        context: RuleEvaluationContext,
     ) -> Optional[dict[str, Any]]:
         """Check if multiple services are degraded."""
         threshold_count = int(rule.threshold or 3)
         
         try:
-            snapshot = await self.diagnostics_service.get_live_snapshot(duration_hours)
+            services = await context.services(rule)
             
-            degraded = [s for s in snapshot.services if s.status in ["degraded", "critical"]]
+            degraded = [s for s in services if s.status in ["degraded", "critical"]]
             
             if len(degraded) >= threshold_count:
                 return {
@@ -357,20 +510,17 @@ class AlertingEngine:
     async def _check_traffic_anomaly(
         self,
         rule: AlertRule,
-        duration_hours: int,
+        context: RuleEvaluationContext,
     ) -> Optional[dict[str, Any]]:
         """Check for abnormal traffic patterns."""
         try:
-            patterns = await self.diagnostics_service.analyze_traffic_patterns(
-                duration_hours=duration_hours,
-                abnormal_only=True,
-            )
+            patterns = [p for p in await context.traffic_patterns(rule) if p.is_abnormal]
             
             if patterns:
                 pattern = patterns[0]
                 return {
-                    "source": pattern.source,
-                    "target": pattern.target,
+                    "source": pattern.source_id,
+                    "target": pattern.target_id,
                     "request_rate": pattern.request_rate,
                     "error_rate": pattern.error_rate,
                 }
@@ -382,13 +532,13 @@ class AlertingEngine:
     async def _check_service_failure(
         self,
         rule: AlertRule,
-        duration_hours: int,
+        context: RuleEvaluationContext,
     ) -> Optional[dict[str, Any]]:
         """Check for service failures."""
         try:
-            snapshot = await self.diagnostics_service.get_live_snapshot(duration_hours)
+            services = await context.services(rule)
             
-            failed = [s for s in snapshot.services if s.status == "critical"]
+            failed = [s for s in services if s.status == "critical"]
             
             if failed:
                 service = failed[0]
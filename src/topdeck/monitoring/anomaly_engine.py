@@ -0,0 +1,239 @@
+"""
+Batch anomaly scoring for live diagnostics.
+
+All resources of one type are scored together from a feature matrix
+(resources x metrics, e.g. the latest value of each batched Prometheus
+metric):
+
+- Robust z-scores compare each resource with its peers, using the median
+  and the median absolute deviation of every column in one vectorized pass.
+- An IsolationForest per resource type, fitted on the feature rows seen over
+  recent snapshots, scores how unusual each row is as a whole. Fitted models
+  are cached and refitted on a schedule rather than on every call.
+
+Both are combined into one 0-1 score per resource.
+"""
+
+import threading
+import time
+import warnings
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+import structlog
+from sklearn.ensemble import IsolationForest
+
+logger = structlog.get_logger(__name__)
+
+# Scale factors turning MAD / mean absolute deviation into a standard deviation
+MAD_TO_SIGMA = 1 / 0.6745
+MEAN_AD_TO_SIGMA = 1.2533
+
+
+@dataclass
+class AnomalyScore:
+    """Anomaly score of one resource."""
+
+    resource_id: str
+    score: float  # 0.0 to 1.0, higher = more anomalous
+    metric_name: str  # Feature deviating most from the peers
+    value: float
+    expected_value: float  # Peer median of that feature
+    z_score: float
+    isolation_score: float | None = None
+
+
+@dataclass
+class _TypeModel:
+    """Training rows and fitted model of one resource type."""
+
+    feature_names: tuple[str, ...]
+    rows: deque = field(default_factory=deque)
+    model: IsolationForest | None = None
+    fitted_at: float | None = None
+
+
+def robust_z_scores(features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute robust z-scores of every value against its column.
+
+    Uses the median absolute deviation, falling back to the mean absolute
+    deviation for columns whose MAD is zero. Missing values (NaN) are
+    ignored and get a z-score of 0.
+
+    Args:
+        features: Matrix of resources x features
+
+    Returns:
+        Tuple of (z-scores with the shape of features, column medians)
+    """
+    with warnings.catch_warnings():
+        # All-NaN columns are expected for metrics no resource reports
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(features, axis=0)
+        deviation = np.abs(features - median)
+        mad = np.nanmedian(deviation, axis=0)
+        mean_ad = np.nanmean(deviation, axis=0)
+
+    scale = np.where(mad > 0, mad * MAD_TO_SIGMA, mean_ad * MEAN_AD_TO_SIGMA)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(scale > 0, (features - median) / scale, 0.0)
+    return np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0), median
+
+
+class BatchAnomalyEngine:
+    """Scores resources of a type in one vectorized pass."""
+
+    def __init__(
+        self,
+        z_threshold: float = 3.5,
+        refit_interval: float = 3600.0,
+        contamination: float = 0.1,
+        min_peers: int = 3,
+        min_training_rows: int = 16,
+        max_training_rows: int = 5000,
+        random_state: int = 42,
+    ):
+        """
+        Initialize batch anomaly engine.
+
+        Args:
+            z_threshold: Robust z-score at which a resource scores 0.5
+            refit_interval: Seconds before a type's IsolationForest is refitted
+            contamination: Expected share of anomalous rows in the training data
+            min_peers: Minimum resources of a type for peer z-scores
+            min_training_rows: Minimum feature rows before fitting a model
+            max_training_rows: Feature rows kept per type for refitting
+            random_state: Random seed for IsolationForest
+        """
+        self.z_threshold = z_threshold
+        self.refit_interval = refit_interval
+        self.contamination = contamination
+        self.min_peers = min_peers
+        self.min_training_rows = min_training_rows
+        self.max_training_rows = max_training_rows
+        self.random_state = random_state
+        self._models: dict[str, _TypeModel] = {}
+        self._lock = threading.Lock()
+        self._fits = 0
+
+    def score(
+        self,
+        resource_type: str,
+        resource_ids: list[str],
+        features: np.ndarray,
+        feature_names: list[str],
+    ) -> list[AnomalyScore]:
+        """
+        Score resources of one type.
+
+        The rows are also added to the type's training data; the type's
+        model is (re)fitted first when it is missing or older than
+        refit_interval.
+
+        Args:
+            resource_type: Resource type the rows belong to
+            resource_ids: Resource ID per row
+            features: Matrix of resources x features (NaN for missing values)
+            feature_names: Name per column
+
+        Returns:
+            One score per resource, in row order
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[0] == 0 or features.shape[1] == 0:
+            return []
+
+        z, median = robust_z_scores(features)
+        if features.shape[0] < self.min_peers:
+            # Too few peers to compare against; keep the column medians as expected values
+            z = np.zeros_like(features)
+        robust = np.minimum(np.abs(z).max(axis=1) / (2 * self.z_threshold), 1.0)
+
+        filled = self._impute(features)
+        model = self._update_model(resource_type, tuple(feature_names), filled)
+        isolation = None
+        if model is not None:
+            # score_samples is the negated paper score: ~0.5 normal, -> 1 anomalous
+            raw = -model.score_samples(filled)
+            isolation = np.clip((raw - 0.5) * 2, 0.0, 1.0)
+            combined = np.maximum(robust, isolation)
+        else:
+            combined = robust
+
+        worst = np.abs(z).argmax(axis=1)
+        rows = np.arange(features.shape[0])
+        return [
+            AnomalyScore(
+                resource_id=resource_id,
+                score=float(combined[i]),
+                metric_name=feature_names[worst[i]],
+                value=float(features[i, worst[i]]),
+                expected_value=float(np.nan_to_num(median[worst[i]])),
+                z_score=float(z[i, worst[i]]),
+                isolation_score=float(isolation[i]) if isolation is not None else None,
+            )
+            for i, resource_id in zip(rows, resource_ids, strict=True)
+        ]
+
+    def get_stats(self) -> dict[str, object]:
+        """
+        Get model statistics.
+
+        Returns:
+            Dictionary with the number of fits and per-type model state
+        """
+        with self._lock:
+            return {
+                "fits": self._fits,
+                "types": {
+                    resource_type: {
+                        "training_rows": len(state.rows),
+                        "fitted": state.model is not None,
+                        "fitted_at": state.fitted_at,
+                    }
+                    for resource_type, state in self._models.items()
+                },
+            }
+
+    @staticmethod
+    def _impute(features: np.ndarray) -> np.ndarray:
+        """Replace missing values with the column median (0 for empty columns)."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median = np.nan_to_num(np.nanmedian(features, axis=0))
+        return np.where(np.isnan(features), median, features)
+
+    def _update_model(
+        self,
+        resource_type: str,
+        feature_names: tuple[str, ...],
+        rows: np.ndarray,
+    ) -> IsolationForest | None:
+        """Add training rows and return the type's model, refitting it when due."""
+        with self._lock:
+            state = self._models.get(resource_type)
+            if state is None or state.feature_names != feature_names:
+                state = _TypeModel(feature_names, deque(maxlen=self.max_training_rows))
+                self._models[resource_type] = state
+            state.rows.extend(rows)
+
+            now = time.monotonic()
+            due = state.fitted_at is None or now - state.fitted_at >= self.refit_interval
+            if due and len(state.rows) >= self.min_training_rows:
+                model = IsolationForest(
+                    contamination=self.contamination,
+                    random_state=self.random_state,
+                    n_estimators=100,
+                )
+                model.fit(np.vstack(state.rows))
+                state.model = model
+                state.fitted_at = now
+                self._fits += 1
+                logger.info(
+                    "anomaly_model_fitted",
+                    resource_type=resource_type,
+                    training_rows=len(state.rows),
+                )
+            return state.model
@@ -100,6 +100,7 @@ class ElasticsearchCollector:
         password: str | None = None,
         api_key: str | None = None,
         timeout: int = 30,
+        client: httpx.AsyncClient | None = None,
     ):
         """
         Initialize Elasticsearch collector.
@@ -111,12 +112,37 @@ class ElasticsearchCollector:
             password: Basic auth password (optional)
             api_key: API key for authentication (optional, preferred over basic auth)
             timeout: Request timeout in seconds
+            client: Shared HTTP client to send requests with, already carrying
+                the authentication headers (a new one is created and owned by
+                the collector if None)
         """
         self.url = url.rstrip("/")
         self.index_pattern = index_pattern
         self.timeout = timeout
 
-        # Setup authentication
+        self._owns_client = client is None
+        if client is None:
+            headers, auth = self.auth_options(username, password, api_key)
+            client = httpx.AsyncClient(timeout=timeout, auth=auth, headers=headers)
+        self.client = client
+
+    @staticmethod
+    def auth_options(
+        username: str | None = None,
+        password: str | None = None,
+        api_key: str | None = None,
+    ) -> tuple[dict[str, str], tuple[str, str] | None]:
+        """
+        Build the headers and basic auth of an Elasticsearch HTTP client.
+
+        Args:
+            username: Basic auth username (optional)
+            password: Basic auth password (optional)
+            api_key: API key (optional, preferred over basic auth)
+
+        Returns:
+            Tuple of (headers, basic auth credentials or None)
+        """
         headers = {"Content-Type": "application/json"}
         auth = None
 
@@ -125,11 +151,12 @@ class ElasticsearchCollector:
         elif username and password:
             auth = (username, password)
 
-        self.client = httpx.AsyncClient(timeout=timeout, auth=auth, headers=headers)
+        return headers, auth
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Close HTTP client (a shared client is left open for its owner)."""
+        if self._owns_client:
+            await self.client.aclose()
 
     async def search(self, query: dict[str, Any]) -> list[dict[str, Any]]:
         """
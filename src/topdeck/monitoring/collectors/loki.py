@@ -44,21 +44,27 @@ class ErrorAnalysis:
 class LokiCollector:
     """Collector for Loki logs."""
 
-    def __init__(self, loki_url: str, timeout: int = 30):
+    def __init__(
+        self, loki_url: str, timeout: int = 30, client: httpx.AsyncClient | None = None
+    ):
         """
         Initialize Loki collector.
 
         Args:
             loki_url: URL of Loki server (e.g., "http://loki:3100")
             timeout: Request timeout in seconds
+            client: Shared HTTP client to send requests with (a new one is
+                created and owned by the collector if None)
         """
         self.loki_url = loki_url.rstrip("/")
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=timeout)
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Close HTTP client (a shared client is left open for its owner)."""
+        if self._owns_client:
+            await self.client.aclose()
 
     async def query(
         self,
@@ -14,6 +14,35 @@ from typing import Any
 
 import httpx
 
+from topdeck.common.worker_pool import WorkerPool, WorkerPoolConfig
+from topdeck.monitoring.collectors.promql_batch import (
+    DEFAULT_MAX_REGEX_LENGTH,
+    DEFAULT_MAX_URL_LENGTH,
+    BatchQuery,
+    demultiplex,
+    metric_templates,
+    plan_batches,
+    resource_selector,
+)
+from topdeck.monitoring.collectors.range_fetch import (
+    DEFAULT_RESOLUTION,
+    MIN_STEP_SECONDS,
+    RangeSeries,
+    choose_step,
+    decode_series,
+    format_step,
+    merge_series,
+    parse_step,
+    plan_chunks,
+    to_results,
+)
+
+# Concurrent batch queries per get_resources_metrics() call
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Concurrent chunk queries per long range fetch
+DEFAULT_CHUNK_CONCURRENCY = 4
+
 
 @dataclass
 class MetricValue:
@@ -47,21 +76,36 @@ class ResourceMetrics:
 class PrometheusCollector:
     """Collector for Prometheus metrics."""
 
-    def __init__(self, prometheus_url: str, timeout: int = 30):
+    def __init__(
+        self,
+        prometheus_url: str,
+        timeout: int = 30,
+        max_regex_length: int = DEFAULT_MAX_REGEX_LENGTH,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+        client: httpx.AsyncClient | None = None,
+    ):
         """
         Initialize Prometheus collector.
 
         Args:
             prometheus_url: URL of Prometheus server (e.g., "http://prometheus:9090")
             timeout: Request timeout in seconds
+            max_regex_length: Maximum resource regex length in batched queries
+            max_url_length: Maximum encoded URL length of batched queries
+            client: Shared HTTP client to send requests with (a new one is
+                created and owned by the collector if None)
         """
         self.prometheus_url = prometheus_url.rstrip("/")
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.max_regex_length = max_regex_length
+        self.max_url_length = max_url_length
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=timeout)
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Close HTTP client (a shared client is left open for its owner)."""
+        if self._owns_client:
+            await self.client.aclose()
 
     async def query(self, query: str) -> list[dict[str, Any]]:
         """
@@ -93,6 +137,9 @@ class PrometheusCollector:
         """
         Execute a PromQL range query.
 
+        Ranges with more points per series than Prometheus allows are split
+        into chunks that are fetched concurrently and merged.
+
         Args:
             query: PromQL query string
             start: Start time
@@ -102,6 +149,82 @@ class PrometheusCollector:
         Returns:
             List of query results with time series
         """
+        try:
+            step_seconds = parse_step(step)
+        except ValueError:
+            # Let Prometheus judge steps we cannot parse
+            return await self._query_range_once(query, start, end, step)
+
+        chunks = plan_chunks(start, end, step_seconds)
+        if len(chunks) == 1:
+            return await self._query_range_once(query, start, end, step)
+        series = await self._fetch_chunks(query, chunks, format_step(step_seconds))
+        return to_results(series)
+
+    async def fetch_range(
+        self,
+        query: str,
+        start: datetime,
+        end: datetime,
+        step: str | None = None,
+        resolution: int | None = None,
+        max_concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
+    ) -> list[RangeSeries]:
+        """
+        Fetch a range query of any length as NumPy arrays.
+
+        The step is chosen so each series has at most ``resolution`` points
+        (never finer than ``step``, if given). Ranges are split into chunks
+        within Prometheus's points-per-series limit, fetched concurrently and
+        merged per series.
+
+        Args:
+            query: PromQL query string
+            start: Start time
+            end: End time
+            step: Fixed step (e.g., "5m"), or the minimum step when a
+                resolution is given as well
+            resolution: Maximum points per series the caller needs
+                (default 1000 when no step is given)
+            max_concurrency: Maximum concurrent chunk queries
+
+        Returns:
+            Series with float64 timestamp and value arrays
+        """
+        min_step = parse_step(step) if step is not None else MIN_STEP_SECONDS
+        if step is None or resolution is not None:
+            step_seconds = max(
+                choose_step(start, end, resolution or DEFAULT_RESOLUTION), min_step
+            )
+        else:
+            step_seconds = min_step
+
+        chunks = plan_chunks(start, end, step_seconds)
+        return await self._fetch_chunks(query, chunks, format_step(step_seconds), max_concurrency)
+
+    async def _fetch_chunks(
+        self,
+        query: str,
+        chunks: list[tuple[datetime, datetime]],
+        step: str,
+        max_concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
+    ) -> list[RangeSeries]:
+        """Fetch range chunks concurrently and merge their decoded series."""
+
+        async def fetch(chunk: tuple[datetime, datetime]) -> list[RangeSeries]:
+            return decode_series(await self._query_range_once(query, chunk[0], chunk[1], step))
+
+        if len(chunks) == 1:
+            return await fetch(chunks[0])
+
+        pool = WorkerPool(WorkerPoolConfig(max_workers=max_concurrency))
+        decoded = await pool.map_partial(fetch, chunks)
+        return merge_series([series for series in decoded if series is not None])
+
+    async def _query_range_once(
+        self, query: str, start: datetime, end: datetime, step: str
+    ) -> list[dict[str, Any]]:
+        """Execute a single PromQL range request."""
         url = f"{self.prometheus_url}/api/v1/query_range"
         params = {
             "query": query,
@@ -133,50 +256,67 @@ class PrometheusCollector:
             duration: Time range to query
 
         Returns:
-            ResourceMetrics with collected metrics and analysis
+            ResourceMetrics with collected metrics and analysis (without
+            metrics if the query failed)
         """
-        end = datetime.now(UTC)
-        start = end - duration
-
-        metrics = {}
-        anomalies = []
+        metrics = await self.get_resources_metrics({resource_id: resource_type}, duration)
+        if resource_id not in metrics:
+            return self._build_resource_metrics(resource_id, resource_type, {})
+        return metrics[resource_id]
+
+    async def get_resources_metrics(
+        self,
+        resources: dict[str, str],
+        duration: timedelta = timedelta(hours=1),
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        deadline: float | None = None,
+    ) -> dict[str, ResourceMetrics]:
+        """
+        Get metrics for many resources with batched queries.
 
-        # Define metric queries based on resource type
-        metric_queries = self._get_metric_queries(resource_id, resource_type)
+        Each metric is queried once per chunk of resources of the same kind
+        (see promql_batch) rather than once per resource, and the result
+        series are split back into per-resource metrics.
 
-        for metric_name, query in metric_queries.items():
-            results = await self.query_range(query, start, end, "1m")
+        Args:
+            resources: Resource type per resource ID
+            duration: Time range to query
+            max_concurrency: Maximum concurrent batch queries
+            deadline: Optional time budget in seconds; resources whose
+                queries did not finish in time are left out of the result
 
-            if results:
-                for result in results:
-                    labels = result.get("metric", {})
-                    values_data = result.get("values", [])
+        Returns:
+            Dictionary mapping resource IDs to their metrics
+        """
+        end = datetime.now(UTC)
+        start = end - duration
 
-                    values = [
-                        MetricValue(
-                            timestamp=datetime.fromtimestamp(ts), value=float(val), labels=labels
-                        )
-                        for ts, val in values_data
-                    ]
+        batches = plan_batches(resources, self.max_regex_length, self.max_url_length)
 
-                    series = MetricSeries(metric_name=metric_name, labels=labels, values=values)
-                    metrics[metric_name] = series
+        async def run(batch: BatchQuery) -> list[dict[str, Any]]:
+            return await self.query_range(batch.query, start, end, "1m")
 
-                    # Check for anomalies
-                    anomaly = self._detect_anomaly(metric_name, values)
-                    if anomaly:
-                        anomalies.append(anomaly)
+        pool = WorkerPool(WorkerPoolConfig(max_workers=max_concurrency))
+        results = await pool.map_partial(run, batches, deadline=deadline)
 
-        # Calculate health score
-        health_score = self._calculate_health_score(metrics, anomalies)
+        series: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        unfinished: set[str] = set()
+        for batch, result in zip(batches, results, strict=True):
+            if result is None:
+                unfinished.update(batch.resource_ids)
+                continue
+            for resource_id, resource_series in demultiplex(batch, result).items():
+                series.setdefault(resource_id, {}).setdefault(batch.metric_name, []).extend(
+                    resource_series
+                )
 
-        return ResourceMetrics(
-            resource_id=resource_id,
-            resource_type=resource_type,
-            metrics=metrics,
-            anomalies=anomalies,
-            health_score=health_score,
-        )
+        return {
+            resource_id: self._build_resource_metrics(
+                resource_id, resource_type, series.get(resource_id, {})
+            )
+            for resource_id, resource_type in resources.items()
+            if resource_id not in unfinished
+        }
 
     async def get_flow_metrics(
         self, flow_path: list[str], duration: timedelta = timedelta(hours=1)
@@ -191,17 +331,9 @@ class PrometheusCollector:
         Returns:
             Dictionary mapping resource IDs to their metrics
         """
-        flow_metrics = {}
-
-        for resource_id in flow_path:
-            # In a real implementation, we'd need to look up the resource type
-            # For now, we'll use a generic approach
-            metrics = await self.get_resource_metrics(
-                resource_id=resource_id, resource_type="service", duration=duration  # Default
-            )
-            flow_metrics[resource_id] = metrics
-
-        return flow_metrics
+        # In a real implementation, we'd need to look up the resource type
+        # For now, we'll use a generic approach
+        return await self.get_resources_metrics(dict.fromkeys(flow_path, "service"), duration)
 
     async def detect_bottlenecks(self, flow_path: list[str]) -> list[dict[str, Any]]:
         """
@@ -261,37 +393,61 @@ class PrometheusCollector:
 
         return bottlenecks
 
+    def _build_resource_metrics(
+        self,
+        resource_id: str,
+        resource_type: str,
+        series_by_metric: dict[str, list[dict[str, Any]]],
+    ) -> ResourceMetrics:
+        """Build ResourceMetrics from the result series of each metric."""
+        metrics = {}
+        anomalies = []
+
+        templates = metric_templates(resource_type)
+        metric_names = list(templates[1]) if templates else []
+        for metric_name in metric_names:
+            for result in series_by_metric.get(metric_name, []):
+                labels = result.get("metric", {})
+                values_data = result.get("values", [])
+
+                values = [
+                    MetricValue(
+                        timestamp=datetime.fromtimestamp(ts), value=float(val), labels=labels
+                    )
+                    for ts, val in values_data
+                ]
+
+                series = MetricSeries(metric_name=metric_name, labels=labels, values=values)
+                metrics[metric_name] = series
+
+                # Check for anomalies
+                anomaly = self._detect_anomaly(metric_name, values)
+                if anomaly:
+                    anomalies.append(anomaly)
+
+        # Calculate health score
+        health_score = self._calculate_health_score(metrics, anomalies)
+
+        return ResourceMetrics(
+            resource_id=resource_id,
+            resource_type=resource_type,
+            metrics=metrics,
+            anomalies=anomalies,
+            health_score=health_score,
+        )
+
     def _get_metric_queries(self, resource_id: str, resource_type: str) -> dict[str, str]:
         """Get PromQL queries for a resource type."""
-        queries = {}
-
-        if resource_type in ("pod", "service", "container"):
-            queries.update(
-                {
-                    "cpu_usage": f'rate(container_cpu_usage_seconds_total{{pod=~".*{resource_id}.*"}}[5m])',
-                    "memory_usage": f'container_memory_usage_bytes{{pod=~".*{resource_id}.*"}}',
-                    "latency_p95": f'histogram_quantile(0.95, rate(http_request_duration_seconds_bucket{{pod=~".*{resource_id}.*"}}[5m]))',
-                    "request_rate": f'rate(http_requests_total{{pod=~".*{resource_id}.*"}}[5m])',
-                    "error_rate": f'rate(http_requests_total{{pod=~".*{resource_id}.*", status=~"5.."}}[5m]) / rate(http_requests_total{{pod=~".*{resource_id}.*"}}[5m])',
-                }
-            )
-        elif resource_type == "database":
-            queries.update(
-                {
-                    "query_duration_p95": f'histogram_quantile(0.95, rate(database_query_duration_seconds_bucket{{instance=~".*{resource_id}.*"}}[5m]))',
-                    "connections": f'database_connections{{instance=~".*{resource_id}.*"}}',
-                    "deadlocks": f'rate(database_deadlocks_total{{instance=~".*{resource_id}.*"}}[5m])',
-                }
-            )
-        elif resource_type == "load_balancer":
-            queries.update(
-                {
-                    "request_rate": f'rate(loadbalancer_requests_total{{name=~".*{resource_id}.*"}}[5m])',
-                    "backend_connection_errors": f'rate(loadbalancer_backend_connection_errors_total{{name=~".*{resource_id}.*"}}[5m])',
-                }
-            )
-
-        return queries
+        templates = metric_templates(resource_type)
+        if templates is None:
+            return {}
+
+        label, queries = templates
+        selector = resource_selector(label, [resource_id])
+        return {
+            metric_name: template.format(selector=selector)
+            for metric_name, template in queries.items()
+        }
 
     def _detect_anomaly(self, metric_name: str, values: list[MetricValue]) -> str | None:
         """Detect anomalies in metric values."""
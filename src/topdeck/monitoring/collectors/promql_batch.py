@@ -0,0 +1,204 @@
+"""
+Batched PromQL planning for per-resource metric queries.
+
+Resource metrics are defined as PromQL templates with a ``{selector}``
+placeholder for the label matcher that picks the resource's series, e.g.
+``pod=~".*web-1.*"``. Instead of running every template once per resource,
+the planner puts many resources into one regex alternation
+(``pod=~".*(web\\-1|web\\-2).*"``), so each metric needs one range query per
+chunk of resources. The result series are then mapped back to resources by
+the same label.
+
+Chunks are capped by the length of the regex and of the encoded request
+URL, so large topologies are split into several queries automatically.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote_plus
+
+# Label identifying the resource, and metric templates, per resource type
+RESOURCE_METRIC_TEMPLATES: dict[tuple[str, ...], tuple[str, dict[str, str]]] = {
+    ("pod", "service", "container"): (
+        "pod",
+        {
+            "cpu_usage": "rate(container_cpu_usage_seconds_total{{{selector}}}[5m])",
+            "memory_usage": "container_memory_usage_bytes{{{selector}}}",
+            "latency_p95": "histogram_quantile(0.95, rate(http_request_duration_seconds_bucket{{{selector}}}[5m]))",
+            "request_rate": "rate(http_requests_total{{{selector}}}[5m])",
+            "error_rate": 'rate(http_requests_total{{{selector}, status=~"5.."}}[5m]) / rate(http_requests_total{{{selector}}}[5m])',
+        },
+    ),
+    ("database",): (
+        "instance",
+        {
+            "query_duration_p95": "histogram_quantile(0.95, rate(database_query_duration_seconds_bucket{{{selector}}}[5m]))",
+            "connections": "database_connections{{{selector}}}",
+            "deadlocks": "rate(database_deadlocks_total{{{selector}}}[5m])",
+        },
+    ),
+    ("load_balancer",): (
+        "name",
+        {
+            "request_rate": "rate(loadbalancer_requests_total{{{selector}}}[5m])",
+            "backend_connection_errors": "rate(loadbalancer_backend_connection_errors_total{{{selector}}}[5m])",
+        },
+    ),
+}
+
+# Defaults keep requests below common proxy and server URL limits (8 KiB)
+DEFAULT_MAX_REGEX_LENGTH = 2048
+DEFAULT_MAX_URL_LENGTH = 6000
+
+# Allowance for the rest of a query_range URL (host, path, start/end/step)
+_URL_OVERHEAD = 200
+
+
+@dataclass
+class BatchQuery:
+    """One range query covering a metric for a chunk of resources."""
+
+    metric_name: str
+    label: str
+    query: str
+    resource_ids: list[str]
+
+
+def metric_templates(resource_type: str) -> tuple[str, dict[str, str]] | None:
+    """
+    Get the resource label and metric templates for a resource type.
+
+    Args:
+        resource_type: Resource type (case-insensitive), e.g. ``pod``
+
+    Returns:
+        Tuple of (label, templates by metric name), or None for types
+        without metrics
+    """
+    resource_type = resource_type.lower()
+    for resource_types, templates in RESOURCE_METRIC_TEMPLATES.items():
+        if resource_type in resource_types:
+            return templates
+    return None
+
+
+def resource_selector(label: str, resource_ids: list[str]) -> str:
+    """
+    Build a label matcher selecting series of any of the resources.
+
+    IDs are matched as substrings of the label value and regex-escaped, so
+    characters like ``.`` only match themselves.
+
+    Args:
+        label: Label carrying the resource name, e.g. ``pod``
+        resource_ids: Resource IDs
+
+    Returns:
+        Matcher such as ``pod=~".*(a|b).*"``
+    """
+    escaped = [_promql_string(re.escape(resource_id)) for resource_id in resource_ids]
+    alternation = escaped[0] if len(escaped) == 1 else f"({'|'.join(escaped)})"
+    return f'{label}=~".*{alternation}.*"'
+
+
+def plan_batches(
+    resources: dict[str, str],
+    max_regex_length: int = DEFAULT_MAX_REGEX_LENGTH,
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+) -> list[BatchQuery]:
+    """
+    Plan the range queries fetching metrics for many resources.
+
+    Args:
+        resources: Resource type per resource ID
+        max_regex_length: Maximum length of one resource regex
+        max_url_length: Maximum length of one encoded query_range URL
+
+    Returns:
+        Batch queries; together they cover every metric of every resource
+        whose type has metrics
+    """
+    groups: dict[tuple[str, tuple[tuple[str, str], ...]], list[str]] = {}
+    for resource_id, resource_type in resources.items():
+        templates = metric_templates(resource_type)
+        if templates is not None:
+            label, queries = templates
+            groups.setdefault((label, tuple(queries.items())), []).append(resource_id)
+
+    batches = []
+    for (label, templates), resource_ids in groups.items():
+        for chunk in _chunk(label, templates, resource_ids, max_regex_length, max_url_length):
+            selector = resource_selector(label, chunk)
+            batches.extend(
+                BatchQuery(
+                    metric_name=metric_name,
+                    label=label,
+                    query=template.format(selector=selector),
+                    resource_ids=chunk,
+                )
+                for metric_name, template in templates
+            )
+    return batches
+
+
+def demultiplex(batch: BatchQuery, results: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """
+    Split the series of a batch query by resource.
+
+    A series belongs to every resource of the batch whose ID occurs in its
+    resource label, mirroring the ``.*id.*`` regex that selected it.
+
+    Args:
+        batch: Executed batch query
+        results: Prometheus result series (``metric`` and ``values``)
+
+    Returns:
+        Result series per resource ID (resources without series are left out)
+    """
+    ids = set(batch.resource_ids)
+    by_resource: dict[str, list[dict[str, Any]]] = {}
+    for series in results:
+        value = series.get("metric", {}).get(batch.label, "")
+        if value in ids:
+            owners = [value]
+        else:
+            owners = [resource_id for resource_id in batch.resource_ids if resource_id in value]
+        for resource_id in owners:
+            by_resource.setdefault(resource_id, []).append(series)
+    return by_resource
+
+
+def _chunk(
+    label: str,
+    templates: tuple[tuple[str, str], ...],
+    resource_ids: list[str],
+    max_regex_length: int,
+    max_url_length: int,
+) -> list[list[str]]:
+    """Greedily split resource IDs into chunks whose queries fit the limits."""
+    longest = max((template for _, template in templates), key=len)
+
+    def fits(chunk: list[str]) -> bool:
+        selector = resource_selector(label, chunk)
+        if len(selector) > max_regex_length:
+            return False
+        encoded = quote_plus(longest.format(selector=selector))
+        return len(encoded) + _URL_OVERHEAD <= max_url_length
+
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    for resource_id in resource_ids:
+        if current and not fits([*current, resource_id]):
+            chunks.append(current)
+            current = []
+        # An ID too long on its own still gets its own query
+        current.append(resource_id)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _promql_string(value: str) -> str:
+    """Escape a value for use inside a double-quoted PromQL string."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
@@ -0,0 +1,230 @@
+"""
+Chunked, step-aware planning and decoding for long PromQL range queries.
+
+Prometheus rejects range queries returning more than 11,000 points per
+series, and long ranges at a fine step produce very large responses. Range
+fetches are therefore:
+
+- given a step derived from the range and the caller's resolution budget
+  (the number of points it needs), unless the caller fixes one,
+- split into chunks of at most ``MAX_POINTS_PER_SERIES`` points that do not
+  share sample timestamps, so they can be fetched concurrently, and
+- decoded into NumPy float64 arrays per series and merged by label set.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+# Prometheus limit on points per series in one range query
+MAX_POINTS_PER_SERIES = 11000
+
+# Points per series when the caller gives neither a step nor a budget
+DEFAULT_RESOLUTION = 1000
+
+# Smallest step chosen automatically, in seconds
+MIN_STEP_SECONDS = 1.0
+
+_DURATION_UNITS = {
+    "ms": 0.001,
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+    "w": 604800,
+    "y": 31536000,
+}
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h|d|w|y)")
+
+
+@dataclass
+class RangeSeries:
+    """One series of a range query, decoded into arrays."""
+
+    labels: dict[str, str]
+    timestamps: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def parse_step(step: str | float | timedelta) -> float:
+    """
+    Convert a Prometheus step to seconds.
+
+    Args:
+        step: Duration string (``"5m"``, ``"1h30m"``), float seconds
+            (``"30"``, ``30``) or timedelta
+
+    Returns:
+        Step in seconds
+
+    Raises:
+        ValueError: If the step is not a positive duration
+    """
+    if isinstance(step, timedelta):
+        seconds = step.total_seconds()
+    elif isinstance(step, int | float):
+        seconds = float(step)
+    else:
+        try:
+            seconds = float(step)
+        except ValueError:
+            parts = _DURATION_PART.findall(step)
+            if not parts or "".join(n + u for n, u in parts) != step:
+                raise ValueError(f"Invalid step: {step!r}") from None
+            seconds = sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    if seconds <= 0:
+        raise ValueError(f"Step must be positive: {step!r}")
+    return seconds
+
+
+def format_step(seconds: float) -> str:
+    """Format a step in seconds for the ``step`` query parameter."""
+    return f"{seconds:g}"
+
+
+def choose_step(
+    start: datetime,
+    end: datetime,
+    resolution: int = DEFAULT_RESOLUTION,
+    min_step: float = MIN_STEP_SECONDS,
+) -> float:
+    """
+    Choose the step giving at most ``resolution`` points over a range.
+
+    Args:
+        start: Range start
+        end: Range end
+        resolution: Maximum number of points per series the caller needs
+        min_step: Smallest step to use in seconds
+
+    Returns:
+        Step in whole seconds (at least min_step)
+    """
+    span = max((end - start).total_seconds(), 0.0)
+    return max(float(math.ceil(span / max(resolution, 1))), min_step)
+
+
+def plan_chunks(
+    start: datetime,
+    end: datetime,
+    step: float,
+    max_points: int = MAX_POINTS_PER_SERIES,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Split a range into chunks of at most ``max_points`` points.
+
+    Chunks start one step after the previous chunk's last point, so the
+    evaluation timestamps of the whole range are covered exactly once.
+
+    Args:
+        start: Range start
+        end: Range end
+        step: Step in seconds
+        max_points: Maximum points per series per chunk
+
+    Returns:
+        List of (start, end) pairs in order
+    """
+    chunk_span = timedelta(seconds=step * (max_points - 1))
+    chunks = []
+    chunk_start = start
+    while True:
+        chunk_end = min(chunk_start + chunk_span, end)
+        chunks.append((chunk_start, chunk_end))
+        if chunk_end >= end:
+            return chunks
+        chunk_start = chunk_end + timedelta(seconds=step)
+        if chunk_start > end:
+            return chunks
+
+
+def decode_series(results: list[dict[str, Any]]) -> list[RangeSeries]:
+    """
+    Decode range query result series into float64 arrays.
+
+    Sample values (strings such as ``"1.5"``, ``"NaN"``, ``"+Inf"``) are
+    parsed straight into the arrays without building intermediate lists.
+
+    Args:
+        results: ``data.result`` of a Prometheus range query
+
+    Returns:
+        Decoded series
+    """
+    decoded = []
+    for result in results:
+        samples = result.get("values", [])
+        count = len(samples)
+        decoded.append(
+            RangeSeries(
+                labels=result.get("metric", {}),
+                timestamps=np.fromiter((s[0] for s in samples), np.float64, count),
+                values=np.fromiter((s[1] for s in samples), np.float64, count),
+            )
+        )
+    return decoded
+
+
+def merge_series(chunks: list[list[RangeSeries]]) -> list[RangeSeries]:
+    """
+    Merge the series of several chunks by label set.
+
+    Args:
+        chunks: Decoded series per chunk
+
+    Returns:
+        One series per label set, sorted by timestamp without duplicates
+    """
+    grouped: dict[tuple[tuple[str, str], ...], list[RangeSeries]] = {}
+    for series_list in chunks:
+        for series in series_list:
+            grouped.setdefault(tuple(sorted(series.labels.items())), []).append(series)
+
+    merged = []
+    for parts in grouped.values():
+        if len(parts) == 1:
+            merged.append(parts[0])
+            continue
+        timestamps = np.concatenate([part.timestamps for part in parts])
+        values = np.concatenate([part.values for part in parts])
+        timestamps, first = np.unique(timestamps, return_index=True)
+        merged.append(RangeSeries(parts[0].labels, timestamps, values[first]))
+    return merged
+
+
+def to_results(series: list[RangeSeries]) -> list[dict[str, Any]]:
+    """
+    Convert decoded series back to Prometheus result format.
+
+    Args:
+        series: Decoded series
+
+    Returns:
+        Series with ``metric`` labels and ``[timestamp, "value"]`` pairs
+    """
+    return [
+        {
+            "metric": s.labels,
+            "values": [
+                [timestamp, _format_value(value)]
+                for timestamp, value in zip(s.timestamps.tolist(), s.values.tolist(), strict=True)
+            ],
+        }
+        for s in series
+    ]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus does."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
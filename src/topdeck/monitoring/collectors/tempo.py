@@ -49,21 +49,27 @@ class Trace:
 class TempoCollector:
     """Collector for Tempo distributed traces."""
 
-    def __init__(self, tempo_url: str, timeout: int = 30):
+    def __init__(
+        self, tempo_url: str, timeout: int = 30, client: httpx.AsyncClient | None = None
+    ):
         """
         Initialize Tempo collector.
 
         Args:
             tempo_url: URL of Tempo server (e.g., "http://tempo:3200")
             timeout: Request timeout in seconds
+            client: Shared HTTP client to send requests with (a new one is
+                created and owned by the collector if None)
         """
         self.tempo_url = tempo_url.rstrip("/")
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=timeout)
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Close HTTP client (a shared client is left open for its owner)."""
+        if self._owns_client:
+            await self.client.aclose()
 
     @staticmethod
     def _escape_traceql_string(value: str) -> str:
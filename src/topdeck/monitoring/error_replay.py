@@ -12,22 +12,30 @@ Key Features:
 - Replay error sequences to understand causation
 - Correlate errors with topology changes
 - Time-travel debugging to see system state at error time
+
+Context collectors run concurrently when an error is captured. Collectors
+that miss the capture deadline are recorded in the snapshot's metadata and
+keep running in the background, updating the stored snapshot when they
+finish.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
-from dataclasses import asdict, dataclass, field
+from collections.abc import Coroutine
+from dataclasses import asdict, dataclass, field, replace
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Any
 
+from topdeck.common.config import settings
 from topdeck.monitoring.collectors.azure_log_analytics import AzureLogAnalyticsCollector
 from topdeck.monitoring.collectors.elasticsearch import ElasticsearchCollector
 from topdeck.monitoring.collectors.loki import LokiCollector
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
 from topdeck.monitoring.collectors.tempo import TempoCollector
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 logger = logging.getLogger(__name__)
 
@@ -122,16 +130,25 @@ class ErrorReplayService:
 
     def __init__(
         self,
-        neo4j_client: Neo4jClient,
+        neo4j_client: AsyncNeo4jClient,
         prometheus_url: str | None = None,
         loki_url: str | None = None,
         tempo_url: str | None = None,
         elasticsearch_url: str | None = None,
         azure_workspace_id: str | None = None,
+        prometheus_collector: PrometheusCollector | None = None,
+        loki_collector: LokiCollector | None = None,
+        tempo_collector: TempoCollector | None = None,
+        elasticsearch_collector: ElasticsearchCollector | None = None,
+        capture_timeout: float | None = None,
+        enrichment_timeout: float | None = None,
     ):
         """
         Initialize error replay service.
 
+        Collectors passed in (e.g. on shared HTTP clients) take precedence
+        over the corresponding URLs.
+
         Args:
             neo4j_client: Neo4j client for topology and error storage
             prometheus_url: Prometheus server URL
@@ -139,16 +156,30 @@ class ErrorReplayService:
             tempo_url: Tempo server URL
             elasticsearch_url: Elasticsearch server URL
             azure_workspace_id: Azure Log Analytics workspace ID
+            prometheus_collector: Prometheus collector to use
+            loki_collector: Loki collector to use
+            tempo_collector: Tempo collector to use
+            elasticsearch_collector: Elasticsearch collector to use
+            capture_timeout: Seconds capture_error waits for context collectors
+                (defaults to settings.error_replay_capture_timeout)
+            enrichment_timeout: Seconds slower collectors may keep enriching
+                a captured snapshot in the background
+                (defaults to settings.error_replay_enrichment_timeout)
         """
         self.neo4j_client = neo4j_client
+        self.capture_timeout = capture_timeout or settings.error_replay_capture_timeout
+        self.enrichment_timeout = enrichment_timeout or settings.error_replay_enrichment_timeout
+        self._enrichment_tasks: set[asyncio.Task] = set()
 
         # Initialize collectors for different platforms
-        self.prometheus_collector = (
+        self.prometheus_collector = prometheus_collector or (
             PrometheusCollector(prometheus_url) if prometheus_url else None
         )
-        self.loki_collector = LokiCollector(loki_url) if loki_url else None
-        self.tempo_collector = TempoCollector(tempo_url) if tempo_url else None
-        self.elasticsearch_collector = (
+        self.loki_collector = loki_collector or (LokiCollector(loki_url) if loki_url else None)
+        self.tempo_collector = tempo_collector or (
+            TempoCollector(tempo_url) if tempo_url else None
+        )
+        self.elasticsearch_collector = elasticsearch_collector or (
             ElasticsearchCollector(elasticsearch_url) if elasticsearch_url else None
         )
         self.azure_log_collector = (
@@ -180,6 +211,11 @@ class ErrorReplayService:
         """
         Capture an error with full context.
 
+        Context is collected concurrently within capture_timeout. The
+        snapshot is stored and returned without the collectors that are not
+        done by then; they are listed in ``metadata["timed_out_collectors"]``
+        and update the stored snapshot in the background.
+
         Args:
             message: Error message
             severity: Error severity level
@@ -200,26 +236,39 @@ class ErrorReplayService:
         timestamp = datetime.now(UTC)
         error_id = self._generate_error_id(timestamp, message, resource_id)
 
-        # Collect context from all available sources
-        logs = await self._collect_surrounding_logs(timestamp, resource_id, correlation_id)
-        metrics = await self._collect_metrics_at_time(timestamp, resource_id)
-        traces = await self._collect_traces(trace_id, correlation_id)
-        topology_snapshot = await self._capture_topology_snapshot(timestamp, resource_id)
-
-        # Find related errors
-        related_errors = await self._find_related_errors(
-            timestamp, resource_id, correlation_id, trace_id
-        )
-
-        # Find affected resources
-        affected_resources = await self._identify_affected_resources(
-            resource_id, error_type, topology_snapshot
-        )
-
-        # Get deployment context
-        deployment_context = await self._get_deployment_context(timestamp, resource_id)
+        # Independent context collectors, keyed by the snapshot field they fill
+        collectors: dict[str, Coroutine[Any, Any, Any]] = {
+            "logs": self._collect_surrounding_logs(timestamp, resource_id, correlation_id),
+            "metrics": self._collect_metrics_at_time(timestamp, resource_id),
+            "traces": self._collect_traces(trace_id, correlation_id),
+            "topology_snapshot": self._capture_topology_snapshot(timestamp, resource_id),
+            "related_errors": self._find_related_errors(
+                timestamp, resource_id, correlation_id, trace_id
+            ),
+            "affected_resources": self._identify_affected_resources(resource_id, error_type),
+            "deployment_context": self._get_deployment_context(timestamp, resource_id),
+        }
+        tasks = {name: asyncio.create_task(coro) for name, coro in collectors.items()}
+        try:
+            await asyncio.wait(tasks.values(), timeout=self.capture_timeout)
+        except asyncio.CancelledError:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        context, failed = self._collected_context(tasks)
+        pending = {name: task for name, task in tasks.items() if not task.done()}
+        metadata = dict(metadata or {})
+        if failed:
+            metadata["failed_collectors"] = failed
+        if pending:
+            metadata["timed_out_collectors"] = sorted(pending)
+            metadata["enrichment_pending"] = True
+            logger.info(
+                f"Error {error_id} captured without {', '.join(sorted(pending))} "
+                f"after {self.capture_timeout}s; enriching in the background"
+            )
 
-        # Create error snapshot
         error_snapshot = ErrorSnapshot(
             error_id=error_id,
             timestamp=timestamp,
@@ -233,22 +282,90 @@ class ErrorReplayService:
             correlation_id=correlation_id,
             trace_id=trace_id,
             span_id=span_id,
-            logs=logs,
-            metrics=metrics,
-            traces=traces,
-            topology_snapshot=topology_snapshot,
-            related_errors=related_errors,
-            affected_resources=affected_resources,
-            deployment_context=deployment_context,
             tags=tags or {},
-            metadata=metadata or {},
+            metadata=metadata,
+            **context,
         )
 
         # Store error snapshot
-        await self._store_error_snapshot(error_snapshot)
+        try:
+            await self._store_error_snapshot(error_snapshot)
+        except BaseException:
+            # Without a stored snapshot, nothing would own the pending collectors
+            for task in pending.values():
+                task.cancel()
+            raise
+
+        if pending:
+            task = asyncio.create_task(self._enrich_error_snapshot(error_snapshot, pending))
+            self._enrichment_tasks.add(task)
+            task.add_done_callback(self._enrichment_tasks.discard)
 
         return error_snapshot
 
+    async def wait_for_enrichment(self) -> None:
+        """Wait until the background enrichment of captured errors is done."""
+        while self._enrichment_tasks:
+            await asyncio.gather(*self._enrichment_tasks, return_exceptions=True)
+
+    def _collected_context(
+        self, tasks: dict[str, asyncio.Task]
+    ) -> tuple[dict[str, Any], list[str]]:
+        """
+        Collect the results of finished collector tasks.
+
+        Args:
+            tasks: Collector tasks keyed by snapshot field
+
+        Returns:
+            Tuple of (results of the finished collectors keyed by snapshot
+            field, names of the collectors that raised)
+        """
+        context = {}
+        failed = []
+        for name, task in tasks.items():
+            if not task.done() or task.cancelled():
+                continue
+            if task.exception() is not None:
+                logger.warning(f"Failed to collect {name} for error snapshot: {task.exception()}")
+                failed.append(name)
+            else:
+                context[name] = task.result()
+        return context, failed
+
+    async def _enrich_error_snapshot(
+        self, error_snapshot: ErrorSnapshot, pending: dict[str, asyncio.Task]
+    ) -> None:
+        """
+        Wait for collectors that missed the capture deadline and store their context.
+
+        Collectors still running after enrichment_timeout are cancelled and
+        listed in ``metadata["failed_collectors"]``.
+
+        Args:
+            error_snapshot: Snapshot stored without the pending collectors
+            pending: Collector tasks still running, keyed by snapshot field
+        """
+        _, still_pending = await asyncio.wait(pending.values(), timeout=self.enrichment_timeout)
+        for task in still_pending:
+            task.cancel()
+
+        context, failed = self._collected_context(pending)
+        failed += [name for name, task in pending.items() if task in still_pending]
+        metadata = dict(error_snapshot.metadata)
+        metadata.pop("enrichment_pending", None)
+        if failed:
+            metadata["failed_collectors"] = sorted(metadata.get("failed_collectors", []) + failed)
+
+        try:
+            await self._store_error_snapshot(
+                replace(error_snapshot, metadata=metadata, **context)
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to store enriched error snapshot {error_snapshot.error_id}: {e}"
+            )
+
     async def replay_error(self, error_id: str) -> ErrorReplayResult:
         """
         Replay an error to understand what happened.
@@ -403,47 +520,36 @@ class ErrorReplayService:
     async def _collect_surrounding_logs(
         self, timestamp: datetime, resource_id: str | None, correlation_id: str | None
     ) -> list[dict[str, Any]]:
-        """Collect logs surrounding the error time."""
-        logs = []
+        """Collect logs surrounding the error time from all log sources concurrently."""
+        if not resource_id:
+            return []
 
         # 5 minutes before and after
         time_window = timedelta(minutes=5)
-        start_time = timestamp - time_window
-        end_time = timestamp + time_window
-
-        # Try Loki first
-        if self.loki_collector and resource_id:
-            try:
-                loki_logs = await self.loki_collector.get_logs(
-                    resource_id=resource_id, start_time=start_time, end_time=end_time, limit=50
-                )
-                logs.extend([asdict(log) for log in loki_logs])
-            except Exception as e:
-                logger.debug(f"Failed to collect logs from Loki: {e}")
-                pass  # Continue with other sources
-
-        # Try Elasticsearch
-        if self.elasticsearch_collector and resource_id:
-            try:
-                es_logs = await self.elasticsearch_collector.search_logs(
-                    resource_id=resource_id, start_time=start_time, end_time=end_time, limit=50
-                )
-                logs.extend([asdict(log) for log in es_logs])
-            except Exception as e:
-                logger.debug(f"Failed to collect logs from Elasticsearch: {e}")
-                pass
-
-        # Try Azure Log Analytics
-        if self.azure_log_collector and resource_id:
-            try:
-                azure_logs = await self.azure_log_collector.query_logs(
-                    resource_id=resource_id, start_time=start_time, end_time=end_time, limit=50
-                )
-                logs.extend([asdict(log) for log in azure_logs])
-            except Exception as e:
-                logger.debug(f"Failed to collect logs from Azure Log Analytics: {e}")
-                pass
+        window = {
+            "resource_id": resource_id,
+            "start_time": timestamp - time_window,
+            "end_time": timestamp + time_window,
+            "limit": 50,
+        }
+
+        queries = []
+        if self.loki_collector:
+            queries.append(("Loki", self.loki_collector.get_logs(**window)))
+        if self.elasticsearch_collector:
+            queries.append(("Elasticsearch", self.elasticsearch_collector.search_logs(**window)))
+        if self.azure_log_collector:
+            queries.append(("Azure Log Analytics", self.azure_log_collector.query_logs(**window)))
+
+        results = await asyncio.gather(*(query for _, query in queries), return_exceptions=True)
 
+        logs = []
+        for (source, _), result in zip(queries, results, strict=True):
+            if isinstance(result, BaseException):
+                # Continue with other sources
+                logger.debug(f"Failed to collect logs from {source}: {result}")
+                continue
+            logs.extend(asdict(log) for log in result)
         return logs
 
     async def _collect_metrics_at_time(
@@ -545,7 +651,7 @@ class ErrorReplayService:
         return [record["error_id"] for record in records]
 
     async def _identify_affected_resources(
-        self, resource_id: str | None, error_type: str | None, topology_snapshot: dict[str, Any]
+        self, resource_id: str | None, error_type: str | None
     ) -> list[str]:
         """Identify resources affected by this error."""
         if not resource_id:
@@ -598,9 +704,10 @@ class ErrorReplayService:
 
     async def _store_error_snapshot(self, error_snapshot: ErrorSnapshot) -> None:
         """Store error snapshot in Neo4j."""
+        # Merged on error_id so background enrichment updates the stored snapshot
         query = """
-        CREATE (e:ErrorSnapshot {
-            error_id: $error_id,
+        MERGE (e:ErrorSnapshot {error_id: $error_id})
+        SET e += {
             timestamp: $timestamp,
             severity: $severity,
             source: $source,
@@ -621,7 +728,7 @@ class ErrorReplayService:
             deployment_context: $deployment_context,
             tags: $tags,
             metadata: $metadata
-        })
+        }
         """
 
         # Convert to storable format
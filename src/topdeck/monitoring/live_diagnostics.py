@@ -5,22 +5,94 @@ Integrates ML-based anomaly detection with network topology to identify
 failing services and abnormal traffic patterns in real-time.
 """
 
+import asyncio
 import re
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import numpy as np
 import structlog
-from sklearn.ensemble import IsolationForest
 
 from topdeck.analysis.prediction.predictor import Predictor
+from topdeck.common.config import settings
+from topdeck.common.worker_pool import WorkerPool, WorkerPoolConfig
+from topdeck.monitoring.anomaly_engine import AnomalyScore, BatchAnomalyEngine
 from topdeck.monitoring.collectors.loki import LokiCollector
-from topdeck.monitoring.collectors.prometheus import PrometheusCollector
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.monitoring.collectors.prometheus import PrometheusCollector, ResourceMetrics
+from topdeck.monitoring.collectors.promql_batch import metric_templates
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
+from topdeck.storage.query_catalog import NODE_LABEL, QueryBuilder, register_query
 
 logger = structlog.get_logger(__name__)
 
+FAILING_DEPENDENCIES_QUERY = register_query(
+    "diagnostics.failing_dependencies",
+    f"""
+    MATCH (source:{NODE_LABEL})-[r:DEPENDS_ON]->(target:{NODE_LABEL})
+    RETURN source.id as source_id,
+           source.name as source_name,
+           target.id as target_id,
+           target.name as target_name,
+           r.properties as relationship_props
+    """,
+)
+
+TOPOLOGY_RESOURCES_QUERY = register_query(
+    "diagnostics.topology_resources",
+    f"""
+    MATCH (n:{NODE_LABEL})
+    WHERE n.id IS NOT NULL
+    RETURN n.id as id, n.name as name, {QueryBuilder.primary_label("n")} as type,
+           n.namespace as namespace
+    LIMIT 1000
+    """,
+)
+
+RESOURCE_IDS_QUERY = register_query(
+    "diagnostics.resource_ids",
+    f"""
+    MATCH (n:{NODE_LABEL})
+    WHERE n.id IS NOT NULL
+    RETURN n.id as id
+    LIMIT 1000
+    """,
+)
+
+SERVICE_DEPENDENCIES_QUERY = register_query(
+    "diagnostics.service_dependencies",
+    f"""
+    MATCH (source:{NODE_LABEL})-[:DEPENDS_ON]->(target:{NODE_LABEL})
+    RETURN source.id as source, target.id as target
+    """,
+)
+
+RESOURCE_NAME_QUERY = register_query(
+    "diagnostics.resource_name",
+    f"""
+    MATCH {QueryBuilder.node("n", id_param="resource_id")}
+    RETURN n.name as name
+    """,
+)
+
+RESOURCES_BY_ID_QUERY = register_query(
+    "diagnostics.resources_by_id",
+    f"""
+    UNWIND $resource_ids as resource_id
+    MATCH {QueryBuilder.node_by("n", "resource_id")}
+    RETURN n.id as id, n.name as name, {QueryBuilder.primary_label("n")} as type
+    """,
+)
+
+RESOURCE_INFO_QUERY = register_query(
+    "diagnostics.resource_info",
+    f"""
+    MATCH {QueryBuilder.node("n", id_param="resource_id")}
+    RETURN n.name as name, n.type as type, {QueryBuilder.primary_label("n")} as label
+    """,
+)
+
 
 @dataclass
 class ServiceHealthStatus:
@@ -77,6 +149,12 @@ class LiveDiagnosticsSnapshot:
     anomalies: list[AnomalyAlert]
     traffic_patterns: list[TrafficPattern]
     failing_dependencies: list[dict[str, Any]]
+    # Stages that ran out of time; their lists only hold the results ready in time
+    incomplete_stages: list[str] = field(default_factory=list)
+    # Anomaly score (0.0 to 1.0) per scored resource ID
+    anomaly_scores: dict[str, float] = field(default_factory=dict)
+    # Kubernetes namespace per resource ID (namespaced resources only)
+    namespaces: dict[str, str] = field(default_factory=dict)
 
 
 class LiveDiagnosticsService:
@@ -95,9 +173,12 @@ class LiveDiagnosticsService:
     def __init__(
         self,
         prometheus_collector: PrometheusCollector,
-        neo4j_client: Neo4jClient,
+        neo4j_client: AsyncNeo4jClient,
         predictor: Predictor,
         loki_collector: LokiCollector | None = None,
+        max_concurrency: int | None = None,
+        stage_timeout: float | None = None,
+        anomaly_engine: BatchAnomalyEngine | None = None,
     ):
         """
         Initialize live diagnostics service.
@@ -107,20 +188,27 @@ class LiveDiagnosticsService:
             neo4j_client: Neo4j database client
             predictor: ML predictor for anomaly detection
             loki_collector: Optional Loki log collector for error logs
+            max_concurrency: Maximum concurrent per-service lookups
+                (defaults to settings.live_diagnostics_max_concurrency)
+            stage_timeout: Time budget in seconds for each snapshot stage
+                (defaults to settings.live_diagnostics_stage_timeout)
+            anomaly_engine: Batch anomaly engine (one keeps fitted models
+                between snapshots, so share it across calls)
         """
         self.prometheus = prometheus_collector
         self.neo4j = neo4j_client
         self.predictor = predictor
         self.loki = loki_collector
+        self.max_concurrency = max_concurrency or settings.live_diagnostics_max_concurrency
+        self.stage_timeout = (
+            stage_timeout if stage_timeout is not None else settings.live_diagnostics_stage_timeout
+        )
 
-        # Initialize anomaly detection model
-        self.anomaly_detector = IsolationForest(
-            contamination=0.1,  # Expect 10% of data to be anomalies
-            random_state=42,
-            n_estimators=100,
+        # Scores all resources of a type at once; caches a fitted model per type
+        self.anomaly_engine = anomaly_engine or BatchAnomalyEngine(
+            z_threshold=settings.live_diagnostics_anomaly_z_threshold,
+            refit_interval=settings.live_diagnostics_anomaly_refit_interval,
         )
-        self.is_trained = False
-        self.baseline_data: dict[str, list[float]] = {}
 
     async def get_live_snapshot(self, duration_hours: int = 1) -> LiveDiagnosticsSnapshot:
         """
@@ -133,24 +221,35 @@ class LiveDiagnosticsService:
             LiveDiagnosticsSnapshot with current state
         """
         logger.info("get_live_snapshot", duration_hours=duration_hours)
+        incomplete_stages = []
 
-        # Get all resources from topology
+        # Get all resources (with their names) from topology in one query
         resources = await self._get_topology_resources()
 
-        # Get health status for each resource
-        services = []
-        for resource in resources:
-            health = await self.get_service_health(resource["id"], resource["type"], duration_hours)
-            services.append(health)
-
-        # Detect anomalies
-        anomalies = await self.detect_anomalies([s.resource_id for s in services], duration_hours)
-
-        # Analyze traffic patterns
-        traffic_patterns = await self.analyze_traffic_patterns(duration_hours)
-
-        # Identify failing dependencies
-        failing_deps = await self.get_failing_dependencies()
+        # Get health status for all resources with batched metric queries
+        services, complete = await self._get_services_health(
+            [(r["id"], r["type"], r["name"] or r["id"]) for r in resources], duration_hours
+        )
+        if not complete:
+            incomplete_stages.append("service_health")
+
+        # Anomalies, traffic patterns and failing dependencies are independent
+        (
+            (anomalies, anomaly_scores, anomalies_complete),
+            (traffic_patterns, traffic_complete),
+            (failing_deps, failing_complete),
+        ) = await asyncio.gather(
+            self._detect_anomalies(services),
+            self._analyze_traffic_patterns(duration_hours),
+            self._get_failing_dependencies({s.resource_id: s for s in services}),
+        )
+        for stage, stage_complete in (
+            ("anomalies", anomalies_complete),
+            ("traffic_patterns", traffic_complete),
+            ("failing_dependencies", failing_complete),
+        ):
+            if not stage_complete:
+                incomplete_stages.append(stage)
 
         # Determine overall health
         overall_health = self._calculate_overall_health(services)
@@ -162,10 +261,17 @@ class LiveDiagnosticsService:
             anomalies=anomalies,
             traffic_patterns=traffic_patterns,
             failing_dependencies=failing_deps,
+            incomplete_stages=incomplete_stages,
+            anomaly_scores=anomaly_scores,
+            namespaces={r["id"]: r["namespace"] for r in resources if r["namespace"]},
         )
 
     async def get_service_health(
-        self, resource_id: str, resource_type: str, duration_hours: int = 1
+        self,
+        resource_id: str,
+        resource_type: str,
+        duration_hours: int = 1,
+        resource_name: str | None = None,
     ) -> ServiceHealthStatus:
         """
         Get health status for a specific service.
@@ -174,6 +280,7 @@ class LiveDiagnosticsService:
             resource_id: Resource identifier
             resource_type: Type of resource
             duration_hours: Time window for analysis
+            resource_name: Resource name if already known (looked up otherwise)
 
         Returns:
             ServiceHealthStatus with current health
@@ -185,6 +292,59 @@ class LiveDiagnosticsService:
             duration=timedelta(hours=duration_hours),
         )
 
+        # Get resource name from topology
+        if resource_name is None:
+            resource_name = await self._get_resource_name(resource_id)
+
+        return self._build_service_health(resource_id, resource_type, resource_name, metrics_result)
+
+    async def _get_services_health(
+        self, resources: list[tuple[str, str, str]], duration_hours: int
+    ) -> tuple[list[ServiceHealthStatus], bool]:
+        """
+        Get health status for many services with batched metric queries.
+
+        Args:
+            resources: (resource_id, resource_type, resource_name) tuples
+            duration_hours: Time window for analysis
+
+        Returns:
+            Tuple of (health of the services whose metrics arrived before the
+            stage deadline, whether all of them did)
+        """
+        resource_types = {resource_id: resource_type for resource_id, resource_type, _ in resources}
+        metrics_by_id = await self.prometheus.get_resources_metrics(
+            resource_types,
+            duration=timedelta(hours=duration_hours),
+            max_concurrency=self.max_concurrency,
+            deadline=self.stage_timeout,
+        )
+
+        services = [
+            self._build_service_health(
+                resource_id, resource_type, resource_name, metrics_by_id[resource_id]
+            )
+            for resource_id, resource_type, resource_name in resources
+            if resource_id in metrics_by_id
+        ]
+        complete = len(metrics_by_id) == len(resource_types)
+        if not complete:
+            logger.warning(
+                "service_health_incomplete",
+                missing=len(resource_types) - len(metrics_by_id),
+                total=len(resource_types),
+                deadline_seconds=self.stage_timeout,
+            )
+        return services, complete
+
+    def _build_service_health(
+        self,
+        resource_id: str,
+        resource_type: str,
+        resource_name: str,
+        metrics_result: ResourceMetrics,
+    ) -> ServiceHealthStatus:
+        """Build a service health status from its Prometheus metrics."""
         # Determine status based on health score and anomalies
         if metrics_result.health_score >= self.HEALTH_GOOD_THRESHOLD:
             status = "healthy"
@@ -200,9 +360,6 @@ class LiveDiagnosticsService:
                 latest_value = series.values[-1].value
                 key_metrics[metric_name] = latest_value
 
-        # Get resource name from topology
-        resource_name = await self._get_resource_name(resource_id)
-
         return ServiceHealthStatus(
             resource_id=resource_id,
             resource_name=resource_name,
@@ -215,7 +372,10 @@ class LiveDiagnosticsService:
         )
 
     async def detect_anomalies(
-        self, resource_ids: list[str], duration_hours: int = 1
+        self,
+        resource_ids: list[str],
+        duration_hours: int = 1,
+        resource_names: dict[str, str] | None = None,
     ) -> list[AnomalyAlert]:
         """
         Detect anomalies across multiple resources.
@@ -223,57 +383,111 @@ class LiveDiagnosticsService:
         Args:
             resource_ids: List of resource IDs to analyze
             duration_hours: Time window for analysis
+            resource_names: Names per resource ID if already known (looked
+                up with the resource types otherwise)
 
         Returns:
             List of detected anomaly alerts
         """
-        alerts = []
+        resources = await self._get_resources(resource_ids)
+        if resource_names:
+            resources = [
+                (resource_id, resource_type, resource_names.get(resource_id, name))
+                for resource_id, resource_type, name in resources
+            ]
 
-        for resource_id in resource_ids:
-            # Use ML predictor for anomaly detection
-            try:
-                resource_info = await self._get_resource_info(resource_id)
-                anomaly_result = await self.predictor.detect_anomalies(
-                    resource_id=resource_id,
-                    resource_name=resource_info.get("name", resource_id),
-                    detection_window_hours=duration_hours,
-                )
+        try:
+            services, _ = await self._get_services_health(resources, duration_hours)
+        except Exception as e:
+            logger.warning("anomaly_detection_failed", error=str(e))
+            return []
 
-                # Convert anomaly points to alerts
-                for anomaly_point in anomaly_result.anomalies:
-                    severity = self._determine_severity(anomaly_point.anomaly_score)
-
-                    alert = AnomalyAlert(
-                        alert_id=f"{resource_id}_{anomaly_point.metric_name}_{anomaly_point.timestamp.isoformat()}",
-                        resource_id=resource_id,
-                        resource_name=resource_info.get("name", resource_id),
-                        severity=severity,
-                        metric_name=anomaly_point.metric_name,
-                        current_value=anomaly_point.actual_value,
-                        expected_value=anomaly_point.expected_value,
-                        deviation_percentage=anomaly_point.deviation_percentage,
-                        detected_at=anomaly_point.timestamp,
-                        message=f"Anomaly detected in {anomaly_point.metric_name}: {anomaly_point.deviation_percentage:.1f}% deviation",
-                        potential_causes=anomaly_result.potential_causes,
-                    )
-                    alerts.append(alert)
+        alerts, _, _ = await self._detect_anomalies(services)
+        return alerts
 
-            except Exception as e:
-                logger.warning(
-                    "anomaly_detection_failed",
-                    resource_id=resource_id,
-                    error=str(e),
-                )
+    async def _detect_anomalies(
+        self, services: list[ServiceHealthStatus]
+    ) -> tuple[list[AnomalyAlert], dict[str, float], bool]:
+        """
+        Score services in one batch per resource type and alert on outliers.
 
-        # Sort by severity (critical first) and timestamp (newest first)
-        severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-        alerts.sort(
-            key=lambda a: (severity_order.get(a.severity, 4), a.detected_at),
-            reverse=True,
+        Returns:
+            Tuple of (alerts, score per resource ID, completed in time)
+        """
+        try:
+            scores = await asyncio.wait_for(
+                asyncio.to_thread(self._score_services, services), timeout=self.stage_timeout
+            )
+        except TimeoutError:
+            logger.warning(
+                "live_snapshot_stage_incomplete",
+                stage="anomalies",
+                total=len(services),
+                deadline_seconds=self.stage_timeout,
+            )
+            return [], {}, False
+        except Exception as e:
+            logger.warning("anomaly_detection_failed", error=str(e))
+            return [], {}, True
+
+        services_by_id = {s.resource_id: s for s in services}
+        detected_at = datetime.now(UTC)
+
+        # Highest score (and so severity) first
+        alerts = [
+            self._build_anomaly_alert(score, services_by_id[score.resource_id], detected_at)
+            for score in sorted(scores, key=lambda score: score.score, reverse=True)
+            if score.score >= self.ANOMALY_SCORE_MEDIUM
+        ]
+
+        return alerts, {score.resource_id: score.score for score in scores}, True
+
+    def _score_services(self, services: list[ServiceHealthStatus]) -> list[AnomalyScore]:
+        """Build a feature matrix per resource type and score it (runs in a thread)."""
+        by_type: dict[str, list[ServiceHealthStatus]] = {}
+        for service in services:
+            # Resources without any metric values have nothing to score
+            if service.metrics and metric_templates(service.resource_type) is not None:
+                by_type.setdefault(service.resource_type.lower(), []).append(service)
+
+        scores = []
+        for resource_type, group in by_type.items():
+            feature_names = list(metric_templates(resource_type)[1])
+            features = np.array(
+                [[s.metrics.get(name, np.nan) for name in feature_names] for s in group],
+                dtype=np.float64,
+            )
+            scores.extend(
+                self.anomaly_engine.score(
+                    resource_type, [s.resource_id for s in group], features, feature_names
+                )
+            )
+        return scores
+
+    def _build_anomaly_alert(
+        self, score: AnomalyScore, service: ServiceHealthStatus, detected_at: datetime
+    ) -> AnomalyAlert:
+        """Build an anomaly alert from a resource's anomaly score."""
+        if score.expected_value:
+            deviation = (score.value - score.expected_value) / abs(score.expected_value) * 100
+        else:
+            deviation = 0.0 if score.value == score.expected_value else 100.0
+
+        return AnomalyAlert(
+            alert_id=f"{score.resource_id}_{score.metric_name}_{detected_at.isoformat()}",
+            resource_id=score.resource_id,
+            resource_name=service.resource_name,
+            severity=self._determine_severity(score.score),
+            metric_name=score.metric_name,
+            current_value=score.value,
+            expected_value=score.expected_value,
+            deviation_percentage=deviation,
+            detected_at=detected_at,
+            message=f"Anomaly detected in {score.metric_name}: {deviation:.1f}% deviation "
+            f"from similar {service.resource_type} resources",
+            potential_causes=list(service.anomalies),
         )
 
-        return alerts
-
     async def analyze_traffic_patterns(self, duration_hours: int = 1) -> list[TrafficPattern]:
         """
         Analyze traffic patterns between services.
@@ -284,77 +498,84 @@ class LiveDiagnosticsService:
         Returns:
             List of traffic patterns with anomaly detection
         """
-        patterns = []
+        patterns, _ = await self._analyze_traffic_patterns(duration_hours)
+        return patterns
 
+    async def _analyze_traffic_patterns(
+        self, duration_hours: int
+    ) -> tuple[list[TrafficPattern], bool]:
+        """Analyze dependencies concurrently; returns (patterns, completed in time)."""
         # Get all service dependencies
         dependencies = await self._get_service_dependencies()
 
-        for dep in dependencies:
-            source_id = dep["source"]
-            target_id = dep["target"]
-
-            # Sanitize input for Prometheus queries
-            # Only allow alphanumeric, dash, underscore, and dot characters
-            if not re.match(r"^[a-zA-Z0-9\-_.]+$", source_id) or not re.match(
-                r"^[a-zA-Z0-9\-_.]+$", target_id
-            ):
-                logger.warning(
-                    "invalid_resource_id_for_prometheus",
-                    source_id=source_id,
-                    target_id=target_id,
-                )
-                continue
-
-            # Query Prometheus for traffic metrics
-            end_time = datetime.now(UTC)
-            start_time = end_time - timedelta(hours=duration_hours)
+        end_time = datetime.now(UTC)
+        start_time = end_time - timedelta(hours=duration_hours)
 
-            # Request rate - use safe string formatting
-            request_rate_query = (
-                f'rate(http_requests_total{{source="{source_id}",target="{target_id}"}}[5m])'
-            )
-            request_rate_results = await self.prometheus.query_range(
-                request_rate_query, start_time, end_time, "1m"
-            )
-
-            # Error rate - use safe string formatting
-            error_rate_query = f'rate(http_requests_total{{source="{source_id}",target="{target_id}",status=~"5.."}}[5m]) / rate(http_requests_total{{source="{source_id}",target="{target_id}"}}[5m])'
-            error_rate_results = await self.prometheus.query_range(
-                error_rate_query, start_time, end_time, "1m"
-            )
+        return await self._fan_out(
+            "traffic_patterns",
+            lambda dep: self._analyze_dependency_traffic(dep, start_time, end_time),
+            dependencies,
+        )
 
-            # Latency - use safe string formatting
-            latency_query = f'histogram_quantile(0.95, rate(http_request_duration_seconds_bucket{{source="{source_id}",target="{target_id}"}}[5m]))'
-            latency_results = await self.prometheus.query_range(
-                latency_query, start_time, end_time, "1m"
+    async def _analyze_dependency_traffic(
+        self, dependency: dict[str, str], start_time: datetime, end_time: datetime
+    ) -> TrafficPattern | None:
+        """Analyze traffic over one dependency (None if its IDs are not queryable)."""
+        source_id = dependency["source"]
+        target_id = dependency["target"]
+
+        # Sanitize input for Prometheus queries
+        # Only allow alphanumeric, dash, underscore, and dot characters
+        if not re.match(r"^[a-zA-Z0-9\-_.]+$", source_id) or not re.match(
+            r"^[a-zA-Z0-9\-_.]+$", target_id
+        ):
+            logger.warning(
+                "invalid_resource_id_for_prometheus",
+                source_id=source_id,
+                target_id=target_id,
             )
+            return None
 
-            # Extract values
-            request_rate = self._extract_avg_value(request_rate_results)
-            error_rate = self._extract_avg_value(error_rate_results)
-            latency_p95 = self._extract_avg_value(latency_results)
-
-            # Detect abnormalities
-            is_abnormal, anomaly_score = self._detect_traffic_anomaly(
-                source_id, target_id, request_rate, error_rate, latency_p95
+        # Request rate - use safe string formatting
+        request_rate_query = (
+            f'rate(http_requests_total{{source="{source_id}",target="{target_id}"}}[5m])'
+        )
+        # Error rate - use safe string formatting
+        error_rate_query = f'rate(http_requests_total{{source="{source_id}",target="{target_id}",status=~"5.."}}[5m]) / rate(http_requests_total{{source="{source_id}",target="{target_id}"}}[5m])'
+        # Latency - use safe string formatting
+        latency_query = f'histogram_quantile(0.95, rate(http_request_duration_seconds_bucket{{source="{source_id}",target="{target_id}"}}[5m]))'
+
+        # Query Prometheus for traffic metrics
+        request_rate_results, error_rate_results, latency_results = await asyncio.gather(
+            *(
+                self.prometheus.query_range(query, start_time, end_time, "1m")
+                for query in (request_rate_query, error_rate_query, latency_query)
             )
+        )
 
-            # Determine trend
-            trend = self._calculate_trend(request_rate_results)
+        # Extract values
+        request_rate = self._extract_avg_value(request_rate_results)
+        error_rate = self._extract_avg_value(error_rate_results)
+        latency_p95 = self._extract_avg_value(latency_results)
 
-            pattern = TrafficPattern(
-                source_id=source_id,
-                target_id=target_id,
-                request_rate=request_rate,
-                error_rate=error_rate,
-                latency_p95=latency_p95,
-                is_abnormal=is_abnormal,
-                anomaly_score=anomaly_score,
-                trend=trend,
-            )
-            patterns.append(pattern)
+        # Detect abnormalities
+        is_abnormal, anomaly_score = self._detect_traffic_anomaly(
+            source_id, target_id, request_rate, error_rate, latency_p95
+        )
 
-        return patterns
+        # Determine trend
+        trend = self._calculate_trend(request_rate_results)
+
+        return TrafficPattern(
+            source_id=source_id,
+            target_id=target_id,
+            request_rate=request_rate,
+            error_rate=error_rate,
+            latency_p95=latency_p95,
+            is_abnormal=is_abnormal,
+            anomaly_score=anomaly_score,
+            trend=trend,
+        )
 
     async def get_failing_dependencies(self) -> list[dict[str, Any]]:
         """
@@ -363,29 +584,50 @@ class LiveDiagnosticsService:
         Returns:
             List of failing dependencies with details
         """
-        failing_deps = []
+        failing_deps, _ = await self._get_failing_dependencies({})
+        return failing_deps
+
+    async def _get_failing_dependencies(
+        self, known_health: dict[str, ServiceHealthStatus]
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Find failing dependencies, reusing health already fetched for the snapshot.
+
+        Args:
+            known_health: Health per resource ID; other dependency targets are
+                fetched once each, concurrently
 
-        # Query topology for all dependencies
-        query = """
-        MATCH (source)-[r:DEPENDS_ON]->(target)
-        RETURN source.id as source_id,
-               source.name as source_name,
-               target.id as target_id,
-               target.name as target_name,
-               r.properties as relationship_props
+        Returns:
+            Tuple of (failing dependencies, completed in time)
         """
+        failing_deps = []
+        complete = True
 
         try:
-            results = await self.neo4j.execute_query(query)
+            results = await self.neo4j.execute_query(FAILING_DEPENDENCIES_QUERY)
+
+            target_names = {
+                record["target_id"]: record["target_name"]
+                for record in results
+                if record["target_id"] not in known_health
+            }
+            fetched, complete = await self._get_services_health(
+                [
+                    (target_id, "service", target_name or target_id)
+                    for target_id, target_name in target_names.items()
+                ],
+                1,
+            )
+            health = {**known_health, **{h.resource_id: h for h in fetched}}
 
             for record in results:
                 source_id = record["source_id"]
                 target_id = record["target_id"]
 
                 # Check if dependency is failing
-                target_health = await self.get_service_health(target_id, "service", 1)
+                target_health = health.get(target_id)
 
-                if target_health.status in ("failed", "degraded"):
+                if target_health and target_health.status in ("failed", "degraded"):
                     failing_deps.append(
                         {
                             "source_id": source_id,
@@ -402,7 +644,7 @@ class LiveDiagnosticsService:
         except Exception as e:
             logger.error("get_failing_dependencies_failed", error=str(e))
 
-        return failing_deps
+        return failing_deps, complete
 
     async def get_recent_error_logs(
         self, resource_id: str, limit: int = 10, duration_hours: int = 1
@@ -577,19 +819,46 @@ class LiveDiagnosticsService:
             "timestamp": health_status.last_updated.isoformat(),
         }
 
-    async def _get_topology_resources(self) -> list[dict[str, str]]:
-        """Get all resources from topology."""
-        query = """
-        MATCH (n)
-        WHERE n.id IS NOT NULL
-        RETURN n.id as id, n.name as name, labels(n)[0] as type
-        LIMIT 1000
+    async def _fan_out(
+        self, stage: str, func: Callable[[Any], Awaitable[Any]], items: list[Any]
+    ) -> tuple[list[Any], bool]:
         """
+        Run func over items with bounded concurrency within the stage deadline.
 
+        Args:
+            stage: Stage name for logging
+            func: Async callable applied to each item
+            items: Items to process
+
+        Returns:
+            Tuple of (results that finished in time and are not None,
+            whether every item finished before the deadline)
+        """
+        pool = WorkerPool(WorkerPoolConfig(max_workers=self.max_concurrency))
+        results = await pool.map_partial(func, items, deadline=self.stage_timeout)
+
+        cancelled = pool.get_summary()["cancelled"]
+        if cancelled:
+            logger.warning(
+                "live_snapshot_stage_incomplete",
+                stage=stage,
+                cancelled=cancelled,
+                total=len(items),
+                deadline_seconds=self.stage_timeout,
+            )
+        return [result for result in results if result is not None], cancelled == 0
+
+    async def _get_topology_resources(self) -> list[dict[str, str]]:
+        """Get all resources from topology."""
         try:
-            results = await self.neo4j.execute_query(query)
+            results = await self.neo4j.execute_query(TOPOLOGY_RESOURCES_QUERY)
             return [
-                {"id": r["id"], "name": r.get("name", r["id"]), "type": r.get("type", "unknown")}
+                {
+                    "id": r["id"],
+                    "name": r.get("name", r["id"]),
+                    "type": r.get("type", "unknown"),
+                    "namespace": r.get("namespace"),
+                }
                 for r in results
             ]
         except Exception as e:
@@ -598,13 +867,8 @@ class LiveDiagnosticsService:
 
     async def _get_service_dependencies(self) -> list[dict[str, str]]:
         """Get service dependencies from topology."""
-        query = """
-        MATCH (source)-[:DEPENDS_ON]->(target)
-        RETURN source.id as source, target.id as target
-        """
-
         try:
-            results = await self.neo4j.execute_query(query)
+            results = await self.neo4j.execute_query(SERVICE_DEPENDENCIES_QUERY)
             return [{"source": r["source"], "target": r["target"]} for r in results]
         except Exception as e:
             logger.error("get_service_dependencies_failed", error=str(e))
@@ -612,13 +876,10 @@ class LiveDiagnosticsService:
 
     async def _get_resource_name(self, resource_id: str) -> str:
         """Get resource name from topology."""
-        query = """
-        MATCH (n {id: $resource_id})
-        RETURN n.name as name
-        """
-
         try:
-            results = await self.neo4j.execute_query(query, {"resource_id": resource_id})
+            results = await self.neo4j.execute_query(
+                RESOURCE_NAME_QUERY, {"resource_id": resource_id}
+            )
             if results:
                 return results[0].get("name", resource_id)
         except Exception as e:
@@ -626,15 +887,30 @@ class LiveDiagnosticsService:
 
         return resource_id
 
+    async def _get_resources(self, resource_ids: list[str]) -> list[tuple[str, str, str]]:
+        """Get (id, type, name) of several resources from topology in one query."""
+        if not resource_ids:
+            return []
+
+        try:
+            results = await self.neo4j.execute_query(
+                RESOURCES_BY_ID_QUERY, {"resource_ids": list(resource_ids)}
+            )
+            return [
+                (r["id"], r.get("type") or "unknown", r.get("name") or r["id"])
+                for r in results
+                if r.get("id")
+            ]
+        except Exception as e:
+            logger.error("get_resources_failed", error=str(e))
+            return []
+
     async def _get_resource_info(self, resource_id: str) -> dict[str, Any]:
         """Get resource information from topology."""
-        query = """
-        MATCH (n {id: $resource_id})
-        RETURN n.name as name, n.type as type, labels(n)[0] as label
-        """
-
         try:
-            results = await self.neo4j.execute_query(query, {"resource_id": resource_id})
+            results = await self.neo4j.execute_query(
+                RESOURCE_INFO_QUERY, {"resource_id": resource_id}
+            )
             if results:
                 return {
                     "name": results[0].get("name", resource_id),
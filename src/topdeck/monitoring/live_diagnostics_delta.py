@@ -0,0 +1,255 @@
+"""
+Incremental (delta) views of live diagnostics snapshots.
+
+Streaming clients keep the last view they were sent and only receive what
+changed since, per section:
+
+- ``services`` keyed by resource ID,
+- ``anomalies`` keyed by resource ID and metric,
+- ``traffic_patterns`` and ``failing_dependencies`` keyed by source and
+  target ID.
+
+A snapshot is serialized into a keyed view once per update; each client's
+view is that view narrowed to its subscription (resource IDs and/or
+namespaces) and compared with what the client already has.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from topdeck.monitoring.live_diagnostics import LiveDiagnosticsSnapshot
+
+SECTIONS = ("services", "anomalies", "traffic_patterns", "failing_dependencies")
+
+# Item fields naming the resources an item belongs to, per section
+_ITEM_RESOURCES = {
+    "services": ("resource_id",),
+    "anomalies": ("resource_id",),
+    "traffic_patterns": ("source_id", "target_id"),
+    "failing_dependencies": ("source_id", "target_id"),
+}
+
+# Item fields that change on every snapshot without a change in state. Service
+# metric samples move on every tick, so a service is only re-sent when its
+# status, health score or anomalies change (and then with its latest metrics).
+_VOLATILE_FIELDS = {
+    "services": ("metrics", "last_updated"),
+    "anomalies": ("alert_id", "detected_at"),
+    "traffic_patterns": (),
+    "failing_dependencies": (),
+}
+
+
+@dataclass
+class SubscriptionFilter:
+    """Resources a client is subscribed to (everything when empty)."""
+
+    resource_ids: set[str] = field(default_factory=set)
+    namespaces: set[str] = field(default_factory=set)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the filter selects every resource."""
+        return not self.resource_ids and not self.namespaces
+
+    def add(
+        self, resource_ids: list[str] | None = None, namespaces: list[str] | None = None
+    ) -> None:
+        """Subscribe to more resources and namespaces."""
+        self.resource_ids.update(resource_ids or [])
+        self.namespaces.update(namespaces or [])
+
+    def remove(
+        self, resource_ids: list[str] | None = None, namespaces: list[str] | None = None
+    ) -> None:
+        """Unsubscribe from resources and namespaces."""
+        self.resource_ids.difference_update(resource_ids or [])
+        self.namespaces.difference_update(namespaces or [])
+
+    def matches(self, resource_ids: list[str], namespaces: dict[str, str]) -> bool:
+        """
+        Check whether any of an item's resources is selected.
+
+        Args:
+            resource_ids: Resource IDs the item belongs to
+            namespaces: Namespace per resource ID
+
+        Returns:
+            True if the item belongs to the subscription
+        """
+        if self.is_empty:
+            return True
+        return any(
+            resource_id in self.resource_ids or namespaces.get(resource_id) in self.namespaces
+            for resource_id in resource_ids
+        )
+
+    def to_dict(self) -> dict[str, list[str]]:
+        """Serialize to a dictionary."""
+        return {
+            "resource_ids": sorted(self.resource_ids),
+            "namespaces": sorted(self.namespaces),
+        }
+
+
+@dataclass
+class SnapshotView:
+    """Serialized snapshot with items keyed per section."""
+
+    sections: dict[str, dict[str, dict[str, Any]]]
+    summary: dict[str, Any]
+    namespaces: dict[str, str] = field(default_factory=dict)
+
+    def filtered(self, subscription: SubscriptionFilter) -> "SnapshotView":
+        """
+        Narrow the view to a subscription.
+
+        Args:
+            subscription: Resources to keep
+
+        Returns:
+            View holding only the subscribed items (self for empty filters)
+        """
+        if subscription.is_empty:
+            return self
+        sections = {
+            section: {
+                key: item
+                for key, item in items.items()
+                if subscription.matches(
+                    [item[name] for name in _ITEM_RESOURCES[section]], self.namespaces
+                )
+            }
+            for section, items in self.sections.items()
+        }
+        return SnapshotView(sections, self.summary, self.namespaces)
+
+    def to_message_data(self) -> dict[str, Any]:
+        """Serialize the whole view as the data of a full snapshot message."""
+        data: dict[str, Any] = {
+            section: list(items.values()) for section, items in self.sections.items()
+        }
+        data.update(self.summary)
+        return data
+
+
+def snapshot_view(snapshot: LiveDiagnosticsSnapshot) -> SnapshotView:
+    """
+    Serialize a snapshot into a keyed view.
+
+    Args:
+        snapshot: Live diagnostics snapshot
+
+    Returns:
+        View of the snapshot
+    """
+    services = {
+        s.resource_id: {
+            "key": s.resource_id,
+            "resource_id": s.resource_id,
+            "resource_name": s.resource_name,
+            "resource_type": s.resource_type,
+            "namespace": snapshot.namespaces.get(s.resource_id),
+            "status": s.status,
+            "health_score": s.health_score,
+            "anomaly_score": snapshot.anomaly_scores.get(s.resource_id),
+            "anomalies": s.anomalies,
+            "metrics": s.metrics,
+            "last_updated": s.last_updated.isoformat(),
+        }
+        for s in snapshot.services
+    }
+    anomalies = {}
+    for a in snapshot.anomalies:
+        key = f"{a.resource_id}:{a.metric_name}"
+        anomalies[key] = {
+            "key": key,
+            "alert_id": a.alert_id,
+            "resource_id": a.resource_id,
+            "resource_name": a.resource_name,
+            "severity": a.severity,
+            "metric_name": a.metric_name,
+            "current_value": a.current_value,
+            "expected_value": a.expected_value,
+            "deviation_percentage": a.deviation_percentage,
+            "detected_at": a.detected_at.isoformat(),
+            "message": a.message,
+            "potential_causes": a.potential_causes,
+        }
+    traffic_patterns = {}
+    for t in snapshot.traffic_patterns:
+        key = f"{t.source_id}->{t.target_id}"
+        traffic_patterns[key] = {
+            "key": key,
+            "source_id": t.source_id,
+            "target_id": t.target_id,
+            "request_rate": t.request_rate,
+            "error_rate": t.error_rate,
+            "latency_p95": t.latency_p95,
+            "is_abnormal": t.is_abnormal,
+            "anomaly_score": t.anomaly_score,
+            "trend": t.trend,
+        }
+    failing_dependencies = {}
+    for dependency in snapshot.failing_dependencies:
+        key = f"{dependency['source_id']}->{dependency['target_id']}"
+        failing_dependencies[key] = {"key": key, **dependency}
+
+    return SnapshotView(
+        sections={
+            "services": services,
+            "anomalies": anomalies,
+            "traffic_patterns": traffic_patterns,
+            "failing_dependencies": failing_dependencies,
+        },
+        summary={
+            "overall_health": snapshot.overall_health,
+            "incomplete_stages": list(snapshot.incomplete_stages),
+            "snapshot_timestamp": snapshot.timestamp.isoformat(),
+        },
+        namespaces=dict(snapshot.namespaces),
+    )
+
+
+def diff_views(previous: SnapshotView, current: SnapshotView) -> dict[str, Any] | None:
+    """
+    Compute what changed between two views.
+
+    Args:
+        previous: View the client already has
+        current: New view
+
+    Returns:
+        Delta with ``upserted`` items and ``removed`` keys per changed section
+        plus the summary, or None if no section changed
+    """
+    delta: dict[str, Any] = {}
+    for section in SECTIONS:
+        old_items = previous.sections.get(section, {})
+        new_items = current.sections.get(section, {})
+        volatile = _VOLATILE_FIELDS[section]
+        upserted = [
+            item
+            for key, item in new_items.items()
+            if key not in old_items or not _same_item(old_items[key], item, volatile)
+        ]
+        removed = [key for key in old_items if key not in new_items]
+        if upserted or removed:
+            delta[section] = {"upserted": upserted, "removed": removed}
+
+    summary_changed = any(
+        previous.summary.get(name) != value
+        for name, value in current.summary.items()
+        if name != "snapshot_timestamp"
+    )
+    if not delta and not summary_changed:
+        return None
+    delta.update(current.summary)
+    return delta
+
+
+def _same_item(old: dict[str, Any], new: dict[str, Any], volatile: tuple[str, ...]) -> bool:
+    """Compare two items, ignoring fields that change on every snapshot."""
+    if not volatile:
+        return old == new
+    return all(old.get(name) == value for name, value in new.items() if name not in volatile)
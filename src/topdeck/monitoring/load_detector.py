@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import numpy as np
 import structlog
 
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
@@ -116,7 +117,7 @@ class LoadChangeDetector:
         # Query pod count over time
         # This assumes metrics like kube_deployment_status_replicas exist
         query = f'kube_deployment_status_replicas{{deployment=~".*{resource_id}.*"}}'
-        results = await self.prometheus.query_range(query, start, end, "5m")
+        results = await self.prometheus.fetch_range(query, start, end, step="5m")
 
         scaling_events = []
 
@@ -125,40 +126,35 @@ class LoadChangeDetector:
             return scaling_events
 
         # Analyze pod count changes
-        for result in results:
-            values = result.get("values", [])
-
-            if len(values) < 2:
+        for series in results:
+            if len(series) < 2:
                 continue
 
-            # Look for significant changes in pod count
-            for i in range(1, len(values)):
-                prev_timestamp, prev_count = values[i - 1]
-                curr_timestamp, curr_count = values[i]
-
-                prev_count = int(float(prev_count))
-                curr_count = int(float(curr_count))
-
-                # Detect change in pod count
-                if prev_count != curr_count:
-                    scaling_type = "scale_up" if curr_count > prev_count else "scale_down"
-
-                    event = ScalingEvent(
-                        resource_id=resource_id,
-                        timestamp=datetime.fromtimestamp(curr_timestamp, UTC),
-                        pod_count_before=prev_count,
-                        pod_count_after=curr_count,
-                        scaling_type=scaling_type,
-                    )
-                    scaling_events.append(event)
-
-                    logger.info(
-                        "scaling_event_detected",
-                        resource_id=resource_id,
-                        from_pods=prev_count,
-                        to_pods=curr_count,
-                        type=scaling_type,
-                    )
+            # Look for changes in pod count between consecutive samples
+            finite = np.isfinite(series.values)
+            counts = series.values[finite].astype(np.int64)
+            timestamps = series.timestamps[finite]
+            for i in np.flatnonzero(np.diff(counts)) + 1:
+                prev_count = int(counts[i - 1])
+                curr_count = int(counts[i])
+                scaling_type = "scale_up" if curr_count > prev_count else "scale_down"
+
+                event = ScalingEvent(
+                    resource_id=resource_id,
+                    timestamp=datetime.fromtimestamp(timestamps[i], UTC),
+                    pod_count_before=prev_count,
+                    pod_count_after=curr_count,
+                    scaling_type=scaling_type,
+                )
+                scaling_events.append(event)
+
+                logger.info(
+                    "scaling_event_detected",
+                    resource_id=resource_id,
+                    from_pods=prev_count,
+                    to_pods=curr_count,
+                    type=scaling_type,
+                )
 
         # Cache for later use
         self.scaling_event_cache[resource_id] = scaling_events
@@ -20,7 +20,7 @@ from topdeck.monitoring.collectors.azure_log_analytics import (
 )
 from topdeck.monitoring.collectors.loki import LokiCollector
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
-from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
 
 
 @dataclass
@@ -35,6 +35,7 @@ class FlowNode:
     status: str = "success"  # success, error, warning
     log_entries: list[Any] = field(default_factory=list)
     metrics: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -70,10 +71,12 @@ class TransactionFlowService:
 
     def __init__(
         self,
-        neo4j_client: Neo4jClient,
+        neo4j_client: AsyncNeo4jClient,
         loki_url: str | None = None,
         prometheus_url: str | None = None,
         azure_workspace_id: str | None = None,
+        loki_collector: LokiCollector | None = None,
+        prometheus_collector: PrometheusCollector | None = None,
     ):
         """
         Initialize transaction flow service.
@@ -83,11 +86,25 @@ class TransactionFlowService:
             loki_url: Loki server URL
             prometheus_url: Prometheus server URL
             azure_workspace_id: Azure Log Analytics workspace ID
+            loki_collector: Loki collector on a shared HTTP client to use
+                instead of creating one per call
+            prometheus_collector: Prometheus collector on a shared HTTP client
+                to use instead of creating one per call
         """
         self.neo4j_client = neo4j_client
         self.loki_url = loki_url
         self.prometheus_url = prometheus_url
         self.azure_workspace_id = azure_workspace_id
+        self.loki_collector = loki_collector
+        self.prometheus_collector = prometheus_collector
+
+    def _loki(self) -> LokiCollector:
+        """Get the shared Loki collector or create one."""
+        return self.loki_collector or LokiCollector(self.loki_url)
+
+    def _prometheus(self) -> PrometheusCollector:
+        """Get the shared Prometheus collector or create one."""
+        return self.prometheus_collector or PrometheusCollector(self.prometheus_url)
 
     async def trace_transaction(
         self, correlation_id: str, duration: timedelta = timedelta(hours=1), source: str = "auto"
@@ -173,7 +190,7 @@ class TransactionFlowService:
         # Try Loki
         if self.loki_url:
             try:
-                collector = LokiCollector(self.loki_url)
+                collector = self._loki()
                 try:
                     ids = await collector.find_correlation_ids_for_resource(
                         pod_resource_id, duration, limit
@@ -290,7 +307,7 @@ class TransactionFlowService:
         if not self.loki_url:
             return None
 
-        collector = LokiCollector(self.loki_url)
+        collector = self._loki()
 
         try:
             streams = await collector.get_logs_by_correlation_id(correlation_id, duration)
@@ -384,10 +401,10 @@ class TransactionFlowService:
         self, flow: TransactionFlowVisualization
     ) -> TransactionFlowVisualization:
         """Enrich flow with topology data from Neo4j."""
-        # Query Neo4j for resource details
-        with self.neo4j_client.driver.session() as session:
+        async with self.neo4j_client.session() as session:
+            # Query Neo4j for resource details
             for node in flow.nodes:
-                result = session.run(
+                result = await session.run(
                     """
                     MATCH (r:Resource)
                     WHERE r.id = $resource_id OR r.name = $resource_id
@@ -397,16 +414,15 @@ class TransactionFlowService:
                     """,
                     resource_id=node.resource_id,
                 )
-                record = result.single()
+                record = await result.single()
                 if record:
                     node.resource_name = record["name"] or node.resource_name
                     node.resource_type = record["type"] or node.resource_type
                     node.metadata["cloud_provider"] = record["provider"]
 
-        # Query for actual edges in topology
-        with self.neo4j_client.driver.session() as session:
+            # Query for actual edges in topology
             for edge in flow.edges:
-                result = session.run(
+                result = await session.run(
                     """
                     MATCH (a:Resource)-[r]->(b:Resource)
                     WHERE (a.id = $source_id OR a.name = $source_id)
@@ -417,7 +433,7 @@ class TransactionFlowService:
                     source_id=edge.source_id,
                     target_id=edge.target_id,
                 )
-                record = result.single()
+                record = await result.single()
                 if record:
                     edge.protocol = record["protocol"]
 
@@ -430,7 +446,7 @@ class TransactionFlowService:
         if not self.prometheus_url:
             return flow
 
-        collector = PrometheusCollector(self.prometheus_url)
+        collector = self._prometheus()
 
         try:
             for node in flow.nodes:
@@ -1,10 +1,18 @@
 """Data persistence layers.
 
 This module contains:
-- Graph: Neo4j graph database interface
+- Graph: Neo4j graph database interface (sync and async clients)
 - Cache: Redis caching layer
+- Query catalog: index-anchored Cypher queries
+- Tiered cache: query results shared between replicas through Redis
 """
 
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
+from topdeck.storage.batch_writer import (
+    BatchWriteReport,
+    GraphBatchWriter,
+    StreamingGraphWriter,
+)
 from topdeck.storage.neo4j_client import Neo4jClient
 from topdeck.storage.neo4j_manager import (
     Neo4jManager,
@@ -18,10 +26,26 @@ from topdeck.storage.query_cache import (
     get_query_cache,
     initialize_query_cache,
 )
+from topdeck.storage.query_catalog import (
+    QueryBuilder,
+    QueryCatalog,
+    get_query_catalog,
+    register_query,
+)
+from topdeck.storage.tiered_cache import (
+    TieredQueryCache,
+    cached_result,
+    get_tiered_cache,
+    set_tiered_cache,
+)
 
 __all__ = [
+    "AsyncNeo4jClient",
+    "BatchWriteReport",
+    "GraphBatchWriter",
     "Neo4jClient",
     "Neo4jManager",
+    "StreamingGraphWriter",
     "get_neo4j_client",
     "initialize_neo4j",
     "close_neo4j",
@@ -29,4 +53,12 @@ __all__ = [
     "QueryCache",
     "get_query_cache",
     "initialize_query_cache",
+    "QueryBuilder",
+    "QueryCatalog",
+    "get_query_catalog",
+    "register_query",
+    "TieredQueryCache",
+    "cached_result",
+    "get_tiered_cache",
+    "set_tiered_cache",
 ]
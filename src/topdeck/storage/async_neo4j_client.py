@@ -0,0 +1,575 @@
+"""
+Async Neo4j Client for TopDeck.
+
+Counterpart of Neo4jClient built on the driver's async API, for use from
+``async def`` route handlers and services: queries await the network instead
+of blocking the event loop. Method names, arguments, Cypher and query cache
+behaviour are the same as Neo4jClient's; every I/O method is a coroutine.
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from neo4j import AsyncGraphDatabase, AsyncSession
+
+from topdeck.storage.neo4j_client import (
+    BATCH_CREATE_RESOURCES_QUERY,
+    BATCH_UPSERT_DEPENDENCIES_QUERY,
+    BATCH_UPSERT_RESOURCES_QUERY,
+    CLEAR_ALL_QUERY,
+    CREATE_DEPENDENCY_QUERY,
+    RESOURCE_BY_ID_QUERY,
+    RESOURCE_DEPENDENCIES_QUERY,
+    RESOURCES_BY_TYPE_QUERY,
+    SCHEMA_CONSTRAINT_QUERIES,
+    SCHEMA_INDEX_QUERIES,
+    UPSERT_RELATIONSHIP_TYPES,
+    BaseNeo4jClient,
+    label_backfill_query,
+    node_create_query,
+    node_upsert_query,
+    relationship_compaction_query,
+    relationship_create_query,
+    relationship_method_backfill_query,
+    relationship_upsert_query,
+)
+from topdeck.storage.query_catalog import TOPOLOGY_LABELS
+
+
+class AsyncNeo4jClient(BaseNeo4jClient):
+    """
+    Async client for interacting with Neo4j database.
+
+    Supports the same URI schemes, connection pooling and query caching as
+    Neo4jClient.
+    """
+
+    def connect(self) -> None:
+        """Create the async driver (connections are opened on first use)."""
+        self.driver = AsyncGraphDatabase.driver(self.uri, **self._driver_options())
+
+    async def close(self) -> None:
+        """Close connection to Neo4j"""
+        if self.driver:
+            await self.driver.close()
+            self.driver = None
+
+    def get_pool_stats(self) -> dict[str, int]:
+        """
+        Get connection pool utilization.
+
+        Returns:
+            Dictionary with the pool size limit and the open, in-use and idle
+            connections (all 0 before connecting)
+        """
+        # The driver does not expose its pool publicly; its async lock cannot
+        # be taken here, but reading the pool does not yield to the event loop
+        pool = getattr(self.driver, "_pool", None)
+        try:
+            connections = [c for conns in pool.connections.values() for c in conns]
+        except AttributeError:
+            connections = []
+        return self._pool_stats(connections)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Async context manager for Neo4j sessions.
+
+        Usage:
+            async with client.session() as session:
+                result = await session.run("MATCH (n) RETURN n")
+        """
+        if not self.driver:
+            self.connect()
+
+        session = self.driver.session()
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def execute_query(
+        self, query: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Run a query and return all records.
+
+        Nodes and relationships in the records are converted to dictionaries
+        of their properties. Call invalidate_written after writing topology
+        through this method.
+
+        Args:
+            query: Cypher query string
+            params: Query parameters
+
+        Returns:
+            List of result records as dictionaries
+        """
+        async with self.session() as session:
+            result = await session.run(query, params or {})
+            return await result.data()
+
+    async def _fetch(self, query: str, params: dict[str, Any] | None) -> list[dict[str, Any]]:
+        """Run a read query and return its records as dictionaries."""
+        async with self.session() as session:
+            result = await session.run(query, params or {})
+            return [dict(record) async for record in result]
+
+    async def _single(self, query: str, **params: Any) -> Any:
+        """Run a query and return its single record (None if there is none)."""
+        async with self.session() as session:
+            result = await session.run(query, **params)
+            return await result.single()
+
+    async def _create_node(self, label: str, properties: dict[str, Any]) -> str:
+        """Create a topology node and return its element ID."""
+        record = await self._single(node_create_query(label), properties=properties)
+        self.invalidate_written(node_ids=[properties.get("id")], labels=[label])
+        return record["node_id"] if record else None
+
+    async def _upsert_node(
+        self, label: str, properties: dict[str, Any], replace: bool = False
+    ) -> str:
+        """Create or update a topology node by ID and return its element ID."""
+        self._require_id(label, properties)
+        record = await self._single(
+            node_upsert_query(label, replace), id=properties["id"], properties=properties
+        )
+        self.invalidate_written(node_ids=[properties["id"]], labels=[label])
+        return record["node_id"] if record else None
+
+    async def create_resource(self, properties: dict[str, Any]) -> str:
+        """
+        Create a resource node in Neo4j.
+
+        Args:
+            properties: Resource properties
+
+        Returns:
+            Node element ID
+        """
+        return await self._create_node("Resource", properties)
+
+    async def create_dependency(
+        self,
+        source_id: str,
+        target_id: str,
+        properties: dict[str, Any],
+    ) -> bool:
+        """
+        Create a DEPENDS_ON relationship between resources.
+
+        Args:
+            source_id: Source resource ID
+            target_id: Target resource ID
+            properties: Relationship properties
+
+        Returns:
+            True if successful, False otherwise
+        """
+        record = await self._single(
+            CREATE_DEPENDENCY_QUERY,
+            source_id=source_id,
+            target_id=target_id,
+            properties=properties,
+        )
+        self.invalidate_written(
+            node_ids=[source_id, target_id], relationship_types=["DEPENDS_ON"]
+        )
+        return record is not None
+
+    async def upsert_resource(self, properties: dict[str, Any]) -> str:
+        """
+        Create or update a resource node.
+
+        Args:
+            properties: Resource properties (must include 'id')
+
+        Returns:
+            Node element ID
+        """
+        return await self._upsert_node("Resource", properties)
+
+    async def get_resource_by_id(self, resource_id: str) -> dict[str, Any] | None:
+        """
+        Get a resource by ID.
+
+        Args:
+            resource_id: Resource ID
+
+        Returns:
+            Resource properties or None if not found
+        """
+        record = await self._single(RESOURCE_BY_ID_QUERY, id=resource_id)
+        return dict(record["r"]) if record else None
+
+    async def get_resources_by_type(
+        self,
+        resource_type: str,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """
+        Get resources by type.
+
+        Args:
+            resource_type: Resource type
+            limit: Maximum number of results
+
+        Returns:
+            List of resource properties
+        """
+        async with self.session() as session:
+            result = await session.run(
+                RESOURCES_BY_TYPE_QUERY, resource_type=resource_type, limit=limit
+            )
+            return [dict(record["r"]) async for record in result]
+
+    async def get_dependencies(self, resource_id: str) -> list[dict[str, Any]]:
+        """
+        Get all dependencies for a resource.
+
+        Args:
+            resource_id: Resource ID
+
+        Returns:
+            List of dependency relationships with target resources
+        """
+        async with self.session() as session:
+            result = await session.run(RESOURCE_DEPENDENCIES_QUERY, id=resource_id)
+            return [
+                {
+                    "target": dict(record["target"]),
+                    "relationship": dict(record["dep"]),
+                }
+                async for record in result
+            ]
+
+    async def create_application(self, properties: dict[str, Any]) -> str:
+        """Create an application node; returns its element ID."""
+        return await self._create_node("Application", properties)
+
+    async def upsert_application(self, properties: dict[str, Any]) -> str:
+        """Create or update an application node (must include 'id'); returns its element ID."""
+        return await self._upsert_node("Application", properties)
+
+    async def create_repository(self, properties: dict[str, Any]) -> str:
+        """Create a repository node; returns its element ID."""
+        return await self._create_node("Repository", properties)
+
+    async def upsert_repository(self, properties: dict[str, Any]) -> str:
+        """Create or update a repository node (must include 'id'); returns its element ID."""
+        return await self._upsert_node("Repository", properties)
+
+    async def create_deployment(self, properties: dict[str, Any]) -> str:
+        """Create a deployment node; returns its element ID."""
+        return await self._create_node("Deployment", properties)
+
+    async def upsert_deployment(self, properties: dict[str, Any]) -> str:
+        """Create or update a deployment node (must include 'id'); returns its element ID."""
+        return await self._upsert_node("Deployment", properties)
+
+    async def create_relationship(
+        self,
+        source_id: str,
+        source_label: str,
+        target_id: str,
+        target_label: str,
+        relationship_type: str,
+        properties: dict[str, Any],
+    ) -> bool:
+        """
+        Create a relationship between any two nodes.
+
+        Args:
+            source_id: Source node ID
+            source_label: Source node label (e.g., "Application", "Resource")
+            target_id: Target node ID
+            target_label: Target node label
+            relationship_type: Type of relationship (e.g., "BUILT_FROM", "DEPLOYED_TO")
+            properties: Relationship properties
+
+        Returns:
+            True if successful, False otherwise
+        """
+        record = await self._single(
+            relationship_create_query(source_label, target_label, relationship_type),
+            source_id=source_id,
+            target_id=target_id,
+            properties=properties,
+        )
+        self.invalidate_written(
+            node_ids=[source_id, target_id], relationship_types=[relationship_type]
+        )
+        return record is not None
+
+    async def create_namespace(self, properties: dict[str, Any]) -> str:
+        """Create a Kubernetes namespace node; returns its element ID."""
+        return await self._create_node("Namespace", properties)
+
+    async def upsert_namespace(self, properties: dict[str, Any]) -> str:
+        """Create or replace a namespace node (must include 'id'); returns its element ID."""
+        return await self._upsert_node("Namespace", properties, replace=True)
+
+    async def create_pod(self, properties: dict[str, Any]) -> str:
+        """Create a Kubernetes pod node; returns its element ID."""
+        return await self._create_node("Pod", properties)
+
+    async def upsert_pod(self, properties: dict[str, Any]) -> str:
+        """Create or replace a pod node (must include 'id'); returns its element ID."""
+        return await self._upsert_node("Pod", properties, replace=True)
+
+    async def create_managed_identity(self, properties: dict[str, Any]) -> str:
+        """Create a managed identity node; returns its element ID."""
+        return await self._create_node("ManagedIdentity", properties)
+
+    async def upsert_managed_identity(self, properties: dict[str, Any]) -> str:
+        """Create or replace a managed identity node (must include 'id'); returns its element ID."""
+        return await self._upsert_node("ManagedIdentity", properties, replace=True)
+
+    async def create_service_principal(self, properties: dict[str, Any]) -> str:
+        """Create a service principal node; returns its element ID."""
+        return await self._create_node("ServicePrincipal", properties)
+
+    async def upsert_service_principal(self, properties: dict[str, Any]) -> str:
+        """Create or replace a service principal node (must include 'id'); returns its element ID."""
+        return await self._upsert_node("ServicePrincipal", properties, replace=True)
+
+    async def create_app_registration(self, properties: dict[str, Any]) -> str:
+        """Create an app registration node; returns its element ID."""
+        return await self._create_node("AppRegistration", properties)
+
+    async def upsert_app_registration(self, properties: dict[str, Any]) -> str:
+        """Create or replace an app registration node (must include 'id'); returns its element ID."""
+        return await self._upsert_node("AppRegistration", properties, replace=True)
+
+    async def clear_all(self) -> int:
+        """
+        Delete all nodes and relationships (use with caution!).
+
+        Returns:
+            Number of nodes deleted
+        """
+        record = await self._single(CLEAR_ALL_QUERY)
+        self.invalidate_cache()
+        return record["count"] if record else 0
+
+    async def batch_create_resources(self, resources: list[dict[str, Any]]) -> int:
+        """
+        Create multiple resource nodes in a single transaction using UNWIND.
+
+        Uses CREATE, so it fails for resources that already exist; use
+        batch_upsert_resources() when existence is uncertain.
+
+        Args:
+            resources: List of resource property dictionaries (each must include 'id')
+
+        Returns:
+            Number of resources created
+        """
+        if not resources:
+            return 0
+        self._validate_resources(resources)
+
+        record = await self._single(BATCH_CREATE_RESOURCES_QUERY, resources=resources)
+        self.invalidate_written(
+            node_ids=[resource["id"] for resource in resources], labels=["Resource"]
+        )
+        return record["count"] if record else 0
+
+    async def batch_upsert_resources(self, resources: list[dict[str, Any]]) -> int:
+        """
+        Create or update multiple resource nodes in a single transaction using UNWIND.
+
+        Args:
+            resources: List of resource property dictionaries (each must include 'id')
+
+        Returns:
+            Number of resources upserted
+        """
+        if not resources:
+            return 0
+        self._validate_resources(resources)
+
+        record = await self._single(BATCH_UPSERT_RESOURCES_QUERY, resources=resources)
+        self.invalidate_written(
+            node_ids=[resource["id"] for resource in resources], labels=["Resource"]
+        )
+        return record["count"] if record else 0
+
+    async def batch_create_dependencies(self, dependencies: list[dict[str, Any]]) -> int:
+        """
+        Create or update multiple DEPENDS_ON relationships in a single transaction.
+
+        Relationships are merged on (source, target, discovered_method);
+        missing endpoints are created with just their ID.
+
+        Args:
+            dependencies: List of dependency dictionaries, each with
+                source_id, target_id and optional properties
+
+        Returns:
+            Number of dependencies created or updated
+        """
+        if not dependencies:
+            return 0
+        self._validate_dependencies(dependencies)
+
+        record = await self._single(BATCH_UPSERT_DEPENDENCIES_QUERY, dependencies=dependencies)
+        self.invalidate_written(
+            node_ids=[dep[key] for dep in dependencies for key in ("source_id", "target_id")],
+            labels=["Resource"],
+            relationship_types=["DEPENDS_ON"],
+        )
+        return record["count"] if record else 0
+
+    async def batch_upsert_relationships(self, relationships: list[dict[str, Any]]) -> int:
+        """
+        Idempotently create or update relationships of any type.
+
+        Relationships are grouped by type and each group is written with one
+        UNWIND query that MERGEs on (source, target, type, discovered_method).
+        Both endpoints must already exist.
+
+        Args:
+            relationships: List of relationship dictionaries, each with
+                source_id, target_id, relationship_type and optional properties
+
+        Returns:
+            Number of relationships created or updated
+        """
+        if not relationships:
+            return 0
+
+        rows_by_type = self.group_relationship_rows(relationships)
+
+        count = 0
+        async with self.session() as session:
+            for relationship_type, rows in rows_by_type.items():
+                result = await session.run(relationship_upsert_query(relationship_type), rows=rows)
+                record = await result.single()
+                count += record["count"] if record else 0
+                self.invalidate_written(
+                    node_ids=[row[key] for row in rows for key in ("source_id", "target_id")],
+                    relationship_types=[relationship_type],
+                )
+        return count
+
+    async def compact_duplicate_relationships(
+        self,
+        relationship_types: tuple[str, ...] | list[str] = UPSERT_RELATIONSHIP_TYPES,
+        batch_size: int = 10000,
+    ) -> dict[str, int]:
+        """
+        Collapse duplicate relationships left by earlier CREATE-based writes.
+
+        Args:
+            relationship_types: Relationship types to compact
+            batch_size: Duplicate groups handled per transaction
+
+        Returns:
+            Number of relationships removed per type
+        """
+
+        async def remove_batch(tx, query: str):
+            result = await tx.run(query, batch_size=batch_size)
+            return await result.single()
+
+        removed: dict[str, int] = {}
+        async with self.session() as session:
+            for relationship_type in relationship_types:
+                result = await session.run(relationship_method_backfill_query(relationship_type))
+                await result.consume()
+                query = relationship_compaction_query(relationship_type)
+                total = 0
+                while True:
+                    record = await session.execute_write(remove_batch, query)
+                    batch_removed = record["removed"] if record else 0
+                    total += batch_removed
+                    if not batch_removed:
+                        break
+                removed[relationship_type] = total
+                if total:
+                    self.invalidate_written(relationship_types=[relationship_type])
+        return removed
+
+    async def initialize_schema(self) -> dict[str, Any]:
+        """
+        Initialize database schema by creating indexes and constraints.
+
+        Also adds the :Node super-label to topology nodes that predate it.
+
+        Returns:
+            Dictionary with counts of constraints and indexes created and
+            nodes labelled
+        """
+        constraints_created = 0
+        indexes_created = 0
+        nodes_labelled = 0
+        errors = []
+
+        async with self.session() as session:
+            for query in SCHEMA_CONSTRAINT_QUERIES:
+                try:
+                    await (await session.run(query)).consume()
+                    constraints_created += 1
+                except Exception as e:
+                    if "already exists" not in str(e).lower():
+                        errors.append(f"Constraint error: {str(e)}")
+
+            for query in SCHEMA_INDEX_QUERIES:
+                try:
+                    await (await session.run(query)).consume()
+                    indexes_created += 1
+                except Exception as e:
+                    if "already exists" not in str(e).lower():
+                        errors.append(f"Index error: {str(e)}")
+
+            for label in TOPOLOGY_LABELS:
+                try:
+                    result = await session.run(label_backfill_query(label))
+                    summary = await result.consume()
+                    nodes_labelled += summary.counters.labels_added
+                except Exception as e:
+                    errors.append(f"Label backfill error ({label}): {str(e)}")
+
+        return {
+            "constraints_created": constraints_created,
+            "indexes_created": indexes_created,
+            "nodes_labelled": nodes_labelled,
+            "errors": errors,
+        }
+
+    async def run_cached_query(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        ttl: int | None = None,
+        tags: set[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run a read-only query with caching enabled.
+
+        Shares the query cache, keys and invalidation tags with Neo4jClient.
+
+        Args:
+            query: Cypher query string
+            params: Query parameters
+            ttl: Cache TTL in seconds (uses cache default if None)
+            tags: Invalidation tags (derived from the query if None)
+
+        Returns:
+            List of result records as dictionaries
+        """
+        tags = self._cache_tags(query, params, tags)
+        if tags is None:
+            return await self._fetch(query, params)
+
+        cached_result = self._query_cache.get(query, params, tags)
+        if cached_result is not None:
+            return cached_result
+
+        result_list = await self._fetch(query, params)
+        self._cache_result(query, params, ttl, tags, result_list)
+        return result_list
@@ -0,0 +1,761 @@
+"""
+Batched persistence of discovery results.
+
+Writes discovered nodes and dependencies with UNWIND queries in chunks of
+``batch_size`` rows. Each chunk runs in a managed write transaction, so the
+driver retries it on transient errors (deadlocks, leader switches, dropped
+connections) until ``max_transaction_retry_time`` expires. A chunk that
+still fails is split in half and retried so that a single bad row only
+loses that row, as with the previous one-item-per-transaction writes.
+
+Every row carries a ``content_hash`` fingerprint. Incremental writes
+(:meth:`GraphBatchWriter.write_discovery_changes`) compare fingerprints with
+the stored ones and only write new, changed or deleted nodes and
+relationships, returning a :class:`~topdeck.discovery.change_set.ChangeSet`.
+:class:`StreamingGraphWriter` does the same for resources that arrive in
+chunks while discovery is still running.
+"""
+
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from topdeck.common.metrics import record_neo4j_query
+from topdeck.discovery.change_set import (
+    CONTENT_HASH_PROPERTY,
+    ChangeSet,
+    EdgeKey,
+    content_hash,
+    edge_key,
+)
+from topdeck.storage.neo4j_client import (
+    UPSERT_RELATIONSHIP_TYPES,
+    Neo4jClient,
+    relationship_upsert_query,
+)
+from topdeck.storage.query_catalog import (
+    NODE_LABEL,
+    RESOURCE_LABEL,
+    QueryBuilder,
+    register_query,
+)
+
+if TYPE_CHECKING:
+    from topdeck.discovery.models import DiscoveryResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# DiscoveryResult attribute -> node label, in write order
+NODE_KINDS = (
+    ("resources", "Resource"),
+    ("applications", "Application"),
+    ("repositories", "Repository"),
+    ("deployments", "Deployment"),
+    ("namespaces", "Namespace"),
+    ("pods", "Pod"),
+    ("managed_identities", "ManagedIdentity"),
+    ("service_principals", "ServicePrincipal"),
+    ("app_registrations", "AppRegistration"),
+)
+
+NODE_UPSERT_QUERIES = {
+    label: register_query(
+        f"write.upsert_{label.lower()}",
+        f"""
+        UNWIND $rows as row
+        MERGE (n:{label} {{id: row.id}})
+        SET n:{NODE_LABEL}, n += row
+        RETURN count(n) as count
+        """,
+    )
+    for _, label in NODE_KINDS
+}
+
+STORED_NODE_HASHES_QUERY = register_query(
+    "write.stored_node_hashes",
+    f"""
+    UNWIND $node_ids as node_id
+    MATCH {QueryBuilder.node_by("n", "node_id")}
+    RETURN n.id as id, n.{CONTENT_HASH_PROPERTY} as content_hash
+    """,
+)
+
+STORED_RESOURCE_IDS_QUERY = register_query(
+    "write.stored_resource_ids",
+    f"""
+    MATCH (n:{RESOURCE_LABEL})
+    WHERE n.cloud_provider = $cloud_provider
+      AND ($subscription_id IS NULL OR n.subscription_id = $subscription_id)
+    RETURN n.id as id, n.region as region, n.resource_type as resource_type
+    """,
+)
+
+STORED_DEPENDENCY_HASHES_QUERY = register_query(
+    "write.stored_dependency_hashes",
+    f"""
+    UNWIND $source_ids as source_id
+    MATCH {QueryBuilder.node_by("source", "source_id")}-[r:DEPENDS_ON]->(target:{NODE_LABEL})
+    RETURN source.id as source_id,
+           target.id as target_id,
+           r.discovered_method as discovered_method,
+           r.{CONTENT_HASH_PROPERTY} as content_hash
+    """,
+)
+
+DELETE_RESOURCES_QUERY = register_query(
+    "write.delete_resources",
+    f"""
+    UNWIND $rows as row
+    MATCH (n:{RESOURCE_LABEL} {{id: row.id}})
+    DETACH DELETE n
+    RETURN count(*) as count
+    """,
+)
+
+DELETE_DEPENDENCIES_QUERY = register_query(
+    "write.delete_dependencies",
+    f"""
+    UNWIND $rows as row
+    MATCH {QueryBuilder.node_by("source", "row.source_id")}
+          -[r:DEPENDS_ON {{discovered_method: row.discovered_method}}]->
+          {QueryBuilder.node_by("target", "row.target_id")}
+    DELETE r
+    RETURN count(*) as count
+    """,
+)
+
+
+@dataclass
+class BatchTiming:
+    """
+    Timing of one written batch.
+
+    Attributes:
+        kind: What was written, e.g. ``resources`` or ``dependencies``
+        size: Rows sent in the batch
+        written: Rows the database reported as written
+        duration_seconds: Wall time including retries
+        attempts: Transaction attempts (more than 1 when the driver retried)
+    """
+
+    kind: str
+    size: int
+    written: int
+    duration_seconds: float
+    attempts: int
+
+
+@dataclass
+class BatchWriteReport:
+    """
+    Outcome of writing one discovery result.
+
+    Attributes:
+        written: Rows written per kind
+        failed: Rows that could not be written per kind
+        batches: Per-batch timings in write order
+        errors: Error messages for failed rows
+    """
+
+    written: dict[str, int] = field(default_factory=dict)
+    failed: dict[str, int] = field(default_factory=dict)
+    batches: list[BatchTiming] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def duration_seconds(self) -> float:
+        """Total time spent in batch writes."""
+        return sum(batch.duration_seconds for batch in self.batches)
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Summarize the report for logging and API responses.
+
+        Returns:
+            Dictionary with totals and per-kind batch statistics
+        """
+        kinds: dict[str, dict[str, Any]] = {}
+        for batch in self.batches:
+            stats = kinds.setdefault(
+                batch.kind, {"batches": 0, "seconds": 0.0, "max_batch_seconds": 0.0}
+            )
+            stats["batches"] += 1
+            stats["seconds"] += batch.duration_seconds
+            stats["max_batch_seconds"] = max(stats["max_batch_seconds"], batch.duration_seconds)
+        for kind, stats in kinds.items():
+            stats["written"] = self.written.get(kind, 0)
+            stats["failed"] = self.failed.get(kind, 0)
+            stats["seconds"] = round(stats["seconds"], 3)
+            stats["max_batch_seconds"] = round(stats["max_batch_seconds"], 3)
+        return {
+            "written": sum(self.written.values()),
+            "failed": sum(self.failed.values()),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "kinds": kinds,
+        }
+
+
+# Row keys holding IDs of written nodes
+_ROW_ID_KEYS = ("id", "source_id", "target_id")
+
+
+def _deletion_scope(
+    result: "DiscoveryResult", cloud_provider: str | None
+) -> tuple[bool, set[tuple[str, str]]]:
+    """
+    Decide which stale items a discovery run may delete.
+
+    Stale resources are only deleted within the partitions the run recorded
+    as scanned, so a run that recorded none deletes no resources. Stale
+    edges of rediscovered resources may be deleted when the run recorded
+    partitions or reported no errors.
+
+    Returns:
+        Tuple of (whether edge deletes are allowed, partitions to limit
+        resource deletes to)
+    """
+    if cloud_provider is None:
+        return False, set()
+    partitions = result.scanned_partitions
+    return bool(partitions) or not result.has_errors, partitions
+
+
+def _chunks(rows: list[Any], size: int) -> Iterator[list[Any]]:
+    """Split rows into consecutive chunks of at most ``size``."""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+class GraphBatchWriter:
+    """
+    Writes discovery results to Neo4j in batched write transactions.
+    """
+
+    def __init__(self, neo4j_client: Neo4jClient, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize batch writer.
+
+        Args:
+            neo4j_client: Neo4j client to write through
+            batch_size: Maximum rows per UNWIND batch
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.neo4j_client = neo4j_client
+        self.batch_size = batch_size
+
+    def write_discovery_result(self, result: "DiscoveryResult") -> BatchWriteReport:
+        """
+        Write all nodes and dependencies of a discovery result.
+
+        Nodes are written before dependencies so relationship endpoints exist.
+
+        Args:
+            result: Discovery result to persist
+
+        Returns:
+            BatchWriteReport with counts and per-batch timings
+        """
+        report = BatchWriteReport()
+        for kind, label in NODE_KINDS:
+            items = getattr(result, kind, None) or []
+            if items:
+                self.write_nodes(kind, label, items, report)
+        if result.dependencies:
+            self.write_dependencies(result.dependencies, report)
+        return report
+
+    def write_nodes(
+        self,
+        kind: str,
+        label: str,
+        items: Iterable[Any],
+        report: BatchWriteReport | None = None,
+    ) -> BatchWriteReport:
+        """
+        Upsert nodes of one label by ID.
+
+        Args:
+            kind: Name used in the report, e.g. ``pods``
+            label: Node label (one of the labels in NODE_KINDS)
+            items: Discovery model objects with ``to_neo4j_properties()``
+            report: Report to add to (a new one is created if omitted)
+
+        Returns:
+            The report
+        """
+        report = report if report is not None else BatchWriteReport()
+        rows = self._serialize(kind, items, report, self._node_row)
+        self._write(kind, NODE_UPSERT_QUERIES[label], rows, report, labels=[label])
+        return report
+
+    def write_dependencies(
+        self, dependencies: Iterable[Any], report: BatchWriteReport | None = None
+    ) -> BatchWriteReport:
+        """
+        Upsert DEPENDS_ON relationships from discovered dependencies.
+
+        Args:
+            dependencies: ResourceDependency objects
+            report: Report to add to (a new one is created if omitted)
+
+        Returns:
+            The report
+        """
+        report = report if report is not None else BatchWriteReport()
+        rows = self._dependency_rows(dependencies, report)
+        self._write(
+            "dependencies",
+            relationship_upsert_query("DEPENDS_ON"),
+            rows,
+            report,
+            relationship_types=["DEPENDS_ON"],
+        )
+        return report
+
+    def write_relationships(
+        self, relationships: list[dict[str, Any]], report: BatchWriteReport | None = None
+    ) -> BatchWriteReport:
+        """
+        Upsert relationships of any type, batched per relationship type.
+
+        Relationships are merged on (source, target, type, discovered_method),
+        so writing the same relationships again does not duplicate edges.
+
+        Args:
+            relationships: Dictionaries with source_id, target_id,
+                relationship_type and optional properties
+            report: Report to add to (a new one is created if omitted)
+
+        Returns:
+            The report, with one entry per relationship type
+        """
+        report = report if report is not None else BatchWriteReport()
+        for relationship_type, rows in Neo4jClient.group_relationship_rows(
+            relationships
+        ).items():
+            self._write(
+                relationship_type.lower(),
+                relationship_upsert_query(relationship_type),
+                rows,
+                report,
+                relationship_types=[relationship_type],
+            )
+        return report
+
+    def write_discovery_changes(
+        self, result: "DiscoveryResult", cloud_provider: str | None = None
+    ) -> tuple[BatchWriteReport, ChangeSet]:
+        """
+        Write only what changed since the last discovery run.
+
+        Discovered nodes and dependencies are fingerprinted and compared with
+        the fingerprints stored in the graph; unchanged items are not written.
+        Deletions require a ``cloud_provider`` and are limited to what the run
+        is known to have covered.
+
+        - Resources of the provider (and subscription) that were not
+          discovered are detach-deleted if their (region, resource type)
+          partition is in ``result.scanned_partitions``.
+        - DEPENDS_ON edges from discovered resources that were not
+          rediscovered are deleted if the run recorded scanned partitions or
+          has no errors, limited to the discovery methods seen in this run so
+          edges maintained by other discoverers are kept. After a partially
+          failed run, only edges to rediscovered targets are deleted.
+
+        Args:
+            result: Discovery result to persist
+            cloud_provider: Provider the result covers, e.g. ``azure``
+
+        Returns:
+            Tuple of (report of the writes, change-set of the run)
+        """
+        report = BatchWriteReport()
+        changes = ChangeSet()
+
+        for kind, label in NODE_KINDS:
+            self.write_node_changes(kind, label, getattr(result, kind, None) or [], report, changes)
+
+        allow_deletes, partitions = _deletion_scope(result, cloud_provider)
+        resource_ids = {resource.id for resource in result.resources}
+        if partitions:
+            self.delete_stale_resources(
+                cloud_provider, result.subscription_id, resource_ids, partitions, report, changes
+            )
+        self.write_dependency_changes(
+            result.dependencies,
+            resource_ids,
+            report,
+            changes,
+            allow_deletes,
+            deletable_targets=resource_ids if result.has_errors else None,
+        )
+        return report, changes
+
+    def write_node_changes(
+        self,
+        kind: str,
+        label: str,
+        items: Iterable[Any],
+        report: BatchWriteReport,
+        changes: ChangeSet,
+    ) -> None:
+        """
+        Write the new and changed nodes of one label.
+
+        Args:
+            kind: Name used in the report and change-set, e.g. ``resources``
+            label: Node label (one of the labels in NODE_KINDS)
+            items: Discovery model objects with ``to_neo4j_properties()``
+            report: Report to add to
+            changes: Change-set to record added and changed nodes in
+        """
+        rows = self._serialize(kind, items, report, self._node_row)
+        stored = self._stored_node_hashes([row["id"] for row in rows])
+        changed = changes.diff_nodes(kind, rows, stored)
+        if changed:
+            self._write(kind, NODE_UPSERT_QUERIES[label], changed, report, labels=[label])
+
+    def delete_stale_resources(
+        self,
+        cloud_provider: str,
+        subscription_id: str | None,
+        discovered_ids: set[str],
+        partitions: set[tuple[str, str]],
+        report: BatchWriteReport,
+        changes: ChangeSet,
+    ) -> None:
+        """
+        Detach-delete stored resources of scanned partitions that were not discovered.
+
+        Args:
+            cloud_provider: Provider the discovery covered
+            subscription_id: Subscription the discovery covered (None for all)
+            discovered_ids: IDs of every resource discovered in the run
+            partitions: (region, resource_type) pairs the discovery scanned;
+                stored resources outside them are kept
+            report: Report to add to
+            changes: Change-set to record deleted resources in
+        """
+        stale_ids = [
+            record["id"]
+            for record in self._stored_resources(cloud_provider, subscription_id)
+            if record["id"] not in discovered_ids
+            and (record["region"], record["resource_type"]) in partitions
+        ]
+        if stale_ids:
+            self._write(
+                "deleted_resources",
+                DELETE_RESOURCES_QUERY,
+                [{"id": resource_id} for resource_id in stale_ids],
+                report,
+                labels=[RESOURCE_LABEL],
+                relationship_types=UPSERT_RELATIONSHIP_TYPES,
+            )
+            changes.record_deleted("resources", stale_ids)
+
+    def write_dependency_changes(
+        self,
+        dependencies: Iterable[Any],
+        source_ids: set[str],
+        report: BatchWriteReport,
+        changes: ChangeSet,
+        allow_deletes: bool = False,
+        deletable_targets: set[str] | None = None,
+    ) -> None:
+        """
+        Write new and changed DEPENDS_ON edges and delete vanished ones.
+
+        Args:
+            dependencies: ResourceDependency objects discovered in the run
+            source_ids: IDs of discovered resources whose stored edges are compared
+            report: Report to add to
+            changes: Change-set to record edge changes in
+            allow_deletes: Whether stored edges that were not rediscovered
+                are deleted (limited to the discovery methods seen in the run)
+            deletable_targets: IDs edges must point to in order to be deleted
+                (None for any target)
+        """
+        rows = self._dependency_rows(dependencies, report)
+        source_ids = source_ids | {row["source_id"] for row in rows}
+        stored_edges = self._stored_dependency_hashes(sorted(source_ids))
+        changed = changes.diff_edges(rows, stored_edges)
+        if changed:
+            self._write(
+                "dependencies",
+                relationship_upsert_query("DEPENDS_ON"),
+                changed,
+                report,
+                relationship_types=["DEPENDS_ON"],
+            )
+
+        if allow_deletes:
+            methods = {row["discovered_method"] for row in rows}
+            current = {edge_key(row) for row in rows}
+            gone = [
+                key
+                for key in stored_edges
+                if key not in current
+                and key[2] in methods
+                and (deletable_targets is None or key[1] in deletable_targets)
+            ]
+            if gone:
+                self._write(
+                    "deleted_dependencies",
+                    DELETE_DEPENDENCIES_QUERY,
+                    [
+                        {"source_id": source, "target_id": target, "discovered_method": method}
+                        for source, target, method in gone
+                    ],
+                    report,
+                    relationship_types=["DEPENDS_ON"],
+                )
+                changes.deleted_edges.update(gone)
+
+    def _stored_node_hashes(self, node_ids: list[str]) -> dict[str, str | None]:
+        """Read stored fingerprints of the given nodes, by ID."""
+        stored: dict[str, str | None] = {}
+        for chunk in _chunks(node_ids, self.batch_size):
+            for record in self._read(STORED_NODE_HASHES_QUERY, node_ids=chunk):
+                stored[record["id"]] = record["content_hash"]
+        return stored
+
+    def _stored_resources(self, cloud_provider: str, subscription_id: str | None) -> list[Any]:
+        """Read IDs, regions and types of stored resources of a provider (and subscription)."""
+        return self._read(
+            STORED_RESOURCE_IDS_QUERY,
+            cloud_provider=cloud_provider,
+            subscription_id=subscription_id,
+        )
+
+    def _stored_dependency_hashes(self, source_ids: list[str]) -> dict[EdgeKey, str | None]:
+        """Read stored fingerprints of DEPENDS_ON edges leaving the given nodes."""
+        stored: dict[EdgeKey, str | None] = {}
+        for chunk in _chunks(source_ids, self.batch_size):
+            for record in self._read(STORED_DEPENDENCY_HASHES_QUERY, source_ids=chunk):
+                stored[edge_key(record)] = record["content_hash"]
+        return stored
+
+    def _read(self, query: str, **parameters: Any) -> list[Any]:
+        """Run a read query in a managed read transaction."""
+        with self.neo4j_client.session() as session:
+            return session.execute_read(lambda tx: list(tx.run(query, **parameters)))
+
+    def _dependency_rows(
+        self, dependencies: Iterable[Any], report: BatchWriteReport
+    ) -> list[dict[str, Any]]:
+        """Convert dependencies to fingerprinted DEPENDS_ON upsert rows."""
+        relationships = self._serialize(
+            "dependencies",
+            dependencies,
+            report,
+            lambda dep: {
+                "source_id": dep.source_id,
+                "target_id": dep.target_id,
+                "relationship_type": "DEPENDS_ON",
+                "properties": dep.to_neo4j_properties(),
+            },
+        )
+        rows = Neo4jClient.group_relationship_rows(relationships).get("DEPENDS_ON", [])
+        for row in rows:
+            row["properties"][CONTENT_HASH_PROPERTY] = content_hash(row["properties"])
+        return rows
+
+    @staticmethod
+    def _node_row(item: Any) -> dict[str, Any]:
+        """Convert a discovery model object to a fingerprinted node row."""
+        row = item.to_neo4j_properties()
+        row[CONTENT_HASH_PROPERTY] = content_hash(row)
+        return row
+
+    @staticmethod
+    def _serialize(
+        kind: str,
+        items: Iterable[Any],
+        report: BatchWriteReport,
+        to_row: Callable[[Any], dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Convert items to rows, recording items that cannot be converted."""
+        rows = []
+        for item in items:
+            try:
+                rows.append(to_row(item))
+            except Exception as e:
+                report.failed[kind] = report.failed.get(kind, 0) + 1
+                report.errors.append(f"Failed to serialize {kind} item: {e}")
+                logger.error(f"Failed to serialize {kind} item: {e}", exc_info=True)
+        return rows
+
+    def _write(
+        self,
+        kind: str,
+        query: str,
+        rows: list[dict[str, Any]],
+        report: BatchWriteReport,
+        labels: Iterable[str] = (),
+        relationship_types: Iterable[str] = (),
+    ) -> None:
+        """Write rows in chunks, timing each chunk, then invalidate cached reads."""
+        report.written.setdefault(kind, 0)
+        started = time.perf_counter()
+        for chunk in _chunks(rows, self.batch_size):
+            self._write_chunk(kind, query, chunk, report)
+        self.neo4j_client.invalidate_written(
+            node_ids=[row[key] for row in rows for key in _ROW_ID_KEYS if key in row],
+            labels=labels,
+            relationship_types=relationship_types,
+        )
+        logger.info(
+            f"Stored {report.written[kind]}/{len(rows)} {kind} in "
+            f"{(len(rows) + self.batch_size - 1) // self.batch_size} batches "
+            f"({time.perf_counter() - started:.2f}s)"
+        )
+
+    def _write_chunk(
+        self, kind: str, query: str, chunk: list[dict[str, Any]], report: BatchWriteReport
+    ) -> None:
+        """Write one chunk; on failure split it to isolate the failing rows."""
+        attempts = 0
+
+        def work(tx):
+            nonlocal attempts
+            attempts += 1
+            record = tx.run(query, rows=chunk).single()
+            return record["count"] if record else 0
+
+        started = time.perf_counter()
+        try:
+            with self.neo4j_client.session() as session:
+                written = session.execute_write(work)
+        except Exception as e:
+            duration = time.perf_counter() - started
+            record_neo4j_query(f"batch_{kind}", "error", duration)
+            if len(chunk) > 1:
+                logger.warning(
+                    f"Batch of {len(chunk)} {kind} failed after {attempts} attempt(s), "
+                    f"splitting: {e}"
+                )
+                middle = len(chunk) // 2
+                self._write_chunk(kind, query, chunk[:middle], report)
+                self._write_chunk(kind, query, chunk[middle:], report)
+                return
+            row_id = chunk[0].get("id") or (chunk[0].get("source_id"), chunk[0].get("target_id"))
+            report.failed[kind] = report.failed.get(kind, 0) + 1
+            report.errors.append(f"Failed to store {kind} {row_id}: {e}")
+            logger.error(f"Failed to store {kind} {row_id}: {e}")
+            return
+
+        duration = time.perf_counter() - started
+        record_neo4j_query(f"batch_{kind}", "success", duration)
+        report.written[kind] += written
+        report.batches.append(
+            BatchTiming(
+                kind=kind,
+                size=len(chunk),
+                written=written,
+                duration_seconds=duration,
+                attempts=attempts,
+            )
+        )
+        logger.debug(
+            f"Wrote batch of {len(chunk)} {kind} in {duration * 1000:.1f}ms "
+            f"({attempts} attempt(s))"
+        )
+
+
+class StreamingGraphWriter:
+    """
+    Writes a discovery whose resources arrive in chunks.
+
+    Each chunk of resources is written (or, for incremental writes, diffed
+    against the stored fingerprints) as soon as it is discovered, and only
+    the resource IDs are kept. :meth:`finish` then writes the remaining
+    nodes and the dependencies and applies deletions the same way
+    :meth:`GraphBatchWriter.write_discovery_changes` does for a complete
+    result.
+    """
+
+    def __init__(self, writer: GraphBatchWriter, incremental: bool = False):
+        """
+        Initialize streaming writer.
+
+        Args:
+            writer: Batch writer to write through
+            incremental: Whether only new, changed or deleted items are written
+        """
+        self.writer = writer
+        self.report = BatchWriteReport()
+        self.changes: ChangeSet | None = ChangeSet() if incremental else None
+        self.resource_ids: set[str] = set()
+
+    def write_resources(self, resources: list[Any]) -> None:
+        """
+        Write one chunk of discovered resources.
+
+        Args:
+            resources: DiscoveredResource objects
+        """
+        self.resource_ids.update(resource.id for resource in resources)
+        if self.changes is not None:
+            self.writer.write_node_changes(
+                "resources", RESOURCE_LABEL, resources, self.report, self.changes
+            )
+        else:
+            self.writer.write_nodes("resources", RESOURCE_LABEL, resources, self.report)
+
+    def finish(
+        self, result: "DiscoveryResult", cloud_provider: str | None = None
+    ) -> tuple[BatchWriteReport, ChangeSet | None]:
+        """
+        Write the rest of the discovery once every chunk was written.
+
+        Args:
+            result: Discovery result holding what was not streamed
+                (dependencies, applications, ...); its resources, if any,
+                are written as a last chunk
+            cloud_provider: Provider the discovery covers; with incremental
+                writes, stale resources and edges are only deleted when set,
+                within the scope write_discovery_changes uses
+
+        Returns:
+            Tuple of (report of all writes, change-set or None when not incremental)
+        """
+        if result.resources:
+            self.write_resources(result.resources)
+
+        # Resources come first in NODE_KINDS and were written chunk by chunk
+        for kind, label in NODE_KINDS[1:]:
+            items = getattr(result, kind, None) or []
+            if self.changes is not None:
+                self.writer.write_node_changes(kind, label, items, self.report, self.changes)
+            elif items:
+                self.writer.write_nodes(kind, label, items, self.report)
+
+        if self.changes is None:
+            if result.dependencies:
+                self.writer.write_dependencies(result.dependencies, self.report)
+            return self.report, None
+
+        allow_deletes, partitions = _deletion_scope(result, cloud_provider)
+        if partitions:
+            self.writer.delete_stale_resources(
+                cloud_provider,
+                result.subscription_id,
+                self.resource_ids,
+                partitions,
+                self.report,
+                self.changes,
+            )
+        self.writer.write_dependency_changes(
+            result.dependencies,
+            self.resource_ids,
+            self.report,
+            self.changes,
+            allow_deletes,
+            deletable_targets=self.resource_ids if result.has_errors else None,
+        )
+        return self.report, self.changes
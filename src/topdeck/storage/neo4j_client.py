@@ -6,23 +6,308 @@ Supports encrypted connections using bolt+s:// or neo4j+s:// schemes.
 Implements connection pooling for improved performance.
 """
 
+from collections import defaultdict
+from collections.abc import Iterable
 from contextlib import contextmanager
+from functools import cache
 from typing import Any
 
-from neo4j import Driver, GraphDatabase, Session
+from neo4j import GraphDatabase, Session
+
+from topdeck.storage.query_cache import (
+    ANY_RELATIONSHIP,
+    label_tag,
+    query_tags,
+    relationship_tag,
+    resource_tag,
+    result_tags,
+)
+from topdeck.storage.query_catalog import (
+    DEPENDENCY_RELATIONSHIP_TYPES,
+    NODE_LABEL,
+    TOPOLOGY_LABELS,
+    QueryBuilder,
+    register_query,
+)
+
+# Relationship types written through the batch upsert API by default
+UPSERT_RELATIONSHIP_TYPES = (*DEPENDENCY_RELATIONSHIP_TYPES, "REDUNDANT_WITH")
+
+# discovered_method used in the MERGE key when a relationship has none
+DEFAULT_DISCOVERED_METHOD = "unknown"
+
+
+@cache
+def relationship_upsert_query(relationship_type: str) -> str:
+    """
+    Get the idempotent UNWIND upsert query for one relationship type.
+
+    Relationships are merged on (source, target, type, discovered_method), so
+    re-running discovery updates existing edges instead of duplicating them,
+    while the same link found by two discovery methods is kept separately.
 
+    Args:
+        relationship_type: Relationship type, e.g. ``DEPENDS_ON``
 
-class Neo4jClient:
+    Returns:
+        Query text taking ``$rows`` of {source_id, target_id,
+        discovered_method, properties}
     """
-    Client for interacting with Neo4j database.
+    rel_type = QueryBuilder.relationship_types([relationship_type])
+    return register_query(
+        f"write.upsert_relationships_{rel_type.lower()}",
+        f"""
+        UNWIND $rows as row
+        MATCH {QueryBuilder.node_by("source", "row.source_id")}
+        MATCH {QueryBuilder.node_by("target", "row.target_id")}
+        MERGE (source)-[r:{rel_type} {{discovered_method: row.discovered_method}}]->(target)
+        SET r += row.properties
+        RETURN count(r) as count
+        """,
+    )
+
+
+@cache
+def relationship_compaction_query(relationship_type: str) -> str:
+    """
+    Get the query deleting one batch of duplicate relationships of a type.
 
-    Supports both encrypted and unencrypted connections:
-    - bolt://     - Unencrypted (development only)
-    - bolt+s://   - Encrypted with TLS
-    - neo4j://    - Unencrypted routing
-    - neo4j+s://  - Encrypted routing with TLS
-    
-    Uses connection pooling for improved performance.
+    Duplicates share source, target, type and discovered_method; the most
+    recently discovered edge of each group is kept. Run after
+    relationship_method_backfill_query so edges without a method are grouped.
+
+    Args:
+        relationship_type: Relationship type, e.g. ``DEPENDS_ON``
+
+    Returns:
+        Query text taking ``$batch_size`` (duplicate groups per batch)
+    """
+    rel_type = QueryBuilder.relationship_types([relationship_type])
+    return register_query(
+        f"maintenance.compact_{rel_type.lower()}",
+        f"""
+        MATCH (source:{NODE_LABEL})-[r:{rel_type}]->(target:{NODE_LABEL})
+        WITH source, target, r.discovered_method as method, r
+        ORDER BY COALESCE(r.discovered_at, '') DESC
+        WITH source, target, method, collect(r) as rels
+        WHERE size(rels) > 1
+        WITH tail(rels) as duplicates
+        LIMIT $batch_size
+        UNWIND duplicates as duplicate
+        DELETE duplicate
+        RETURN count(duplicate) as removed
+        """,
+    )
+
+
+@cache
+def relationship_method_backfill_query(relationship_type: str) -> str:
+    """
+    Get the query giving legacy relationships the default discovered_method.
+
+    Edges written before the upsert API may lack the property, which would
+    keep them from matching the MERGE key.
+
+    Args:
+        relationship_type: Relationship type, e.g. ``DEPENDS_ON``
+
+    Returns:
+        Query text (must run in an auto-commit transaction)
+    """
+    rel_type = QueryBuilder.relationship_types([relationship_type])
+    return register_query(
+        f"maintenance.backfill_method_{rel_type.lower()}",
+        f"""
+        MATCH (:{NODE_LABEL})-[r:{rel_type}]->(:{NODE_LABEL})
+        WHERE r.discovered_method IS NULL
+        CALL {{ WITH r SET r.discovered_method = '{DEFAULT_DISCOVERED_METHOD}' }}
+        IN TRANSACTIONS OF 10000 ROWS
+        """,
+    )
+
+
+for _relationship_type in UPSERT_RELATIONSHIP_TYPES:
+    relationship_upsert_query(_relationship_type)
+    relationship_compaction_query(_relationship_type)
+    relationship_method_backfill_query(_relationship_type)
+
+
+@cache
+def node_create_query(label: str) -> str:
+    """
+    Get the query creating a topology node.
+
+    Args:
+        label: Node label, e.g. ``Application``
+
+    Returns:
+        Query text taking ``$properties`` and returning ``node_id``
+    """
+    return f"""
+        CREATE (n:{label}:{NODE_LABEL})
+        SET n = $properties
+        RETURN elementId(n) as node_id
+    """
+
+
+@cache
+def node_upsert_query(label: str, replace: bool = False) -> str:
+    """
+    Get the query creating or updating a topology node by ID.
+
+    Args:
+        label: Node label, e.g. ``Application``
+        replace: Replace all properties of an existing node instead of
+            merging the given ones into them
+
+    Returns:
+        Query text taking ``$id`` and ``$properties`` and returning ``node_id``
+    """
+    operator = "=" if replace else "+="
+    return f"""
+        MERGE (n:{label} {{id: $id}})
+        SET n:{NODE_LABEL}, n {operator} $properties
+        RETURN elementId(n) as node_id
+    """
+
+
+@cache
+def relationship_create_query(source_label: str, target_label: str, relationship_type: str) -> str:
+    """
+    Get the query creating a relationship between two nodes.
+
+    Args:
+        source_label: Source node label
+        target_label: Target node label
+        relationship_type: Relationship type, e.g. ``BUILT_FROM``
+
+    Returns:
+        Query text taking ``$source_id``, ``$target_id`` and ``$properties``
+    """
+    return f"""
+        MATCH (source:{source_label} {{id: $source_id}})
+        MATCH (target:{target_label} {{id: $target_id}})
+        CREATE (source)-[r:{relationship_type}]->(target)
+        SET r = $properties
+        RETURN r
+    """
+
+
+def label_backfill_query(label: str) -> str:
+    """Get the query adding the :Node super-label to nodes of a label that lack it."""
+    return f"""
+        MATCH (n:{label}) WHERE NOT n:{NODE_LABEL}
+        CALL {{ WITH n SET n:{NODE_LABEL} }} IN TRANSACTIONS OF 10000 ROWS
+    """
+
+
+CREATE_DEPENDENCY_QUERY = """
+    MATCH (source:Resource {id: $source_id})
+    MATCH (target:Resource {id: $target_id})
+    CREATE (source)-[r:DEPENDS_ON]->(target)
+    SET r = $properties
+    RETURN r
+"""
+
+RESOURCE_BY_ID_QUERY = """
+    MATCH (r:Resource {id: $id})
+    RETURN r
+"""
+
+RESOURCES_BY_TYPE_QUERY = """
+    MATCH (r:Resource {resource_type: $resource_type})
+    RETURN r
+    LIMIT $limit
+"""
+
+RESOURCE_DEPENDENCIES_QUERY = """
+    MATCH (source:Resource {id: $id})-[dep:DEPENDS_ON]->(target:Resource)
+    RETURN target, dep
+"""
+
+CLEAR_ALL_QUERY = """
+    MATCH (n)
+    DETACH DELETE n
+    RETURN count(n) as count
+"""
+
+BATCH_CREATE_RESOURCES_QUERY = """
+    UNWIND $resources as resource
+    CREATE (r:Resource:Node)
+    SET r = resource
+    RETURN count(r) as count
+"""
+
+BATCH_UPSERT_RESOURCES_QUERY = """
+    UNWIND $resources as resource
+    MERGE (r:Resource {id: resource.id})
+    SET r:Node, r += resource
+    RETURN count(r) as count
+"""
+
+BATCH_UPSERT_DEPENDENCIES_QUERY = f"""
+    UNWIND $dependencies as dep
+    MERGE (source:Resource {{id: dep.source_id}})
+    ON CREATE SET source:Node
+    MERGE (target:Resource {{id: dep.target_id}})
+    ON CREATE SET target:Node
+    WITH source, target, dep, COALESCE(dep.properties, {{}}) as props
+    MERGE (source)-[r:DEPENDS_ON {{
+        discovered_method: COALESCE(
+            props.discovered_method, '{DEFAULT_DISCOVERED_METHOD}'
+        )
+    }}]->(target)
+    SET r += props
+    RETURN count(r) as count
+"""
+
+# Uniqueness constraints created by initialize_schema
+SCHEMA_CONSTRAINT_QUERIES = (
+    "CREATE CONSTRAINT resource_id_unique IF NOT EXISTS FOR (r:Resource) REQUIRE r.id IS UNIQUE",
+    "CREATE CONSTRAINT application_id_unique IF NOT EXISTS FOR (a:Application) REQUIRE a.id IS UNIQUE",
+    "CREATE CONSTRAINT repository_id_unique IF NOT EXISTS FOR (r:Repository) REQUIRE r.id IS UNIQUE",
+    "CREATE CONSTRAINT deployment_id_unique IF NOT EXISTS FOR (d:Deployment) REQUIRE d.id IS UNIQUE",
+    "CREATE CONSTRAINT namespace_id_unique IF NOT EXISTS FOR (n:Namespace) REQUIRE n.id IS UNIQUE",
+    "CREATE CONSTRAINT pod_id_unique IF NOT EXISTS FOR (p:Pod) REQUIRE p.id IS UNIQUE",
+    "CREATE CONSTRAINT managed_identity_id_unique IF NOT EXISTS FOR (mi:ManagedIdentity) REQUIRE mi.id IS UNIQUE",
+    "CREATE CONSTRAINT service_principal_id_unique IF NOT EXISTS FOR (sp:ServicePrincipal) REQUIRE sp.id IS UNIQUE",
+    "CREATE CONSTRAINT app_registration_id_unique IF NOT EXISTS FOR (ar:AppRegistration) REQUIRE ar.id IS UNIQUE",
+)
+
+# Indexes for common query patterns created by initialize_schema
+SCHEMA_INDEX_QUERIES = (
+    # Resource indexes
+    "CREATE INDEX resource_id IF NOT EXISTS FOR (r:Resource) ON (r.id)",
+    "CREATE INDEX resource_type IF NOT EXISTS FOR (r:Resource) ON (r.resource_type)",
+    "CREATE INDEX resource_cloud_provider IF NOT EXISTS FOR (r:Resource) ON (r.cloud_provider)",
+    "CREATE INDEX resource_name IF NOT EXISTS FOR (r:Resource) ON (r.name)",
+    "CREATE INDEX resource_region IF NOT EXISTS FOR (r:Resource) ON (r.region)",
+    "CREATE INDEX resource_status IF NOT EXISTS FOR (r:Resource) ON (r.status)",
+    "CREATE INDEX resource_environment IF NOT EXISTS FOR (r:Resource) ON (r.environment)",
+    # Composite indexes for common query patterns
+    "CREATE INDEX resource_type_provider IF NOT EXISTS FOR (r:Resource) ON (r.resource_type, r.cloud_provider)",
+    "CREATE INDEX resource_region_type IF NOT EXISTS FOR (r:Resource) ON (r.region, r.resource_type)",
+    # Application indexes
+    "CREATE INDEX application_id IF NOT EXISTS FOR (a:Application) ON (a.id)",
+    "CREATE INDEX application_name IF NOT EXISTS FOR (a:Application) ON (a.name)",
+    # Deployment indexes
+    "CREATE INDEX deployment_id IF NOT EXISTS FOR (d:Deployment) ON (d.id)",
+    "CREATE INDEX deployment_status IF NOT EXISTS FOR (d:Deployment) ON (d.status)",
+    # Namespace indexes
+    "CREATE INDEX namespace_id IF NOT EXISTS FOR (n:Namespace) ON (n.id)",
+    "CREATE INDEX namespace_name IF NOT EXISTS FOR (n:Namespace) ON (n.name)",
+    # Pod indexes
+    "CREATE INDEX pod_id IF NOT EXISTS FOR (p:Pod) ON (p.id)",
+    "CREATE INDEX pod_name IF NOT EXISTS FOR (p:Pod) ON (p.name)",
+    # Super-label index used by ID lookups in the analysis layer
+    f"CREATE INDEX node_id IF NOT EXISTS FOR (n:{NODE_LABEL}) ON (n.id)",
+)
+
+
+class BaseNeo4jClient:
+    """
+    Connection settings, validation and query cache bookkeeping shared by
+    the synchronous and asynchronous Neo4j clients.
     """
 
     def __init__(
@@ -34,6 +319,7 @@ class Neo4jClient:
         max_connection_pool_size: int = 50,
         connection_acquisition_timeout: float = 60.0,
         enable_query_cache: bool = True,
+        max_transaction_retry_time: float = 30.0,
     ):
         """
         Initialize Neo4j client.
@@ -46,6 +332,8 @@ class Neo4jClient:
             max_connection_pool_size: Maximum number of connections in the pool (default: 50)
             connection_acquisition_timeout: Timeout in seconds for acquiring a connection (default: 60.0)
             enable_query_cache: Whether to enable query result caching (default: True)
+            max_transaction_retry_time: Seconds to retry managed transactions on
+                transient errors (default: 30.0)
         """
         self.uri = uri
         self.username = username
@@ -54,7 +342,8 @@ class Neo4jClient:
         self.max_connection_pool_size = max_connection_pool_size
         self.connection_acquisition_timeout = connection_acquisition_timeout
         self.enable_query_cache = enable_query_cache
-        self.driver: Driver | None = None
+        self.max_transaction_retry_time = max_transaction_retry_time
+        self.driver = None
         self._query_cache = None
 
         # Auto-upgrade to encrypted connection if requested and not already encrypted
@@ -75,15 +364,197 @@ class Neo4jClient:
         """Check if a URI uses an encrypted protocol."""
         return "+s://" in uri or "+ssc://" in uri
 
+    def _driver_options(self) -> dict[str, Any]:
+        """Keyword arguments for creating the driver."""
+        return {
+            "auth": (self.username, self.password),
+            "encrypted": self.encrypted or self._is_encrypted_uri(self.uri),
+            "max_connection_pool_size": self.max_connection_pool_size,
+            "connection_acquisition_timeout": self.connection_acquisition_timeout,
+            "max_transaction_retry_time": self.max_transaction_retry_time,
+        }
+
+    def _pool_stats(self, connections: list[Any]) -> dict[str, int]:
+        """Count the open, in-use and idle connections of the driver's pool."""
+        in_use = sum(1 for connection in connections if connection.in_use)
+        return {
+            "max_size": self.max_connection_pool_size,
+            "open": len(connections),
+            "in_use": in_use,
+            "idle": len(connections) - in_use,
+        }
+
+    @staticmethod
+    def _require_id(label: str, properties: dict[str, Any]) -> None:
+        """Raise ValueError if node properties lack an ID."""
+        if "id" not in properties:
+            raise ValueError(f"{label} properties must include 'id'")
+
+    @staticmethod
+    def _validate_resources(resources: list[dict[str, Any]]) -> None:
+        """Raise ValueError if a resource of a batch lacks an ID."""
+        for idx, resource in enumerate(resources):
+            if "id" not in resource:
+                raise ValueError(f"Resource at index {idx} is missing required 'id' field")
+
+    @staticmethod
+    def _validate_dependencies(dependencies: list[dict[str, Any]]) -> None:
+        """Raise ValueError if a dependency of a batch lacks an endpoint."""
+        for idx, dep in enumerate(dependencies):
+            missing = [key for key in ("source_id", "target_id") if key not in dep]
+            if missing:
+                raise ValueError(
+                    f"Dependency at index {idx} is missing required fields: {', '.join(missing)}"
+                )
+
+    @staticmethod
+    def group_relationship_rows(
+        relationships: list[dict[str, Any]],
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Validate relationships and group them into upsert rows by type.
+
+        Args:
+            relationships: Relationship dictionaries (see batch_upsert_relationships)
+
+        Returns:
+            Mapping of relationship type to rows for relationship_upsert_query
+
+        Raises:
+            ValueError: If a relationship is missing a required field
+        """
+        rows_by_type: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for idx, rel in enumerate(relationships):
+            missing = [
+                key for key in ("source_id", "target_id", "relationship_type") if not rel.get(key)
+            ]
+            if missing:
+                raise ValueError(
+                    f"Relationship at index {idx} is missing required fields: "
+                    f"{', '.join(missing)}"
+                )
+            properties = dict(rel.get("properties") or {})
+            method = properties.get("discovered_method") or DEFAULT_DISCOVERED_METHOD
+            properties["discovered_method"] = method
+            rows_by_type[rel["relationship_type"]].append(
+                {
+                    "source_id": rel["source_id"],
+                    "target_id": rel["target_id"],
+                    "discovered_method": method,
+                    "properties": properties,
+                }
+            )
+        return dict(rows_by_type)
+
+    def _cache_tags(
+        self, query: str, params: dict[str, Any] | None, tags: set[str] | None
+    ) -> set[str] | None:
+        """Get the invalidation tags of a cached query (None if caching is disabled)."""
+        if not self.enable_query_cache or self._query_cache is None:
+            return None
+        return set(tags) if tags is not None else query_tags(query, params)
+
+    def _cache_result(
+        self,
+        query: str,
+        params: dict[str, Any] | None,
+        ttl: int | None,
+        tags: set[str],
+        result_list: list[dict[str, Any]],
+    ) -> None:
+        """Cache a query result, tagged with the nodes it returned."""
+        returned = result_tags(result_list)
+        # Too many nodes to tag individually: depend on the scanned labels instead
+        tags |= returned if returned is not None else query_tags(query)
+        self._query_cache.set(query, result_list, params, ttl, tags)
+
+    def invalidate_cache(self, query: str | None = None, params: dict[str, Any] | None = None) -> None:
+        """
+        Invalidate cached query results.
+
+        Args:
+            query: Specific query to invalidate (None = clear all)
+            params: Query parameters (only used if query is specified)
+        """
+        if self._query_cache is None:
+            return
+
+        if query is None:
+            self._query_cache.clear()
+        else:
+            self._query_cache.invalidate(query, params)
+
+    def invalidate_written(
+        self,
+        node_ids: Iterable[str | None] = (),
+        labels: Iterable[str] = (),
+        relationship_types: Iterable[str] = (),
+    ) -> int:
+        """
+        Invalidate cached results affected by a write.
+
+        Drops entries depending on the written nodes, scans of the written
+        labels (including the :Node super-label) and scans of the written
+        relationship types. Called by every write method of this client;
+        call it after writing through ``session()`` directly.
+
+        Args:
+            node_ids: IDs of created, updated or deleted nodes, and of the
+                endpoints of written relationships
+            labels: Labels of written nodes
+            relationship_types: Types of written relationships
+
+        Returns:
+            Number of cache entries removed
+        """
+        if self._query_cache is None:
+            return 0
+
+        tags = {resource_tag(node_id) for node_id in node_ids if node_id}
+        labels = set(labels)
+        if labels:
+            labels.add(NODE_LABEL)
+        tags.update(label_tag(label) for label in labels)
+        relationship_types = set(relationship_types)
+        if relationship_types:
+            relationship_types.add(ANY_RELATIONSHIP)
+        tags.update(relationship_tag(rel_type) for rel_type in relationship_types)
+        return self._query_cache.invalidate_tags(tags)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """
+        Get query cache statistics.
+
+        Returns:
+            Dictionary with cache stats or empty dict if caching disabled
+        """
+        if self._query_cache is None:
+            return {
+                "enabled": False,
+                "message": "Query caching is disabled"
+            }
+
+        stats = self._query_cache.get_stats()
+        stats["enabled"] = True
+        return stats
+
+
+class Neo4jClient(BaseNeo4jClient):
+    """
+    Client for interacting with Neo4j database.
+
+    Supports both encrypted and unencrypted connections:
+    - bolt://     - Unencrypted (development only)
+    - bolt+s://   - Encrypted with TLS
+    - neo4j://    - Unencrypted routing
+    - neo4j+s://  - Encrypted routing with TLS
+    
+    Uses connection pooling for improved performance.
+    """
+
     def connect(self) -> None:
         """Establish connection to Neo4j with optional TLS encryption and connection pooling."""
-        self.driver = GraphDatabase.driver(
-            self.uri,
-            auth=(self.username, self.password),
-            encrypted=self.encrypted or self._is_encrypted_uri(self.uri),
-            max_connection_pool_size=self.max_connection_pool_size,
-            connection_acquisition_timeout=self.connection_acquisition_timeout,
-        )
+        self.driver = GraphDatabase.driver(self.uri, **self._driver_options())
 
     def close(self) -> None:
         """Close connection to Neo4j"""
@@ -91,6 +562,23 @@ class Neo4jClient:
             self.driver.close()
             self.driver = None
 
+    def get_pool_stats(self) -> dict[str, int]:
+        """
+        Get connection pool utilization.
+
+        Returns:
+            Dictionary with the pool size limit and the open, in-use and idle
+            connections (all 0 before connecting)
+        """
+        # The driver does not expose its pool publicly
+        pool = getattr(self.driver, "_pool", None)
+        try:
+            with pool.lock:
+                connections = [c for conns in pool.connections.values() for c in conns]
+        except AttributeError:
+            connections = []
+        return self._pool_stats(connections)
+
     @contextmanager
     def session(self) -> Session:
         """
@@ -109,6 +597,51 @@ class Neo4jClient:
         finally:
             session.close()
 
+    def execute_query(
+        self, query: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Run a query and return all records.
+
+        Nodes and relationships in the records are converted to dictionaries
+        of their properties. Call invalidate_written after writing topology
+        through this method.
+
+        Args:
+            query: Cypher query string
+            params: Query parameters
+
+        Returns:
+            List of result records as dictionaries
+        """
+        with self.session() as session:
+            return session.run(query, params or {}).data()
+
+    def _fetch(self, query: str, params: dict[str, Any] | None) -> list[dict[str, Any]]:
+        """Run a read query and return its records as dictionaries."""
+        with self.session() as session:
+            result = session.run(query, params or {})
+            return [dict(record) for record in result]
+
+    def _create_node(self, label: str, properties: dict[str, Any]) -> str:
+        """Create a topology node and return its element ID."""
+        with self.session() as session:
+            record = session.run(node_create_query(label), properties=properties).single()
+
+        self.invalidate_written(node_ids=[properties.get("id")], labels=[label])
+        return record["node_id"] if record else None
+
+    def _upsert_node(self, label: str, properties: dict[str, Any], replace: bool = False) -> str:
+        """Create or update a topology node by ID and return its element ID."""
+        self._require_id(label, properties)
+        with self.session() as session:
+            record = session.run(
+                node_upsert_query(label, replace), id=properties["id"], properties=properties
+            ).single()
+
+        self.invalidate_written(node_ids=[properties["id"]], labels=[label])
+        return record["node_id"] if record else None
+
     def create_resource(self, properties: dict[str, Any]) -> str:
         """
         Create a resource node in Neo4j.
@@ -119,18 +652,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (r:Resource)
-                SET r = $properties
-                RETURN elementId(r) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("Resource", properties)
 
     def create_dependency(
         self,
@@ -151,19 +673,17 @@ class Neo4jClient:
         """
         with self.session() as session:
             result = session.run(
-                """
-                MATCH (source:Resource {id: $source_id})
-                MATCH (target:Resource {id: $target_id})
-                CREATE (source)-[r:DEPENDS_ON]->(target)
-                SET r = $properties
-                RETURN r
-            """,
+                CREATE_DEPENDENCY_QUERY,
                 source_id=source_id,
                 target_id=target_id,
                 properties=properties,
             )
+            created = result.single() is not None
 
-            return result.single() is not None
+        self.invalidate_written(
+            node_ids=[source_id, target_id], relationship_types=["DEPENDS_ON"]
+        )
+        return created
 
     def upsert_resource(self, properties: dict[str, Any]) -> str:
         """
@@ -175,22 +695,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        if "id" not in properties:
-            raise ValueError("Resource properties must include 'id'")
-
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (r:Resource {id: $id})
-                SET r += $properties
-                RETURN elementId(r) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("Resource", properties)
 
     def get_resource_by_id(self, resource_id: str) -> dict[str, Any] | None:
         """
@@ -203,18 +708,8 @@ class Neo4jClient:
             Resource properties or None if not found
         """
         with self.session() as session:
-            result = session.run(
-                """
-                MATCH (r:Resource {id: $id})
-                RETURN r
-            """,
-                id=resource_id,
-            )
-
-            record = result.single()
-            if record:
-                return dict(record["r"])
-            return None
+            record = session.run(RESOURCE_BY_ID_QUERY, id=resource_id).single()
+            return dict(record["r"]) if record else None
 
     def get_resources_by_type(
         self,
@@ -232,16 +727,7 @@ class Neo4jClient:
             List of resource properties
         """
         with self.session() as session:
-            result = session.run(
-                """
-                MATCH (r:Resource {resource_type: $resource_type})
-                RETURN r
-                LIMIT $limit
-            """,
-                resource_type=resource_type,
-                limit=limit,
-            )
-
+            result = session.run(RESOURCES_BY_TYPE_QUERY, resource_type=resource_type, limit=limit)
             return [dict(record["r"]) for record in result]
 
     def get_dependencies(self, resource_id: str) -> list[dict[str, Any]]:
@@ -255,14 +741,7 @@ class Neo4jClient:
             List of dependency relationships with target resources
         """
         with self.session() as session:
-            result = session.run(
-                """
-                MATCH (source:Resource {id: $id})-[dep:DEPENDS_ON]->(target:Resource)
-                RETURN target, dep
-            """,
-                id=resource_id,
-            )
-
+            result = session.run(RESOURCE_DEPENDENCIES_QUERY, id=resource_id)
             return [
                 {
                     "target": dict(record["target"]),
@@ -281,18 +760,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (a:Application)
-                SET a = $properties
-                RETURN elementId(a) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("Application", properties)
 
     def upsert_application(self, properties: dict[str, Any]) -> str:
         """
@@ -304,22 +772,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        if "id" not in properties:
-            raise ValueError("Application properties must include 'id'")
-
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (a:Application {id: $id})
-                SET a += $properties
-                RETURN elementId(a) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("Application", properties)
 
     def create_repository(self, properties: dict[str, Any]) -> str:
         """
@@ -331,18 +784,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (r:Repository)
-                SET r = $properties
-                RETURN elementId(r) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("Repository", properties)
 
     def upsert_repository(self, properties: dict[str, Any]) -> str:
         """
@@ -354,22 +796,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        if "id" not in properties:
-            raise ValueError("Repository properties must include 'id'")
-
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (r:Repository {id: $id})
-                SET r += $properties
-                RETURN elementId(r) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("Repository", properties)
 
     def create_deployment(self, properties: dict[str, Any]) -> str:
         """
@@ -381,18 +808,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (d:Deployment)
-                SET d = $properties
-                RETURN elementId(d) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("Deployment", properties)
 
     def upsert_deployment(self, properties: dict[str, Any]) -> str:
         """
@@ -404,22 +820,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        if "id" not in properties:
-            raise ValueError("Deployment properties must include 'id'")
-
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (d:Deployment {id: $id})
-                SET d += $properties
-                RETURN elementId(d) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("Deployment", properties)
 
     def create_relationship(
         self,
@@ -444,20 +845,17 @@ class Neo4jClient:
         Returns:
             True if successful, False otherwise
         """
+        query = relationship_create_query(source_label, target_label, relationship_type)
         with self.session() as session:
-            # Build dynamic query with labels
-            query = f"""
-                MATCH (source:{source_label} {{id: $source_id}})
-                MATCH (target:{target_label} {{id: $target_id}})
-                CREATE (source)-[r:{relationship_type}]->(target)
-                SET r = $properties
-                RETURN r
-            """
             result = session.run(
                 query, source_id=source_id, target_id=target_id, properties=properties
             )
+            created = result.single() is not None
 
-            return result.single() is not None
+        self.invalidate_written(
+            node_ids=[source_id, target_id], relationship_types=[relationship_type]
+        )
+        return created
 
     def create_namespace(self, properties: dict[str, Any]) -> str:
         """
@@ -469,18 +867,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (n:Namespace)
-                SET n = $properties
-                RETURN elementId(n) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("Namespace", properties)
 
     def upsert_namespace(self, properties: dict[str, Any]) -> str:
         """
@@ -492,19 +879,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (n:Namespace {id: $id})
-                SET n = $properties
-                RETURN elementId(n) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("Namespace", properties, replace=True)
 
     def create_pod(self, properties: dict[str, Any]) -> str:
         """
@@ -516,18 +891,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (p:Pod)
-                SET p = $properties
-                RETURN elementId(p) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("Pod", properties)
 
     def upsert_pod(self, properties: dict[str, Any]) -> str:
         """
@@ -539,19 +903,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (p:Pod {id: $id})
-                SET p = $properties
-                RETURN elementId(p) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("Pod", properties, replace=True)
 
     def create_managed_identity(self, properties: dict[str, Any]) -> str:
         """
@@ -563,18 +915,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (mi:ManagedIdentity)
-                SET mi = $properties
-                RETURN elementId(mi) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("ManagedIdentity", properties)
 
     def upsert_managed_identity(self, properties: dict[str, Any]) -> str:
         """
@@ -586,19 +927,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (mi:ManagedIdentity {id: $id})
-                SET mi = $properties
-                RETURN elementId(mi) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("ManagedIdentity", properties, replace=True)
 
     def create_service_principal(self, properties: dict[str, Any]) -> str:
         """
@@ -610,18 +939,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (sp:ServicePrincipal)
-                SET sp = $properties
-                RETURN elementId(sp) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("ServicePrincipal", properties)
 
     def upsert_service_principal(self, properties: dict[str, Any]) -> str:
         """
@@ -633,19 +951,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (sp:ServicePrincipal {id: $id})
-                SET sp = $properties
-                RETURN elementId(sp) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("ServicePrincipal", properties, replace=True)
 
     def create_app_registration(self, properties: dict[str, Any]) -> str:
         """
@@ -657,18 +963,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                CREATE (ar:AppRegistration)
-                SET ar = $properties
-                RETURN elementId(ar) as node_id
-            """,
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._create_node("AppRegistration", properties)
 
     def upsert_app_registration(self, properties: dict[str, Any]) -> str:
         """
@@ -680,19 +975,7 @@ class Neo4jClient:
         Returns:
             Node element ID
         """
-        with self.session() as session:
-            result = session.run(
-                """
-                MERGE (ar:AppRegistration {id: $id})
-                SET ar = $properties
-                RETURN elementId(ar) as node_id
-            """,
-                id=properties["id"],
-                properties=properties,
-            )
-
-            record = result.single()
-            return record["node_id"] if record else None
+        return self._upsert_node("AppRegistration", properties, replace=True)
 
     def clear_all(self) -> int:
         """
@@ -702,16 +985,10 @@ class Neo4jClient:
             Number of nodes deleted
         """
         with self.session() as session:
-            result = session.run(
-                """
-                MATCH (n)
-                DETACH DELETE n
-                RETURN count(n) as count
-            """
-            )
+            record = session.run(CLEAR_ALL_QUERY).single()
 
-            record = result.single()
-            return record["count"] if record else 0
+        self.invalidate_cache()
+        return record["count"] if record else 0
 
     def batch_create_resources(self, resources: list[dict[str, Any]]) -> int:
         """
@@ -732,25 +1009,15 @@ class Neo4jClient:
         """
         if not resources:
             return 0
-
-        # Validate all resources have an ID
-        for idx, resource in enumerate(resources):
-            if "id" not in resource:
-                raise ValueError(f"Resource at index {idx} is missing required 'id' field")
+        self._validate_resources(resources)
 
         with self.session() as session:
-            result = session.run(
-                """
-                UNWIND $resources as resource
-                CREATE (r:Resource)
-                SET r = resource
-                RETURN count(r) as count
-                """,
-                resources=resources,
-            )
+            record = session.run(BATCH_CREATE_RESOURCES_QUERY, resources=resources).single()
 
-            record = result.single()
-            return record["count"] if record else 0
+        self.invalidate_written(
+            node_ids=[resource["id"] for resource in resources], labels=["Resource"]
+        )
+        return record["count"] if record else 0
 
     def batch_upsert_resources(self, resources: list[dict[str, Any]]) -> int:
         """
@@ -766,34 +1033,25 @@ class Neo4jClient:
         """
         if not resources:
             return 0
-
-        # Validate all resources have an ID
-        for idx, resource in enumerate(resources):
-            if "id" not in resource:
-                raise ValueError(f"Resource at index {idx} is missing required 'id' field")
+        self._validate_resources(resources)
 
         with self.session() as session:
-            result = session.run(
-                """
-                UNWIND $resources as resource
-                MERGE (r:Resource {id: resource.id})
-                SET r += resource
-                RETURN count(r) as count
-                """,
-                resources=resources,
-            )
+            record = session.run(BATCH_UPSERT_RESOURCES_QUERY, resources=resources).single()
 
-            record = result.single()
-            return record["count"] if record else 0
+        self.invalidate_written(
+            node_ids=[resource["id"] for resource in resources], labels=["Resource"]
+        )
+        return record["count"] if record else 0
 
     def batch_create_dependencies(
         self, dependencies: list[dict[str, Any]]
     ) -> int:
         """
-        Create multiple DEPENDS_ON relationships in a single transaction using UNWIND.
-        
-        This is much more efficient than creating dependencies one at a time.
-        
+        Create or update multiple DEPENDS_ON relationships in a single transaction.
+
+        Relationships are merged on (source, target, discovered_method), so
+        calling this again with the same dependencies does not duplicate edges.
+
         Note: Uses MERGE to ensure both source and target resources exist. If either
         resource doesn't exist, it will be created with just the ID property.
 
@@ -804,38 +1062,99 @@ class Neo4jClient:
                 - properties: Relationship properties (optional)
 
         Returns:
-            Number of dependencies created
+            Number of dependencies created or updated
         """
         if not dependencies:
             return 0
+        self._validate_dependencies(dependencies)
 
-        # Validate all dependencies have required fields
-        for idx, dep in enumerate(dependencies):
-            if "source_id" not in dep or "target_id" not in dep:
-                missing = []
-                if "source_id" not in dep:
-                    missing.append("source_id")
-                if "target_id" not in dep:
-                    missing.append("target_id")
-                raise ValueError(
-                    f"Dependency at index {idx} is missing required fields: {', '.join(missing)}"
-                )
+        with self.session() as session:
+            record = session.run(
+                BATCH_UPSERT_DEPENDENCIES_QUERY, dependencies=dependencies
+            ).single()
+
+        self.invalidate_written(
+            node_ids=[dep[key] for dep in dependencies for key in ("source_id", "target_id")],
+            labels=["Resource"],
+            relationship_types=["DEPENDS_ON"],
+        )
+        return record["count"] if record else 0
+
+    def batch_upsert_relationships(self, relationships: list[dict[str, Any]]) -> int:
+        """
+        Idempotently create or update relationships of any type.
+
+        Relationships are grouped by type and each group is written with one
+        UNWIND query that MERGEs on (source, target, type, discovered_method).
+        Both endpoints must already exist.
+
+        Args:
+            relationships: List of relationship dictionaries, each with:
+                - source_id: Source node ID
+                - target_id: Target node ID
+                - relationship_type: Relationship type, e.g. "USES"
+                - properties: Relationship properties (optional); its
+                  discovered_method is part of the MERGE key
+
+        Returns:
+            Number of relationships created or updated
+        """
+        if not relationships:
+            return 0
+
+        rows_by_type = self.group_relationship_rows(relationships)
 
+        count = 0
         with self.session() as session:
-            result = session.run(
-                """
-                UNWIND $dependencies as dep
-                MERGE (source:Resource {id: dep.source_id})
-                MERGE (target:Resource {id: dep.target_id})
-                CREATE (source)-[r:DEPENDS_ON]->(target)
-                SET r = COALESCE(dep.properties, {})
-                RETURN count(r) as count
-                """,
-                dependencies=dependencies,
-            )
+            for relationship_type, rows in rows_by_type.items():
+                result = session.run(relationship_upsert_query(relationship_type), rows=rows)
+                record = result.single()
+                count += record["count"] if record else 0
+                self.invalidate_written(
+                    node_ids=[row[key] for row in rows for key in ("source_id", "target_id")],
+                    relationship_types=[relationship_type],
+                )
+        return count
+
+    def compact_duplicate_relationships(
+        self,
+        relationship_types: tuple[str, ...] | list[str] = UPSERT_RELATIONSHIP_TYPES,
+        batch_size: int = 10000,
+    ) -> dict[str, int]:
+        """
+        Collapse duplicate relationships left by earlier CREATE-based writes.
+
+        Edges without a discovered_method first get the default one so they
+        match the upsert MERGE key. Duplicates then share source, target,
+        type and discovered_method; the most recently discovered edge of each
+        group is kept. Deletes run in batches of ``batch_size`` duplicate
+        groups until none remain.
 
-            record = result.single()
-            return record["count"] if record else 0
+        Args:
+            relationship_types: Relationship types to compact
+            batch_size: Duplicate groups handled per transaction
+
+        Returns:
+            Number of relationships removed per type
+        """
+        removed: dict[str, int] = {}
+        with self.session() as session:
+            for relationship_type in relationship_types:
+                session.run(relationship_method_backfill_query(relationship_type)).consume()
+                query = relationship_compaction_query(relationship_type)
+                total = 0
+                while True:
+                    record = session.execute_write(
+                        lambda tx, q=query: tx.run(q, batch_size=batch_size).single()
+                    )
+                    batch_removed = record["removed"] if record else 0
+                    total += batch_removed
+                    if not batch_removed:
+                        break
+                removed[relationship_type] = total
+                if total:
+                    self.invalidate_written(relationship_types=[relationship_type])
+        return removed
 
     def initialize_schema(self) -> dict[str, Any]:
         """
@@ -844,28 +1163,20 @@ class Neo4jClient:
         This should be called on application startup to ensure optimal query performance.
         Uses IF NOT EXISTS to avoid errors on subsequent calls.
 
+        Also adds the :Node super-label to topology nodes that predate it.
+
         Returns:
-            Dictionary with counts of constraints and indexes created
+            Dictionary with counts of constraints and indexes created and
+            nodes labelled
         """
         constraints_created = 0
         indexes_created = 0
+        nodes_labelled = 0
         errors = []
 
         with self.session() as session:
             # Create uniqueness constraints
-            constraint_queries = [
-                "CREATE CONSTRAINT resource_id_unique IF NOT EXISTS FOR (r:Resource) REQUIRE r.id IS UNIQUE",
-                "CREATE CONSTRAINT application_id_unique IF NOT EXISTS FOR (a:Application) REQUIRE a.id IS UNIQUE",
-                "CREATE CONSTRAINT repository_id_unique IF NOT EXISTS FOR (r:Repository) REQUIRE r.id IS UNIQUE",
-                "CREATE CONSTRAINT deployment_id_unique IF NOT EXISTS FOR (d:Deployment) REQUIRE d.id IS UNIQUE",
-                "CREATE CONSTRAINT namespace_id_unique IF NOT EXISTS FOR (n:Namespace) REQUIRE n.id IS UNIQUE",
-                "CREATE CONSTRAINT pod_id_unique IF NOT EXISTS FOR (p:Pod) REQUIRE p.id IS UNIQUE",
-                "CREATE CONSTRAINT managed_identity_id_unique IF NOT EXISTS FOR (mi:ManagedIdentity) REQUIRE mi.id IS UNIQUE",
-                "CREATE CONSTRAINT service_principal_id_unique IF NOT EXISTS FOR (sp:ServicePrincipal) REQUIRE sp.id IS UNIQUE",
-                "CREATE CONSTRAINT app_registration_id_unique IF NOT EXISTS FOR (ar:AppRegistration) REQUIRE ar.id IS UNIQUE",
-            ]
-
-            for query in constraint_queries:
+            for query in SCHEMA_CONSTRAINT_QUERIES:
                 try:
                     session.run(query)
                     constraints_created += 1
@@ -875,33 +1186,7 @@ class Neo4jClient:
                         errors.append(f"Constraint error: {str(e)}")
 
             # Create indexes for common query patterns
-            index_queries = [
-                # Resource indexes
-                "CREATE INDEX resource_id IF NOT EXISTS FOR (r:Resource) ON (r.id)",
-                "CREATE INDEX resource_type IF NOT EXISTS FOR (r:Resource) ON (r.resource_type)",
-                "CREATE INDEX resource_cloud_provider IF NOT EXISTS FOR (r:Resource) ON (r.cloud_provider)",
-                "CREATE INDEX resource_name IF NOT EXISTS FOR (r:Resource) ON (r.name)",
-                "CREATE INDEX resource_region IF NOT EXISTS FOR (r:Resource) ON (r.region)",
-                "CREATE INDEX resource_status IF NOT EXISTS FOR (r:Resource) ON (r.status)",
-                "CREATE INDEX resource_environment IF NOT EXISTS FOR (r:Resource) ON (r.environment)",
-                # Composite indexes for common query patterns
-                "CREATE INDEX resource_type_provider IF NOT EXISTS FOR (r:Resource) ON (r.resource_type, r.cloud_provider)",
-                "CREATE INDEX resource_region_type IF NOT EXISTS FOR (r:Resource) ON (r.region, r.resource_type)",
-                # Application indexes
-                "CREATE INDEX application_id IF NOT EXISTS FOR (a:Application) ON (a.id)",
-                "CREATE INDEX application_name IF NOT EXISTS FOR (a:Application) ON (a.name)",
-                # Deployment indexes
-                "CREATE INDEX deployment_id IF NOT EXISTS FOR (d:Deployment) ON (d.id)",
-                "CREATE INDEX deployment_status IF NOT EXISTS FOR (d:Deployment) ON (d.status)",
-                # Namespace indexes
-                "CREATE INDEX namespace_id IF NOT EXISTS FOR (n:Namespace) ON (n.id)",
-                "CREATE INDEX namespace_name IF NOT EXISTS FOR (n:Namespace) ON (n.name)",
-                # Pod indexes
-                "CREATE INDEX pod_id IF NOT EXISTS FOR (p:Pod) ON (p.id)",
-                "CREATE INDEX pod_name IF NOT EXISTS FOR (p:Pod) ON (p.name)",
-            ]
-
-            for query in index_queries:
+            for query in SCHEMA_INDEX_QUERIES:
                 try:
                     session.run(query)
                     indexes_created += 1
@@ -910,20 +1195,37 @@ class Neo4jClient:
                     if "already exists" not in str(e).lower():
                         errors.append(f"Index error: {str(e)}")
 
+            # Backfill the super-label on nodes written before it existed
+            for label in TOPOLOGY_LABELS:
+                try:
+                    summary = session.run(label_backfill_query(label)).consume()
+                    nodes_labelled += summary.counters.labels_added
+                except Exception as e:
+                    errors.append(f"Label backfill error ({label}): {str(e)}")
+
         return {
             "constraints_created": constraints_created,
             "indexes_created": indexes_created,
+            "nodes_labelled": nodes_labelled,
             "errors": errors,
         }
 
     def run_cached_query(
-        self, query: str, params: dict[str, Any] | None = None, ttl: int | None = None
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        ttl: int | None = None,
+        tags: set[str] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Run a query with caching enabled.
         
         Results are cached based on query + parameters. Use for read-only queries
         that are frequently executed with the same parameters.
+
+        Entries are tagged with the IDs in ``params``, the labels and
+        relationship types the query mentions, and the node IDs in the result,
+        so writes through this client only invalidate the entries they affect.
         
         WARNING: Do not use for queries that modify data (CREATE, MERGE, DELETE, SET).
 
@@ -931,57 +1233,21 @@ class Neo4jClient:
             query: Cypher query string
             params: Query parameters
             ttl: Cache TTL in seconds (uses cache default if None)
+            tags: Invalidation tags (derived from the query if None)
 
         Returns:
             List of result records as dictionaries
         """
-        if not self.enable_query_cache or self._query_cache is None:
+        tags = self._cache_tags(query, params, tags)
+        if tags is None:
             # Cache disabled, execute directly
-            with self.session() as session:
-                result = session.run(query, params or {})
-                return [dict(record) for record in result]
+            return self._fetch(query, params)
 
         # Check cache first
-        cached_result = self._query_cache.get(query, params)
+        cached_result = self._query_cache.get(query, params, tags)
         if cached_result is not None:
             return cached_result
 
-        # Execute query and cache result
-        with self.session() as session:
-            result = session.run(query, params or {})
-            result_list = [dict(record) for record in result]
-            self._query_cache.set(query, result_list, params, ttl)
-            return result_list
-
-    def invalidate_cache(self, query: str | None = None, params: dict[str, Any] | None = None) -> None:
-        """
-        Invalidate cached query results.
-
-        Args:
-            query: Specific query to invalidate (None = clear all)
-            params: Query parameters (only used if query is specified)
-        """
-        if self._query_cache is None:
-            return
-
-        if query is None:
-            self._query_cache.clear()
-        else:
-            self._query_cache.invalidate(query, params)
-
-    def get_cache_stats(self) -> dict[str, Any]:
-        """
-        Get query cache statistics.
-
-        Returns:
-            Dictionary with cache stats or empty dict if caching disabled
-        """
-        if self._query_cache is None:
-            return {
-                "enabled": False,
-                "message": "Query caching is disabled"
-            }
-
-        stats = self._query_cache.get_stats()
-        stats["enabled"] = True
-        return stats
+        result_list = self._fetch(query, params)
+        self._cache_result(query, params, ttl, tags, result_list)
+        return result_list
@@ -3,22 +3,142 @@ Query result caching for Neo4j queries.
 
 Provides a simple in-memory cache with TTL for frequently accessed query results
 to reduce database load and improve response times.
+
+Entries carry tags describing what they depend on, so writes only invalidate
+the entries they can affect instead of clearing the whole cache:
+
+- ``resource:<id>`` - the entry reads or returns the node with this ID
+- ``label:<Label>`` - the entry scans all nodes of a label
+- ``relationship:<TYPE>`` - the entry scans all relationships of a type
+  (``relationship:*`` for untyped relationship patterns)
+
+The part before the colon is the tag family; hit, miss, eviction and
+invalidation counters are kept per family.
 """
 
+import fnmatch
 import hashlib
 import json
+import logging
+import re
 import threading
 import time
 from collections import OrderedDict
+from collections.abc import Callable, Iterable
 from threading import Lock
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
+RESOURCE_TAG = "resource"
+LABEL_TAG = "label"
+RELATIONSHIP_TAG = "relationship"
+UNTAGGED = "untagged"
+
+# Relationship "type" of untyped patterns such as (a)-->(b), hit by any
+# relationship write
+ANY_RELATIONSHIP = "*"
+
+# Result IDs beyond this many are not tagged individually; the entry is
+# tagged with the labels it reads instead
+MAX_RESULT_TAGS = 500
+
+_NODE_LABELS = re.compile(r"\(\s*\w*\s*((?::\s*\w+\s*)+)")
+_RELATIONSHIP_TYPES = re.compile(r"\[\s*\w*\s*:\s*([\w|:\s]+?)\s*[\]{*]")
+_UNTYPED_RELATIONSHIP = re.compile(r"-\[\s*\w*\s*(?:\*[^\]]*)?\]-|\)\s*<?--\s*>?\s*\(")
+_LABEL_NAME = re.compile(r"\w+")
+
+
+def resource_tag(resource_id: str) -> str:
+    """Tag for entries depending on one node."""
+    return f"{RESOURCE_TAG}:{resource_id}"
+
+
+def label_tag(label: str) -> str:
+    """Tag for entries scanning all nodes of a label."""
+    return f"{LABEL_TAG}:{label}"
+
+
+def relationship_tag(relationship_type: str) -> str:
+    """Tag for entries scanning all relationships of a type."""
+    return f"{RELATIONSHIP_TAG}:{relationship_type}"
+
+
+def tag_family(tag: str) -> str:
+    """Family of a tag, e.g. ``resource`` for ``resource:vm-1``."""
+    return tag.split(":", 1)[0]
+
+
+def _param_ids(params: dict[str, Any] | None) -> set[str]:
+    """Resource IDs passed as query parameters (``id``, ``*_id`` and ``*_ids``)."""
+    ids: set[str] = set()
+    for name, value in (params or {}).items():
+        if name == "id" or name.endswith("_id"):
+            if isinstance(value, str):
+                ids.add(value)
+        elif name == "ids" or name.endswith("_ids"):
+            if isinstance(value, list | tuple | set):
+                ids.update(item for item in value if isinstance(item, str))
+    return ids
+
+
+def query_tags(query: str, params: dict[str, Any] | None = None) -> set[str]:
+    """
+    Derive invalidation tags for a read query.
+
+    A query depends on the nodes of its ID parameters and on the labels and
+    relationship types it mentions, so it is invalidated both by writes to
+    those nodes and by writes (such as relationship deletes) that are only
+    tagged by label or type.
+
+    Args:
+        query: Cypher query string
+        params: Query parameters
+
+    Returns:
+        Set of tags
+    """
+    tags = {resource_tag(resource_id) for resource_id in _param_ids(params)}
+    for match in _NODE_LABELS.finditer(query):
+        tags.update(label_tag(label) for label in _LABEL_NAME.findall(match.group(1)))
+    for match in _RELATIONSHIP_TYPES.finditer(query):
+        tags.update(relationship_tag(rel) for rel in _LABEL_NAME.findall(match.group(1)))
+    if _UNTYPED_RELATIONSHIP.search(query):
+        tags.add(relationship_tag(ANY_RELATIONSHIP))
+    return tags
+
+
+def result_tags(records: list[dict[str, Any]]) -> set[str] | None:
+    """
+    Derive resource tags from the node IDs in query results.
+
+    Looks at ``id``/``*_id`` values of each record and of nodes or maps
+    nested one level deep, so cached neighbourhoods are invalidated when any
+    node in them changes.
+
+    Args:
+        records: Result records as dictionaries
+
+    Returns:
+        Set of tags, or None if the result holds more than MAX_RESULT_TAGS IDs
+    """
+    ids: set[str] = set()
+    for record in records:
+        for value in [record, *(v for v in record.values() if isinstance(v, dict))]:
+            for key, item in value.items():
+                if (key == "id" or key.endswith("_id")) and isinstance(item, str):
+                    ids.add(item)
+        if len(ids) > MAX_RESULT_TAGS:
+            return None
+    return {resource_tag(resource_id) for resource_id in ids}
+
 
 class QueryCache:
     """
     Thread-safe LRU cache with TTL for Neo4j query results.
-    
+
     Stores query results in memory with automatic expiration and LRU eviction.
+    Entries are indexed by tag so they can be invalidated selectively.
     """
 
     def __init__(self, max_size: int = 1000, default_ttl: int = 300):
@@ -31,10 +151,47 @@ class QueryCache:
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self._cache: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._cache: OrderedDict[str, tuple[Any, float, frozenset[str]]] = OrderedDict()
+        self._tag_index: dict[str, set[str]] = {}
         self._lock = Lock()
         self._hits = 0
         self._misses = 0
+        self._family_stats: dict[str, dict[str, int]] = {}
+        self._listeners: list[Callable[[frozenset[str] | None], None]] = []
+
+    def add_invalidation_listener(
+        self, listener: Callable[[frozenset[str] | None], None]
+    ) -> None:
+        """
+        Register a callback for invalidations made through this cache.
+
+        The callback receives the invalidated tags, or None when the cache
+        was cleared. It may be called from any thread.
+
+        Args:
+            listener: Callback to register
+        """
+        self._listeners.append(listener)
+
+    def remove_invalidation_listener(
+        self, listener: Callable[[frozenset[str] | None], None]
+    ) -> None:
+        """
+        Unregister an invalidation callback.
+
+        Args:
+            listener: Callback to remove
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, tags: frozenset[str] | None) -> None:
+        """Call invalidation listeners, logging rather than raising failures."""
+        for listener in list(self._listeners):
+            try:
+                listener(tags)
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed: {e}")
 
     def _generate_key(self, query: str, params: dict[str, Any] | None = None) -> str:
         """
@@ -56,13 +213,40 @@ class QueryCache:
         combined = f"{query}:{params_str}"
         return hashlib.sha256(combined.encode()).hexdigest()
 
-    def get(self, query: str, params: dict[str, Any] | None = None) -> Any | None:
+    def _count(self, tags: Iterable[str], counter: str) -> None:
+        """Increment a counter once for each family in tags (lock must be held)."""
+        families = {tag_family(tag) for tag in tags} or {UNTAGGED}
+        for family in families:
+            stats = self._family_stats.setdefault(
+                family, {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+            )
+            stats[counter] += 1
+
+    def _remove(self, key: str, counter: str | None = None) -> None:
+        """Remove an entry and its tag index entries (lock must be held)."""
+        _, _, tags = self._cache.pop(key)
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        if counter:
+            self._count(tags, counter)
+
+    def get(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> Any | None:
         """
         Get cached result for a query.
 
         Args:
             query: Cypher query string
             params: Query parameters
+            tags: Tags the entry would have, used to attribute misses
 
         Returns:
             Cached result or None if not found or expired
@@ -71,23 +255,30 @@ class QueryCache:
 
         with self._lock:
             if key in self._cache:
-                result, expiry_time = self._cache[key]
-                
+                result, expiry_time, entry_tags = self._cache[key]
+
                 # Check if expired
                 if time.time() < expiry_time:
                     # Move to end (most recently used)
                     self._cache.move_to_end(key)
                     self._hits += 1
+                    self._count(entry_tags, "hits")
                     return result
                 else:
                     # Remove expired entry
-                    del self._cache[key]
+                    self._remove(key, "evictions")
 
             self._misses += 1
+            self._count(tags or (), "misses")
             return None
 
     def set(
-        self, query: str, result: Any, params: dict[str, Any] | None = None, ttl: int | None = None
+        self,
+        query: str,
+        result: Any,
+        params: dict[str, Any] | None = None,
+        ttl: int | None = None,
+        tags: Iterable[str] | None = None,
     ) -> None:
         """
         Cache a query result.
@@ -97,22 +288,26 @@ class QueryCache:
             result: Query result to cache
             params: Query parameters
             ttl: Time to live in seconds (uses default_ttl if None)
+            tags: Tags to invalidate the entry by
         """
         key = self._generate_key(query, params)
         ttl = ttl or self.default_ttl
         expiry_time = time.time() + ttl
+        entry_tags = frozenset(tags or ())
 
         with self._lock:
             # If key exists, update it
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
 
             # Add new entry
-            self._cache[key] = (result, expiry_time)
+            self._cache[key] = (result, expiry_time, entry_tags)
+            for tag in entry_tags:
+                self._tag_index.setdefault(tag, set()).add(key)
 
             # Evict oldest if over size limit
             while len(self._cache) > self.max_size:
-                self._cache.popitem(last=False)
+                self._remove(next(iter(self._cache)), "evictions")
 
     def invalidate(self, query: str, params: dict[str, Any] | None = None) -> None:
         """
@@ -126,39 +321,70 @@ class QueryCache:
 
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key, "invalidations")
+
+    def invalidate_tags(self, tags: Iterable[str], notify: bool = True) -> int:
+        """
+        Invalidate all entries carrying any of the given tags.
+
+        Args:
+            tags: Tags to invalidate
+            notify: Whether to tell invalidation listeners (False when
+                applying an invalidation received from another replica)
+
+        Returns:
+            Number of entries removed
+        """
+        tags = frozenset(tags)
+        with self._lock:
+            keys: set[str] = set()
+            for tag in tags:
+                keys.update(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key, "invalidations")
+        if notify and tags:
+            self._notify(tags)
+        return len(keys)
 
     def invalidate_pattern(self, pattern: str) -> int:
         """
-        Clear all cached entries.
-        
-        Note: Pattern matching not currently implemented - this clears the entire cache.
-        In a future version, this could filter based on query content.
+        Invalidate entries with a tag matching a glob pattern.
+
+        For example ``resource:aks-*`` drops every entry depending on a node
+        whose ID starts with ``aks-``, and ``label:*`` drops every label scan.
 
         Args:
-            pattern: String pattern (currently ignored)
+            pattern: Glob pattern matched against entry tags
 
         Returns:
-            Number of entries cleared
+            Number of entries removed
         """
         with self._lock:
-            count = len(self._cache)
-            self._cache.clear()
-        return count
+            matching = [tag for tag in self._tag_index if fnmatch.fnmatchcase(tag, pattern)]
+        return self.invalidate_tags(matching)
+
+    def clear(self, notify: bool = True) -> None:
+        """
+        Clear all cached entries.
 
-    def clear(self) -> None:
-        """Clear all cached entries."""
+        Args:
+            notify: Whether to tell invalidation listeners
+        """
         with self._lock:
             self._cache.clear()
+            self._tag_index.clear()
             self._hits = 0
             self._misses = 0
+            self._family_stats.clear()
+        if notify:
+            self._notify(None)
 
     def get_stats(self) -> dict[str, Any]:
         """
         Get cache statistics.
 
         Returns:
-            Dictionary with cache stats
+            Dictionary with cache stats, including counters per tag family
         """
         with self._lock:
             total_requests = self._hits + self._misses
@@ -167,11 +393,19 @@ class QueryCache:
             # Clean up expired entries first
             current_time = time.time()
             expired_keys = [
-                key for key, (_, expiry) in self._cache.items() 
+                key for key, (_, expiry, _) in self._cache.items()
                 if current_time >= expiry
             ]
             for key in expired_keys:
-                del self._cache[key]
+                self._remove(key, "evictions")
+
+            families = {}
+            for family, stats in sorted(self._family_stats.items()):
+                lookups = stats["hits"] + stats["misses"]
+                families[family] = {
+                    **stats,
+                    "hit_rate": round(stats["hits"] / lookups * 100, 2) if lookups else 0,
+                }
 
             return {
                 "size": len(self._cache),
@@ -180,6 +414,8 @@ class QueryCache:
                 "misses": self._misses,
                 "hit_rate": round(hit_rate, 2),
                 "default_ttl": self.default_ttl,
+                "tags": len(self._tag_index),
+                "families": families,
             }
 
 
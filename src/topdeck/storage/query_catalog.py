@@ -0,0 +1,292 @@
+"""
+Central catalog of Cypher queries.
+
+Queries used by the analysis layer are registered here under a stable name
+so they can be inspected as a whole: the plan test harness runs ``EXPLAIN``
+on every entry against a real Neo4j and fails if any plan falls back to an
+``AllNodesScan``.
+
+Queries are composed with :class:`QueryBuilder`, which always anchors node
+patterns on an indexed label. Every topology entity (resources, pods,
+namespaces, applications, deployments, identities, ...) carries the
+``:Node`` super-label next to its own label, with an index on ``:Node(id)``,
+so lookups by ID are index seeks even when the kind of node is not known.
+"""
+
+import re
+import textwrap
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+# Super-label shared by all topology entities, indexed on id
+NODE_LABEL = "Node"
+RESOURCE_LABEL = "Resource"
+
+# Labels that receive the :Node super-label
+TOPOLOGY_LABELS = (
+    "Resource",
+    "Application",
+    "Repository",
+    "Deployment",
+    "Namespace",
+    "Pod",
+    "ManagedIdentity",
+    "ServicePrincipal",
+    "AppRegistration",
+)
+
+# Relationship types that indicate a genuine dependency between resources
+DEPENDENCY_RELATIONSHIP_TYPES = (
+    "DEPENDS_ON",
+    "USES",
+    "CONNECTS_TO",
+    "ROUTES_TO",
+    "ACCESSES",
+    "AUTHENTICATES_WITH",
+    "READS_FROM",
+    "WRITES_TO",
+)
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_PARAMETER = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+
+
+def _identifier(value: str) -> str:
+    """Validate a label, relationship type or variable name."""
+    if not _IDENTIFIER.match(value):
+        raise ValueError(f"Invalid Cypher identifier: {value!r}")
+    return value
+
+
+class QueryBuilder:
+    """
+    Helpers for composing index-anchored Cypher fragments.
+    """
+
+    @staticmethod
+    def node(variable: str, label: str = NODE_LABEL, id_param: str | None = "id") -> str:
+        """
+        Build a node pattern anchored on a label, optionally looked up by ID.
+
+        Args:
+            variable: Pattern variable name
+            label: Label to anchor on (defaults to the :Node super-label)
+            id_param: Parameter holding the ID (None for no ID lookup)
+
+        Returns:
+            Pattern such as ``(r:Node {id: $id})``
+        """
+        pattern = f"{_identifier(variable)}:{_identifier(label)}"
+        if id_param is not None:
+            pattern += f" {{id: ${_identifier(id_param)}}}"
+        return f"({pattern})"
+
+    @staticmethod
+    def node_by(variable: str, id_expression: str, label: str = NODE_LABEL) -> str:
+        """
+        Build a node pattern looked up by an ID expression (e.g. an UNWIND variable).
+
+        Args:
+            variable: Pattern variable name
+            id_expression: Cypher expression for the ID, e.g. ``dep.source_id``
+            label: Label to anchor on
+
+        Returns:
+            Pattern such as ``(r:Node {id: dep_id})``
+        """
+        return f"({_identifier(variable)}:{_identifier(label)} {{id: {id_expression}}})"
+
+    @staticmethod
+    def primary_label(variable: str) -> str:
+        """
+        Expression for a node's own label, ignoring the :Node super-label.
+
+        ``labels(n)[0]`` is not stable once a node carries two labels, so
+        type fallbacks must skip the super-label explicitly.
+
+        Args:
+            variable: Pattern variable name
+
+        Returns:
+            Cypher expression yielding the first non-super label
+        """
+        variable = _identifier(variable)
+        return f"[label IN labels({variable}) WHERE label <> '{NODE_LABEL}'][0]"
+
+    @staticmethod
+    def node_type(variable: str) -> str:
+        """
+        Expression for a node's resource type, falling back to its own label.
+
+        Args:
+            variable: Pattern variable name
+
+        Returns:
+            Cypher ``COALESCE`` expression
+        """
+        primary = QueryBuilder.primary_label(variable)
+        return f"COALESCE({_identifier(variable)}.resource_type, {primary})"
+
+    @staticmethod
+    def relationship_types(types: Iterable[str]) -> str:
+        """
+        Join relationship types for use in a typed pattern like ``[rel:A|B]``.
+
+        Args:
+            types: Relationship type names
+
+        Returns:
+            Types joined with ``|``
+        """
+        joined = "|".join(_identifier(t) for t in types)
+        if not joined:
+            raise ValueError("At least one relationship type is required")
+        return joined
+
+
+@dataclass(frozen=True)
+class CatalogQuery:
+    """
+    A registered query.
+
+    Attributes:
+        name: Unique dotted name, e.g. ``dependency.upstream_count``
+        cypher: Query text
+        parameters: Parameter names referenced by the query
+    """
+
+    name: str
+    cypher: str
+    parameters: frozenset[str] = field(default_factory=frozenset)
+
+
+class QueryCatalog:
+    """
+    Registry of named Cypher queries.
+    """
+
+    def __init__(self):
+        """Initialize an empty catalog."""
+        self._queries: dict[str, CatalogQuery] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, cypher: str) -> str:
+        """
+        Register a query and return its text.
+
+        Args:
+            name: Unique dotted name
+            cypher: Query text (indentation is normalised)
+
+        Returns:
+            The normalised query text, ready to pass to ``session.run``
+
+        Raises:
+            ValueError: If a different query is already registered under the name
+        """
+        text = textwrap.dedent(cypher).strip()
+        entry = CatalogQuery(
+            name=name, cypher=text, parameters=frozenset(_PARAMETER.findall(text))
+        )
+        with self._lock:
+            existing = self._queries.get(name)
+            if existing is not None and existing.cypher != text:
+                raise ValueError(f"Query '{name}' is already registered with different text")
+            self._queries[name] = entry
+        return text
+
+    def get(self, name: str) -> str:
+        """
+        Get the text of a registered query.
+
+        Args:
+            name: Query name
+
+        Returns:
+            Query text
+
+        Raises:
+            KeyError: If no query is registered under the name
+        """
+        return self._queries[name].cypher
+
+    def __iter__(self) -> Iterator[CatalogQuery]:
+        return iter(list(self._queries.values()))
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._queries
+
+    def example_parameters(self, name: str) -> dict[str, Any]:
+        """
+        Build placeholder parameters for planning a query with EXPLAIN.
+
+        Args:
+            name: Query name
+
+        Returns:
+            Mapping of every referenced parameter to a placeholder value
+        """
+        placeholders: dict[str, Any] = {}
+        for parameter in self._queries[name].parameters:
+            if parameter.endswith(("_ids", "_types", "resources", "dependencies", "rows")):
+                placeholders[parameter] = []
+            elif parameter.startswith(("max_", "min_", "limit", "offset", "depth")):
+                placeholders[parameter] = 1
+            else:
+                placeholders[parameter] = "placeholder"
+        return placeholders
+
+
+# Global catalog instance
+_query_catalog = QueryCatalog()
+
+
+def get_query_catalog() -> QueryCatalog:
+    """
+    Get the global query catalog.
+
+    Returns:
+        QueryCatalog shared by all modules
+    """
+    return _query_catalog
+
+
+def register_query(name: str, cypher: str) -> str:
+    """
+    Register a query in the global catalog.
+
+    Args:
+        name: Unique dotted name
+        cypher: Query text
+
+    Returns:
+        The normalised query text
+    """
+    return _query_catalog.register(name, cypher)
+
+
+def catalogued_modules() -> tuple[str, ...]:
+    """
+    Modules that register queries at import time.
+
+    Importing these populates the catalog; the plan test harness uses this
+    list so new analyzers only need to be added here.
+
+    Returns:
+        Dotted module names
+    """
+    return (
+        "topdeck.analysis.graph_snapshot",
+        "topdeck.analysis.risk.analyzer",
+        "topdeck.analysis.risk.batch",
+        "topdeck.analysis.risk.dependency",
+        "topdeck.analysis.risk.enhanced_impact",
+        "topdeck.monitoring.live_diagnostics",
+        "topdeck.storage.batch_writer",
+        "topdeck.storage.neo4j_client",
+    )
@@ -0,0 +1,387 @@
+"""
+Two-tier query result cache shared by all API replicas.
+
+Results of expensive reads (topology graphs, risk assessments) are kept in
+the in-process :class:`~topdeck.storage.query_cache.QueryCache` (L1) and in
+Redis through :class:`~topdeck.common.cache.Cache` (L2), so one replica's
+result serves the others.
+
+Recomputation is kept to one caller at a time:
+
+- Concurrent misses for a key within a replica share one computation
+  (single-flight) that runs in its own task, so cancelling the caller that
+  started it does not cancel the others, and a short Redis lock makes the other replicas wait for
+  the L2 result instead of computing it again.
+- Entries are refreshed early with a probability that grows as they approach
+  expiry, scaled by how long they took to compute ("XFetch"), so replicas do
+  not all recompute when a TTL runs out. The stale value is served while the
+  refresh runs.
+
+Invalidations of the L1 cache (e.g. by Neo4jClient writes) delete the tagged
+L2 entries and are broadcast over Redis pub/sub so every replica drops its
+L1 entries too.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+import random
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from topdeck.common.cache import Cache, deserialize
+from topdeck.storage.query_cache import QueryCache, get_query_cache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "query-cache:invalidate"
+KEY_PREFIX = "query:"
+DEFAULT_EARLY_REFRESH_BETA = 1.0
+DEFAULT_LOCK_TIMEOUT = 5.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+class TieredQueryCache:
+    """
+    L1 (in-process) + L2 (Redis) cache with stampede protection.
+    """
+
+    def __init__(
+        self,
+        l1: QueryCache | None = None,
+        l2: Cache | None = None,
+        default_ttl: int = 300,
+        early_refresh_beta: float = DEFAULT_EARLY_REFRESH_BETA,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+    ):
+        """
+        Initialize tiered cache.
+
+        Args:
+            l1: In-process cache (defaults to the global query cache)
+            l2: Connected Redis cache (None for L1 only)
+            default_ttl: Default TTL in seconds
+            early_refresh_beta: Early refresh aggressiveness (0 disables it,
+                values above 1 refresh earlier)
+            lock_timeout: Seconds to wait for another replica computing the
+                same key before computing it here
+        """
+        self.l1 = l1 or get_query_cache()
+        self.l2 = l2
+        self.default_ttl = default_ttl
+        self.early_refresh_beta = early_refresh_beta
+        self.lock_timeout = lock_timeout
+        self.instance_id = uuid.uuid4().hex
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener_task: asyncio.Task | None = None
+        self._pubsub: Any | None = None
+        self._stats = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "computed": 0,
+            "coalesced": 0,
+            "early_refreshes": 0,
+            "remote_invalidations": 0,
+        }
+
+    async def start(self) -> None:
+        """Start broadcasting local invalidations and applying remote ones."""
+        self._loop = asyncio.get_running_loop()
+        self.l1.add_invalidation_listener(self._on_local_invalidation)
+        if self.l2 is not None:
+            self._pubsub = await self.l2.subscribe(INVALIDATION_CHANNEL)
+            if self._pubsub is not None:
+                self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop invalidation broadcasting and listening."""
+        self.l1.remove_invalidation_listener(self._on_local_invalidation)
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        if self._pubsub is not None:
+            await self._pubsub.close()
+            self._pubsub = None
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: int | None = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Get a cached value, computing and caching it on a miss.
+
+        Args:
+            key: Cache key, e.g. ``topology:azure::eastus``
+            compute: Function producing the value; coroutine functions are
+                awaited, plain functions run in a worker thread. Values that
+                are not serializable (lists, dicts and scalars) are only
+                cached in L1.
+            ttl: Time to live in seconds (uses default_ttl if None)
+            tags: Invalidation tags (see topdeck.storage.query_cache)
+
+        Returns:
+            The cached or computed value
+        """
+        key = KEY_PREFIX + key
+        ttl = ttl or self.default_ttl
+        tags = frozenset(tags)
+
+        envelope = self.l1.get(key, None, tags)
+        if envelope is not None:
+            self._stats["l1_hits"] += 1
+        elif self.l2 is not None:
+            envelope = await self.l2.get(key)
+            if envelope is not None:
+                self._stats["l2_hits"] += 1
+                self._store_l1(key, envelope, tags)
+
+        if envelope is not None:
+            if key in self._inflight or not self._should_refresh(envelope):
+                return envelope["value"]
+            self._stats["early_refreshes"] += 1
+
+        return await self._compute_once(key, compute, ttl, tags, envelope)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Invalidate tagged entries in this and every other replica.
+
+        Args:
+            tags: Tags to invalidate
+
+        Returns:
+            Number of L1 entries removed in this replica
+        """
+        tags = frozenset(tags)
+        removed = self.l1.invalidate_tags(tags, notify=False)
+        await self._broadcast(tags)
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get tiered cache statistics.
+
+        Returns:
+            Dictionary with hit counters per tier and stampede protection counters
+        """
+        return {
+            **self._stats,
+            "l2_enabled": self.l2 is not None,
+            "inflight": len(self._inflight),
+            "l1": self.l1.get_stats(),
+        }
+
+    def _should_refresh(self, envelope: dict[str, Any]) -> bool:
+        """Decide on probabilistic early refresh (XFetch)."""
+        if self.early_refresh_beta <= 0:
+            return False
+        # -log(u) for u in (0, 1] is exponentially distributed with mean 1
+        jitter = -math.log(1.0 - random.random())
+        return time.time() + envelope["delta"] * self.early_refresh_beta * jitter >= (
+            envelope["expires_at"]
+        )
+
+    def _store_l1(self, key: str, envelope: dict[str, Any], tags: frozenset[str]) -> None:
+        """Store an envelope in L1 for the rest of its lifetime."""
+        remaining = envelope["expires_at"] - time.time()
+        if remaining > 0:
+            self.l1.set(key, envelope, None, max(1, math.ceil(remaining)), tags)
+
+    async def _compute_once(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: int,
+        tags: frozenset[str],
+        stale: dict[str, Any] | None,
+    ) -> Any:
+        """
+        Compute a value, sharing one computation between concurrent callers.
+
+        The computation runs in a task of its own that every caller awaits
+        through a shield, so a cancelled caller stops waiting without
+        cancelling the computation for the others.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            task = asyncio.create_task(self._compute_shared(key, compute, ttl, tags, stale))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished computation."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _compute_shared(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: int,
+        tags: frozenset[str],
+        stale: dict[str, Any] | None,
+    ) -> Any:
+        """Compute a value unless another replica is already computing it."""
+        lock_key = f"{key}:lock"
+        locked = False
+        if self.l2 is not None:
+            locked = await self.l2.set_if_absent(
+                lock_key, self.instance_id, ttl=max(1, math.ceil(self.lock_timeout))
+            )
+            if not locked:
+                if stale is not None:
+                    return stale["value"]
+                envelope = await self._wait_for_l2(key)
+                if envelope is not None:
+                    self._store_l1(key, envelope, tags)
+                    return envelope["value"]
+
+        try:
+            started = time.monotonic()
+            if inspect.iscoroutinefunction(compute):
+                value = await compute()
+            else:
+                value = await asyncio.to_thread(compute)
+            self._stats["computed"] += 1
+
+            envelope = {
+                "value": value,
+                "delta": time.monotonic() - started,
+                "expires_at": time.time() + ttl,
+            }
+            self._store_l1(key, envelope, tags)
+            # Values that cannot be serialized are not stored in L2
+            if self.l2 is not None and await self.l2.set(key, envelope, ttl=ttl):
+                await self.l2.tag_key(key, tags, ttl=ttl)
+            return value
+        finally:
+            if locked:
+                await self.l2.delete(lock_key)
+
+    async def _wait_for_l2(self, key: str) -> dict[str, Any] | None:
+        """Poll L2 for a value another replica is computing."""
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            envelope = await self.l2.get(key)
+            if envelope is not None:
+                return envelope
+        return None
+
+    def _on_local_invalidation(self, tags: frozenset[str] | None) -> None:
+        """Forward an L1 invalidation to Redis; may be called from any thread."""
+        if self.l2 is None or self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._loop.create_task(self._broadcast(tags))
+        else:
+            asyncio.run_coroutine_threadsafe(self._broadcast(tags), self._loop)
+
+    async def _broadcast(self, tags: frozenset[str] | None) -> None:
+        """Delete invalidated L2 entries and tell the other replicas."""
+        if self.l2 is None:
+            return
+        if tags is None:
+            await self.l2.clear_pattern(f"{KEY_PREFIX}*")
+        else:
+            await self.l2.delete_tagged(tags)
+        await self.l2.publish(
+            INVALIDATION_CHANNEL,
+            {"origin": self.instance_id, "tags": sorted(tags) if tags is not None else None},
+        )
+
+    async def _listen(self) -> None:
+        """Apply invalidations broadcast by other replicas."""
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    self._apply_remote(deserialize(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error, resubscribing: {e}")
+                await asyncio.sleep(1)
+
+    def _apply_remote(self, payload: dict[str, Any]) -> None:
+        """Apply one invalidation message from another replica."""
+        if payload.get("origin") == self.instance_id:
+            return
+        self._stats["remote_invalidations"] += 1
+        tags = payload.get("tags")
+        if tags is None:
+            self.l1.clear(notify=False)
+        else:
+            self.l1.invalidate_tags(tags, notify=False)
+
+
+# Global tiered cache instance (set up by the API lifespan)
+_tiered_cache: TieredQueryCache | None = None
+
+
+def get_tiered_cache() -> TieredQueryCache | None:
+    """
+    Get the global tiered cache.
+
+    Returns:
+        TieredQueryCache, or None if it has not been initialized
+    """
+    return _tiered_cache
+
+
+def set_tiered_cache(cache: TieredQueryCache | None) -> None:
+    """
+    Set (or clear) the global tiered cache.
+
+    Args:
+        cache: Tiered cache to use, or None
+    """
+    global _tiered_cache
+    _tiered_cache = cache
+
+
+async def cached_result(
+    key: str,
+    compute: Callable[[], Any],
+    ttl: int | None = None,
+    tags: Iterable[str] = (),
+) -> Any:
+    """
+    Get a value through the global tiered cache, or compute it if there is none.
+
+    Args:
+        key: Cache key
+        compute: Function producing the value (see TieredQueryCache.get_or_compute)
+        ttl: Time to live in seconds
+        tags: Invalidation tags
+
+    Returns:
+        The cached or computed value
+    """
+    cache = get_tiered_cache()
+    if cache is None:
+        value = compute()
+        return await value if inspect.isawaitable(value) else value
+    return await cache.get_or_compute(key, compute, ttl=ttl, tags=tags)
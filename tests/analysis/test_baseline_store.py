@@ -0,0 +1,156 @@
+"""Tests for the rolling baseline aggregate store."""
+
+import random
+import statistics
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from topdeck.analysis.baseline import BaselineAnalyzer, MetricType
+from topdeck.analysis.baseline_store import (
+    BaselineStore,
+    MetricBaselineState,
+    QuantileSketch,
+    RunningStats,
+)
+from topdeck.common.cache import deserialize, serialize
+from topdeck.monitoring.collectors.range_fetch import decode_series
+
+
+class FakeCache:
+    """In-memory stand-in for topdeck.common.cache.Cache."""
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+
+    async def get(self, key):
+        data = self.values.get(key)
+        return deserialize(data) if data is not None else None
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = serialize(value)
+        return True
+
+    async def delete(self, key):
+        return self.values.pop(key, None) is not None
+
+
+def test_running_stats_merge_matches_full_computation():
+    """Test merged Welford statistics equal those of all values at once."""
+    rng = random.Random(7)
+    values = [rng.gauss(100, 15) for _ in range(1000)]
+
+    first, second = RunningStats(), RunningStats()
+    for value in values[:300]:
+        first.add(value)
+    for value in values[300:]:
+        second.add(value)
+    first.merge(second)
+
+    assert first.count == 1000
+    assert first.mean == pytest.approx(statistics.mean(values))
+    assert first.std_dev == pytest.approx(statistics.stdev(values))
+    assert (first.min_value, first.max_value) == (min(values), max(values))
+
+
+def test_quantile_sketch_relative_accuracy():
+    """Test sketch quantiles stay within the relative accuracy, also after merging."""
+    rng = random.Random(11)
+    values = [rng.lognormvariate(3, 1) for _ in range(5000)] + [0.0, -2.5]
+
+    sketch, other = QuantileSketch(0.01), QuantileSketch(0.01)
+    for value in values[:2500]:
+        sketch.add(value)
+    for value in values[2500:]:
+        other.add(value)
+    sketch.merge(QuantileSketch.from_dict(deserialize(serialize(other.to_dict()))))
+
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+    assert sketch.quantile(0.0) == pytest.approx(-2.5, rel=0.011)
+
+
+def test_state_skips_seen_samples_and_expires_buckets():
+    """Test overlapping windows are not double counted and old buckets expire."""
+    state = MetricBaselineState("svc", "cpu_usage", bucket_seconds=100)
+
+    assert state.add_samples([(50, 1.0), (150, 2.0)]) == 2
+    assert state.add_samples([(150, 2.0), (250, 3.0)]) == 1
+    assert state.last_timestamp == 250
+    assert state.summary().stats.count == 3
+
+    assert state.expire(before=200) == 2
+    assert state.summary().stats.mean == 3.0
+
+
+async def test_store_persists_state_in_cache():
+    """Test a state saved by one store is loaded by another sharing the cache."""
+    cache = FakeCache()
+    state = await BaselineStore(cache=cache).load("svc", "cpu_usage")
+    state.add_samples([(1000.0, 4.0), (1300.0, 6.0)])
+    await BaselineStore(cache=cache).save(state)
+
+    loaded = await BaselineStore(cache=cache).load("svc", "cpu_usage")
+
+    assert loaded.last_timestamp == 1300.0
+    assert loaded.summary().stats.mean == 5.0
+    assert loaded.summary().sketch.count == 2
+
+
+async def test_analyzer_fetches_only_new_samples():
+    """Test recalculating a baseline only queries samples after the last update."""
+    now = float(int(datetime.now(UTC).timestamp()))
+    first_window = [[now - 600 + i * 300, str(10.0 * i)] for i in range(3)]
+    prometheus = AsyncMock()
+    prometheus.fetch_range = AsyncMock(return_value=decode_series([{"values": first_window}]))
+    neo4j = AsyncMock()
+    neo4j.execute_query = AsyncMock(return_value=[])
+    cache = FakeCache()
+    analyzer = BaselineAnalyzer(
+        prometheus_collector=prometheus,
+        neo4j_client=neo4j,
+        baseline_store=BaselineStore(cache=cache),
+    )
+
+    baseline = await analyzer.calculate_baseline("svc", metrics=[MetricType.CPU_USAGE])
+    metric = baseline.metrics["cpu_usage"]
+    assert (metric.sample_count, metric.mean, metric.max_value) == (3, 10.0, 20.0)
+
+    # A fresh analyzer resumes from the persisted aggregates
+    prometheus.fetch_range = AsyncMock(
+        return_value=decode_series([{"values": [first_window[-1], [now + 300, "30.0"]]}])
+    )
+    restarted = BaselineAnalyzer(
+        prometheus_collector=prometheus,
+        neo4j_client=neo4j,
+        baseline_store=BaselineStore(cache=cache),
+    )
+    baseline = await restarted.calculate_baseline("svc", metrics=[MetricType.CPU_USAGE])
+
+    start = prometheus.fetch_range.await_args.kwargs["start"]
+    assert start == datetime.fromtimestamp(now, UTC)
+    metric = baseline.metrics["cpu_usage"]
+    assert (metric.sample_count, metric.mean, metric.max_value) == (4, 15.0, 30.0)
+
+
+async def test_analyzer_serves_stored_baseline_when_prometheus_fails():
+    """Test a failing fetch falls back to the stored aggregates."""
+    now = datetime.now(UTC).timestamp()
+    prometheus = AsyncMock()
+    prometheus.fetch_range = AsyncMock(return_value=decode_series([{"values": [[now - 60, "5.0"]]}]))
+    neo4j = AsyncMock()
+    neo4j.execute_query = AsyncMock(return_value=[])
+    analyzer = BaselineAnalyzer(prometheus_collector=prometheus, neo4j_client=neo4j)
+    await analyzer.calculate_baseline("svc", metrics=[MetricType.CPU_USAGE])
+
+    prometheus.fetch_range = AsyncMock(side_effect=ConnectionError("down"))
+    with patch("topdeck.analysis.baseline.logger"):
+        baseline = await analyzer.calculate_baseline(
+            "svc", metrics=[MetricType.CPU_USAGE], force_recalculate=True
+        )
+
+    assert baseline.metrics["cpu_usage"].sample_count == 1
+    assert baseline.metrics["cpu_usage"].mean == 5.0
@@ -0,0 +1,220 @@
+"""Tests for the in-memory graph snapshot."""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from topdeck.analysis.graph_snapshot import (
+    GraphSnapshot,
+    GraphSnapshotStore,
+)
+from topdeck.analysis.risk.dependency import DependencyAnalyzer
+from topdeck.analysis.topology import TopologyService
+
+
+def _node(node_id, resource_type="web_app", is_resource=True, **props):
+    return {
+        "id": node_id,
+        "name": node_id.upper(),
+        "resource_type": resource_type,
+        "cloud_provider": "azure",
+        "is_resource": is_resource,
+        "properties": {"id": node_id, "region": "eastus", **props},
+    }
+
+
+@pytest.fixture
+def snapshot():
+    """
+    Build a small graph:
+
+        web -> api -> db
+        worker -> api
+        api -> cache (USES)
+        db -> backup (REDUNDANT_WITH)
+        pod -> api (pod is not a :Resource)
+    """
+    nodes = [
+        _node("web"),
+        _node("api", "api_gateway"),
+        _node("db", "database"),
+        _node("worker", "function_app"),
+        _node("cache", "cache"),
+        _node("backup", "database"),
+        _node("pod", "Pod", is_resource=False),
+    ]
+    edges = [
+        ("web", "api", "DEPENDS_ON"),
+        ("api", "db", "DEPENDS_ON"),
+        ("worker", "api", "DEPENDS_ON"),
+        ("api", "cache", "USES"),
+        ("db", "backup", "REDUNDANT_WITH"),
+        ("pod", "api", "CONNECTS_TO"),
+        ("ghost", "api", "DEPENDS_ON"),  # unknown endpoint, must be skipped
+    ]
+    return GraphSnapshot(nodes, edges)
+
+
+def test_snapshot_counts(snapshot):
+    """Test node and edge counts skip dangling edges."""
+    assert snapshot.node_count == 7
+    assert snapshot.edge_count == 6
+    assert "api" in snapshot
+    assert "ghost" not in snapshot
+
+
+def test_neighbors_by_direction_and_type(snapshot):
+    """Test neighbour lookups respect direction and relationship filters."""
+    assert sorted(snapshot.neighbors("api", "out")) == [("cache", "USES"), ("db", "DEPENDS_ON")]
+    assert sorted(n for n, _ in snapshot.neighbors("api", "in")) == ["pod", "web", "worker"]
+    assert snapshot.neighbors("api", "in", ["USES"]) == []
+    assert snapshot.neighbors("missing") == []
+
+
+def test_dependency_counts(snapshot):
+    """Test upstream/downstream counts over dependency relationship types."""
+    assert snapshot.dependency_counts("api") == (2, 3)
+    assert snapshot.dependency_counts("db") == (0, 1)
+
+
+def test_traverse_returns_shortest_distances(snapshot):
+    """Test BFS distances and depth limits."""
+    assert snapshot.traverse("db", "in") == {"api": 1, "web": 2, "worker": 2, "pod": 2}
+    assert snapshot.traverse("db", "in", max_depth=1) == {"api": 1}
+    assert snapshot.traverse("web", "out", relationship_types=["DEPENDS_ON"]) == {
+        "api": 1,
+        "db": 2,
+    }
+
+
+def test_traverse_nodes_resources_only(snapshot):
+    """Test filtering traversal results to :Resource nodes."""
+    reached = snapshot.traverse_nodes("api", "in", resources_only=True)
+    assert sorted(node["id"] for node, _ in reached) == ["web", "worker"]
+
+
+def test_deepest_path(snapshot):
+    """Test the critical path follows dependents to the furthest node."""
+    path = snapshot.deepest_path("db", "in")
+    assert path[0] == "db"
+    assert path[1] == "api"
+    assert len(path) == 3
+    assert snapshot.deepest_path("web", "in") == ["web"]
+
+
+def test_tree_edges_keep_original_direction(snapshot):
+    """Test dependency tree edges are reported source -> target."""
+    edges = snapshot.tree_edges("db", "in", max_depth=2)
+    assert set(edges) == {("api", "db"), ("web", "api"), ("worker", "api"), ("pod", "api")}
+    assert snapshot.tree_edges("db", "in", max_depth=1) == [("api", "db")]
+
+
+def test_cycles_terminate():
+    """Test traversal on cyclic graphs terminates."""
+    cyclic = GraphSnapshot(
+        [_node("a"), _node("b")], [("a", "b", "DEPENDS_ON"), ("b", "a", "DEPENDS_ON")]
+    )
+    assert cyclic.traverse("a", "out") == {"b": 1}
+    assert cyclic.max_depth("a", "out") == 1
+
+
+def test_from_neo4j_uses_two_queries():
+    """Test snapshot load issues one node query and one edge query."""
+    client = Mock()
+    client.session = MagicMock()
+    session = MagicMock()
+    client.session.return_value.__enter__.return_value = session
+    session.run.side_effect = [
+        [
+            {
+                "id": "a",
+                "name": "A",
+                "resource_type": "web_app",
+                "cloud_provider": "azure",
+                "is_resource": True,
+                "properties": {"id": "a"},
+            },
+            {
+                "id": "b",
+                "name": "B",
+                "resource_type": "database",
+                "cloud_provider": "azure",
+                "is_resource": True,
+                "properties": {"id": "b"},
+            },
+        ],
+        [{"source_id": "a", "target_id": "b", "relationship_type": "DEPENDS_ON"}],
+    ]
+
+    loaded = GraphSnapshot.from_neo4j(client)
+
+    assert session.run.call_count == 2
+    assert loaded.node_count == 2
+    assert loaded.neighbors("a") == [("b", "DEPENDS_ON")]
+
+
+def test_store_refresh_swaps_snapshot(monkeypatch, snapshot):
+    """Test the store replaces the snapshot only once fully built."""
+    store = GraphSnapshotStore()
+    assert store.get() is None
+
+    monkeypatch.setattr(GraphSnapshot, "from_neo4j", classmethod(lambda cls, client: snapshot))
+    assert store.refresh(Mock()) is snapshot
+    assert store.get() is snapshot
+
+    store.clear()
+    assert store.get() is None
+
+
+def test_dependency_analyzer_uses_snapshot(snapshot):
+    """Test DependencyAnalyzer answers from the snapshot without Neo4j."""
+    client = Mock()
+    client.session = MagicMock(side_effect=AssertionError("Neo4j should not be queried"))
+    analyzer = DependencyAnalyzer(client, graph_snapshot=snapshot)
+
+    assert analyzer.get_dependency_counts("api") == (2, 3)
+    assert analyzer.is_single_point_of_failure("api") is True
+    assert analyzer.is_single_point_of_failure("db") is False
+
+    direct, indirect = analyzer.get_affected_resources("db")
+    assert [r["id"] for r in direct] == ["api"]
+    assert sorted(r["id"] for r in indirect) == ["web", "worker"]
+    assert all(r["distance"] == 2 for r in indirect)
+
+    assert analyzer.find_critical_path("db")[:2] == ["db", "api"]
+    assert analyzer.get_all_dependency_types("api")["CONNECTS_TO"][0]["id"] == "pod"
+    assert analyzer._calculate_max_dependency_depth("web") == 2
+
+
+def test_dependency_analyzer_falls_back_for_unknown_resource(snapshot):
+    """Test resources missing from the snapshot are looked up in Neo4j."""
+    client = Mock()
+    client.session = MagicMock()
+    session = MagicMock()
+    result = MagicMock()
+    result.single.return_value = {"count": 4}
+    session.run.return_value = result
+    client.session.return_value.__enter__.return_value = session
+    analyzer = DependencyAnalyzer(client, graph_snapshot=snapshot)
+
+    assert analyzer.get_dependency_counts("new-resource") == (4, 4)
+    assert session.run.call_count == 2
+
+
+def test_topology_dependencies_from_snapshot(snapshot):
+    """Test TopologyService traverses the snapshot and only queries attachments."""
+    client = Mock()
+    client.session = MagicMock()
+    session = MagicMock()
+    session.run.return_value = []
+    client.session.return_value.__enter__.return_value = session
+    service = TopologyService(client, graph_snapshot=snapshot)
+
+    deps = service.get_resource_dependencies("api", depth=3, direction="both")
+
+    assert deps.resource_name == "API"
+    assert sorted(n.id for n in deps.upstream) == ["backup", "cache", "db"]
+    assert sorted(n.id for n in deps.downstream) == ["web", "worker"]
+    assert deps.upstream[0].region == "eastus"
+    # Only the two single-hop attachment queries hit Neo4j
+    assert session.run.call_count == 2
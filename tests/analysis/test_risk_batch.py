@@ -0,0 +1,184 @@
+"""Tests for the batch risk engine."""
+
+from unittest.mock import MagicMock, Mock
+
+import numpy as np
+import pytest
+
+from topdeck.analysis.graph_snapshot import GraphSnapshot
+from topdeck.analysis.risk import BatchRiskEngine, RiskAnalyzer, RiskScorer
+
+RESOURCES = [
+    {"id": "web", "name": "Web", "resource_type": "web_app", "cloud_provider": "azure"},
+    {"id": "api", "name": "API", "resource_type": "api_gateway", "cloud_provider": "azure"},
+    {"id": "db", "name": "DB", "resource_type": "database", "cloud_provider": "azure"},
+    {"id": "backup", "name": "Backup", "resource_type": "database", "cloud_provider": "azure"},
+    {"id": "cache", "name": "Cache", "resource_type": "redis_cache", "cloud_provider": "azure"},
+]
+
+EDGES = [
+    ("web", "api", "DEPENDS_ON"),
+    ("api", "db", "DEPENDS_ON"),
+    ("api", "cache", "USES"),
+    ("db", "backup", "REDUNDANT_WITH"),
+    ("web", "cache", "DEPENDS_ON"),
+]
+
+
+def _resource_records():
+    return [
+        {"id": r["id"], "resource_type": r["resource_type"], "properties": dict(r)}
+        for r in RESOURCES
+    ]
+
+
+def _edge_records():
+    types = {r["id"]: r["resource_type"] for r in RESOURCES}
+    return [
+        {
+            "source_id": source,
+            "source_type": types[source],
+            "target_id": target,
+            "target_type": types[target],
+            "relationship_type": rel_type,
+        }
+        for source, target, rel_type in EDGES
+    ]
+
+
+@pytest.fixture
+def snapshot():
+    nodes = [{**r, "properties": dict(r)} for r in RESOURCES]
+    return GraphSnapshot(nodes, EDGES)
+
+
+@pytest.fixture
+def mock_client():
+    client = Mock()
+    client.session = MagicMock()
+    session = MagicMock()
+    client.session.return_value.__enter__.return_value = session
+    return client, session
+
+
+def test_vectorized_scores_match_scalar():
+    """Test calculate_risk_scores matches calculate_risk_score element-wise."""
+    scorer = RiskScorer()
+    cases = [
+        ("database", True, 12, False),
+        ("web_app", False, 0, False),
+        ("api_gateway", True, 3, True),
+        ("unknown_type", False, 60, False),
+    ]
+
+    expected = [
+        scorer.calculate_risk_score(
+            dependency_count=0,
+            dependents_count=dependents,
+            resource_type=resource_type,
+            is_single_point_of_failure=spof,
+            has_redundancy=redundancy,
+        )
+        for resource_type, spof, dependents, redundancy in cases
+    ]
+    scores = scorer.calculate_risk_scores(
+        dependents_counts=np.array([c[2] for c in cases]),
+        criticality_scores=np.array(
+            [scorer._calculate_criticality(t, s, d, r) for t, s, d, r in cases]
+        ),
+        has_redundancy=np.array([c[3] for c in cases]),
+    )
+
+    np.testing.assert_allclose(scores, expected)
+
+
+def test_batch_matches_per_resource_analysis(mock_client, snapshot):
+    """Test batch assessments equal RiskAnalyzer.analyze_resource output."""
+    client, session = mock_client
+    session.run.return_value = _resource_records()
+    engine = BatchRiskEngine(client, graph_snapshot=snapshot)
+
+    batch = {a.resource_id: a for a in engine.assess_all()}
+
+    analyzer = RiskAnalyzer(client, graph_snapshot=snapshot)
+    details = {r["id"]: {**r, "region": "unknown"} for r in RESOURCES}
+    analyzer._get_resource_details = details.get
+
+    assert set(batch) == set(details)
+    for resource_id in details:
+        expected = analyzer.analyze_resource(resource_id)
+        actual = batch[resource_id]
+        assert actual.risk_score == pytest.approx(expected.risk_score)
+        assert actual.risk_level == expected.risk_level
+        assert actual.criticality_score == expected.criticality_score
+        assert actual.blast_radius == expected.blast_radius
+        assert actual.single_point_of_failure == expected.single_point_of_failure
+        assert actual.factors == expected.factors
+        assert actual.recommendations == expected.recommendations
+        assert actual.misconfiguration_count == expected.misconfiguration_count
+
+
+def test_batch_uses_two_queries_without_snapshot(mock_client, snapshot):
+    """Test relationships are loaded in one query when no snapshot is available."""
+    client, session = mock_client
+    session.run.side_effect = [_resource_records(), _edge_records()]
+    engine = BatchRiskEngine(client)
+
+    assessments = engine.assess_all()
+
+    assert session.run.call_count == 2
+    by_id = {a.resource_id: a for a in assessments}
+    assert by_id["api"].dependencies_count == 2
+    assert by_id["api"].dependents_count == 1
+    assert by_id["db"].single_point_of_failure is False
+    assert by_id["db"].blast_radius == 2
+    assert by_id["cache"].single_point_of_failure is True
+
+
+def test_batch_loads_relationships_when_snapshot_is_stale(mock_client, snapshot):
+    """Test resources missing from the snapshot trigger a relationship query."""
+    client, session = mock_client
+    records = _resource_records() + [
+        {"id": "new", "resource_type": "vm", "properties": {"id": "new", "name": "New"}}
+    ]
+    session.run.side_effect = [records, _edge_records()]
+    engine = BatchRiskEngine(client, graph_snapshot=snapshot)
+
+    assessments = engine.assess_all()
+
+    assert session.run.call_count == 2
+    assert len(assessments) == 6
+
+
+def test_batch_filters_and_ordering(mock_client, snapshot):
+    """Test results are sorted by score and filtered by level/score."""
+    client, session = mock_client
+    session.run.return_value = _resource_records()
+    engine = BatchRiskEngine(client, graph_snapshot=snapshot)
+
+    assessments = engine.assess_all()
+    scores = [a.risk_score for a in assessments]
+    assert scores == sorted(scores, reverse=True)
+
+    threshold = scores[1]
+    assert all(a.risk_score >= threshold for a in engine.assess_all(min_score=threshold))
+
+    level = assessments[0].risk_level
+    filtered = engine.assess_all(risk_level=level)
+    assert filtered and all(a.risk_level == level for a in filtered)
+
+    _, kwargs = session.run.call_args
+    assert kwargs == {"cloud_provider": None, "resource_type": None}
+
+
+def test_batch_passes_filters_to_query(mock_client):
+    """Test provider and type filters are pushed down to the resource query."""
+    client, session = mock_client
+    session.run.return_value = []
+    engine = BatchRiskEngine(client)
+
+    assert engine.assess_all(cloud_provider="aws", resource_type="rds_instance") == []
+    session.run.assert_called_once()
+    _, kwargs = session.run.call_args
+    assert kwargs == {"cloud_provider": "aws", "resource_type": "rds_instance"}
+
@@ -0,0 +1,98 @@
+"""Tests for circular dependency detection."""
+
+from unittest.mock import MagicMock, Mock
+
+from topdeck.analysis.graph_snapshot import GraphSnapshot
+from topdeck.analysis.risk import CycleDetector, DependencyAnalyzer, get_cycle_detector
+
+EDGES = [
+    ("a", "b"),
+    ("b", "c"),
+    ("c", "a"),
+    ("b", "a"),
+    ("c", "d"),
+    ("x", "y"),
+    ("y", "x"),
+    ("z", "z"),  # self-loops are ignored
+]
+
+
+def test_components_and_membership():
+    """Test strongly connected components, sizes and membership."""
+    report = CycleDetector(EDGES).analyze()
+
+    assert report.components == [["a", "b", "c"], ["x", "y"]]
+    assert report.component_sizes == [3, 2]
+    assert report.component_of("b") == 0
+    assert report.component_of("y") == 1
+    assert report.component_of("d") is None
+    assert report.component_of("z") is None
+
+
+def test_cycles_are_complete_and_deduplicated():
+    """Test each elementary cycle appears once, rooted at its smallest ID."""
+    report = CycleDetector(EDGES).analyze()
+
+    assert report.cycles == [
+        ["a", "b", "a"],
+        ["x", "y", "x"],
+        ["a", "b", "c", "a"],
+    ]
+    assert report.truncated is False
+    assert report.cycles_for("c") == [["a", "b", "c", "a"]]
+
+
+def test_cycle_length_bound_and_limit():
+    """Test the length bound and cycle limit."""
+    ring = [(f"n{i}", f"n{(i + 1) % 5}") for i in range(5)]
+
+    assert CycleDetector(ring, max_cycle_length=4).analyze().cycles == []
+    assert len(CycleDetector(ring, max_cycle_length=5).analyze().cycles) == 1
+
+    report = CycleDetector(EDGES, max_cycles=1).analyze()
+    assert len(report.cycles) == 1
+    assert report.truncated is True
+
+
+def test_incremental_add_edges_reports_only_new_cycles():
+    """Test adding edges returns just the cycles they create."""
+    detector = CycleDetector([("a", "b"), ("b", "c"), ("x", "y"), ("y", "x")])
+    assert detector.analyze().cycles == [["x", "y", "x"]]
+
+    assert detector.add_edges([("d", "e")]) == []
+    assert detector.add_edges([("a", "b")]) == []
+
+    created = detector.add_edges([("c", "a"), ("c", "x")])
+    assert created == [["a", "b", "c", "a"]]
+
+    # Joining the two components merges them
+    created = detector.add_edges([("y", "b")])
+    assert created == [["b", "c", "x", "y", "b"]]
+    report = detector.analyze()
+    assert report.components == [["a", "b", "c", "x", "y"]]
+    assert report.cycles == CycleDetector(
+        [("a", "b"), ("b", "c"), ("x", "y"), ("y", "x"), ("c", "a"), ("c", "x"), ("y", "b")]
+    ).analyze().cycles
+
+
+def test_dependency_analyzer_uses_snapshot():
+    """Test cycle detection runs on the snapshot without Neo4j."""
+    nodes = [{"id": node_id} for node_id in "abcd"]
+    snapshot = GraphSnapshot(
+        nodes,
+        [
+            ("a", "b", "DEPENDS_ON"),
+            ("b", "a", "USES"),
+            ("b", "c", "DEPENDS_ON"),
+            ("c", "b", "REDUNDANT_WITH"),  # not a dependency type
+        ],
+    )
+    client = Mock()
+    client.session = MagicMock(side_effect=AssertionError("Neo4j should not be queried"))
+    analyzer = DependencyAnalyzer(client, graph_snapshot=snapshot)
+
+    assert analyzer.detect_circular_dependencies() == [["a", "b", "a"]]
+    assert analyzer.detect_circular_dependencies("b") == [["a", "b", "a"]]
+    assert analyzer.detect_circular_dependencies("c") == []
+    assert analyzer.analyze_circular_dependencies().components == [["a", "b"]]
+    assert get_cycle_detector(snapshot) is get_cycle_detector(snapshot)
@@ -290,10 +290,14 @@ def test_detect_circular_dependencies_all(dependency_analyzer, mock_neo4j_client
     mock_session = MagicMock()
     mock_result = MagicMock()
 
-    # Mock multiple cycles
+    # Dependency edges forming two cycles: 1 -> 2 -> 3 -> 1 and 4 -> 5 -> 4
     mock_result.__iter__.return_value = [
-        {"cycle": ["res-1", "res-2", "res-3", "res-1"]},
-        {"cycle": ["res-4", "res-5", "res-4"]},
+        {"source_id": "res-1", "target_id": "res-2"},
+        {"source_id": "res-2", "target_id": "res-3"},
+        {"source_id": "res-3", "target_id": "res-1"},
+        {"source_id": "res-4", "target_id": "res-5"},
+        {"source_id": "res-5", "target_id": "res-4"},
+        {"source_id": "res-5", "target_id": "res-6"},
     ]
 
     mock_session.run.return_value = mock_result
@@ -301,7 +305,7 @@ def test_detect_circular_dependencies_all(dependency_analyzer, mock_neo4j_client
 
     cycles = dependency_analyzer.detect_circular_dependencies()
 
-    assert len(cycles) == 2
+    assert cycles == [["res-4", "res-5", "res-4"], ["res-1", "res-2", "res-3", "res-1"]]
     assert mock_session.run.call_count == 1
 
 
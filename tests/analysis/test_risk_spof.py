@@ -0,0 +1,119 @@
+"""Tests for structural single point of failure detection."""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from topdeck.analysis.graph_snapshot import GraphSnapshot
+from topdeck.analysis.risk import RiskAnalyzer, SPOFEngine, get_spof_analysis
+
+
+def _snapshot(node_ids, edges):
+    nodes = [
+        {"id": node_id, "name": node_id.upper(), "resource_type": "web_app"}
+        for node_id in node_ids
+    ]
+    return GraphSnapshot(nodes, list(edges))
+
+
+@pytest.fixture
+def snapshot():
+    """
+    web and mobile depend on api; api depends on db and cache;
+    worker depends on db only; db is backed up by replica.
+
+        web ----\\
+                 api --> db <-- worker
+        mobile -/   \\--> cache
+    """
+    return _snapshot(
+        ["web", "mobile", "api", "db", "cache", "worker", "replica"],
+        [
+            ("web", "api", "DEPENDS_ON"),
+            ("mobile", "api", "DEPENDS_ON"),
+            ("api", "db", "DEPENDS_ON"),
+            ("api", "cache", "DEPENDS_ON"),
+            ("worker", "db", "DEPENDS_ON"),
+            ("db", "replica", "REDUNDANT_WITH"),
+        ],
+    )
+
+
+def test_articulation_points_and_bridges(snapshot):
+    """Test cut vertices and cut edges of the undirected dependency graph."""
+    analysis = SPOFEngine(snapshot).analyze()
+
+    assert analysis.articulation_points == {"api", "db"}
+    assert set(analysis.bridges) == {
+        ("web", "api"),
+        ("mobile", "api"),
+        ("api", "db"),
+        ("api", "cache"),
+        ("worker", "db"),
+    }
+
+
+def test_parallel_links_are_not_bridges():
+    """Test a link in both directions is not reported as a bridge."""
+    analysis = SPOFEngine(
+        _snapshot(["a", "b"], [("a", "b", "DEPENDS_ON"), ("b", "a", "DEPENDS_ON")])
+    ).analyze()
+
+    assert analysis.bridges == []
+    assert analysis.articulation_points == set()
+
+
+def test_dominators_report_resources_losing_all_paths(snapshot):
+    """Test dominator subtrees give the exact resources cut off by a failure."""
+    analysis = SPOFEngine(snapshot).analyze()
+
+    # api still reaches cache if db fails, so only worker is cut off by db
+    assert analysis.dominated_resources("db") == ["worker"]
+    assert analysis.blast_radius("db") == 1
+    assert sorted(analysis.dominated_resources("api")) == ["mobile", "web"]
+    assert analysis.immediate_dominators["web"] == "api"
+    assert analysis.immediate_dominators["api"] is None
+    assert analysis.blast_radius("web") == 0
+    assert analysis.blast_radius("replica") == 0
+
+
+def test_dominators_on_chain_and_cycle():
+    """Test a dependency chain and a foundation-less cycle."""
+    analysis = SPOFEngine(
+        _snapshot(
+            ["a", "b", "c", "x", "y"],
+            [
+                ("a", "b", "DEPENDS_ON"),
+                ("b", "c", "DEPENDS_ON"),
+                ("x", "y", "DEPENDS_ON"),
+                ("y", "x", "DEPENDS_ON"),
+            ],
+        )
+    ).analyze()
+
+    assert analysis.dominated_resources("c") == ["b", "a"]
+    assert analysis.blast_radius("b") == 1
+    # One node of the cycle becomes its root; the other hangs off it
+    assert analysis.blast_radius("x") + analysis.blast_radius("y") == 1
+
+
+def test_spof_analysis_is_cached_per_snapshot(snapshot):
+    """Test the analysis runs once per snapshot."""
+    assert get_spof_analysis(snapshot) is get_spof_analysis(snapshot)
+
+
+def test_identify_spofs_from_snapshot(snapshot):
+    """Test RiskAnalyzer finds SPOFs without querying Neo4j."""
+    client = Mock()
+    client.session = MagicMock(side_effect=AssertionError("Neo4j should not be queried"))
+    analyzer = RiskAnalyzer(client, graph_snapshot=snapshot)
+
+    spofs = analyzer.identify_single_points_of_failure()
+
+    # db has a REDUNDANT_WITH alternative, so only api and cache qualify
+    assert [s.resource_id for s in spofs] == ["api", "cache"]
+    api = spofs[0]
+    assert api.dependents_count == 2
+    assert api.blast_radius == 2
+    assert any("splits the dependency graph" in r for r in api.recommendations)
+    assert not any("splits the dependency graph" in r for r in spofs[1].recommendations)
@@ -0,0 +1,72 @@
+"""Tests for the shared API clients."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from topdeck.api.dependencies import ServiceContainer
+from topdeck.common.config import settings
+
+
+@pytest.fixture
+def backends():
+    """Configure all observability backends."""
+    with patch.multiple(
+        settings,
+        prometheus_url="http://prometheus:9090",
+        loki_url="http://loki:3100",
+        tempo_url="http://tempo:3200",
+        elasticsearch_url="http://elasticsearch:9200",
+        elasticsearch_username="",
+        elasticsearch_password="",
+        elasticsearch_api_key="secret",
+    ):
+        yield settings
+
+
+async def test_collectors_share_one_client_per_backend(backends):
+    """Test collectors reuse their backend's pooled client across requests."""
+    container = ServiceContainer(neo4j_client=MagicMock(), max_connections=8)
+
+    first, second = container.prometheus(), container.prometheus()
+    assert first is not second
+    assert first.client is second.client is container.http_client("prometheus")
+    assert container.loki().client is not first.client
+    assert container.elasticsearch().client.headers["Authorization"] == "ApiKey secret"
+
+    # Closing a collector leaves the shared client open for the next request
+    await first.close()
+    assert not container.http_client("prometheus").is_closed
+
+    await container.close()
+    assert first.client.is_closed
+
+
+async def test_unconfigured_backend_has_no_collector(backends):
+    """Test backends without a URL get no collector."""
+    backends.tempo_url = ""
+    container = ServiceContainer(neo4j_client=MagicMock())
+
+    assert container.tempo() is None
+    with pytest.raises(ValueError):
+        container.http_client("unknown")
+    await container.close()
+
+
+async def test_pool_stats_cover_created_pools(backends):
+    """Test pool statistics report Neo4j and every HTTP pool created so far."""
+    neo4j = MagicMock()
+    neo4j.get_pool_stats.return_value = {"max_size": 50, "open": 3, "in_use": 1, "idle": 2}
+    container = ServiceContainer(neo4j_client=neo4j, max_connections=8)
+    container.loki()
+
+    with patch("topdeck.api.dependencies.record_connection_pool") as record:
+        stats = container.get_pool_stats()
+
+    assert set(stats) == {"neo4j", "loki"}
+    assert stats["loki"] == {"max_size": 8, "open": 0, "in_use": 0, "idle": 0}
+    record.assert_any_call("neo4j", 1, 2, 50)
+
+    # A Neo4j client passed in belongs to the caller
+    await container.close()
+    neo4j.close.assert_not_called()
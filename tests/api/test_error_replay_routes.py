@@ -4,7 +4,7 @@ Tests for error replay API routes.
 
 import pytest
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from fastapi.testclient import TestClient
 
@@ -371,19 +371,17 @@ def test_capture_error_with_stack_trace(client, mock_error_replay_service, sampl
 
 def test_error_replay_service_initialization(client):
     """Test that error replay service can be initialized."""
-    with patch("topdeck.api.routes.error_replay.Neo4jClient"), patch(
-        "topdeck.api.routes.error_replay.settings"
-    ) as mock_settings:
-        mock_settings.NEO4J_URI = "bolt://localhost:7687"
-        mock_settings.NEO4J_USERNAME = "neo4j"
-        mock_settings.NEO4J_PASSWORD = "password"
-        mock_settings.PROMETHEUS_URL = None
-        mock_settings.LOKI_URL = None
-        mock_settings.TEMPO_URL = None
-        mock_settings.ELASTICSEARCH_URL = None
-        mock_settings.AZURE_LOG_ANALYTICS_WORKSPACE_ID = None
-
+    container = Mock()
+    container.prometheus.return_value = None
+    container.loki.return_value = None
+    container.tempo.return_value = None
+    container.elasticsearch.return_value = None
+    with patch(
+        "topdeck.api.routes.error_replay.get_service_container", return_value=container
+    ):
         from topdeck.api.routes.error_replay import get_error_replay_service
 
         service = get_error_replay_service()
         assert service is not None
+        assert service.neo4j_client is container.async_neo4j
+        assert get_error_replay_service() is service
@@ -0,0 +1,136 @@
+"""Tests for the live diagnostics WebSocket fan-out."""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+
+from topdeck.api.routes.live_diagnostics_ws import ClientConnection, ConnectionManager
+from topdeck.monitoring.live_diagnostics import LiveDiagnosticsSnapshot, ServiceHealthStatus
+from topdeck.monitoring.live_diagnostics_delta import snapshot_view
+
+
+class FakeWebSocket:
+    """WebSocket recording sent messages; sends block while paused."""
+
+    def __init__(self, name="client"):
+        self.client = name
+        self.sent = []
+        self.closed = False
+        self.resume = asyncio.Event()
+        self.resume.set()
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        await self.resume.wait()
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+
+def _view(health_scores):
+    now = datetime.now(UTC)
+    return snapshot_view(
+        LiveDiagnosticsSnapshot(
+            timestamp=now,
+            overall_health="healthy",
+            services=[
+                ServiceHealthStatus(
+                    resource_id=resource_id,
+                    resource_name=resource_id,
+                    resource_type="pod",
+                    status="healthy",
+                    health_score=score,
+                    anomalies=[],
+                    metrics={},
+                    last_updated=now,
+                )
+                for resource_id, score in health_scores.items()
+            ],
+            anomalies=[],
+            traffic_patterns=[],
+            failing_dependencies=[],
+        )
+    )
+
+
+async def _drain(client):
+    for _ in range(50):
+        if client.queue.empty():
+            return
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_client_gets_snapshot_then_deltas():
+    """Test the first message is a full snapshot and later ones only changes."""
+    websocket = FakeWebSocket()
+    client = ClientConnection(websocket, max_queue_size=4, send_timeout=1)
+    client.start()
+
+    client.publish(_view({"web": 95.0, "api": 95.0}))
+    client.publish(_view({"web": 95.0, "api": 95.0}))
+    client.publish(_view({"web": 95.0, "api": 40.0}))
+    await _drain(client)
+    await client.close()
+
+    assert [m["type"] for m in websocket.sent] == ["snapshot", "snapshot_delta"]
+    assert [m["seq"] for m in websocket.sent] == [1, 2]
+    assert len(websocket.sent[0]["data"]["services"]) == 2
+    upserted = websocket.sent[1]["data"]["services"]["upserted"]
+    assert [s["resource_id"] for s in upserted] == ["api"]
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_resynced_without_blocking_others():
+    """Test an overflowing queue is dropped and replaced by a full snapshot."""
+    manager = ConnectionManager()
+    slow_socket, fast_socket = FakeWebSocket("slow"), FakeWebSocket("fast")
+    slow_socket.resume.clear()
+    slow = await manager.connect(slow_socket)
+    await manager.connect(fast_socket)
+    slow.queue = asyncio.Queue(maxsize=2)
+
+    for score in range(5):
+        await manager.publish_view(_view({"web": float(score)}))
+        await asyncio.sleep(0)
+
+    assert len(fast_socket.sent) == 5
+    assert slow.dropped_messages > 0
+    assert slow.resyncs >= 2
+
+    slow_socket.resume.set()
+    await _drain(slow)
+    await manager.disconnect(slow_socket)
+    await manager.disconnect(fast_socket)
+
+    # Whatever was dropped, the client ends on a full snapshot it can apply deltas to
+    last_snapshot = max(i for i, m in enumerate(slow_socket.sent) if m["type"] == "snapshot")
+    services = slow_socket.sent[last_snapshot]["data"]["services"]
+    for message in slow_socket.sent[last_snapshot + 1 :]:
+        services = message["data"]["services"]["upserted"]
+    assert services[0]["health_score"] == 4.0
+    assert await manager.get_connection_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_respects_subscriptions():
+    """Test resource events only reach clients subscribed to the resource."""
+    manager = ConnectionManager()
+    all_socket, web_socket = FakeWebSocket("all"), FakeWebSocket("web")
+    everything = await manager.connect(all_socket)
+    web_only = await manager.connect(web_socket)
+    web_only.subscription.add(resource_ids=["web"])
+
+    await manager.broadcast({"type": "health_change"}, resource_ids=["api"])
+    await manager.broadcast({"type": "health_change"}, resource_ids=["web"])
+    await _drain(everything)
+    await _drain(web_only)
+
+    assert len(all_socket.sent) == 2
+    assert len(web_socket.sent) == 1
+    await manager.disconnect(all_socket)
+    await manager.disconnect(web_socket)
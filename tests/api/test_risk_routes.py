@@ -0,0 +1,95 @@
+"""Tests for risk API endpoints."""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from topdeck.analysis.risk import RiskAssessment, RiskLevel
+from topdeck.api.routes import risk
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the risk router only."""
+    app = FastAPI()
+    app.include_router(risk.router)
+    return TestClient(app)
+
+
+def _assessment(resource_id, score, level):
+    return RiskAssessment(
+        resource_id=resource_id,
+        resource_name=resource_id.upper(),
+        resource_type="web_app",
+        risk_score=score,
+        risk_level=level,
+        criticality_score=20.0,
+        dependencies_count=1,
+        dependents_count=0,
+        blast_radius=0,
+        single_point_of_failure=False,
+        deployment_failure_rate=0.0,
+        time_since_last_change=None,
+        recommendations=[],
+        factors={},
+    )
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Replace the batch engine with a mock returning three assessments."""
+    engine = Mock()
+    engine.assess_all.return_value = [
+        _assessment("a", 80.0, RiskLevel.CRITICAL),
+        _assessment("b", 55.0, RiskLevel.HIGH),
+        _assessment("c", 10.0, RiskLevel.LOW),
+    ]
+    monkeypatch.setattr(risk, "get_batch_risk_engine", lambda: engine)
+    return engine
+
+
+def test_get_all_risk_assessments_paginates(client, engine):
+    """Test /all applies offset/limit and reports the total count."""
+    response = client.get("/api/v1/risk/all", params={"offset": 1, "limit": 1})
+
+    assert response.status_code == 200
+    assert [a["resource_id"] for a in response.json()] == ["b"]
+    assert response.headers["X-Total-Count"] == "3"
+
+
+def test_get_all_risk_assessments_passes_filters(client, engine):
+    """Test /all forwards filters to the batch engine."""
+    response = client.get(
+        "/api/v1/risk/all",
+        params={"cloud_provider": "aws", "risk_level": "HIGH", "min_score": 50},
+    )
+
+    assert response.status_code == 200
+    engine.assess_all.assert_called_once_with(
+        cloud_provider="aws",
+        resource_type=None,
+        risk_level=RiskLevel.HIGH,
+        min_score=50.0,
+    )
+
+
+def test_get_all_risk_assessments_invalid_level(client, engine):
+    """Test /all rejects unknown risk levels."""
+    response = client.get("/api/v1/risk/all", params={"risk_level": "extreme"})
+
+    assert response.status_code == 400
+
+
+def test_stream_all_risk_assessments_ndjson(client, engine):
+    """Test /all/stream emits one JSON assessment per line."""
+    response = client.get("/api/v1/risk/all/stream", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["X-Total-Count"] == "3"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["resource_id"] for line in lines] == ["a", "b"]
+    assert lines[0]["risk_level"] == "critical"
@@ -2,6 +2,7 @@
 Tests for cache layer.
 """
 
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -10,6 +11,8 @@ from topdeck.common.cache import (
     Cache,
     CacheConfig,
     cached,
+    deserialize,
+    serialize,
 )
 
 
@@ -203,6 +206,29 @@ class TestCache:
         assert stats["keys"] == 50
 
 
+class TestSerialization:
+    """Tests for cache value serialization"""
+
+    def test_round_trip(self):
+        """Test values survive serialization"""
+        value = {"nodes": [{"id": "a", "weight": 1.5}], "edges": [], "ok": True}
+
+        data = serialize(value)
+
+        assert isinstance(data, bytes)
+        assert deserialize(data) == value
+
+    def test_rejects_values_that_would_change_type(self):
+        """Test values without a lossless encoding raise instead of becoming strings"""
+        with pytest.raises(TypeError):
+            serialize({"at": datetime(2026, 1, 1, tzinfo=UTC)})
+
+    def test_reads_legacy_json(self):
+        """Test values written as plain JSON are still readable"""
+        assert deserialize(b'{"value": 123}') == {"value": 123}
+        assert deserialize('{"value": 123}') == {"value": 123}
+
+
 class TestCachedDecorator:
     """Tests for @cached decorator"""
 
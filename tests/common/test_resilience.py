@@ -49,6 +49,23 @@ class TestRateLimiter:
         # Should have waited close to 1 second
         assert elapsed >= 0.9
 
+    @pytest.mark.asyncio
+    async def test_rate_limiter_refund(self):
+        """Test a refunded call frees its slot"""
+        limiter = RateLimiter(max_calls=2, time_window=1.0)
+
+        await limiter.acquire()
+        await limiter.acquire()
+        await limiter.refund()
+
+        # The refunded slot is available without waiting
+        start = time.time()
+        await limiter.acquire()
+        elapsed = time.time() - start
+
+        assert elapsed < 0.1
+        assert len(limiter.calls) == 2
+
 
 class TestRetryConfig:
     """Tests for RetryConfig"""
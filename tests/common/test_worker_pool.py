@@ -175,6 +175,27 @@ class TestWorkerPool:
             await pool.execute(tasks, task_args)
 
 
+    @pytest.mark.asyncio
+    async def test_worker_pool_map_partial_deadline(self):
+        """Test map_partial keeps finished results when the deadline passes"""
+        pool = WorkerPool(WorkerPoolConfig(max_workers=2))
+
+        async def task(x):
+            if x == 1:
+                await asyncio.sleep(1.0)
+            if x == 3:
+                raise ValueError("failed")
+            return x * 10
+
+        results = await pool.map_partial(task, [0, 1, 2, 3], deadline=0.2)
+
+        assert results == [0, None, 20, None]
+        summary = pool.get_summary()
+        assert summary["success"] == 2
+        assert summary["failure"] == 1
+        assert summary["cancelled"] == 1
+
+
 class TestParallelMap:
     """Tests for parallel_map convenience function"""
 
@@ -9,6 +9,8 @@ import pytest
 from topdeck.discovery.aws.discoverer import AWSDiscoverer
 from topdeck.discovery.models import DiscoveredResource
 
+ACCOUNT_ID = "123456789012"
+
 
 class TestAWSDiscoverer:
     """Test suite for AWSDiscoverer."""
@@ -68,15 +70,14 @@ class TestAWSDiscoverer:
 
         with patch.object(discoverer, "session") as mock_session:
             mock_session.client.return_value = mock_ec2
-            with patch.object(discoverer, "get_account_id", return_value="123456789012"):
-                resources = await discoverer._discover_ec2_instances("us-east-1")
+            resources = await discoverer._discover_ec2_instances("us-east-1", ACCOUNT_ID)
 
-                assert len(resources) == 1
-                resource = resources[0]
-                assert resource.resource_type == "ec2"
-                assert "instance_type" in resource.properties
-                assert resource.properties["instance_type"] == "t2.micro"
-                assert resource.properties["state"] == "running"
+            assert len(resources) == 1
+            resource = resources[0]
+            assert resource.resource_type == "ec2"
+            assert "instance_type" in resource.properties
+            assert resource.properties["instance_type"] == "t2.micro"
+            assert resource.properties["state"] == "running"
 
     @pytest.mark.asyncio
     async def test_discover_eks_clusters(self, discoverer):
@@ -97,14 +98,13 @@ class TestAWSDiscoverer:
 
         with patch.object(discoverer, "session") as mock_session:
             mock_session.client.return_value = mock_eks
-            with patch.object(discoverer, "get_account_id", return_value="123456789012"):
-                resources = await discoverer._discover_eks_clusters("us-east-1")
+            resources = await discoverer._discover_eks_clusters("us-east-1", ACCOUNT_ID)
 
-                assert len(resources) == 1
-                resource = resources[0]
-                assert resource.resource_type == "eks"
-                assert resource.properties["status"] == "ACTIVE"
-                assert resource.properties["version"] == "1.24"
+            assert len(resources) == 1
+            resource = resources[0]
+            assert resource.resource_type == "eks"
+            assert resource.properties["status"] == "ACTIVE"
+            assert resource.properties["version"] == "1.24"
 
     @pytest.mark.asyncio
     async def test_discover_rds_databases(self, discoverer):
@@ -130,17 +130,16 @@ class TestAWSDiscoverer:
 
         with patch.object(discoverer, "session") as mock_session:
             mock_session.client.return_value = mock_rds
-            with patch.object(discoverer, "get_account_id", return_value="123456789012"):
-                resources = await discoverer._discover_rds_databases("us-east-1")
-
-                assert len(resources) == 1
-                resource = resources[0]
-                assert resource.resource_type == "rds"
-                assert resource.properties["engine"] == "postgres"
-                assert (
-                    resource.properties["endpoint_address"]
-                    == "test-db.abc123.us-east-1.rds.amazonaws.com"
-                )
+            resources = await discoverer._discover_rds_databases("us-east-1", ACCOUNT_ID)
+
+            assert len(resources) == 1
+            resource = resources[0]
+            assert resource.resource_type == "rds"
+            assert resource.properties["engine"] == "postgres"
+            assert (
+                resource.properties["endpoint_address"]
+                == "test-db.abc123.us-east-1.rds.amazonaws.com"
+            )
 
     @pytest.mark.asyncio
     async def test_discover_s3_buckets(self, discoverer):
@@ -158,11 +157,10 @@ class TestAWSDiscoverer:
 
         with patch.object(discoverer, "session") as mock_session:
             mock_session.client.return_value = mock_s3
-            with patch.object(discoverer, "get_account_id", return_value="123456789012"):
-                resources = await discoverer._discover_s3_buckets("us-east-1")
+            resources = await discoverer._discover_s3_buckets("us-east-1", ACCOUNT_ID)
 
-                assert len(resources) == 2
-                assert all(r.resource_type == "s3" for r in resources)
+            assert len(resources) == 2
+            assert all(r.resource_type == "s3" for r in resources)
 
     @pytest.mark.asyncio
     async def test_discover_lambda_functions(self, discoverer):
@@ -183,13 +181,12 @@ class TestAWSDiscoverer:
 
         with patch.object(discoverer, "session") as mock_session:
             mock_session.client.return_value = mock_lambda
-            with patch.object(discoverer, "get_account_id", return_value="123456789012"):
-                resources = await discoverer._discover_lambda_functions("us-east-1")
+            resources = await discoverer._discover_lambda_functions("us-east-1", ACCOUNT_ID)
 
-                assert len(resources) == 1
-                resource = resources[0]
-                assert resource.resource_type == "lambda"
-                assert resource.properties["runtime"] == "python3.9"
+            assert len(resources) == 1
+            resource = resources[0]
+            assert resource.resource_type == "lambda"
+            assert resource.properties["runtime"] == "python3.9"
 
     @pytest.mark.asyncio
     async def test_discover_dynamodb_tables(self, discoverer):
@@ -211,13 +208,12 @@ class TestAWSDiscoverer:
 
         with patch.object(discoverer, "session") as mock_session:
             mock_session.client.return_value = mock_dynamodb
-            with patch.object(discoverer, "get_account_id", return_value="123456789012"):
-                resources = await discoverer._discover_dynamodb_tables("us-east-1")
+            resources = await discoverer._discover_dynamodb_tables("us-east-1", ACCOUNT_ID)
 
-                assert len(resources) == 1
-                resource = resources[0]
-                assert resource.resource_type == "dynamodb"
-                assert resource.properties["status"] == "ACTIVE"
+            assert len(resources) == 1
+            resource = resources[0]
+            assert resource.resource_type == "dynamodb"
+            assert resource.properties["status"] == "ACTIVE"
 
     @pytest.mark.asyncio
     async def test_discover_vpcs(self, discoverer):
@@ -237,13 +233,12 @@ class TestAWSDiscoverer:
 
         with patch.object(discoverer, "session") as mock_session:
             mock_session.client.return_value = mock_ec2
-            with patch.object(discoverer, "get_account_id", return_value="123456789012"):
-                resources = await discoverer._discover_vpcs("us-east-1")
+            resources = await discoverer._discover_vpcs("us-east-1", ACCOUNT_ID)
 
-                assert len(resources) == 1
-                resource = resources[0]
-                assert resource.resource_type == "vpc"
-                assert resource.properties["cidr_block"] == "10.0.0.0/16"
+            assert len(resources) == 1
+            resource = resources[0]
+            assert resource.resource_type == "vpc"
+            assert resource.properties["cidr_block"] == "10.0.0.0/16"
 
     @pytest.mark.asyncio
     async def test_discover_load_balancers(self, discoverer):
@@ -266,13 +261,12 @@ class TestAWSDiscoverer:
 
         with patch.object(discoverer, "session") as mock_session:
             mock_session.client.return_value = mock_elbv2
-            with patch.object(discoverer, "get_account_id", return_value="123456789012"):
-                resources = await discoverer._discover_load_balancers("us-east-1")
+            resources = await discoverer._discover_load_balancers("us-east-1", ACCOUNT_ID)
 
-                assert len(resources) == 1
-                resource = resources[0]
-                assert resource.resource_type == "load_balancer"
-                assert resource.properties["load_balancer_type"] == "application"
+            assert len(resources) == 1
+            resource = resources[0]
+            assert resource.resource_type == "load_balancer"
+            assert resource.properties["load_balancer_type"] == "application"
 
     @pytest.mark.asyncio
     async def test_discover_dependencies(self, discoverer):
@@ -369,6 +363,7 @@ class TestAWSDiscoverer:
             _discover_load_balancers=AsyncMock(),
             _discover_dependencies=AsyncMock(),
             _infer_applications=AsyncMock(),
+            get_account_id=MagicMock(return_value=ACCOUNT_ID),
         ) as mocks:
             # Set return values
             mocks["_discover_ec2_instances"].return_value = []
@@ -0,0 +1,176 @@
+"""
+Tests for concurrent AWS discovery, with boto3 clients stubbed by botocore.
+"""
+
+import pytest
+
+pytest.importorskip("boto3")
+
+from botocore.stub import Stubber  # noqa: E402
+
+from topdeck.discovery.aws.discoverer import AWSDiscoverer  # noqa: E402
+
+ACCOUNT_ID = "123456789012"
+
+
+@pytest.fixture
+def discoverer():
+    """Create an AWSDiscoverer with static credentials."""
+    return AWSDiscoverer(
+        access_key_id="test_key",
+        secret_access_key="test_secret",
+        region="us-east-1",
+    )
+
+
+def _stub(discoverer, service, region=None):
+    """Activate a Stubber on the client the executor uses for a service."""
+    stubber = Stubber(discoverer.executor.client(service, region))
+    stubber.activate()
+    return stubber
+
+
+def _instance(instance_id):
+    """Create a describe_instances instance."""
+    return {
+        "InstanceId": instance_id,
+        "InstanceType": "t3.micro",
+        "State": {"Name": "running"},
+        "VpcId": "vpc-1",
+        "Tags": [{"Key": "Name", "Value": f"web-{instance_id}"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_paginate_collects_every_page_within_rate_limit(discoverer):
+    """Test all pages are fetched, each counting against the service's rate limit."""
+    ec2 = _stub(discoverer, "ec2", "us-east-1")
+    ec2.add_response(
+        "describe_instances",
+        {"Reservations": [{"Instances": [_instance("i-1")]}], "NextToken": "page-2"},
+        {},
+    )
+    ec2.add_response(
+        "describe_instances",
+        {"Reservations": [{"Instances": [_instance("i-2")]}]},
+        {"NextToken": "page-2"},
+    )
+
+    reservations = await discoverer.executor.paginate(
+        "ec2", "us-east-1", "describe_instances", "Reservations"
+    )
+
+    assert [r["Instances"][0]["InstanceId"] for r in reservations] == ["i-1", "i-2"]
+    assert len(discoverer.executor._limiter("ec2", "us-east-1").calls) == 2
+    ec2.assert_no_pending_responses()
+
+
+@pytest.mark.asyncio
+async def test_discover_all_resources_fans_out_over_regions_and_services(discoverer):
+    """Test every region and service is scanned and the account ID is looked up once."""
+    sts = _stub(discoverer, "sts")
+    sts.add_response("get_caller_identity", {"Account": ACCOUNT_ID})
+
+    stubbers = [sts]
+    for region in ("us-east-1", "eu-west-1"):
+        ec2 = _stub(discoverer, "ec2", region)
+        ec2.add_response(
+            "describe_instances", {"Reservations": [{"Instances": [_instance(f"i-{region}")]}]}
+        )
+        eks = _stub(discoverer, "eks", region)
+        eks.add_response("list_clusters", {"clusters": ["platform"]})
+        eks.add_response(
+            "describe_cluster",
+            {
+                "cluster": {
+                    "name": "platform",
+                    "arn": f"arn:aws:eks:{region}:{ACCOUNT_ID}:cluster/platform",
+                    "status": "ACTIVE",
+                    "resourcesVpcConfig": {"vpcId": "vpc-1"},
+                }
+            },
+            {"name": "platform"},
+        )
+        stubbers.extend([ec2, eks])
+
+    result = await discoverer.discover_all_resources(
+        regions=["us-east-1", "eu-west-1"], resource_types=["ec2", "eks"]
+    )
+
+    assert result.errors == []
+    assert result.subscription_id == ACCOUNT_ID
+    assert [(r.region, r.name) for r in result.resources] == [
+        ("us-east-1", "web-i-us-east-1"),
+        ("us-east-1", "platform"),
+        ("eu-west-1", "web-i-eu-west-1"),
+        ("eu-west-1", "platform"),
+    ]
+    assert result.resources[0].id == (
+        f"arn:aws:ec2:us-east-1:{ACCOUNT_ID}:instance/i-us-east-1"
+    )
+    assert result.resources[1].properties["vpc_id"] == "vpc-1"
+    for stubber in stubbers:
+        stubber.assert_no_pending_responses()
+
+
+@pytest.mark.asyncio
+async def test_failed_service_is_reported_as_error():
+    """Test a service whose API call fails is recorded as an error, not as no resources."""
+    # A single worker keeps concurrent calls in order, as the stubber expects
+    discoverer = AWSDiscoverer(
+        access_key_id="test_key", secret_access_key="test_secret", max_workers=1
+    )
+    sts = _stub(discoverer, "sts")
+    sts.add_response("get_caller_identity", {"Account": ACCOUNT_ID})
+    ec2 = _stub(discoverer, "ec2", "us-east-1")
+    ec2.add_client_error("describe_instances", "RequestLimitExceeded")
+    ec2.add_response("describe_vpcs", {"Vpcs": [{"VpcId": "vpc-1"}]})
+
+    result = await discoverer.discover_all_resources(
+        regions=["us-east-1"], resource_types=["ec2", "vpc"]
+    )
+
+    assert len(result.errors) == 1
+    assert "ec2" in result.errors[0] and "RequestLimitExceeded" in result.errors[0]
+    assert [r.id for r in result.resources] == [f"arn:aws:ec2:us-east-1:{ACCOUNT_ID}:vpc/vpc-1"]
+    # Only the VPC scan succeeded, so only stale VPCs may be deleted
+    assert result.scanned_partitions == {("us-east-1", "vpc")}
+
+
+@pytest.mark.asyncio
+async def test_unresolved_account_id_stops_discovery(discoverer):
+    """Test no resources are discovered when the account ID cannot be resolved."""
+    sts = _stub(discoverer, "sts")
+    sts.add_client_error("get_caller_identity", "ExpiredToken")
+
+    result = await discoverer.discover_all_resources(regions=["us-east-1"])
+
+    assert result.resources == []
+    assert result.errors == ["Could not resolve the AWS account ID"]
+    sts.assert_no_pending_responses()
+
+
+@pytest.mark.asyncio
+async def test_s3_buckets_are_listed_once_for_all_regions():
+    """Test buckets are listed once per run and assigned to their own region."""
+    # A single worker keeps concurrent calls in order, as the stubber expects
+    discoverer = AWSDiscoverer(
+        access_key_id="test_key", secret_access_key="test_secret", max_workers=1
+    )
+    s3 = _stub(discoverer, "s3")
+    s3.add_response("list_buckets", {"Buckets": [{"Name": "logs"}, {"Name": "assets"}]})
+    s3.add_response(
+        "get_bucket_location", {"LocationConstraint": "eu-west-1"}, {"Bucket": "logs"}
+    )
+    s3.add_response("get_bucket_location", {}, {"Bucket": "assets"})
+    s3.add_response(
+        "get_bucket_tagging", {"TagSet": [{"Key": "team", "Value": "web"}]}, {"Bucket": "assets"}
+    )
+    s3.add_client_error("get_bucket_tagging", "NoSuchTagSet", expected_params={"Bucket": "logs"})
+
+    east = await discoverer._discover_s3_buckets("us-east-1", ACCOUNT_ID)
+    west = await discoverer._discover_s3_buckets("eu-west-1", ACCOUNT_ID)
+
+    assert [(b.name, b.region, b.tags) for b in east] == [("assets", "us-east-1", {"team": "web"})]
+    assert [(b.name, b.region, b.tags) for b in west] == [("logs", "eu-west-1", {})]
+    s3.assert_no_pending_responses()
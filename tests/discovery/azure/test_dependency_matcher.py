@@ -0,0 +1,66 @@
+"""Tests for indexed Azure dependency matching."""
+
+from topdeck.discovery.azure.dependency_matcher import DependencyMatcher, ResourceIdTrie
+from topdeck.discovery.models import (
+    CloudProvider,
+    DependencyCategory,
+    DependencyType,
+    DiscoveredResource,
+)
+
+SQL = "/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Sql/servers"
+
+PATTERNS = [
+    ("app_service", "sql_database", DependencyCategory.DATA, DependencyType.REQUIRED, 0.9,
+     "App Service likely depends on SQL Database"),
+    ("app_service", "key_vault", DependencyCategory.CONFIGURATION, DependencyType.OPTIONAL, 0.8,
+     "App Service may use Key Vault for secrets"),
+    ("app_service", "key_vault", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.1,
+     "Shadowed by the first key_vault pattern"),
+]
+
+
+def _resource(resource_id: str, resource_type: str, resource_group: str = "rg1"):
+    """Create an Azure resource."""
+    return DiscoveredResource(
+        id=resource_id,
+        name=resource_id.rsplit("/", 1)[-1],
+        resource_type=resource_type,
+        cloud_provider=CloudProvider.AZURE,
+        region="eastus",
+        resource_group=resource_group,
+    )
+
+
+def test_trie_finds_nearest_parent_by_path_prefix():
+    """Test parents are matched on whole ID segments, case-insensitively."""
+    server = _resource(f"{SQL}/srv1", "sql_server")
+    lookalike = _resource(f"{SQL}/srv", "sql_server")
+    trie = ResourceIdTrie([server, lookalike])
+
+    assert trie.find_parent(f"{SQL.upper()}/SRV1/databases/db1", "sql_server") is server
+    assert trie.find_parent(f"{SQL}/srv10/databases/db1", "sql_server") is None
+    assert trie.find_parent(f"{SQL}/srv1", "sql_server") is None
+
+
+def test_match_links_children_and_applies_patterns_within_resource_group():
+    """Test hierarchy and same-group patterns, in resource order, without duplicates."""
+    resources = [
+        _resource("/rg1/vault", "key_vault"),
+        _resource(f"{SQL}/srv1/databases/db1", "sql_database"),
+        _resource("/rg1/web", "app_service"),
+        _resource(f"{SQL}/srv1", "sql_server"),
+        _resource("/rg2/vault", "key_vault", resource_group="rg2"),
+    ]
+
+    dependencies = DependencyMatcher(PATTERNS).match(resources)
+
+    assert [(d.source_id, d.target_id, d.discovered_method) for d in dependencies] == [
+        (f"{SQL}/srv1/databases/db1", f"{SQL}/srv1", "resource_hierarchy"),
+        ("/rg1/web", "/rg1/vault", "heuristic_same_rg"),
+        ("/rg1/web", f"{SQL}/srv1/databases/db1", "heuristic_same_rg"),
+    ]
+    assert dependencies[1].strength == 0.8
+    assert dependencies[2].description == (
+        "App Service likely depends on SQL Database in same resource group"
+    )
@@ -0,0 +1,161 @@
+"""
+Tests for streamed Azure resource discovery.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from topdeck.discovery.azure.discoverer import AzureDiscoverer
+from topdeck.discovery.azure.streaming import ResourceRef
+from topdeck.discovery.models import DiscoveredResource
+
+RG1 = "/subscriptions/sub1/resourceGroups/rg1/providers"
+RG2 = "/subscriptions/sub1/resourceGroups/rg2/providers"
+
+
+def _sdk_resource(resource_id, azure_type):
+    """Create a resource as returned by the Azure SDK listing."""
+    return SimpleNamespace(
+        id=resource_id,
+        name=resource_id.rsplit("/", 1)[-1],
+        type=azure_type,
+        location="eastus",
+        tags={},
+    )
+
+
+PAGES = [
+    [
+        _sdk_resource(f"{RG1}/Microsoft.Web/sites/webapp1", "Microsoft.Web/sites"),
+        _sdk_resource(f"{RG1}/Microsoft.Sql/servers/srv1", "Microsoft.Sql/servers"),
+    ],
+    [
+        _sdk_resource(
+            f"{RG1}/Microsoft.Sql/servers/srv1/databases/db1", "Microsoft.Sql/servers/databases"
+        ),
+        _sdk_resource(
+            f"{RG1}/Microsoft.Storage/storageAccounts/storage1", "Microsoft.Storage/storageAccounts"
+        ),
+    ],
+    [_sdk_resource(f"{RG2}/Microsoft.Web/sites/webapp2", "Microsoft.Web/sites")],
+]
+
+
+def _listing(pages):
+    """Create a resource client whose listing returns the given pages."""
+    listing = SimpleNamespace(by_page=lambda: iter(pages))
+    return SimpleNamespace(resources=SimpleNamespace(list=lambda: listing))
+
+
+@pytest.fixture
+def discoverer():
+    """Create an AzureDiscoverer whose resource listing returns PAGES."""
+    discoverer = AzureDiscoverer(subscription_id="sub1", credential=Mock())
+    discoverer.resource_client = _listing(PAGES)
+    return discoverer
+
+
+@pytest.fixture
+def detectors():
+    """Replace the detectors that call Azure APIs."""
+    with (
+        patch(
+            "topdeck.discovery.azure.resources.detect_servicebus_dependencies",
+            new_callable=AsyncMock,
+            return_value=[],
+        ) as servicebus,
+        patch(
+            "topdeck.discovery.azure.discoverer.detect_aks_resource_dependencies",
+            new_callable=AsyncMock,
+            return_value=[],
+        ) as aks,
+    ):
+        yield servicebus, aks
+
+
+@pytest.mark.asyncio
+async def test_iter_resources_maps_pages_and_records_errors(discoverer):
+    """Test resources are mapped page by page, filtered and mapping errors recorded."""
+    broken = SimpleNamespace(id=f"{RG1}/Microsoft.Web/sites/broken", name="broken")
+    discoverer.resource_client = _listing([*PAGES, [broken]])
+    errors = []
+
+    resources = [r async for r in discoverer.iter_resources(["rg1"], errors=errors)]
+
+    assert [r.name for r in resources] == ["webapp1", "srv1", "db1", "storage1"]
+    assert resources[2].resource_type == "sql_database"
+    assert len(errors) == 1
+    assert errors[0].startswith(f"Failed to map resource {RG1}/Microsoft.Web/sites/broken")
+
+
+@pytest.mark.asyncio
+async def test_stream_all_resources_writes_chunks_and_matches_on_index(discoverer, detectors):
+    """Test chunks are written as listed and dependencies match a full discovery."""
+    chunks = []
+
+    async def write_chunk(resources):
+        chunks.append([r.name for r in resources])
+
+    result, index = await discoverer.stream_all_resources(write_chunk, chunk_size=2)
+    full = await discoverer.discover_all_resources()
+
+    assert chunks == [["webapp1", "srv1"], ["db1", "storage1"], ["webapp2"]]
+    assert result.resources == [] and result.errors == []
+    assert all(isinstance(ref, ResourceRef) for ref in index.refs)
+    assert [r.name for r in index.retained] == ["webapp1", "srv1", "storage1", "webapp2"]
+    assert [(d.source_id, d.target_id, d.discovered_method) for d in result.dependencies] == [
+        (d.source_id, d.target_id, d.discovered_method) for d in full.dependencies
+    ]
+    assert result.dependencies[0].target_id == f"{RG1}/Microsoft.Sql/servers/srv1"
+    assert [a.id for a in result.applications] == [a.id for a in full.applications]
+    # The detectors inspect the retained resources in full
+    servicebus, aks = detectors
+    streamed_call, _ = servicebus.call_args_list
+    assert all(isinstance(r, DiscoveredResource) for r in streamed_call.args[0])
+    assert aks.call_args_list[0].args[0] == index.retained
+
+
+@pytest.mark.asyncio
+async def test_stream_all_resources_records_failed_write(discoverer, detectors):
+    """Test a failing chunk write is recorded so no stale data is deleted."""
+
+    async def write_chunk(resources):
+        raise ConnectionError("database unavailable")
+
+    result, _ = await discoverer.stream_all_resources(write_chunk, chunk_size=2)
+
+    assert result.errors == ["Unexpected error: database unavailable"]
+
+
+@pytest.mark.asyncio
+async def test_complete_listing_records_scanned_partitions(discoverer, detectors):
+    """Test only an unfiltered listing records its partitions as scanned."""
+    full = await discoverer.discover_all_resources()
+    filtered = await discoverer.discover_all_resources(["rg1"])
+
+    assert full.scanned_partitions == {(r.region, r.resource_type) for r in full.resources}
+    assert ("eastus", "app_service") in full.scanned_partitions
+    assert filtered.scanned_partitions == set()
+
+
+@pytest.mark.asyncio
+async def test_failed_pod_listing_is_recorded_and_not_scanned(discoverer, detectors):
+    """Test a failed pod listing is an error and leaves the stored pods alone."""
+    cluster = f"{RG1}/Microsoft.ContainerService/managedClusters/aks1"
+    discoverer.resource_client = _listing(
+        [[_sdk_resource(cluster, "Microsoft.ContainerService/managedClusters")]]
+    )
+
+    async def list_pods(subscription_id, credential, aks_resources, errors=None):
+        errors.append("Error listing pods in aks1/shop: Unauthorized")
+        return [], []
+
+    with patch(
+        "topdeck.discovery.azure.resources.discover_aks_pods_and_storage", side_effect=list_pods
+    ):
+        result = await discoverer.discover_all_resources()
+
+    assert result.errors == ["Error listing pods in aks1/shop: Unauthorized"]
+    assert result.scanned_partitions == {("eastus", "aks")}
@@ -297,3 +297,26 @@ class TestGCPDiscoverer:
             # Should have error in result
             assert len(result.errors) > 0
             assert any("Test error" in error for error in result.errors)
+
+    @pytest.mark.asyncio
+    async def test_failed_service_is_not_marked_scanned(self, discoverer):
+        """Test only services that listed successfully are recorded as scanned."""
+        with patch.multiple(
+            discoverer,
+            _discover_compute_instances=AsyncMock(side_effect=Exception("quota exceeded")),
+            _discover_gke_clusters=AsyncMock(return_value=[]),
+            _discover_cloud_sql_instances=AsyncMock(return_value=[]),
+            _discover_vpcs=AsyncMock(return_value=[]),
+            _discover_cloud_functions=AsyncMock(return_value=[]),
+            _discover_cloud_run_services=AsyncMock(return_value=[]),
+            _discover_storage_buckets=AsyncMock(side_effect=Exception("forbidden")),
+            _discover_dependencies=AsyncMock(return_value=[]),
+            _infer_applications=AsyncMock(return_value=[]),
+        ):
+            result = await discoverer.discover_all_resources(regions=["us-central1"])
+
+        assert len(result.errors) == 2
+        assert result.scanned_partitions == {
+            ("us-central1", "gke_cluster"),
+            ("global", "vpc_network"),
+        }
@@ -0,0 +1,110 @@
+"""
+Tests for content fingerprints and discovery change-sets.
+"""
+
+from datetime import datetime, timedelta
+
+from topdeck.discovery.change_set import ChangeSet, content_hash
+from topdeck.discovery.models import CloudProvider, DiscoveredResource
+
+
+def _resource(**overrides) -> DiscoveredResource:
+    values = {
+        "id": "res-1",
+        "name": "web",
+        "resource_type": "web_app",
+        "cloud_provider": CloudProvider.AZURE,
+        "region": "eastus",
+        "tags": {"team": "payments", "env": "prod"},
+    }
+    values.update(overrides)
+    return DiscoveredResource(**values)
+
+
+class TestContentHash:
+    """Test fingerprinting of node properties"""
+
+    def test_ignores_discovery_timestamps(self):
+        """Test rediscovering an unchanged resource gives the same hash"""
+        first = _resource(discovered_at=datetime(2024, 1, 1), last_seen=datetime(2024, 1, 1))
+        later = _resource(
+            discovered_at=datetime(2024, 1, 1) + timedelta(hours=8),
+            last_seen=datetime(2024, 1, 1) + timedelta(hours=8),
+        )
+
+        assert content_hash(first.to_neo4j_properties()) == content_hash(
+            later.to_neo4j_properties()
+        )
+
+    def test_changes_with_content(self):
+        """Test a changed property or tag changes the hash"""
+        base = content_hash(_resource().to_neo4j_properties())
+
+        assert content_hash(_resource(region="westus").to_neo4j_properties()) != base
+        assert content_hash(_resource(tags={"team": "search"}).to_neo4j_properties()) != base
+
+    def test_is_independent_of_key_order(self):
+        """Test the hash does not depend on dictionary order"""
+        assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+
+
+class TestChangeSet:
+    """Test diffing discovered rows against stored fingerprints"""
+
+    def test_diff_nodes_classifies_rows(self):
+        """Test rows are split into added, updated and unchanged"""
+        rows = [
+            {"id": "new", "content_hash": "h1"},
+            {"id": "changed", "content_hash": "h2"},
+            {"id": "same", "content_hash": "h3"},
+            {"id": "legacy", "content_hash": "h4"},
+        ]
+        stored = {"changed": "old", "same": "h3", "legacy": None}
+
+        changes = ChangeSet()
+        to_write = changes.diff_nodes("resources", rows, stored)
+
+        assert [row["id"] for row in to_write] == ["new", "changed", "legacy"]
+        assert changes.added == {"resources": {"new"}}
+        assert changes.updated == {"resources": {"changed", "legacy"}}
+        assert changes.unchanged == 1
+
+    def test_diff_edges_and_affected_ids(self):
+        """Test edge changes mark both endpoints as affected"""
+        rows = [
+            {
+                "source_id": "a",
+                "target_id": "b",
+                "discovered_method": "network",
+                "properties": {"content_hash": "h1"},
+            },
+            {
+                "source_id": "a",
+                "target_id": "c",
+                "discovered_method": "network",
+                "properties": {"content_hash": "h2"},
+            },
+        ]
+        stored = {("a", "c", "network"): "h2"}
+
+        changes = ChangeSet()
+        to_write = changes.diff_edges(rows, stored)
+
+        assert [row["target_id"] for row in to_write] == ["b"]
+        assert changes.added_edges == {("a", "b", "network")}
+        assert changes.affected_ids == {"a", "b"}
+        assert changes.topology_changed
+
+    def test_empty_and_merge(self):
+        """Test merging change-sets and the empty check"""
+        changes = ChangeSet(unchanged=5)
+        assert changes.is_empty
+
+        other = ChangeSet(updated={"pods": {"pod-1"}})
+        other.record_deleted("resources", ["res-9"])
+        changes.merge(other)
+
+        assert not changes.is_empty
+        assert changes.node_ids == {"pod-1", "res-9"}
+        assert changes.summary()["deleted"] == {"resources": 1}
+        assert changes.summary()["unchanged"] == 5
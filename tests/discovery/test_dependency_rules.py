@@ -0,0 +1,117 @@
+"""Tests for the shared dependency rule engine."""
+
+import pytest
+
+from topdeck.discovery.dependency_rules import (
+    DependencyRule,
+    DependencyRuleEngine,
+    rules_from_patterns,
+)
+from topdeck.discovery.models import (
+    CloudProvider,
+    DependencyCategory,
+    DependencyType,
+    DiscoveredResource,
+)
+
+
+def _resource(resource_id, resource_type, region="us-east-1", vpc_id=None, project=None):
+    """Create an AWS resource."""
+    resource = DiscoveredResource(
+        id=resource_id,
+        name=resource_id,
+        resource_type=resource_type,
+        cloud_provider=CloudProvider.AWS,
+        region=region,
+        subscription_id=project,
+    )
+    if vpc_id:
+        resource.properties["vpc_id"] = vpc_id
+    return resource
+
+
+def _rule(source_type, target_type, scope=("region",), strength=0.5):
+    """Create a dependency rule."""
+    return DependencyRule(
+        source_type=source_type,
+        target_type=target_type,
+        category=DependencyCategory.DATA,
+        dependency_type=DependencyType.OPTIONAL,
+        strength=strength,
+        description=f"{source_type} uses {target_type}",
+        scope=scope,
+    )
+
+
+def test_rules_are_joined_on_scope_keys():
+    """Test region and project scopes group unknown values, the VPC scope skips them."""
+    resources = [
+        _resource("db-other-vpc", "rds", vpc_id="vpc-2"),
+        _resource("db", "rds", vpc_id="vpc-1"),
+        _resource("db-no-vpc", "rds"),
+        _resource("bucket-west", "s3", region="us-west-2"),
+        _resource("bucket", "s3"),
+        _resource("bucket-other-project", "s3", project="other"),
+        _resource("app", "ec2", vpc_id="vpc-1"),
+    ]
+    engine = DependencyRuleEngine(
+        [_rule("ec2", "rds", scope=("region", "vpc")), _rule("ec2", "s3", ("project", "region"))]
+    )
+
+    dependencies = engine.match(resources)
+
+    assert [(d.source_id, d.target_id) for d in dependencies] == [("app", "db"), ("app", "bucket")]
+
+
+def test_first_rule_wins_and_existing_pairs_are_skipped():
+    """Test pairs are created once, by the first matching rule, in resource order."""
+    resources = [
+        _resource("cache", "elasticache"),
+        _resource("db", "rds"),
+        _resource("app", "ec2"),
+    ]
+    rules = rules_from_patterns(
+        [
+            ("ec2", "rds", DependencyCategory.DATA, DependencyType.REQUIRED, 0.9, "EC2 uses RDS"),
+            ("ec2", "rds", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.1, "Shadowed"),
+            ("ec2", "elasticache", DependencyCategory.DATA, DependencyType.OPTIONAL, 0.6,
+             "EC2 uses ElastiCache"),
+        ],
+        scope=("region",),
+        discovered_method="heuristic_same_region",
+        description_suffix=" in same region",
+    )
+    engine = DependencyRuleEngine(rules)
+    existing_pairs = {("app", "cache")}
+
+    dependencies = engine.match(resources, existing_pairs)
+
+    assert [(d.target_id, d.strength, d.description) for d in dependencies] == [
+        ("db", 0.9, "EC2 uses RDS in same region"),
+    ]
+    assert dependencies[0].discovered_method == "heuristic_same_region"
+    assert ("app", "db") in existing_pairs
+    assert [(s["candidates"], s["hits"]) for s in engine.get_stats()] == [(1, 1), (1, 0), (1, 0)]
+
+
+def test_profile_reports_phases_and_slowest_rules(caplog):
+    """Test profile mode times every rule and logs a summary."""
+    resources = [_resource("db", "rds"), _resource("app", "ec2")]
+    engine = DependencyRuleEngine([_rule("ec2", "rds"), _rule("ec2", "s3")], profile=True)
+
+    with caplog.at_level("INFO", logger="topdeck.discovery.dependency_rules"):
+        engine.match(resources)
+
+    profile = engine.get_profile(top=1)
+    assert profile["runs"] == 1
+    assert set(profile["phase_seconds"]) == {"index", "join", "emit"}
+    assert len(profile["slowest_rules"]) == 1
+    assert "seconds" in profile["slowest_rules"][0]
+    assert "Matched 2 dependency rules against 2 resources" in caplog.text
+    assert DependencyRuleEngine([_rule("ec2", "rds")]).get_profile()["slowest_rules"] == []
+
+
+def test_unknown_scope_is_rejected():
+    """Test rules with an unknown scope fail at construction."""
+    with pytest.raises(ValueError, match="Unknown scope 'zone'"):
+        DependencyRuleEngine([_rule("ec2", "rds", scope=("region", "zone"))])
@@ -67,6 +67,25 @@ class TestDiscoveredResource:
         assert "discovered_at" in props
         assert "last_seen" in props
 
+    def test_resources_are_slotted_and_share_repeated_strings(self):
+        """Test resources have no __dict__ and repeated strings are stored once"""
+        resources = [
+            DiscoveredResource(
+                id=f"vm{i}",
+                name=f"vm{i}",
+                resource_type="virtual_machine",
+                cloud_provider=CloudProvider.AZURE,
+                region="".join(["east", "us"]),
+                resource_group="-".join(["rg", "prod"]),
+            )
+            for i in range(2)
+        ]
+
+        assert not hasattr(resources[0], "__dict__")
+        assert resources[0].region is resources[1].region
+        assert resources[0].resource_group is resources[1].resource_group
+        assert resources[0].to_neo4j_properties()["resource_group"] == "rg-prod"
+
 
 class TestApplication:
     """Tests for Application model"""
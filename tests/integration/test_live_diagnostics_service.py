@@ -9,11 +9,15 @@ These tests call the REAL service methods (not mocking them) and only mock
 the external dependencies (Prometheus, Neo4j, Predictor).
 """
 
+import asyncio
 import pytest
 from datetime import UTC, datetime
 from unittest.mock import MagicMock, AsyncMock
 
+from topdeck.monitoring.collectors.prometheus import PrometheusCollector
 from topdeck.monitoring.live_diagnostics import (
+    RESOURCE_NAME_QUERY,
+    TOPOLOGY_RESOURCES_QUERY,
     LiveDiagnosticsService,
     LiveDiagnosticsSnapshot,
 )
@@ -158,3 +162,101 @@ async def test_analyze_traffic_patterns_no_dependencies(diagnostics_service, moc
 # Note: Snapshot tests are complex as they call multiple async methods
 # The API layer has comprehensive snapshot tests that verify the integration
 # These integration tests focus on testing individual service methods
+
+
+def _snapshot_topology(resource_count):
+    """Neo4j execute_query stub serving a topology of independent pods."""
+    resources = [
+        {"id": f"svc-{i}", "name": f"Service {i}", "type": "pod"} for i in range(resource_count)
+    ]
+
+    async def execute_query(query, parameters=None):
+        if query == TOPOLOGY_RESOURCES_QUERY:
+            return resources
+        if query == RESOURCE_NAME_QUERY:
+            raise AssertionError("names should come from the topology query")
+        return []
+
+    return execute_query
+
+
+@pytest.mark.asyncio
+async def test_snapshot_batches_metric_queries(mock_neo4j_client, mock_predictor):
+    """Test service health takes one query per metric, not per metric and service."""
+    mock_neo4j_client.execute_query = AsyncMock(side_effect=_snapshot_topology(30))
+    prometheus = PrometheusCollector("http://prometheus:9090")
+
+    async def query_range(query, start, end, step="1m"):
+        if query.startswith("rate(http_requests_total") and "5.." in query:
+            # Error rate for svc-7 only
+            return [{"metric": {"pod": "svc-7-abc"}, "values": [[1700000000, "0.5"]]}]
+        return []
+
+    prometheus.query_range = AsyncMock(side_effect=query_range)
+    service = LiveDiagnosticsService(prometheus, mock_neo4j_client, mock_predictor)
+
+    snapshot = await service.get_live_snapshot(duration_hours=1)
+
+    assert len(snapshot.services) == 30
+    assert prometheus.query_range.await_count == 5
+    health = {s.resource_id: s for s in snapshot.services}
+    assert health["svc-0"].resource_name == "Service 0"
+    assert health["svc-0"].status == "healthy"
+    assert health["svc-7"].status == "failed"
+    assert snapshot.incomplete_stages == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_returns_partial_results_after_stage_deadline(
+    mock_neo4j_client, mock_predictor
+):
+    """Test a hanging metric query is left out instead of holding up the snapshot."""
+    mock_neo4j_client.execute_query = AsyncMock(side_effect=_snapshot_topology(3))
+    # A tiny regex budget puts every service in its own batch
+    prometheus = PrometheusCollector("http://prometheus:9090", max_regex_length=1)
+
+    async def query_range(query, start, end, step="1m"):
+        if r"svc\\-1" in query:
+            await asyncio.sleep(10)
+        return []
+
+    prometheus.query_range = AsyncMock(side_effect=query_range)
+    service = LiveDiagnosticsService(
+        prometheus, mock_neo4j_client, mock_predictor, stage_timeout=0.2
+    )
+
+    snapshot = await service.get_live_snapshot(duration_hours=1)
+
+    assert [s.resource_id for s in snapshot.services] == ["svc-0", "svc-2"]
+    assert snapshot.incomplete_stages == ["service_health"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_scores_anomalies_in_one_batch(mock_neo4j_client, mock_predictor):
+    """Test anomalies come from one batch over all services' metrics."""
+    mock_neo4j_client.execute_query = AsyncMock(side_effect=_snapshot_topology(12))
+    mock_predictor.detect_anomalies = AsyncMock()
+    prometheus = PrometheusCollector("http://prometheus:9090")
+
+    async def query_range(query, start, end, step="1m"):
+        if not query.startswith("rate(container_cpu_usage_seconds_total"):
+            return []
+        # CPU of svc-5 is far above that of the other pods
+        return [
+            {"metric": {"pod": f"svc-{i}-abc"}, "values": [[1700000000, "0.9" if i == 5 else f"0.1{i}"]]}
+            for i in range(12)
+        ]
+
+    prometheus.query_range = AsyncMock(side_effect=query_range)
+    service = LiveDiagnosticsService(prometheus, mock_neo4j_client, mock_predictor)
+
+    snapshot = await service.get_live_snapshot(duration_hours=1)
+
+    mock_predictor.detect_anomalies.assert_not_called()
+    assert len(snapshot.anomaly_scores) == 12
+    assert [a.resource_id for a in snapshot.anomalies] == ["svc-5"]
+    anomaly = snapshot.anomalies[0]
+    assert anomaly.metric_name == "cpu_usage"
+    assert anomaly.current_value == 0.9
+    assert anomaly.resource_name == "Service 5"
+    assert anomaly.severity == "critical"
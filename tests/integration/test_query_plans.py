@@ -0,0 +1,74 @@
+"""
+Plan checks for catalogued Cypher queries.
+
+Runs ``EXPLAIN`` for every query in the query catalog against a local Neo4j
+and fails if any plan contains an ``AllNodesScan``.
+
+Requires a running Neo4j, e.g.:
+
+    docker run -p 7687:7687 -e NEO4J_AUTH=neo4j/password neo4j:5.13
+    NEO4J_URI=bolt://localhost:7687 NEO4J_PASSWORD=password pytest tests/integration/test_query_plans.py
+
+Skipped when NEO4J_URI is not set or the server is unreachable.
+"""
+
+import importlib
+import os
+
+import pytest
+
+from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.query_catalog import catalogued_modules, get_query_catalog
+
+for module in catalogued_modules():
+    importlib.import_module(module)
+
+
+def _operators(plan):
+    """Yield every operator type in a plan tree."""
+    yield plan["operatorType"]
+    for child in plan.get("children", []):
+        yield from _operators(child)
+
+
+@pytest.fixture(scope="module")
+def neo4j_client():
+    """Connect to the local Neo4j and make sure the schema exists."""
+    uri = os.environ.get("NEO4J_URI")
+    if not uri:
+        pytest.skip("NEO4J_URI not set; requires running Neo4j instance")
+
+    client = Neo4jClient(
+        uri=uri,
+        username=os.environ.get("NEO4J_USERNAME", "neo4j"),
+        password=os.environ.get("NEO4J_PASSWORD", "password"),
+        enable_query_cache=False,
+    )
+    try:
+        client.connect()
+    except Exception as e:
+        pytest.skip(f"Neo4j not reachable at {uri}: {e}")
+
+    client.initialize_schema()
+    yield client
+    client.close()
+
+
+def test_catalog_is_populated():
+    """Test the analysis modules register their queries."""
+    assert len(get_query_catalog()) > 0
+
+
+@pytest.mark.parametrize(
+    "name", sorted(query.name for query in get_query_catalog()), ids=lambda name: name
+)
+def test_query_plan_has_no_all_nodes_scan(neo4j_client, name):
+    """Test each catalogued query is planned without scanning every node."""
+    catalog = get_query_catalog()
+    with neo4j_client.session() as session:
+        summary = session.run(
+            f"EXPLAIN {catalog.get(name)}", **catalog.example_parameters(name)
+        ).consume()
+
+    operators = [op.split("@")[0] for op in _operators(summary.plan)]
+    assert "AllNodesScan" not in operators, f"{name} plan: {operators}"
@@ -257,9 +257,10 @@ class TestRuleEvaluation:
             resource_name="Service 1",
             metric_name="error_rate",
             severity="critical",
-            deviation=5.0,
+            deviation_percentage=500.0,
         )
-        mock_diagnostics_service.detect_anomalies = AsyncMock(return_value=[mock_anomaly])
+        mock_snapshot = mock_diagnostics_service.get_live_snapshot.return_value
+        mock_snapshot.anomalies = [mock_anomaly]
         
         rule = AlertRule(
             id="rule-1",
@@ -273,6 +274,7 @@ class TestRuleEvaluation:
         
         assert len(alerts) == 1
         assert alerts[0].severity == AlertSeverity.CRITICAL
+        assert "Deviation: 500.00" in alerts[0].message
     
     @pytest.mark.asyncio
     async def test_disabled_rule_not_evaluated(self, alerting_engine, mock_diagnostics_service):
@@ -303,6 +305,104 @@ class TestRuleEvaluation:
         assert len(alerts) == 0
 
 
+class TestEvaluationContext:
+    """Test the shared per-tick evaluation context."""
+    
+    @pytest.mark.asyncio
+    async def test_rules_share_one_snapshot(self, alerting_engine, mock_diagnostics_service):
+        """Test that all rules of a tick evaluate against a single snapshot."""
+        for i in range(10):
+            await alerting_engine.add_rule(
+                AlertRule(
+                    id=f"rule-{i}",
+                    name=f"Rule {i}",
+                    trigger_type=list(TriggerType)[i % len(TriggerType)],
+                    threshold=50.0,
+                )
+            )
+        
+        await alerting_engine.evaluate_rules(duration_hours=1)
+        
+        assert mock_diagnostics_service.get_live_snapshot.await_count == 1
+        mock_diagnostics_service.detect_anomalies.assert_not_awaited()
+        
+        # Every tick gets a fresh snapshot
+        await alerting_engine.evaluate_rules(duration_hours=1)
+        assert mock_diagnostics_service.get_live_snapshot.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_no_snapshot_without_rules(self, alerting_engine, mock_diagnostics_service):
+        """Test that the snapshot is only fetched when a rule needs it."""
+        alerts = await alerting_engine.evaluate_rules(duration_hours=1)
+        
+        assert alerts == []
+        mock_diagnostics_service.get_live_snapshot.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_scoped_rule_only_sees_its_resources(
+        self, alerting_engine, mock_diagnostics_service
+    ):
+        """Test that a rule scoped to resources ignores all others."""
+        mock_snapshot = mock_diagnostics_service.get_live_snapshot.return_value
+        mock_snapshot.services = [
+            MagicMock(resource_id="service-1", resource_name="Service 1", health_score=20.0),
+            MagicMock(resource_id="service-2", resource_name="Service 2", health_score=90.0),
+        ]
+        mock_snapshot.traffic_patterns = [
+            MagicMock(
+                source_id="service-1",
+                target_id="db-1",
+                request_rate=10.0,
+                error_rate=0.5,
+                is_abnormal=True,
+            ),
+        ]
+        
+        await alerting_engine.add_rule(
+            AlertRule(
+                id="scoped-health",
+                name="Service 2 Health",
+                trigger_type=TriggerType.HEALTH_SCORE_DROP,
+                threshold=50.0,
+                metadata={"resource_ids": ["service-2", "unknown"]},
+            )
+        )
+        await alerting_engine.add_rule(
+            AlertRule(
+                id="scoped-traffic",
+                name="Database Traffic",
+                trigger_type=TriggerType.TRAFFIC_PATTERN_ANOMALY,
+                metadata={"resource_ids": ["db-1"]},
+            )
+        )
+        
+        alerts = await alerting_engine.evaluate_rules(duration_hours=1)
+        
+        assert [alert.rule_id for alert in alerts] == ["scoped-traffic"]
+        assert "service-1 → db-1" in alerts[0].message
+    
+    @pytest.mark.asyncio
+    async def test_evaluation_timings_recorded(self, alerting_engine, mock_diagnostics_service):
+        """Test that per-rule and snapshot timings are kept for the last tick."""
+        await alerting_engine.add_rule(
+            AlertRule(id="rule-1", name="Rule 1", trigger_type=TriggerType.HEALTH_SCORE_DROP)
+        )
+        await alerting_engine.add_rule(
+            AlertRule(id="rule-2", name="Rule 2", trigger_type=TriggerType.SERVICE_FAILURE)
+        )
+        
+        with patch("topdeck.monitoring.alerting.record_alert_rule_evaluation") as record:
+            await alerting_engine.evaluate_rules(duration_hours=1)
+        
+        stats = alerting_engine.get_evaluation_stats()
+        assert set(stats["rule_seconds"]) == {"rule-1", "rule-2"}
+        assert stats["snapshot_seconds"] is not None
+        assert {call.args[:2] for call in record.call_args_list} == {
+            ("health_score_drop", "not_triggered"),
+            ("service_failure", "not_triggered"),
+        }
+
+
 class TestAlertDeduplication:
     """Test alert deduplication logic."""
     
@@ -0,0 +1,82 @@
+"""Tests for the batch anomaly engine."""
+
+import numpy as np
+
+from topdeck.monitoring.anomaly_engine import BatchAnomalyEngine, robust_z_scores
+
+FEATURES = ["cpu_usage", "error_rate"]
+
+
+def _fleet(count=20, seed=3):
+    """Feature rows of similar resources, evenly spread around a shared level."""
+    rng = np.random.default_rng(seed)
+    cpu = rng.permutation(np.linspace(0.45, 0.55, count))
+    errors = rng.permutation(np.linspace(0.008, 0.012, count))
+    return np.column_stack([cpu, errors])
+
+
+def test_robust_z_scores_flag_outlier_column():
+    """Test z-scores are computed per column and ignore missing values."""
+    features = _fleet()
+    features[4, 1] = 0.5
+    features[7, 0] = np.nan
+
+    z, median = robust_z_scores(features)
+
+    assert z.shape == features.shape
+    assert np.abs(z[4, 1]) > 10
+    assert np.abs(np.delete(z[:, 1], 4)).max() < 4
+    assert z[7, 0] == 0.0
+    assert median[1] == np.median(features[:, 1])
+
+
+def test_score_reports_outlier_metric():
+    """Test the deviating resource gets a high score for the deviating metric."""
+    engine = BatchAnomalyEngine(min_training_rows=1000)
+    features = _fleet()
+    features[2, 1] = 0.4
+    ids = [f"pod-{i}" for i in range(len(features))]
+
+    scores = engine.score("pod", ids, features, FEATURES)
+
+    by_id = {s.resource_id: s for s in scores}
+    assert by_id["pod-2"].score == 1.0
+    assert by_id["pod-2"].metric_name == "error_rate"
+    assert by_id["pod-2"].value == 0.4
+    assert max(s.score for s in scores if s.resource_id != "pod-2") < 0.3
+    # Not enough training rows for a model yet
+    assert by_id["pod-2"].isolation_score is None
+
+
+def test_model_is_cached_and_refitted_on_schedule():
+    """Test the per-type model is fitted once and reused until refit is due."""
+    engine = BatchAnomalyEngine(min_training_rows=16, refit_interval=3600)
+    ids = [f"pod-{i}" for i in range(20)]
+
+    first = engine.score("pod", ids, _fleet(seed=1), FEATURES)
+    engine.score("pod", ids, _fleet(seed=2), FEATURES)
+
+    assert first[0].isolation_score is not None
+    stats = engine.get_stats()
+    assert stats["fits"] == 1
+    assert stats["types"]["pod"]["training_rows"] == 40
+
+    engine.refit_interval = 0
+    engine.score("pod", ids, _fleet(seed=3), FEATURES)
+    assert engine.get_stats()["fits"] == 2
+
+
+def test_too_few_peers_are_not_compared():
+    """Test a couple of resources are not scored against each other."""
+    engine = BatchAnomalyEngine(min_training_rows=1000)
+
+    scores = engine.score(
+        "database",
+        ["db-1", "db-2"],
+        np.array([[1.0, 10.0], [100.0, 30.0]]),
+        ["connections", "latency_p95"],
+    )
+
+    assert [s.score for s in scores] == [0.0, 0.0]
+    assert [s.expected_value for s in scores] == [50.5, 50.5]
+    assert engine.score("database", [], np.empty((0, 1)), ["connections"]) == []
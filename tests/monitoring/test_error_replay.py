@@ -2,10 +2,13 @@
 Tests for error replay service.
 """
 
-import pytest
+import asyncio
+import json
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 from topdeck.monitoring.error_replay import (
     ErrorReplayService,
     ErrorSearchFilter,
@@ -125,6 +128,128 @@ async def test_capture_error_with_context(error_replay_service, mock_neo4j_clien
         assert error.affected_resources == ["app-001"]
 
 
+def _patch_collectors(service, **overrides):
+    """Patch every context collector, with overrides as side effects."""
+    defaults = {
+        "_collect_surrounding_logs": [],
+        "_collect_metrics_at_time": {},
+        "_collect_traces": [],
+        "_capture_topology_snapshot": {},
+        "_find_related_errors": [],
+        "_identify_affected_resources": [],
+        "_get_deployment_context": None,
+    }
+    return patch.multiple(
+        service,
+        **{
+            name: AsyncMock(side_effect=overrides[name])
+            if name in overrides
+            else AsyncMock(return_value=value)
+            for name, value in defaults.items()
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_capture_error_runs_collectors_concurrently(mock_neo4j_client):
+    """Test collectors run at the same time and slow ones enrich the snapshot later."""
+    session = mock_neo4j_client.session.return_value.__aenter__.return_value
+    session.run = AsyncMock()
+    service = ErrorReplayService(neo4j_client=mock_neo4j_client, capture_timeout=0.05)
+    metrics_ready = asyncio.Event()
+
+    async def slow_metrics(*args):
+        await metrics_ready.wait()
+        return {"cpu_usage": 97.0}
+
+    with _patch_collectors(
+        service,
+        _collect_metrics_at_time=slow_metrics,
+        _collect_surrounding_logs=[[{"message": "connection reset"}]],
+    ):
+        error = await service.capture_error(
+            message="Connection reset",
+            severity=ErrorSeverity.HIGH,
+            source=ErrorSource.APPLICATION,
+            resource_id="api-001",
+        )
+
+        assert error.logs == [{"message": "connection reset"}]
+        assert error.metrics == {}
+        assert error.metadata["timed_out_collectors"] == ["metrics"]
+        assert error.metadata["enrichment_pending"] is True
+        assert session.run.await_count == 1
+
+        metrics_ready.set()
+        await service.wait_for_enrichment()
+
+    assert session.run.await_count == 2
+    params = session.run.call_args.args[1]
+    assert params["error_id"] == error.error_id
+    assert json.loads(params["metrics"]) == {"cpu_usage": 97.0}
+    assert json.loads(params["metadata"]) == {"timed_out_collectors": ["metrics"]}
+
+
+@pytest.mark.asyncio
+async def test_capture_error_records_failed_collectors(mock_neo4j_client):
+    """Test collectors that raise or outlive the enrichment deadline are recorded."""
+    session = mock_neo4j_client.session.return_value.__aenter__.return_value
+    session.run = AsyncMock()
+    service = ErrorReplayService(
+        neo4j_client=mock_neo4j_client, capture_timeout=0.01, enrichment_timeout=0.01
+    )
+
+    async def hang(*args):
+        await asyncio.Event().wait()
+
+    with _patch_collectors(
+        service,
+        _collect_traces=hang,
+        _find_related_errors=RuntimeError("Neo4j unavailable"),
+    ):
+        error = await service.capture_error(
+            message="Timeout",
+            severity=ErrorSeverity.MEDIUM,
+            source=ErrorSource.APPLICATION,
+            resource_id="api-001",
+        )
+        await service.wait_for_enrichment()
+
+    assert error.metadata["failed_collectors"] == ["related_errors"]
+    assert error.metadata["timed_out_collectors"] == ["traces"]
+    metadata = json.loads(session.run.call_args.args[1]["metadata"])
+    assert metadata["failed_collectors"] == ["related_errors", "traces"]
+    assert "enrichment_pending" not in metadata
+
+
+@pytest.mark.asyncio
+async def test_capture_error_cancels_pending_collectors_when_store_fails(mock_neo4j_client):
+    """Test collectors that missed the deadline are cancelled if the snapshot cannot be stored."""
+    session = mock_neo4j_client.session.return_value.__aenter__.return_value
+    session.run = AsyncMock(side_effect=RuntimeError("Neo4j unavailable"))
+    service = ErrorReplayService(neo4j_client=mock_neo4j_client, capture_timeout=0.01)
+    cancelled = asyncio.Event()
+
+    async def hang(*args):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with _patch_collectors(service, _collect_traces=hang):
+        with pytest.raises(RuntimeError, match="Neo4j unavailable"):
+            await service.capture_error(
+                message="Timeout",
+                severity=ErrorSeverity.MEDIUM,
+                source=ErrorSource.APPLICATION,
+                resource_id="api-001",
+            )
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    assert not service._enrichment_tasks
+
+
 @pytest.mark.asyncio
 async def test_search_errors_by_severity(error_replay_service, mock_neo4j_client):
     """Test searching errors by severity."""
@@ -0,0 +1,122 @@
+"""Tests for incremental live diagnostics views."""
+
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+
+from topdeck.monitoring.live_diagnostics import (
+    AnomalyAlert,
+    LiveDiagnosticsSnapshot,
+    ServiceHealthStatus,
+)
+from topdeck.monitoring.live_diagnostics_delta import (
+    SubscriptionFilter,
+    diff_views,
+    snapshot_view,
+)
+
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _service(resource_id, status="healthy", health_score=95.0, at=NOW, cpu_usage=0.2):
+    return ServiceHealthStatus(
+        resource_id=resource_id,
+        resource_name=resource_id.title(),
+        resource_type="pod",
+        status=status,
+        health_score=health_score,
+        anomalies=[],
+        metrics={"cpu_usage": cpu_usage},
+        last_updated=at,
+    )
+
+
+def _anomaly(resource_id, at=NOW):
+    return AnomalyAlert(
+        alert_id=f"{resource_id}_cpu_usage_{at.isoformat()}",
+        resource_id=resource_id,
+        resource_name=resource_id.title(),
+        severity="high",
+        metric_name="cpu_usage",
+        current_value=0.9,
+        expected_value=0.2,
+        deviation_percentage=350.0,
+        detected_at=at,
+        message="cpu_usage is anomalous",
+        potential_causes=[],
+    )
+
+
+def _snapshot(services, anomalies=(), at=NOW):
+    return LiveDiagnosticsSnapshot(
+        timestamp=at,
+        overall_health="healthy",
+        services=list(services),
+        anomalies=list(anomalies),
+        traffic_patterns=[],
+        failing_dependencies=[],
+        namespaces={"web": "shop", "api": "shop", "db": "data"},
+    )
+
+
+def test_unchanged_snapshot_has_no_delta():
+    """Test timestamps alone do not count as changes."""
+    later = NOW + timedelta(seconds=10)
+    first = snapshot_view(_snapshot([_service("web")], [_anomaly("web")]))
+    second = snapshot_view(
+        _snapshot([_service("web", at=later)], [_anomaly("web", at=later)], at=later)
+    )
+
+    assert diff_views(first, second) is None
+
+
+def test_metric_samples_alone_do_not_count_as_changes():
+    """Test services are only re-sent when their state changes."""
+    first = snapshot_view(_snapshot([_service("web"), _service("api")]))
+    second = snapshot_view(
+        _snapshot(
+            [_service("web", cpu_usage=0.3), _service("api", "degraded", 60.0, cpu_usage=0.7)]
+        )
+    )
+
+    delta = diff_views(first, second)
+
+    assert delta["services"]["upserted"] == [second.sections["services"]["api"]]
+    assert delta["services"]["upserted"][0]["metrics"] == {"cpu_usage": 0.7}
+
+
+def test_delta_holds_changed_and_removed_items_only():
+    """Test only changed services and anomalies are sent."""
+    first = snapshot_view(_snapshot([_service("web"), _service("api"), _service("db")]))
+    second = snapshot_view(
+        _snapshot(
+            [_service("web"), _service("api", "degraded", 60.0)],
+            [_anomaly("api")],
+        )
+    )
+
+    delta = diff_views(first, second)
+
+    assert [s["resource_id"] for s in delta["services"]["upserted"]] == ["api"]
+    assert delta["services"]["removed"] == ["db"]
+    assert [a["key"] for a in delta["anomalies"]["upserted"]] == ["api:cpu_usage"]
+    assert "traffic_patterns" not in delta
+    assert delta["overall_health"] == "healthy"
+
+
+def test_view_filtered_by_resource_and_namespace():
+    """Test subscriptions select resources by ID or namespace."""
+    snapshot = _snapshot([_service("web"), _service("api"), _service("db")], [_anomaly("db")])
+    view = snapshot_view(snapshot)
+
+    by_namespace = view.filtered(SubscriptionFilter(namespaces={"data"}))
+    assert list(by_namespace.sections["services"]) == ["db"]
+    assert list(by_namespace.sections["anomalies"]) == ["db:cpu_usage"]
+
+    by_id = view.filtered(SubscriptionFilter(resource_ids={"web"}, namespaces={"data"}))
+    assert sorted(by_id.sections["services"]) == ["db", "web"]
+
+    # Changes outside the subscription do not produce a delta
+    changed = snapshot_view(replace(snapshot, services=[_service("web", "failed", 10.0)]))
+    subscription = SubscriptionFilter(namespaces={"data"})
+    delta = diff_views(by_namespace, changed.filtered(subscription))
+    assert delta["services"] == {"upserted": [], "removed": ["db"]}
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, Mock
 import pytest
 
 from topdeck.monitoring.collectors.prometheus import PrometheusCollector
+from topdeck.monitoring.collectors.range_fetch import decode_series
 from topdeck.monitoring.load_detector import (
     LoadBaseline,
     LoadChangeDetector,
@@ -22,6 +23,7 @@ def mock_prometheus():
     collector = Mock(spec=PrometheusCollector)
     collector.query = AsyncMock()
     collector.query_range = AsyncMock()
+    collector.fetch_range = AsyncMock(return_value=[])
     return collector
 
 
@@ -36,16 +38,18 @@ async def test_detect_scaling_events_scale_up(load_detector, mock_prometheus):
     """Test detection of scale-up events."""
     # Mock Prometheus data showing pod count increase
     now = datetime.now(UTC)
-    mock_prometheus.query_range.return_value = [
-        {
-            "metric": {"deployment": "test-service"},
-            "values": [
-                [now.timestamp() - 600, "2"],  # 10 min ago: 2 pods
-                [now.timestamp() - 300, "2"],  # 5 min ago: 2 pods
-                [now.timestamp(), "5"],  # now: 5 pods
-            ],
-        }
-    ]
+    mock_prometheus.fetch_range.return_value = decode_series(
+        [
+            {
+                "metric": {"deployment": "test-service"},
+                "values": [
+                    [now.timestamp() - 600, "2"],  # 10 min ago: 2 pods
+                    [now.timestamp() - 300, "2"],  # 5 min ago: 2 pods
+                    [now.timestamp(), "5"],  # now: 5 pods
+                ],
+            }
+        ]
+    )
 
     events = await load_detector.detect_scaling_events("test-service", lookback_hours=1)
 
@@ -60,16 +64,18 @@ async def test_detect_scaling_events_scale_up(load_detector, mock_prometheus):
 async def test_detect_scaling_events_scale_down(load_detector, mock_prometheus):
     """Test detection of scale-down events."""
     now = datetime.now(UTC)
-    mock_prometheus.query_range.return_value = [
-        {
-            "metric": {"deployment": "test-service"},
-            "values": [
-                [now.timestamp() - 600, "5"],  # 10 min ago: 5 pods
-                [now.timestamp() - 300, "5"],  # 5 min ago: 5 pods
-                [now.timestamp(), "2"],  # now: 2 pods
-            ],
-        }
-    ]
+    mock_prometheus.fetch_range.return_value = decode_series(
+        [
+            {
+                "metric": {"deployment": "test-service"},
+                "values": [
+                    [now.timestamp() - 600, "5"],  # 10 min ago: 5 pods
+                    [now.timestamp() - 300, "5"],  # 5 min ago: 5 pods
+                    [now.timestamp(), "2"],  # now: 2 pods
+                ],
+            }
+        ]
+    )
 
     events = await load_detector.detect_scaling_events("test-service", lookback_hours=1)
 
@@ -83,17 +89,19 @@ async def test_detect_scaling_events_scale_down(load_detector, mock_prometheus):
 async def test_detect_scaling_events_multiple(load_detector, mock_prometheus):
     """Test detection of multiple scaling events."""
     now = datetime.now(UTC)
-    mock_prometheus.query_range.return_value = [
-        {
-            "metric": {"deployment": "test-service"},
-            "values": [
-                [now.timestamp() - 900, "2"],
-                [now.timestamp() - 600, "5"],  # Scale up to 5
-                [now.timestamp() - 300, "5"],
-                [now.timestamp(), "3"],  # Scale down to 3
-            ],
-        }
-    ]
+    mock_prometheus.fetch_range.return_value = decode_series(
+        [
+            {
+                "metric": {"deployment": "test-service"},
+                "values": [
+                    [now.timestamp() - 900, "2"],
+                    [now.timestamp() - 600, "5"],  # Scale up to 5
+                    [now.timestamp() - 300, "5"],
+                    [now.timestamp(), "3"],  # Scale down to 3
+                ],
+            }
+        ]
+    )
 
     events = await load_detector.detect_scaling_events("test-service", lookback_hours=1)
 
@@ -105,7 +113,7 @@ async def test_detect_scaling_events_multiple(load_detector, mock_prometheus):
 @pytest.mark.asyncio
 async def test_detect_scaling_events_no_data(load_detector, mock_prometheus):
     """Test handling when no scaling data is available."""
-    mock_prometheus.query_range.return_value = []
+    mock_prometheus.fetch_range.return_value = []
 
     events = await load_detector.detect_scaling_events("test-service", lookback_hours=1)
 
@@ -178,16 +186,18 @@ async def test_predict_load_impact_with_history(load_detector, mock_prometheus):
     """Test load prediction with historical data."""
     # Mock historical scaling events
     now = datetime.now(UTC)
-    mock_prometheus.query_range.return_value = [
-        {
-            "metric": {"deployment": "test-service"},
-            "values": [
-                [now.timestamp() - 86400, "2"],  # 1 day ago: 2 pods
-                [now.timestamp() - 43200, "5"],  # 12 hours ago: 5 pods
-                [now.timestamp(), "5"],  # now: 5 pods
-            ],
-        }
-    ]
+    mock_prometheus.fetch_range.return_value = decode_series(
+        [
+            {
+                "metric": {"deployment": "test-service"},
+                "values": [
+                    [now.timestamp() - 86400, "2"],  # 1 day ago: 2 pods
+                    [now.timestamp() - 43200, "5"],  # 12 hours ago: 5 pods
+                    [now.timestamp(), "5"],  # now: 5 pods
+                ],
+            }
+        ]
+    )
 
     # Need to set up load_detector.analyze_load_impact to return mock data
     mock_impact = LoadImpact(
@@ -434,15 +444,17 @@ def test_extract_avg_value_invalid_data(load_detector):
 async def test_scaling_event_cache(load_detector, mock_prometheus):
     """Test that scaling events are cached."""
     now = datetime.now(UTC)
-    mock_prometheus.query_range.return_value = [
-        {
-            "metric": {"deployment": "test-service"},
-            "values": [
-                [now.timestamp() - 600, "2"],
-                [now.timestamp(), "5"],
-            ],
-        }
-    ]
+    mock_prometheus.fetch_range.return_value = decode_series(
+        [
+            {
+                "metric": {"deployment": "test-service"},
+                "values": [
+                    [now.timestamp() - 600, "2"],
+                    [now.timestamp(), "5"],
+                ],
+            }
+        ]
+    )
 
     # First call should populate cache
     events1 = await load_detector.detect_scaling_events("test-service", lookback_hours=1)
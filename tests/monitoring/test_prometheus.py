@@ -1,7 +1,10 @@
 """Tests for Prometheus collector."""
 
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+from urllib.parse import quote_plus
 
+import numpy as np
 import pytest
 
 from topdeck.monitoring.collectors.prometheus import (
@@ -9,6 +12,14 @@ from topdeck.monitoring.collectors.prometheus import (
     MetricValue,
     PrometheusCollector,
 )
+from topdeck.monitoring.collectors.promql_batch import demultiplex, plan_batches
+from topdeck.monitoring.collectors.range_fetch import (
+    MAX_POINTS_PER_SERIES,
+    choose_step,
+    decode_series,
+    parse_step,
+    plan_chunks,
+)
 
 
 @pytest.fixture
@@ -133,3 +144,156 @@ def test_calculate_health_score_with_error_rate(prometheus_collector):
 
     score = prometheus_collector._calculate_health_score(metrics, anomalies)
     assert score < 100.0  # Should be reduced due to error rate
+
+
+def test_plan_batches_groups_resources_per_metric():
+    """Test resources of one kind share a query per metric."""
+    batches = plan_batches({"web-1": "pod", "web-2": "service", "db-1": "database", "x": "vnet"})
+
+    pod_batches = [b for b in batches if b.label == "pod"]
+    assert len(pod_batches) == 5
+    assert all(b.resource_ids == ["web-1", "web-2"] for b in pod_batches)
+    assert 'pod=~".*(web\\\\-1|web\\\\-2).*"' in pod_batches[0].query
+    assert len([b for b in batches if b.label == "instance"]) == 3
+
+
+def test_plan_batches_chunks_by_regex_and_url_length():
+    """Test large resource sets are split so every query stays within the limits."""
+    resources = {f"service-{i:04d}": "pod" for i in range(500)}
+
+    batches = plan_batches(resources, max_regex_length=300, max_url_length=2000)
+
+    chunks = {tuple(b.resource_ids) for b in batches}
+    assert len(chunks) > 1
+    assert sorted(rid for chunk in chunks for rid in chunk) == sorted(resources)
+    assert all(len(quote_plus(b.query)) < 2000 for b in batches)
+
+
+def test_demultiplex_maps_series_to_resources():
+    """Test result series go to the resources whose ID occurs in their label."""
+    batch = plan_batches({"web": "pod", "api": "pod"})[0]
+    results = [
+        {"metric": {"pod": "web"}, "values": []},
+        {"metric": {"pod": "api-7d9f"}, "values": []},
+        {"metric": {"pod": "other"}, "values": []},
+    ]
+
+    by_resource = demultiplex(batch, results)
+
+    assert by_resource == {"web": [results[0]], "api": [results[1]]}
+
+
+@pytest.mark.asyncio
+async def test_get_resources_metrics_uses_batched_queries(prometheus_collector):
+    """Test metrics for many resources come from one query per metric."""
+    error_series = {"metric": {"pod": "web-2-xyz"}, "values": [[1700000000, "0.2"]]}
+
+    async def query_range(query, start, end, step="1m"):
+        return [error_series] if 'status=~"5.."' in query else []
+
+    prometheus_collector.query_range = AsyncMock(side_effect=query_range)
+
+    metrics = await prometheus_collector.get_resources_metrics(
+        {f"web-{i}": "pod" for i in range(20)}
+    )
+
+    assert prometheus_collector.query_range.await_count == 5
+    assert len(metrics) == 20
+    assert metrics["web-2"].metrics["error_rate"].values[0].value == 0.2
+    assert metrics["web-2"].anomalies
+    assert metrics["web-3"].health_score == 100.0
+
+
+@pytest.mark.asyncio
+async def test_get_resource_metrics_without_results_when_queries_fail(prometheus_collector):
+    """Test a resource whose batched queries failed gets metrics without series."""
+    prometheus_collector.query_range = AsyncMock(side_effect=RuntimeError("unavailable"))
+
+    metrics = await prometheus_collector.get_resource_metrics("web-1", "pod")
+
+    assert metrics.resource_id == "web-1"
+    assert metrics.metrics == {}
+    assert metrics.health_score == 100.0
+
+
+def test_parse_step_and_choose_step():
+    """Test step parsing and automatic step selection."""
+    assert parse_step("5m") == 300
+    assert parse_step("1h30m") == 5400
+    assert parse_step("15") == 15
+    with pytest.raises(ValueError):
+        parse_step("5 minutes")
+
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    assert choose_step(start, start + timedelta(days=30), resolution=720) == 3600
+    assert choose_step(start, start + timedelta(minutes=1), resolution=1000) == 1
+
+
+def test_plan_chunks_cover_range_without_overlap():
+    """Test long ranges are split into chunks within the points limit."""
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    end = start + timedelta(days=90)
+
+    chunks = plan_chunks(start, end, step=300)
+
+    assert len(chunks) == 3
+    assert chunks[0][0] == start and chunks[-1][1] == end
+    for chunk_start, chunk_end in chunks:
+        assert (chunk_end - chunk_start).total_seconds() / 300 + 1 <= MAX_POINTS_PER_SERIES
+    for (_, previous_end), (next_start, _) in zip(chunks, chunks[1:], strict=False):
+        assert next_start - previous_end == timedelta(seconds=300)
+    assert plan_chunks(start, start + timedelta(hours=1), step=60) == [
+        (start, start + timedelta(hours=1))
+    ]
+
+
+def test_decode_series_into_float_arrays():
+    """Test sample pairs are decoded into float64 arrays."""
+    series = decode_series(
+        [{"metric": {"pod": "web"}, "values": [[1700000000, "1.5"], [1700000060, "NaN"]]}]
+    )
+
+    assert series[0].labels == {"pod": "web"}
+    assert series[0].timestamps.dtype == np.float64
+    assert series[0].values[0] == 1.5
+    assert np.isnan(series[0].values[1])
+
+
+@pytest.mark.asyncio
+async def test_long_range_queries_are_chunked_and_merged(prometheus_collector):
+    """Test a range beyond the points limit is fetched in chunks and merged."""
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    end = start + timedelta(days=60)
+
+    async def query_range_once(query, chunk_start, chunk_end, step):
+        timestamps = [chunk_start.timestamp(), chunk_end.timestamp()]
+        return [{"metric": {"pod": "web"}, "values": [[t, "1"] for t in timestamps]}]
+
+    prometheus_collector._query_range_once = AsyncMock(side_effect=query_range_once)
+
+    series = await prometheus_collector.fetch_range("up", start, end, step="5m")
+
+    assert prometheus_collector._query_range_once.await_count == 2
+    assert len(series) == 1
+    assert series[0].timestamps[0] == start.timestamp()
+    assert series[0].timestamps[-1] == end.timestamp()
+    assert np.all(np.diff(series[0].timestamps) > 0)
+
+    results = await prometheus_collector.query_range("up", start, end, step="5m")
+    assert results[0]["values"][0] == [start.timestamp(), "1.0"]
+    assert len(results[0]["values"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_fetch_range_chooses_step_from_resolution(prometheus_collector):
+    """Test the step follows the caller's resolution budget."""
+    prometheus_collector._query_range_once = AsyncMock(return_value=[])
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+
+    await prometheus_collector.fetch_range("up", start, start + timedelta(days=7), resolution=168)
+    await prometheus_collector.fetch_range(
+        "up", start, start + timedelta(hours=1), step="5m", resolution=1000
+    )
+
+    steps = [call.args[3] for call in prometheus_collector._query_range_once.await_args_list]
+    assert steps == ["3600", "300"]
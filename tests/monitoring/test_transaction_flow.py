@@ -1,7 +1,7 @@
 """Tests for transaction flow service."""
 
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -15,12 +15,12 @@ from topdeck.monitoring.transaction_flow import (
 
 @pytest.fixture
 def mock_neo4j_client():
-    """Create a mock Neo4j client."""
-    client = Mock()
-    client.driver = Mock()
-    session = Mock()
-    client.driver.session.return_value.__enter__ = Mock(return_value=session)
-    client.driver.session.return_value.__exit__ = Mock(return_value=False)
+    """Create a mock async Neo4j client."""
+    client = MagicMock()
+    session = MagicMock()
+    session.run = AsyncMock()
+    client.session.return_value.__aenter__.return_value = session
+    client.mock_session = session
     return client
 
 
@@ -186,6 +186,36 @@ async def test_find_correlation_ids_for_pod_empty(transaction_flow_service):
         assert result == []
 
 
+@pytest.mark.asyncio
+async def test_enrich_with_topology_awaits_queries(transaction_flow_service, mock_neo4j_client):
+    """Test nodes and edges are enriched through the async client."""
+    node_result = MagicMock()
+    node_result.single = AsyncMock(
+        return_value={"name": "checkout", "type": "pod", "provider": "azure"}
+    )
+    edge_result = MagicMock()
+    edge_result.single = AsyncMock(return_value={"rel_type": "CALLS", "protocol": "http"})
+    mock_neo4j_client.mock_session.run.side_effect = [node_result, edge_result]
+    flow = TransactionFlowVisualization(
+        transaction_id="txn-1",
+        start_time=datetime.utcnow(),
+        end_time=datetime.utcnow(),
+        total_duration_ms=0.0,
+        nodes=[FlowNode("pod-1", "pod-1", "unknown", datetime.utcnow())],
+        edges=[FlowEdge("pod-1", "pod-2")],
+        status="success",
+        error_count=0,
+        warning_count=0,
+        source="loki",
+    )
+
+    await transaction_flow_service._enrich_with_topology(flow)
+
+    assert flow.nodes[0].resource_name == "checkout"
+    assert flow.nodes[0].metadata["cloud_provider"] == "azure"
+    assert flow.edges[0].protocol == "http"
+
+
 def test_flow_node_creation():
     """Test FlowNode creation."""
     node = FlowNode(
@@ -0,0 +1,92 @@
+"""Tests for the async Neo4j client."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from topdeck.storage.async_neo4j_client import AsyncNeo4jClient
+from topdeck.storage.neo4j_client import (
+    Neo4jClient,
+    node_upsert_query,
+    relationship_upsert_query,
+)
+
+
+def _result(records=None, single=None):
+    """Async query result returning records or a single record."""
+    result = MagicMock()
+    result.data = AsyncMock(return_value=records or [])
+    result.single = AsyncMock(return_value=single)
+    result.__aiter__.return_value = records or []
+    return result
+
+
+@pytest.fixture
+def client():
+    """Async Neo4j client with a mocked session."""
+    client = AsyncNeo4jClient("bolt://localhost:7687", "neo4j", "password")
+    session = MagicMock()
+    session.run = AsyncMock(return_value=_result())
+    client.session = MagicMock()
+    client.session.return_value.__aenter__.return_value = session
+    client.mock_session = session
+    return client
+
+
+async def test_execute_query_returns_records(client):
+    """Test execute_query awaits the query and returns its records."""
+    client.mock_session.run.return_value = _result([{"n": 1}, {"n": 2}])
+
+    records = await client.execute_query("MATCH (n) RETURN n", {"limit": 2})
+
+    assert records == [{"n": 1}, {"n": 2}]
+    client.mock_session.run.assert_awaited_once_with("MATCH (n) RETURN n", {"limit": 2})
+
+
+async def test_upserts_require_an_id(client):
+    """Test node upserts are rejected without an ID and use the shared queries."""
+    with pytest.raises(ValueError, match="Pod properties must include 'id'"):
+        await client.upsert_pod({"name": "web"})
+
+    client.mock_session.run.return_value = _result(single={"node_id": "4:abc:1"})
+    node_id = await client.upsert_pod({"id": "pod-1", "name": "web"})
+
+    assert node_id == "4:abc:1"
+    assert client.mock_session.run.call_args.args[0] == node_upsert_query("Pod", True)
+
+
+async def test_batch_upsert_runs_one_query_per_type(client):
+    """Test each relationship type is written with a single UNWIND query."""
+    client.mock_session.run.side_effect = lambda query, rows: _result(
+        single={"count": len(rows)}
+    )
+
+    count = await client.batch_upsert_relationships(
+        [
+            {"source_id": "a", "target_id": "b", "relationship_type": "DEPENDS_ON"},
+            {"source_id": "b", "target_id": "c", "relationship_type": "DEPENDS_ON"},
+            {"source_id": "a", "target_id": "c", "relationship_type": "ROUTES_TO"},
+        ]
+    )
+
+    assert count == 3
+    queries = [call.args[0] for call in client.mock_session.run.call_args_list]
+    assert queries == [
+        relationship_upsert_query("DEPENDS_ON"),
+        relationship_upsert_query("ROUTES_TO"),
+    ]
+
+
+async def test_cached_queries_are_shared_with_sync_client(client):
+    """Test the async client reads and invalidates the sync client's cache."""
+    query = "MATCH (r:Resource {id: $id}) RETURN r.name AS name"
+    params = {"id": "async-cache-test"}
+    sync_client = Neo4jClient("bolt://localhost:7687", "neo4j", "password")
+    sync_client._query_cache.set(query, [{"name": "cached"}], params, 60, {"label:Resource"})
+
+    assert await client.run_cached_query(query, params) == [{"name": "cached"}]
+    client.mock_session.run.assert_not_called()
+
+    client.invalidate_written(labels=["Resource"])
+    client.mock_session.run.return_value = _result([{"name": "fresh"}])
+    assert await client.run_cached_query(query, params) == [{"name": "fresh"}]
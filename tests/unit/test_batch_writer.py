@@ -0,0 +1,319 @@
+"""Tests for batched discovery persistence."""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from topdeck.discovery.change_set import content_hash
+from topdeck.discovery.models import (
+    CloudProvider,
+    DependencyCategory,
+    DependencyType,
+    DiscoveredResource,
+    DiscoveryResult,
+    Namespace,
+    ResourceDependency,
+)
+from topdeck.storage.batch_writer import (
+    DELETE_DEPENDENCIES_QUERY,
+    DELETE_RESOURCES_QUERY,
+    NODE_UPSERT_QUERIES,
+    STORED_DEPENDENCY_HASHES_QUERY,
+    STORED_NODE_HASHES_QUERY,
+    STORED_RESOURCE_IDS_QUERY,
+    GraphBatchWriter,
+    StreamingGraphWriter,
+)
+from topdeck.storage.neo4j_client import relationship_upsert_query
+
+
+@pytest.fixture
+def client():
+    """Neo4j client whose write transactions record the rows they receive."""
+    client = Mock()
+    client.session = MagicMock()
+    session = MagicMock()
+    client.session.return_value.__enter__.return_value = session
+    client.tx = Mock()
+    client.tx.run.side_effect = lambda query, rows: Mock(
+        single=Mock(return_value={"count": len(rows)})
+    )
+    session.execute_write.side_effect = lambda work: work(client.tx)
+    client.write_session = session
+    return client
+
+
+def _resource(idx: int) -> DiscoveredResource:
+    return DiscoveredResource(
+        id=f"res-{idx}",
+        name=f"resource-{idx}",
+        resource_type="web_app",
+        cloud_provider=CloudProvider.AZURE,
+        region="eastus",
+    )
+
+
+def _dependency(source: int, target: int) -> ResourceDependency:
+    return ResourceDependency(
+        source_id=f"res-{source}",
+        target_id=f"res-{target}",
+        category=DependencyCategory.NETWORK,
+        dependency_type=DependencyType.REQUIRED,
+    )
+
+
+def test_rows_are_chunked_by_batch_size(client):
+    """Test resources are written in UNWIND batches of at most batch_size rows."""
+    result = DiscoveryResult(resources=[_resource(i) for i in range(7)])
+
+    report = GraphBatchWriter(client, batch_size=3).write_discovery_result(result)
+
+    sizes = [len(call.kwargs["rows"]) for call in client.tx.run.call_args_list]
+    assert sizes == [3, 3, 1]
+    assert report.written == {"resources": 7}
+    assert [batch.size for batch in report.batches] == [3, 3, 1]
+    assert all(batch.attempts == 1 for batch in report.batches)
+    assert client.write_session.execute_write.call_count == 3
+
+
+def test_nodes_are_written_before_dependencies(client):
+    """Test every node kind is persisted before relationships."""
+    result = DiscoveryResult(
+        resources=[_resource(1), _resource(2)],
+        namespaces=[Namespace(id="ns-1", name="default", cluster_id="aks-1")],
+        dependencies=[_dependency(1, 2)],
+    )
+
+    report = GraphBatchWriter(client).write_discovery_result(result)
+
+    queries = [call.args[0] for call in client.tx.run.call_args_list]
+    assert queries == [
+        NODE_UPSERT_QUERIES["Resource"],
+        NODE_UPSERT_QUERIES["Namespace"],
+        relationship_upsert_query("DEPENDS_ON"),
+    ]
+    assert report.written == {"resources": 2, "namespaces": 1, "dependencies": 1}
+    assert report.summary()["kinds"]["dependencies"]["batches"] == 1
+
+
+def test_failing_batch_is_split_to_isolate_bad_rows(client):
+    """Test a batch that keeps failing is bisected so only the bad row is lost."""
+
+    def run(query, rows):
+        if any(row["id"] == "res-2" for row in rows):
+            raise ValueError("bad property")
+        return Mock(single=Mock(return_value={"count": len(rows)}))
+
+    client.tx.run.side_effect = run
+    result = DiscoveryResult(resources=[_resource(i) for i in range(4)])
+
+    report = GraphBatchWriter(client, batch_size=4).write_discovery_result(result)
+
+    assert report.written == {"resources": 3}
+    assert report.failed == {"resources": 1}
+    assert "res-2" in report.errors[0]
+
+
+def test_retried_transactions_are_reported(client):
+    """Test attempts made by the driver's managed retries are counted."""
+
+    def execute_write(work):
+        try:
+            work(Mock(run=Mock(side_effect=RuntimeError("deadlock"))))
+        except RuntimeError:
+            pass
+        return work(client.tx)
+
+    client.write_session.execute_write.side_effect = execute_write
+    result = DiscoveryResult(resources=[_resource(1)])
+
+    report = GraphBatchWriter(client).write_discovery_result(result)
+
+    assert report.batches[0].attempts == 2
+    assert report.written == {"resources": 1}
+
+
+def test_relationships_are_batched_per_type(client):
+    """Test relationships of different types go to their own upsert query."""
+    relationships = [
+        {"source_id": "a", "target_id": "b", "relationship_type": "DEPENDS_ON"},
+        {"source_id": "a", "target_id": "c", "relationship_type": "ROUTES_TO"},
+        {"source_id": "b", "target_id": "c", "relationship_type": "DEPENDS_ON"},
+    ]
+
+    report = GraphBatchWriter(client).write_relationships(relationships)
+
+    queries = [call.args[0] for call in client.tx.run.call_args_list]
+    assert queries == [
+        relationship_upsert_query("DEPENDS_ON"),
+        relationship_upsert_query("ROUTES_TO"),
+    ]
+    assert report.written == {"depends_on": 2, "routes_to": 1}
+
+
+def _stored_graph(client, nodes=None, resource_ids=None, edges=None, resource_types=None):
+    """Make read transactions return the given stored fingerprints."""
+
+    def run(query, **params):
+        if query == STORED_NODE_HASHES_QUERY:
+            return [
+                {"id": node_id, "content_hash": (nodes or {})[node_id]}
+                for node_id in params["node_ids"]
+                if node_id in (nodes or {})
+            ]
+        if query == STORED_RESOURCE_IDS_QUERY:
+            return [
+                {
+                    "id": node_id,
+                    "region": "eastus",
+                    "resource_type": (resource_types or {}).get(node_id, "web_app"),
+                }
+                for node_id in resource_ids or []
+            ]
+        if query == STORED_DEPENDENCY_HASHES_QUERY:
+            return [
+                {
+                    "source_id": source,
+                    "target_id": target,
+                    "discovered_method": method,
+                    "content_hash": stored_hash,
+                }
+                for (source, target, method), stored_hash in (edges or {}).items()
+                if source in params["source_ids"]
+            ]
+        raise AssertionError(f"unexpected read: {query}")
+
+    client.write_session.execute_read.side_effect = lambda work: work(Mock(run=run))
+
+
+def test_incremental_write_skips_unchanged_nodes(client):
+    """Test only new and changed resources are written."""
+    unchanged, changed, new = _resource(1), _resource(2), _resource(3)
+    _stored_graph(
+        client,
+        nodes={
+            unchanged.id: content_hash(unchanged.to_neo4j_properties()),
+            changed.id: "stale-hash",
+        },
+    )
+    result = DiscoveryResult(resources=[unchanged, changed, new])
+
+    report, changes = GraphBatchWriter(client).write_discovery_changes(result)
+
+    [call] = client.tx.run.call_args_list
+    assert [row["id"] for row in call.kwargs["rows"]] == ["res-2", "res-3"]
+    assert report.written == {"resources": 2}
+    assert changes.added == {"resources": {"res-3"}}
+    assert changes.updated == {"resources": {"res-2"}}
+    assert changes.unchanged == 1
+
+
+def test_incremental_write_deletes_stale_resources_and_edges(client):
+    """Test resources and edges no longer discovered are deleted."""
+    dependency = _dependency(1, 2)
+    method = dependency.discovered_method
+    _stored_graph(
+        client,
+        nodes={},
+        resource_ids=["res-1", "res-2", "res-9"],
+        edges={("res-1", "res-8", method): "h", ("res-1", "res-7", "monitoring"): "h"},
+    )
+    result = DiscoveryResult(resources=[_resource(1), _resource(2)], dependencies=[dependency])
+    result.mark_scanned("eastus", "web_app")
+
+    report, changes = GraphBatchWriter(client).write_discovery_changes(result, "azure")
+
+    queries = [call.args[0] for call in client.tx.run.call_args_list]
+    assert DELETE_RESOURCES_QUERY in queries
+    assert DELETE_DEPENDENCIES_QUERY in queries
+    assert changes.deleted == {"resources": {"res-9"}}
+    # Edges of other discovery methods are left alone
+    assert changes.deleted_edges == {("res-1", "res-8", method)}
+    assert changes.added_edges == {("res-1", "res-2", method)}
+
+
+def test_incremental_write_keeps_nodes_after_failed_discovery(client):
+    """Test nothing is deleted when the discovery run reported errors."""
+    _stored_graph(client, nodes={}, resource_ids=["res-1", "res-9"])
+    result = DiscoveryResult(resources=[_resource(1)], errors=["subscription timed out"])
+
+    _, changes = GraphBatchWriter(client).write_discovery_changes(result, "azure")
+
+    queries = [call.args[0] for call in client.tx.run.call_args_list]
+    assert DELETE_RESOURCES_QUERY not in queries
+    assert not changes.deleted
+
+
+def test_incremental_write_keeps_nodes_of_unscanned_partitions(client):
+    """Test an error-free run that recorded no partitions deletes no resources."""
+    _stored_graph(client, nodes={}, resource_ids=["res-1", "pod-1"])
+    result = DiscoveryResult(resources=[_resource(1)])
+
+    _, changes = GraphBatchWriter(client).write_discovery_changes(result, "gcp")
+
+    queries = [call.args[0] for call in client.tx.run.call_args_list]
+    assert DELETE_RESOURCES_QUERY not in queries
+    assert not changes.deleted
+
+
+def test_incremental_write_keeps_nodes_of_failed_partitions(client):
+    """Test a failed scan of one resource type does not delete its stored resources."""
+    vm = DiscoveredResource(
+        id="vm-1",
+        name="vm-1",
+        resource_type="virtual_machine",
+        cloud_provider=CloudProvider.AZURE,
+        region="eastus",
+    )
+    _stored_graph(
+        client,
+        nodes={},
+        resource_ids=["res-1", "res-9", "vm-1", "db-1"],
+        resource_types={"vm-1": "virtual_machine", "db-1": "sql_database"},
+        edges={("vm-1", "db-1", "heuristic"): "h"},
+    )
+    result = DiscoveryResult(resources=[_resource(1), vm], errors=["sql_database scan throttled"])
+    result.mark_scanned("eastus", "web_app")
+    result.mark_scanned("eastus", "virtual_machine")
+    result.add_dependency(
+        ResourceDependency(
+            source_id="vm-1",
+            target_id="res-1",
+            category=DependencyCategory.NETWORK,
+            dependency_type=DependencyType.REQUIRED,
+            discovered_method="heuristic",
+        )
+    )
+
+    _, changes = GraphBatchWriter(client).write_discovery_changes(result, "azure")
+
+    # Only the stale resource of a scanned partition is deleted
+    assert changes.deleted == {"resources": {"res-9"}}
+    # The edge to the unscanned database survives with it
+    assert not changes.deleted_edges
+
+
+def test_streaming_writer_diffs_chunks_and_deletes_unstreamed_resources(client):
+    """Test streamed chunks are diffed one by one and only unstreamed resources are deleted."""
+    dependency = _dependency(1, 3)
+    _stored_graph(
+        client,
+        nodes={"res-1": content_hash(_resource(1).to_neo4j_properties())},
+        resource_ids=["res-1", "res-2", "res-3", "res-9"],
+    )
+    sink = StreamingGraphWriter(GraphBatchWriter(client), incremental=True)
+
+    sink.write_resources([_resource(1), _resource(2)])
+    sink.write_resources([_resource(3)])
+    result = DiscoveryResult(subscription_id="sub-1", dependencies=[dependency])
+    result.mark_scanned("eastus", "web_app")
+    report, changes = sink.finish(result, "azure")
+
+    written = [
+        [row.get("id") or row["source_id"] for row in call.kwargs["rows"]]
+        for call in client.tx.run.call_args_list
+    ]
+    assert written == [["res-2"], ["res-3"], ["res-9"], ["res-1"]]
+    assert changes.added == {"resources": {"res-2", "res-3"}}
+    assert changes.deleted == {"resources": {"res-9"}}
+    assert report.written["resources"] == 2
@@ -0,0 +1,135 @@
+"""Tests for tag-based query cache invalidation."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from topdeck.storage.neo4j_client import Neo4jClient
+from topdeck.storage.query_cache import QueryCache, query_tags, result_tags
+
+RESOURCE_QUERY = "MATCH (r:Resource {id: $id}) RETURN r.id as id, r.name as name"
+ALL_PODS_QUERY = "MATCH (p:Pod) RETURN p.id as id"
+NEIGHBOURS_QUERY = """
+MATCH (r:Node {id: $resource_id})-[:DEPENDS_ON]->(d:Node)
+RETURN d.id as id
+"""
+
+
+def test_query_tags_cover_ids_labels_and_relationship_types():
+    """Test queries depend on their ID parameters, labels and relationship types."""
+    assert query_tags(RESOURCE_QUERY, {"id": "vm-1"}) == {"resource:vm-1", "label:Resource"}
+    assert query_tags(NEIGHBOURS_QUERY, {"resource_id": "vm-1"}) == {
+        "resource:vm-1",
+        "label:Node",
+        "relationship:DEPENDS_ON",
+    }
+    assert query_tags("MATCH (a:Resource)-[:USES|ROUTES_TO]->(b) RETURN a") == {
+        "label:Resource",
+        "relationship:USES",
+        "relationship:ROUTES_TO",
+    }
+    assert "relationship:*" in query_tags("MATCH (a:Resource)-->(b) RETURN a")
+    assert result_tags([{"id": "a", "node": {"id": "b"}, "target_id": "c"}]) == {
+        "resource:a",
+        "resource:b",
+        "resource:c",
+    }
+
+
+def test_invalidate_tags_only_drops_tagged_entries():
+    """Test invalidating one tag keeps unrelated entries cached."""
+    cache = QueryCache()
+    cache.set("q1", [1], {"id": "a"}, tags={"resource:a"})
+    cache.set("q1", [2], {"id": "b"}, tags={"resource:b"})
+    cache.set("q2", [3], tags={"label:Pod"})
+
+    assert cache.invalidate_tags({"resource:a"}) == 1
+    assert cache.get("q1", {"id": "a"}) is None
+    assert cache.get("q1", {"id": "b"}) == [2]
+    assert cache.get("q2") == [3]
+
+    assert cache.invalidate_pattern("label:*") == 1
+    assert cache.get("q2") is None
+    assert cache.get_stats()["tags"] == 1
+
+
+def test_stats_are_reported_per_tag_family():
+    """Test hits, misses, evictions and invalidations are counted per family."""
+    cache = QueryCache(max_size=1)
+    cache.get("q1", {"id": "a"}, tags={"resource:a"})
+    cache.set("q1", [1], {"id": "a"}, tags={"resource:a"})
+    cache.get("q1", {"id": "a"})
+    cache.set("q2", [2], tags={"label:Pod"})  # evicts q1
+    cache.invalidate_tags({"label:Pod"})
+
+    families = cache.get_stats()["families"]
+    assert families["resource"] == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "invalidations": 0,
+        "hit_rate": 50.0,
+    }
+    assert families["label"]["invalidations"] == 1
+
+
+@pytest.fixture
+def client():
+    """Neo4j client with its own cache and a mocked session."""
+    client = Neo4jClient("bolt://localhost:7687", "neo4j", "password")
+    client._query_cache = QueryCache()
+    session = MagicMock()
+    client.session = MagicMock()
+    client.session.return_value.__enter__.return_value = session
+    client.mock_session = session
+    return client
+
+
+def _cache_reads(client):
+    """Populate the cache with a point lookup, a neighbourhood and a label scan."""
+    client.mock_session.run.return_value = [{"id": "vm-1", "name": "vm"}]
+    client.run_cached_query(RESOURCE_QUERY, {"id": "vm-1"})
+    client.mock_session.run.return_value = [{"id": "db-1"}]
+    client.run_cached_query(NEIGHBOURS_QUERY, {"resource_id": "app-1"})
+    client.mock_session.run.return_value = [{"id": "pod-1"}]
+    client.run_cached_query(ALL_PODS_QUERY)
+    client.mock_session.run.reset_mock(return_value=True)
+
+
+def test_writes_invalidate_only_affected_entries(client):
+    """Test a resource upsert keeps cached reads of unrelated labels."""
+    _cache_reads(client)
+
+    client.upsert_resource({"id": "vm-1", "name": "renamed"})
+    client.mock_session.run.reset_mock()
+    client.mock_session.run.return_value = [{"id": "vm-1", "name": "renamed"}]
+
+    assert client.run_cached_query(RESOURCE_QUERY, {"id": "vm-1"})[0]["name"] == "renamed"
+    assert client.run_cached_query(ALL_PODS_QUERY) == [{"id": "pod-1"}]
+    assert client.mock_session.run.call_count == 1
+
+
+def test_relationship_writes_invalidate_anchored_queries(client):
+    """Test writes tagged only by relationship type drop ID-anchored traversals."""
+    _cache_reads(client)
+
+    client.invalidate_written(relationship_types=["DEPENDS_ON"])
+
+    # The point lookup and the pod scan do not traverse DEPENDS_ON edges
+    assert client.get_cache_stats()["size"] == 2
+    client.mock_session.run.return_value = []
+    assert client.run_cached_query(NEIGHBOURS_QUERY, {"resource_id": "app-1"}) == []
+
+
+def test_writes_invalidate_entries_returning_written_nodes(client):
+    """Test changing a node drops cached neighbourhoods that contain it."""
+    _cache_reads(client)
+
+    client.upsert_pod({"id": "db-1"})
+
+    # Only the point lookup of vm-1 survives
+    assert client.get_cache_stats()["size"] == 1
+    client.batch_upsert_relationships(
+        [{"source_id": "vm-1", "target_id": "x", "relationship_type": "USES"}]
+    )
+    assert client.get_cache_stats()["size"] == 0
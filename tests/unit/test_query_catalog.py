@@ -0,0 +1,80 @@
+"""Tests for the Cypher query catalog and builder."""
+
+import importlib
+import re
+
+import pytest
+
+from topdeck.storage.query_catalog import (
+    QueryBuilder,
+    QueryCatalog,
+    catalogued_modules,
+    get_query_catalog,
+)
+
+# A MATCH whose first node pattern has no label, e.g. "MATCH (r {id: $id})"
+_UNANCHORED = re.compile(r"MATCH\s+(?:\w+\s*=\s*)?\((\w+)\s*(?:\{[^}]*\})?\)")
+
+
+def _unanchored_matches(cypher: str) -> list[str]:
+    """Variables a MATCH starts from without a label and without being bound earlier."""
+    return [
+        match.group(1)
+        for match in _UNANCHORED.finditer(cypher)
+        if not re.search(rf"\b{match.group(1)}\b", cypher[: match.start()])
+    ]
+
+
+def test_builder_anchors_on_node_label():
+    """Test node patterns always carry a label."""
+    assert QueryBuilder.node("r") == "(r:Node {id: $id})"
+    assert QueryBuilder.node("n", id_param="resource_id") == "(n:Node {id: $resource_id})"
+    assert QueryBuilder.node("r", label="Resource", id_param=None) == "(r:Resource)"
+    assert QueryBuilder.node_by("r", "dep_id") == "(r:Node {id: dep_id})"
+
+
+def test_builder_type_expressions_skip_super_label():
+    """Test type fallbacks never resolve to the :Node super-label."""
+    assert "label <> 'Node'" in QueryBuilder.primary_label("n")
+    assert QueryBuilder.node_type("n").startswith("COALESCE(n.resource_type, ")
+
+
+def test_builder_rejects_invalid_identifiers():
+    """Test labels and relationship types are validated before interpolation."""
+    assert QueryBuilder.relationship_types(["DEPENDS_ON", "USES"]) == "DEPENDS_ON|USES"
+    with pytest.raises(ValueError):
+        QueryBuilder.node("r", label="Resource) DETACH DELETE (r")
+    with pytest.raises(ValueError):
+        QueryBuilder.relationship_types([])
+
+
+def test_register_normalises_and_detects_conflicts():
+    """Test registration dedents text, tracks parameters and rejects conflicts."""
+    catalog = QueryCatalog()
+    text = catalog.register(
+        "test.lookup",
+        """
+        MATCH (r:Node {id: $id})
+        RETURN r LIMIT $limit
+        """,
+    )
+
+    assert text == "MATCH (r:Node {id: $id})\nRETURN r LIMIT $limit"
+    assert catalog.get("test.lookup") == text
+    assert catalog.example_parameters("test.lookup") == {"id": "placeholder", "limit": 1}
+    # Re-registering the same text is allowed (module reloads)
+    assert catalog.register("test.lookup", text) == text
+    with pytest.raises(ValueError):
+        catalog.register("test.lookup", "MATCH (r:Node) RETURN r")
+
+
+def test_catalogued_queries_are_label_anchored():
+    """Test no catalogued query starts a MATCH from an unlabelled node."""
+    for module in catalogued_modules():
+        importlib.import_module(module)
+
+    catalog = get_query_catalog()
+    assert len(catalog) > 0
+    for query in catalog:
+        unanchored = _unanchored_matches(query.cypher)
+        assert not unanchored, f"{query.name} matches unlabelled nodes: {unanchored}"
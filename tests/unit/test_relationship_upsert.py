@@ -0,0 +1,108 @@
+"""Tests for idempotent relationship upserts and duplicate compaction."""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from topdeck.storage.neo4j_client import (
+    Neo4jClient,
+    relationship_compaction_query,
+    relationship_method_backfill_query,
+    relationship_upsert_query,
+)
+
+
+@pytest.fixture
+def client():
+    """Neo4j client with a mocked session."""
+    client = Neo4jClient("bolt://localhost:7687", "neo4j", "password")
+    session = MagicMock()
+    client.session = MagicMock()
+    client.session.return_value.__enter__.return_value = session
+    client.mock_session = session
+    return client
+
+
+def test_upsert_query_merges_on_discovered_method():
+    """Test relationships are merged, keyed on type and discovery method."""
+    query = relationship_upsert_query("USES")
+
+    assert "MERGE (source)-[r:USES {discovered_method: row.discovered_method}]->(target)" in query
+    assert "CREATE" not in query
+    with pytest.raises(ValueError):
+        relationship_upsert_query("USES]->() DETACH DELETE (x")
+
+
+def test_rows_are_grouped_by_type_with_default_method():
+    """Test rows are grouped per type and always carry a discovered_method."""
+    rows = Neo4jClient.group_relationship_rows(
+        [
+            {
+                "source_id": "a",
+                "target_id": "b",
+                "relationship_type": "DEPENDS_ON",
+                "properties": {"discovered_method": "network", "strength": 0.9},
+            },
+            {"source_id": "a", "target_id": "c", "relationship_type": "USES"},
+        ]
+    )
+
+    assert set(rows) == {"DEPENDS_ON", "USES"}
+    assert rows["DEPENDS_ON"][0]["discovered_method"] == "network"
+    assert rows["USES"][0]["discovered_method"] == "unknown"
+    assert rows["USES"][0]["properties"] == {"discovered_method": "unknown"}
+
+    with pytest.raises(ValueError, match="relationship_type"):
+        Neo4jClient.group_relationship_rows([{"source_id": "a", "target_id": "b"}])
+
+
+def test_batch_upsert_runs_one_query_per_type(client):
+    """Test each relationship type is written with a single UNWIND query."""
+    client.mock_session.run.side_effect = lambda query, rows: Mock(
+        single=Mock(return_value={"count": len(rows)})
+    )
+
+    count = client.batch_upsert_relationships(
+        [
+            {"source_id": "a", "target_id": "b", "relationship_type": "DEPENDS_ON"},
+            {"source_id": "b", "target_id": "c", "relationship_type": "DEPENDS_ON"},
+            {"source_id": "a", "target_id": "c", "relationship_type": "ROUTES_TO"},
+        ]
+    )
+
+    assert count == 3
+    queries = [call.args[0] for call in client.mock_session.run.call_args_list]
+    assert queries == [
+        relationship_upsert_query("DEPENDS_ON"),
+        relationship_upsert_query("ROUTES_TO"),
+    ]
+
+
+def test_batch_create_dependencies_is_idempotent(client):
+    """Test the legacy dependency writer merges instead of creating edges."""
+    client.mock_session.run.return_value.single.return_value = {"count": 1}
+
+    client.batch_create_dependencies(
+        [{"source_id": "a", "target_id": "b", "properties": {"category": "network"}}]
+    )
+
+    query = client.mock_session.run.call_args.args[0]
+    assert "MERGE (source)-[r:DEPENDS_ON" in query
+    assert "CREATE (source)" not in query
+
+
+def test_compaction_repeats_until_no_duplicates_remain(client):
+    """Test compaction backfills methods then deletes duplicates in batches."""
+    removed = iter([10000, 250, 0])
+    client.mock_session.execute_write.side_effect = lambda work: work(
+        Mock(run=Mock(return_value=Mock(single=Mock(return_value={"removed": next(removed)}))))
+    )
+
+    result = client.compact_duplicate_relationships(relationship_types=["DEPENDS_ON"])
+
+    assert result == {"DEPENDS_ON": 10250}
+    assert client.mock_session.execute_write.call_count == 3
+    client.mock_session.run.assert_called_once_with(
+        relationship_method_backfill_query("DEPENDS_ON")
+    )
+    assert "DELETE duplicate" in relationship_compaction_query("DEPENDS_ON")
@@ -4,12 +4,14 @@ Unit tests for the discovery scheduler.
 
 from contextlib import contextmanager
 from datetime import datetime
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 from topdeck.common.scheduler import DiscoveryScheduler, get_scheduler
+from topdeck.discovery.change_set import ChangeSet, content_hash
 from topdeck.discovery.models import DiscoveryResult
+from topdeck.storage.batch_writer import BatchWriteReport
 
 
 @contextmanager
@@ -44,6 +46,8 @@ def mock_settings():
         mock.neo4j_password = "password"
         mock.discovery_scan_interval = 28800  # 8 hours
         mock.discovery_parallel_workers = 5
+        mock.neo4j_write_batch_size = 1000
+        mock.discovery_incremental_writes = False
 
         # Azure credentials
         mock.enable_azure_discovery = True
@@ -51,6 +55,8 @@ def mock_settings():
         mock.azure_client_id = "test-client"
         mock.azure_client_secret = "test-secret"
         mock.azure_subscription_id = "test-subscription"
+        mock.azure_subscription_ids = ""
+        mock.azure_discovery_streaming = False
 
         # AWS credentials
         mock.enable_aws_discovery = False
@@ -254,13 +260,94 @@ async def test_store_results(scheduler, mock_neo4j_client):
 
     results = {"azure": mock_result}
 
+    session = MagicMock()
+    mock_neo4j_client.session = MagicMock()
+    mock_neo4j_client.session.return_value.__enter__.return_value = session
+    tx = Mock()
+    tx.run.return_value.single.return_value = {"count": 1}
+    session.execute_write.side_effect = lambda work: work(tx)
+
     await scheduler._store_results(results)
 
-    # Verify resource was stored
-    mock_neo4j_client.upsert_resource.assert_called_once_with({"id": "test-id"})
+    # Resources and dependencies are written as batches in write transactions
+    assert session.execute_write.call_count == 2
+    resource_call, dependency_call = tx.run.call_args_list
+    [resource_row] = resource_call.kwargs["rows"]
+    assert resource_row["id"] == "test-id"
+    assert resource_row["content_hash"] == content_hash({"id": "test-id"})
+    [dependency_row] = dependency_call.kwargs["rows"]
+    assert dependency_row["source_id"] == "source-id"
+    assert dependency_row["target_id"] == "target-id"
+    assert dependency_row["discovered_method"] == "unknown"
+    mock_neo4j_client.upsert_resource.assert_not_called()
+    mock_neo4j_client.create_dependency.assert_not_called()
+    assert scheduler.last_change_set is None
+
+
+@pytest.mark.asyncio
+async def test_store_results_incremental(scheduler, mock_settings, mock_neo4j_client):
+    """Test incremental writes merge per-provider change-sets."""
+    scheduler.neo4j_client = mock_neo4j_client
+    mock_settings.discovery_incremental_writes = True
+    changes = ChangeSet(added={"resources": {"res-1"}})
+
+    with patch("topdeck.common.scheduler.GraphBatchWriter") as writer_cls:
+        writer_cls.return_value.write_discovery_changes.return_value = (
+            BatchWriteReport(written={"resources": 1}),
+            changes,
+        )
+        change_set = await scheduler._store_results({"azure": DiscoveryResult()})
+
+    writer_cls.return_value.write_discovery_changes.assert_called_once()
+    assert writer_cls.return_value.write_discovery_changes.call_args.args[1] == "azure"
+    assert change_set.affected_ids == {"res-1"}
+    assert scheduler.last_change_set is change_set
+
+
+@pytest.mark.asyncio
+async def test_discover_azure_merges_subscriptions(scheduler, mock_settings):
+    """Test every configured subscription is discovered and a failed one is an error."""
+    mock_settings.azure_subscription_ids = "sub-2, test-subscription,sub-3"
+    results = {
+        "test-subscription": DiscoveryResult(resources=[Mock(id="res-1")]),
+        "sub-2": DiscoveryResult(resources=[Mock(id="res-2"), Mock(id="res-1")]),
+    }
+
+    async def discover(subscription_id, credential):
+        if subscription_id not in results:
+            raise RuntimeError("forbidden")
+        return results[subscription_id]
+
+    with (
+        patch.object(scheduler, "_azure_credential"),
+        patch.object(scheduler, "_discover_azure_subscription", side_effect=discover),
+    ):
+        result = await scheduler._discover_azure()
+
+    assert scheduler._azure_subscription_ids() == ["test-subscription", "sub-2", "sub-3"]
+    assert [r.id for r in result.resources] == ["res-1", "res-2"]
+    assert result.subscription_id is None
+    assert result.errors == ["Azure subscription sub-3 failed: forbidden"]
+
+
+@pytest.mark.asyncio
+async def test_run_discovery_streams_azure(scheduler, mock_settings, mock_neo4j_client):
+    """Test streamed Azure changes are merged into the change-set of the run."""
+    scheduler.neo4j_client = mock_neo4j_client
+    mock_settings.azure_discovery_streaming = True
+    mock_settings.discovery_incremental_writes = True
+    streamed = ChangeSet(added={"resources": {"res-1"}})
+
+    with (
+        patch.object(scheduler, "_stream_azure", return_value=streamed),
+        patch.object(scheduler, "_discover_azure") as discover,
+        patch.object(scheduler, "_refresh_graph_snapshot") as refresh,
+    ):
+        await scheduler._run_discovery()
 
-    # Verify dependency was stored
-    mock_neo4j_client.create_dependency.assert_called_once()
+    discover.assert_not_called()
+    refresh.assert_called_once()
+    assert scheduler.last_change_set.affected_ids == {"res-1"}
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,231 @@
+"""Tests for the two-tier shared query cache."""
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+
+from topdeck.common.cache import deserialize, serialize
+from topdeck.storage.query_cache import QueryCache
+from topdeck.storage.tiered_cache import KEY_PREFIX, TieredQueryCache, cached_result
+
+
+class FakePubSub:
+    """In-memory stand-in for a Redis PubSub object."""
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def close(self):
+        pass
+
+
+class FakeRedisCache:
+    """In-memory stand-in for topdeck.common.cache.Cache shared by replicas."""
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.tags: dict[str, set[str]] = {}
+        self.subscribers: list[FakePubSub] = []
+
+    async def get(self, key):
+        data = self.values.get(key)
+        return deserialize(data) if data is not None else None
+
+    async def set(self, key, value, ttl=None):
+        try:
+            self.values[key] = serialize(value)
+        except TypeError:
+            return False
+        return True
+
+    async def delete(self, key):
+        return self.values.pop(key, None) is not None
+
+    async def set_if_absent(self, key, value, ttl=None):
+        if key in self.values:
+            return False
+        self.values[key] = serialize(value)
+        return True
+
+    async def tag_key(self, key, tags, ttl=None):
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
+        return True
+
+    async def delete_tagged(self, tags):
+        keys = set().union(*(self.tags.pop(tag, set()) for tag in tags))
+        return sum([await self.delete(key) for key in keys])
+
+    async def clear_pattern(self, pattern):
+        count = len(self.values)
+        self.values.clear()
+        return count
+
+    async def publish(self, channel, message):
+        for subscriber in self.subscribers:
+            subscriber.queue.put_nowait({"type": "message", "data": serialize(message)})
+        return True
+
+    async def subscribe(self, channel):
+        pubsub = FakePubSub()
+        self.subscribers.append(pubsub)
+        return pubsub
+
+
+async def _settle():
+    """Let scheduled broadcast and listener tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def redis():
+    return FakeRedisCache()
+
+
+async def test_concurrent_misses_compute_once(redis):
+    """Test concurrent requests for one key share a single computation."""
+    cache = TieredQueryCache(l1=QueryCache(), l2=redis)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"nodes": [1, 2]}
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(10)))
+
+    assert results == [{"nodes": [1, 2]}] * 10
+    assert calls == 1
+    assert cache.get_stats()["coalesced"] == 9
+    assert f"{KEY_PREFIX}k:lock" not in redis.values
+
+
+async def test_cancelled_caller_does_not_cancel_coalesced_callers(redis):
+    """Test cancelling the caller that started a computation leaves it running for the others."""
+    cache = TieredQueryCache(l1=QueryCache(), l2=redis)
+    release = asyncio.Event()
+
+    async def compute():
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(cache.get_or_compute("k", compute))
+    await _settle()
+    second = asyncio.create_task(cache.get_or_compute("k", compute))
+    await _settle()
+
+    first.cancel()
+    await _settle()
+    release.set()
+
+    assert await second == "value"
+    assert first.cancelled()
+    assert cache.get_stats()["inflight"] == 0
+
+
+async def test_unserializable_values_are_not_shared(redis):
+    """Test values Redis cannot store as they are stay in L1 only."""
+    cache = TieredQueryCache(l1=QueryCache(), l2=redis)
+    value = {"at": datetime(2026, 1, 1, tzinfo=UTC)}
+
+    assert await cache.get_or_compute("k", lambda: value, tags={"label:Node"}) == value
+    assert await cache.get_or_compute("k", lambda: "unused") == value
+    assert f"{KEY_PREFIX}k" not in redis.values
+    assert not redis.tags
+
+
+async def test_replicas_share_results_through_redis(redis):
+    """Test a value computed by one replica is served from Redis by another."""
+    first = TieredQueryCache(l1=QueryCache(), l2=redis)
+    second = TieredQueryCache(l1=QueryCache(), l2=redis)
+
+    assert await first.get_or_compute("k", lambda: [1]) == [1]
+    assert await second.get_or_compute("k", lambda: [2]) == [1]
+    assert await second.get_or_compute("k", lambda: [3]) == [1]
+
+    stats = second.get_stats()
+    assert (stats["computed"], stats["l2_hits"], stats["l1_hits"]) == (0, 1, 1)
+
+
+async def test_waits_for_replica_holding_the_lock(redis):
+    """Test a replica waits for the one computing the value instead of computing it."""
+    cache = TieredQueryCache(l1=QueryCache(), l2=redis, lock_timeout=1.0)
+    await redis.set_if_absent(f"{KEY_PREFIX}k:lock", "other-replica")
+
+    async def other_replica_finishes():
+        await asyncio.sleep(0.1)
+        await redis.set(
+            f"{KEY_PREFIX}k", {"value": "theirs", "delta": 0.1, "expires_at": time.time() + 60}
+        )
+
+    finisher = asyncio.create_task(other_replica_finishes())
+    assert await cache.get_or_compute("k", lambda: "ours") == "theirs"
+    await finisher
+    assert cache.get_stats()["computed"] == 0
+
+
+async def test_early_refresh_near_expiry(redis):
+    """Test entries close to expiry are recomputed before they expire."""
+    cache = TieredQueryCache(l1=QueryCache(), l2=redis)
+    values = iter(["old", "new"])
+
+    def compute():
+        time.sleep(0.05)
+        return next(values)
+
+    assert await cache.get_or_compute("k", compute, ttl=1) == "old"
+    # Far from expiry: served from cache
+    assert await cache.get_or_compute("k", compute, ttl=1) == "old"
+
+    # An extreme draw makes the refresh due
+    with patch("topdeck.storage.tiered_cache.random.random", return_value=1 - 1e-13):
+        assert await cache.get_or_compute("k", compute, ttl=1) == "new"
+    assert cache.get_stats()["early_refreshes"] == 1
+
+
+async def test_invalidation_is_broadcast_to_replicas(redis):
+    """Test invalidating locally drops the entry in Redis and in other replicas."""
+    first = TieredQueryCache(l1=QueryCache(), l2=redis)
+    second = TieredQueryCache(l1=QueryCache(), l2=redis)
+    await first.start()
+    await second.start()
+    try:
+        tags = {"label:Node"}
+        await first.get_or_compute("k", lambda: "v1", tags=tags)
+        await second.get_or_compute("k", lambda: "unused", tags=tags)
+        await first.get_or_compute("other", lambda: "kept", tags={"resource:x"})
+
+        # e.g. a Neo4j write through the first replica's client
+        first.l1.invalidate_tags({"label:Node"})
+        await _settle()
+
+        assert f"{KEY_PREFIX}k" not in redis.values
+        assert await second.get_or_compute("k", lambda: "v2", tags=tags) == "v2"
+        assert await first.get_or_compute("other", lambda: "unused") == "kept"
+        assert second.get_stats()["remote_invalidations"] == 1
+        assert first.get_stats()["remote_invalidations"] == 0
+    finally:
+        await first.stop()
+        await second.stop()
+
+
+async def test_without_redis_and_without_cache():
+    """Test the cache works in-process only, and cached_result without a cache."""
+    cache = TieredQueryCache(l1=QueryCache())
+    assert await cache.get_or_compute("k", lambda: 1) == 1
+    assert await cache.get_or_compute("k", lambda: 2) == 1
+
+    async def compute():
+        return "direct"
+
+    assert await cached_result("k", compute) == "direct"
+    assert await cached_result("k", lambda: "sync") == "sync"